@@ -0,0 +1,63 @@
+"""add signpost_current_values materialization
+
+Revision ID: 036_signpost_values
+Revises: 035_stories
+Create Date: 2025-11-14
+
+PERFORMANCE: Materialize each signpost's current value and evidence summary.
+
+Snapshot scoring, /v1/signposts/by-code/{code}/pace and /v1/roadmaps/compare
+used to rediscover "the current value of a signpost" with their own
+per-signpost query chains. This table holds, per signpost:
+- Latest observed value, its date and whether it came from a claim or an event link
+- Highest scorable A/B value and best tier (what the index scores)
+- Evidence counts by tier
+
+Rows are refreshed by app.services.signpost_values on claim/link writes and
+rebuilt in full before each daily snapshot. Populate it after upgrading with
+the app.tasks.snap_index.refresh_signpost_values task (or wait for the next
+daily snapshot).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision: str = '036_signpost_values'
+down_revision: Union[str, None] = '035_stories'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create signpost_current_values table."""
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS signpost_current_values (
+            signpost_id INTEGER PRIMARY KEY REFERENCES signposts(id) ON DELETE CASCADE,
+            current_value NUMERIC,
+            observed_at TIMESTAMPTZ,
+            source_type VARCHAR(10),
+            max_value NUMERIC,
+            best_tier VARCHAR(1),
+            tier_a_count INTEGER NOT NULL DEFAULT 0,
+            tier_b_count INTEGER NOT NULL DEFAULT 0,
+            tier_c_count INTEGER NOT NULL DEFAULT 0,
+            tier_d_count INTEGER NOT NULL DEFAULT 0,
+            refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            CONSTRAINT check_signpost_current_value_source_type
+                CHECK (source_type IS NULL OR source_type IN ('claim', 'event'))
+        )
+    """)
+
+    print("✓ Created signpost_current_values table")
+
+
+def downgrade() -> None:
+    """Drop signpost_current_values table."""
+
+    op.execute("DROP TABLE IF EXISTS signpost_current_values CASCADE")
+
+    print("✓ Dropped signpost_current_values table")
@@ -0,0 +1,71 @@
+"""add near-duplicate story clusters for events
+
+Revision ID: 037_story_clusters
+Revises: 036_signpost_values
+Create Date: 2025-11-17
+
+PERFORMANCE: Cluster near-duplicate events (same story, different outlets).
+
+- events.minhash: 128 x uint32 MinHash signature of title + summary lead
+- events.story_cluster_id: id of the first event of the story
+- event_lsh_buckets: 32 LSH band keys per event, so the near-duplicate
+  candidates of a new event are one indexed lookup
+
+Assigned by app.services.event_clusters.assign_story_clusters, which
+upsert_events runs at ingest time for every event whose minhash is NULL
+(the first ingest run after upgrading backfills existing events).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision: str = '037_story_clusters'
+down_revision: Union[str, None] = '036_signpost_values'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add minhash/story_cluster_id to events and create event_lsh_buckets."""
+
+    op.execute("ALTER TABLE events ADD COLUMN IF NOT EXISTS minhash BYTEA")
+    op.execute("ALTER TABLE events ADD COLUMN IF NOT EXISTS story_cluster_id INTEGER")
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_events_story_cluster_id
+        ON events(story_cluster_id)
+    """)
+    # Pending events (assign_story_clusters picks these up)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_events_minhash_pending
+        ON events(published_at, id) WHERE minhash IS NULL
+    """)
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS event_lsh_buckets (
+            bucket BIGINT NOT NULL,
+            event_id INTEGER NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+            PRIMARY KEY (bucket, event_id)
+        )
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_event_lsh_buckets_event_id
+        ON event_lsh_buckets(event_id)
+    """)
+
+    print("✓ Added events.minhash and events.story_cluster_id")
+    print("✓ Created event_lsh_buckets table")
+
+
+def downgrade() -> None:
+    """Drop story cluster columns and event_lsh_buckets."""
+
+    op.execute("DROP TABLE IF EXISTS event_lsh_buckets CASCADE")
+    op.execute("DROP INDEX IF EXISTS idx_events_minhash_pending")
+    op.execute("DROP INDEX IF EXISTS idx_events_story_cluster_id")
+    op.execute("ALTER TABLE events DROP COLUMN IF EXISTS story_cluster_id")
+    op.execute("ALTER TABLE events DROP COLUMN IF EXISTS minhash")
+
+    print("✓ Dropped story cluster columns and event_lsh_buckets")
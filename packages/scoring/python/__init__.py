@@ -1,12 +1,26 @@
 """AGI Signpost Tracker scoring library (Python)."""
 from .core import (
+    CATEGORY_ORDER,
+    DIRECTION_CODES,
+    NO_EVIDENCE_SIGMA,
+    TIER_SIGMA,
     aggregate_category,
+    aggregate_category_batch,
+    build_category_weight_matrix,
+    build_preset_weight_matrix,
     clamp,
     compute_confidence_bands,
+    compute_confidence_bands_monte_carlo,
     compute_index_from_categories,
+    compute_index_from_categories_batch,
     compute_overall,
+    compute_overall_batch,
     compute_safety_margin,
     compute_signpost_progress,
+    compute_signpost_progress_batch,
+    encode_directions,
+    encode_tier_sigmas,
+    sample_index_distribution,
 )
 
 __all__ = [
@@ -17,5 +31,20 @@ __all__ = [
     "compute_safety_margin",
     "compute_index_from_categories",
     "compute_confidence_bands",
+    # Batch (NumPy) API
+    "CATEGORY_ORDER",
+    "DIRECTION_CODES",
+    "encode_directions",
+    "compute_signpost_progress_batch",
+    "build_category_weight_matrix",
+    "aggregate_category_batch",
+    "compute_overall_batch",
+    "build_preset_weight_matrix",
+    "compute_index_from_categories_batch",
+    # Monte Carlo confidence bands
+    "TIER_SIGMA",
+    "NO_EVIDENCE_SIGMA",
+    "encode_tier_sigmas",
+    "sample_index_distribution",
+    "compute_confidence_bands_monte_carlo",
 ]
-
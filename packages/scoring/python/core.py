@@ -1,5 +1,13 @@
 """Core scoring algorithms for AGI signpost progress calculation."""
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Category order used by the batch (array) API
+CATEGORY_ORDER = ("capabilities", "agents", "inputs", "security")
+
+# Integer direction codes used by the batch (array) API
+DIRECTION_CODES = {">=": 1, "<=": -1}
 
 
 def clamp(value: float, min_val: float = 0.0, max_val: float = 1.0) -> float:
@@ -196,3 +204,299 @@ def compute_confidence_bands(
     
     return bands
 
+
+
+# ---------------------------------------------------------------------------
+# Batch (NumPy) API
+#
+# Vectorized counterparts of the scalar functions above. They score many
+# signposts x presets (or x scenarios) in one call and must stay numerically
+# identical to the scalar versions (see test_core.py parity tests).
+# ---------------------------------------------------------------------------
+
+
+def encode_directions(directions: Sequence[str]) -> np.ndarray:
+    """
+    Encode '>=' / '<=' direction strings as integer codes (1 / -1).
+
+    Raises:
+        ValueError: If any direction is not '>=' or '<='
+    """
+    try:
+        return np.array([DIRECTION_CODES[d] for d in directions], dtype=np.int8)
+    except KeyError as e:
+        raise ValueError(f"Invalid direction: {e.args[0]}. Must be '>=' or '<='") from None
+
+
+def compute_signpost_progress_batch(
+    observed: np.ndarray,
+    baseline: np.ndarray,
+    target: np.ndarray,
+    direction_codes: np.ndarray
+) -> np.ndarray:
+    """
+    Compute progress for many signposts (and scenarios) at once.
+
+    All arguments broadcast against each other, so ``observed`` may be a
+    (scenarios x signposts) matrix while baseline/target/direction_codes
+    are per-signpost vectors.
+
+    Args:
+        observed: Observed values
+        baseline: Baseline values
+        target: Target values
+        direction_codes: 1 for '>=' metrics, -1 for '<=' (see encode_directions)
+
+    Returns:
+        Progress array clamped to [0, 1]
+    """
+    observed = np.asarray(observed, dtype=np.float64)
+    baseline = np.asarray(baseline, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    direction_codes = np.asarray(direction_codes)
+
+    increasing = direction_codes == 1
+    span = np.where(increasing, target - baseline, baseline - target)
+    delta = np.where(increasing, observed - baseline, baseline - observed)
+    degenerate = span == 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        progress = np.clip(delta / np.where(degenerate, 1.0, span), 0.0, 1.0)
+
+    # Baseline == target: binary completion check, as in the scalar version
+    reached = np.where(increasing, observed >= target, observed <= target)
+    return np.where(degenerate, reached.astype(np.float64), progress)
+
+
+def build_category_weight_matrix(
+    categories: Sequence[str],
+    signpost_weights: Optional[Sequence[float]] = None,
+    category_order: Sequence[str] = CATEGORY_ORDER
+) -> np.ndarray:
+    """
+    Build a (signposts x categories) weight matrix for aggregate_category_batch.
+
+    Entry [i, j] holds signpost i's weight if it belongs to category j, else 0.
+    Signposts in categories outside ``category_order`` are ignored.
+    """
+    column = {category: j for j, category in enumerate(category_order)}
+    if signpost_weights is None:
+        signpost_weights = [1.0] * len(categories)
+
+    matrix = np.zeros((len(categories), len(category_order)), dtype=np.float64)
+    for i, (category, weight) in enumerate(zip(categories, signpost_weights)):
+        if category in column:
+            matrix[i, column[category]] = weight
+    return matrix
+
+
+def aggregate_category_batch(progress: np.ndarray, weight_matrix: np.ndarray) -> np.ndarray:
+    """
+    Weighted-mean aggregation of signpost progress into category scores.
+
+    Args:
+        progress: (..., signposts) progress array
+        weight_matrix: (signposts x categories) weights, see build_category_weight_matrix
+
+    Returns:
+        (..., categories) category scores; categories with zero total weight score 0.0
+    """
+    progress = np.asarray(progress, dtype=np.float64)
+    weight_matrix = np.asarray(weight_matrix, dtype=np.float64)
+
+    total_weight = weight_matrix.sum(axis=0)
+    weighted_sum = progress @ weight_matrix
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total_weight == 0, 0.0, weighted_sum / np.where(total_weight == 0, 1.0, total_weight))
+
+
+def compute_overall_batch(capabilities: np.ndarray, inputs: np.ndarray) -> np.ndarray:
+    """Harmonic mean of capabilities and inputs; 0.0 wherever either is zero."""
+    capabilities = np.asarray(capabilities, dtype=np.float64)
+    inputs = np.asarray(inputs, dtype=np.float64)
+
+    zero = (capabilities == 0) | (inputs == 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        overall = 2.0 / (1.0 / np.where(zero, 1.0, capabilities) + 1.0 / np.where(zero, 1.0, inputs))
+    return np.where(zero, 0.0, overall)
+
+
+def build_preset_weight_matrix(
+    presets: Sequence[Dict[str, float]],
+    category_order: Sequence[str] = CATEGORY_ORDER
+) -> np.ndarray:
+    """
+    Build a (presets x categories) matrix from preset weight dicts.
+
+    Missing capabilities/agents weights default to 0.25, matching
+    compute_index_from_categories; other missing weights default to 0.
+    """
+    defaults = {"capabilities": 0.25, "agents": 0.25}
+    return np.array(
+        [[preset.get(category, defaults.get(category, 0.0)) for category in category_order] for preset in presets],
+        dtype=np.float64,
+    ).reshape(len(presets), len(category_order))
+
+
+def compute_index_from_categories_batch(
+    category_scores: np.ndarray,
+    preset_weights: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Compute overall and safety margin for every (row, preset) pair.
+
+    Args:
+        category_scores: (..., 4) scores in CATEGORY_ORDER
+        preset_weights: (presets x 4) weights in CATEGORY_ORDER, see build_preset_weight_matrix
+
+    Returns:
+        Dict with 'overall' and 'safety_margin', each shaped (..., presets)
+    """
+    category_scores = np.asarray(category_scores, dtype=np.float64)
+    preset_weights = np.asarray(preset_weights, dtype=np.float64)
+
+    capabilities = category_scores[..., 0:1]
+    agents = category_scores[..., 1:2]
+    inputs = category_scores[..., 2:3]
+    security = category_scores[..., 3:4]
+
+    cap_weight = preset_weights[:, 0]
+    agent_weight = preset_weights[:, 1]
+    combined_weight = cap_weight + agent_weight
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        combined_cap = np.where(
+            combined_weight > 0,
+            (capabilities * cap_weight + agents * agent_weight) / np.where(combined_weight > 0, combined_weight, 1.0),
+            0.0,
+        )
+
+    return {
+        "overall": compute_overall_batch(combined_cap, inputs),
+        "safety_margin": security - combined_cap,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Monte Carlo confidence bands
+#
+# Alternative to the fixed-width heuristic in compute_confidence_bands: draw
+# per-signpost observed values with noise proportional to evidence quality
+# and push every sample through category aggregation and the harmonic-mean
+# overall, then read percentile bands off the resulting distribution.
+#
+# Progress is clipped to [0, 1], so noise around a signpost at its baseline
+# (or target) can only push it one way and the raw sample percentiles drift
+# away from the score. Bands are therefore built from the sampled spread on
+# each side of the median, re-centred on the noise-free point estimate.
+# ---------------------------------------------------------------------------
+
+# Standard deviation of observed values, as a fraction of |target - baseline|
+TIER_SIGMA = {"A": 0.05, "B": 0.10, "C": 0.25, "D": 0.40}
+NO_EVIDENCE_SIGMA = 0.50
+
+
+def encode_tier_sigmas(tiers: Sequence[Optional[str]]) -> np.ndarray:
+    """Map each signpost's best evidence tier (or None) to its sampling sigma."""
+    return np.array([TIER_SIGMA.get(tier, NO_EVIDENCE_SIGMA) for tier in tiers], dtype=np.float64)
+
+
+def sample_index_distribution(
+    observed: np.ndarray,
+    baseline: np.ndarray,
+    target: np.ndarray,
+    direction_codes: np.ndarray,
+    tier_sigmas: np.ndarray,
+    category_weights: np.ndarray,
+    preset_weights: np.ndarray,
+    n_samples: int = 10000,
+    seed: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Sample the index distribution implied by per-signpost evidence quality.
+
+    Args:
+        observed, baseline, target, direction_codes: Per-signpost vectors
+        tier_sigmas: Per-signpost sigma as a fraction of |target - baseline|
+        category_weights: (signposts x 4) matrix, see build_category_weight_matrix
+        preset_weights: (presets x 4) matrix, see build_preset_weight_matrix
+        n_samples: Number of Monte Carlo draws
+        seed: Optional RNG seed for reproducible bands
+
+    Returns:
+        Dict with 'category_scores' (samples x 4), 'overall' and
+        'safety_margin' (samples x presets), and 'point': the same metrics
+        for the noise-free observed values
+    """
+    baseline = np.asarray(baseline, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    span = np.abs(target - baseline)
+    scale = np.asarray(tier_sigmas, dtype=np.float64) * np.where(span == 0, 1.0, span)
+
+    rng = np.random.default_rng(seed)
+    observed = np.asarray(observed, dtype=np.float64)
+    samples = observed + rng.standard_normal((n_samples, len(baseline))) * scale
+
+    # Row 0 is the noise-free point estimate, the rest are the draws
+    progress = compute_signpost_progress_batch(np.vstack([observed, samples]), baseline, target, direction_codes)
+    category_scores = aggregate_category_batch(progress, category_weights)
+    index = compute_index_from_categories_batch(category_scores, preset_weights)
+
+    return {
+        "category_scores": category_scores[1:],
+        "overall": index["overall"][1:],
+        "safety_margin": index["safety_margin"][1:],
+        "point": {
+            "category_scores": category_scores[0],
+            "overall": index["overall"][0],
+            "safety_margin": index["safety_margin"][0],
+        },
+    }
+
+
+def compute_confidence_bands_monte_carlo(
+    samples: Dict[str, np.ndarray],
+    percentiles: Sequence[float] = (5.0, 95.0),
+    category_order: Sequence[str] = CATEGORY_ORDER
+) -> List[Dict[str, Dict[str, float]]]:
+    """
+    Turn sampled index distributions into per-preset percentile bands.
+
+    Args:
+        samples: Output of sample_index_distribution
+        percentiles: (lower, upper) percentiles, default 90% interval
+
+    Returns:
+        One {metric: {lower, median, upper}} dict per preset, in preset order,
+        covering every category plus 'overall' and 'safety_margin'. The
+        median is the point estimate and lower <= median <= upper always
+        holds: each side spans the sampled distance from the sample median
+        to that percentile, clipped to the metric's range.
+    """
+    lower_pct, upper_pct = percentiles
+    qs = [lower_pct, 50.0, upper_pct]
+    point = samples["point"]
+
+    category_q = np.percentile(samples["category_scores"], qs, axis=0)  # (3 x 4)
+    overall_q = np.percentile(samples["overall"], qs, axis=0)  # (3 x presets)
+    margin_q = np.percentile(samples["safety_margin"], qs, axis=0)
+
+    def band(q: np.ndarray, center: float, low: float = 0.0, high: float = 1.0) -> Dict[str, float]:
+        return {
+            "lower": float(np.clip(center - (q[1] - q[0]), low, center)),
+            "median": float(center),
+            "upper": float(np.clip(center + (q[2] - q[1]), center, high)),
+        }
+
+    category_bands = {
+        category: band(category_q[:, j], point["category_scores"][j]) for j, category in enumerate(category_order)
+    }
+
+    return [
+        {
+            **category_bands,
+            "overall": band(overall_q[:, p], point["overall"][p]),
+            "safety_margin": band(margin_q[:, p], point["safety_margin"][p], low=-1.0),
+        }
+        for p in range(overall_q.shape[1])
+    ]
@@ -5,12 +5,25 @@ from pathlib import Path
 # Add current directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+import numpy as np
 import pytest
 from core import (
-    compute_signpost_progress,
+    CATEGORY_ORDER,
     aggregate_category,
+    aggregate_category_batch,
+    build_category_weight_matrix,
+    build_preset_weight_matrix,
     compute_index_from_categories,
+    compute_index_from_categories_batch,
+    compute_overall,
+    compute_overall_batch,
     compute_safety_margin,
+    compute_signpost_progress,
+    compute_confidence_bands_monte_carlo,
+    compute_signpost_progress_batch,
+    encode_directions,
+    encode_tier_sigmas,
+    sample_index_distribution,
 )
 
 
@@ -170,6 +183,198 @@ def test_weighted_presets():
     assert result_equal["overall"] == pytest.approx(0.533, abs=0.01)
 
 
+def test_batch_progress_parity():
+    """Batch progress matches the scalar function, including edge cases."""
+    cases = [
+        (70, 50, 90, ">="), (100, 50, 90, ">="), (40, 50, 90, ">="),
+        (5, 10, 0, "<="), (-5, 10, 0, "<="), (15, 10, 0, "<="),
+        (90, 90, 90, ">="), (89, 90, 90, ">="), (0, 0, 0, "<="), (1, 0, 0, "<="),
+    ]
+    observed, baseline, target, directions = (list(col) for col in zip(*cases))
+
+    batch = compute_signpost_progress_batch(observed, baseline, target, encode_directions(directions))
+
+    expected = [compute_signpost_progress(*case) for case in cases]
+    np.testing.assert_allclose(batch, expected)
+
+
+def test_batch_progress_broadcasts_over_scenarios():
+    """A (scenarios x signposts) observed matrix scores every scenario at once."""
+    rng = np.random.default_rng(0)
+    baseline = np.array([50.0, 10.0, 0.0])
+    target = np.array([90.0, 0.0, 100.0])
+    directions = encode_directions([">=", "<=", ">="])
+    observed = rng.uniform(-10, 110, size=(200, 3))
+
+    batch = compute_signpost_progress_batch(observed, baseline, target, directions)
+
+    assert batch.shape == (200, 3)
+    for s in (0, 57, 199):
+        for i, d in enumerate([">=", "<=", ">="]):
+            assert batch[s, i] == pytest.approx(compute_signpost_progress(observed[s, i], baseline[i], target[i], d))
+
+
+def test_invalid_direction_batch():
+    """Unknown direction strings are rejected like the scalar version."""
+    with pytest.raises(ValueError):
+        encode_directions([">=", "=="])
+
+
+def test_batch_aggregate_parity():
+    """Category aggregation via weight matrix matches aggregate_category."""
+    progress = np.array([0.5, 1.0, 0.2, 0.8, 0.3])
+    categories = ["capabilities", "capabilities", "agents", "inputs", "economic"]
+    weights = [2.0, 1.0, 1.0, 2.0, 1.0]
+
+    scores = aggregate_category_batch(progress, build_category_weight_matrix(categories, weights))
+
+    assert scores[0] == pytest.approx(aggregate_category([0.5, 1.0], [2.0, 1.0]))
+    assert scores[1] == pytest.approx(aggregate_category([0.2], [1.0]))
+    assert scores[2] == pytest.approx(aggregate_category([0.8], [2.0]))
+    # Security has no signposts; economic is outside CATEGORY_ORDER
+    assert scores[3] == 0.0
+
+
+def test_batch_overall_parity():
+    """Vectorized harmonic mean matches compute_overall, including zeros."""
+    caps = np.array([0.5, 0.4, 0.0, 0.8])
+    inputs = np.array([0.5, 0.6, 0.5, 0.0])
+
+    batch = compute_overall_batch(caps, inputs)
+
+    np.testing.assert_allclose(batch, [compute_overall(c, i) for c, i in zip(caps, inputs)])
+
+
+def test_batch_index_parity_across_presets():
+    """Every (scenario, preset) cell matches compute_index_from_categories."""
+    presets = [
+        {"capabilities": 0.25, "agents": 0.25, "inputs": 0.25, "security": 0.25},
+        {"capabilities": 0.2, "agents": 0.3, "inputs": 0.4, "security": 0.1},
+        {"capabilities": 0.5, "agents": 0.0, "inputs": 0.5},
+        {"capabilities": 0.6, "inputs": 0.4},  # agents defaults to 0.25
+    ]
+    rng = np.random.default_rng(1)
+    scenarios = rng.uniform(0, 1, size=(50, len(CATEGORY_ORDER)))
+    scenarios[0, 2] = 0.0  # zero inputs
+
+    result = compute_index_from_categories_batch(scenarios, build_preset_weight_matrix(presets))
+
+    assert result["overall"].shape == (50, len(presets))
+    for s in (0, 13, 49):
+        categories = dict(zip(CATEGORY_ORDER, scenarios[s]))
+        for p, preset in enumerate(presets):
+            expected = compute_index_from_categories(categories, preset)
+            assert result["overall"][s, p] == pytest.approx(expected["overall"])
+            assert result["safety_margin"][s, p] == pytest.approx(expected["safety_margin"])
+
+
+def _monte_carlo_bands(tiers, n_samples=10000, seed=42):
+    """Run the Monte Carlo pipeline on a small fixed signpost set."""
+    baseline = np.array([50.0, 0.0, 10.0, 24.0, 10.0])
+    target = np.array([90.0, 100.0, 60.0, 27.0, 0.0])
+    observed = np.array([70.0, 40.0, 35.0, 25.5, 5.0])
+    directions = encode_directions([">=", ">=", ">=", ">=", "<="])
+    category_weights = build_category_weight_matrix(
+        ["capabilities", "capabilities", "agents", "inputs", "security"], [2.0, 1.0, 2.0, 2.0, 1.0]
+    )
+    presets = build_preset_weight_matrix([
+        {"capabilities": 0.25, "agents": 0.25, "inputs": 0.25, "security": 0.25},
+        {"capabilities": 0.2, "agents": 0.3, "inputs": 0.4, "security": 0.1},
+    ])
+    samples = sample_index_distribution(
+        observed, baseline, target, directions, encode_tier_sigmas(tiers),
+        category_weights, presets, n_samples=n_samples, seed=seed,
+    )
+    return samples, compute_confidence_bands_monte_carlo(samples)
+
+
+def test_monte_carlo_bands_bracket_point_estimate():
+    """Bands are ordered and contain the deterministic score."""
+    _, bands = _monte_carlo_bands(["A", "B", "A", "B", "C"])
+
+    assert len(bands) == 2
+    for preset_bands in bands:
+        for metric in ("capabilities", "agents", "inputs", "security", "overall", "safety_margin"):
+            band = preset_bands[metric]
+            assert band["lower"] <= band["median"] <= band["upper"]
+
+    # agents: single signpost at 0.5 progress
+    assert bands[0]["agents"]["lower"] < 0.5 < bands[0]["agents"]["upper"]
+    assert bands[0]["agents"]["median"] == pytest.approx(0.5, abs=0.02)
+
+
+def test_monte_carlo_bands_contain_scored_value():
+    """Every band contains its deterministic score, including signposts stuck at baseline."""
+    n = 20
+    baseline, target = np.zeros(n), np.full(n, 100.0)
+    directions = encode_directions([">="] * n)
+    category_weights = build_category_weight_matrix(
+        ["capabilities", "agents", "inputs", "security"] * (n // 4), [1.0] * n
+    )
+    presets = build_preset_weight_matrix([{"capabilities": 0.25, "agents": 0.25, "inputs": 0.25, "security": 0.25}])
+
+    for observed, tiers in [
+        (baseline.copy(), [None] * n),  # no evidence anywhere
+        (np.linspace(0, 100, n), ["A", "B", "C", "D", None] * (n // 5)),  # at baseline, between, at target
+    ]:
+        samples = sample_index_distribution(
+            observed, baseline, target, directions, encode_tier_sigmas(tiers),
+            category_weights, presets, n_samples=2000, seed=3,
+        )
+        (bands,) = compute_confidence_bands_monte_carlo(samples)
+
+        categories = aggregate_category_batch(
+            compute_signpost_progress_batch(observed, baseline, target, directions), category_weights
+        )
+        index = compute_index_from_categories_batch(categories, presets)
+        scored = {
+            **dict(zip(CATEGORY_ORDER, categories)),
+            "overall": index["overall"][0],
+            "safety_margin": index["safety_margin"][0],
+        }
+        for metric, value in scored.items():
+            band = bands[metric]
+            assert band["lower"] <= value <= band["upper"], metric
+            assert band["median"] == pytest.approx(value)
+
+    # No evidence: score 0, so the band can only open upwards
+    no_evidence = compute_confidence_bands_monte_carlo(sample_index_distribution(
+        baseline, baseline, target, directions, encode_tier_sigmas([None] * n),
+        category_weights, presets, n_samples=2000, seed=3,
+    ))[0]
+    assert no_evidence["capabilities"]["lower"] == no_evidence["capabilities"]["median"] == 0.0
+    assert no_evidence["capabilities"]["upper"] > 0.0
+
+
+def test_monte_carlo_bands_widen_with_weaker_evidence():
+    """D-tier evidence yields wider bands than A-tier evidence."""
+    _, strong = _monte_carlo_bands(["A"] * 5)
+    _, weak = _monte_carlo_bands(["D"] * 5)
+
+    def width(band):
+        return band["upper"] - band["lower"]
+
+    assert width(weak[0]["overall"]) > width(strong[0]["overall"])
+    assert width(weak[0]["capabilities"]) > width(strong[0]["capabilities"])
+
+
+def test_monte_carlo_is_reproducible_with_seed():
+    """The same seed gives identical bands."""
+    _, first = _monte_carlo_bands(["B"] * 5, seed=7)
+    _, second = _monte_carlo_bands(["B"] * 5, seed=7)
+
+    assert first == second
+
+
+def test_monte_carlo_sample_shapes():
+    """Samples are (samples x categories) and (samples x presets)."""
+    samples, _ = _monte_carlo_bands(["A", None, "B", "C", "D"], n_samples=500)
+
+    assert samples["category_scores"].shape == (500, len(CATEGORY_ORDER))
+    assert samples["overall"].shape == (500, 2)
+    assert samples["safety_margin"].shape == (500, 2)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
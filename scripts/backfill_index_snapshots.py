@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Rebuild historical IndexSnapshot rows for every preset.
+
+Replays claims and event links chronologically and writes one snapshot per
+day per preset, e.g. after a scoring change.
+
+Usage:
+  python3 scripts/backfill_index_snapshots.py --start=2024-01-01
+  python3 scripts/backfill_index_snapshots.py --start=2024-01-01 --end=2024-12-31
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "services" / "etl"))
+
+from app.tasks.snap_index import backfill_snapshots
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill historical index snapshots")
+    parser.add_argument("--start", required=True, help="First day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--end", default=None, help="Last day to rebuild (YYYY-MM-DD, default: today)")
+    args = parser.parse_args()
+
+    result = backfill_snapshots(args.start, args.end)
+    if result.get("status") == "error":
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
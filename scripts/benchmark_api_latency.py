@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Load-test the hot read endpoints and report p50/p99 latency under concurrency.
+
+Mixes cheap requests (/v1/index) with expensive ones (365-day history,
+full-text search) so head-of-line blocking shows up in the cheap endpoints'
+tail latency. Save a run before a change and compare after it:
+
+Usage:
+  python3 scripts/benchmark_api_latency.py --base-url=http://localhost:8000 --save=before.json
+  python3 scripts/benchmark_api_latency.py --base-url=http://localhost:8000 --compare=before.json
+  python3 scripts/benchmark_api_latency.py --concurrency=64 --requests=2000
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+import httpx
+
+# (name, path, weight). Requests send "Cache-Control: no-store" unless
+# --keep-cache; both @swr_cache and fastapi-cache's @cache bypass the response
+# cache for it, so every request reaches the database.
+ENDPOINTS = [
+    ("index", "/v1/index?preset=equal", 5),
+    ("events", "/v1/events?limit=50", 3),
+    ("dashboard", "/v1/dashboard/summary", 2),
+    ("history_365d", "/v1/index/history?days=365&presets=equal,aschenbrenner,cotra,conservative", 1),
+    ("search", "/v1/search?q=benchmark&limit=50", 1),
+]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_load(base_url: str, concurrency: int, total: int, seed: int, bust_cache: bool) -> dict:
+    """Fire total weighted-random requests with at most concurrency in flight."""
+    rng = random.Random(seed)
+    names = [name for name, _, _ in ENDPOINTS]
+    paths = {name: path for name, path, _ in ENDPOINTS}
+    plan = rng.choices(names, weights=[w for _, _, w in ENDPOINTS], k=total)
+
+    latencies = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    headers = {"Cache-Control": "no-store"} if bust_cache else {}
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits, headers=headers) as client:
+
+        async def one(name: str):
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(paths[name])
+                    ok = response.status_code < 500
+                except httpx.HTTPError:
+                    ok = False
+                elapsed_ms = (time.perf_counter() - started) * 1000
+            if ok:
+                latencies[name].append(elapsed_ms)
+            else:
+                errors[name] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(name) for name in plan))
+        wall_s = time.perf_counter() - started
+
+    results = {"wall_s": wall_s, "throughput_rps": total / wall_s, "endpoints": {}}
+    for name in names:
+        values = latencies[name]
+        results["endpoints"][name] = {
+            "requests": len(values),
+            "errors": errors[name],
+            "p50_ms": percentile(values, 50) if values else None,
+            "p99_ms": percentile(values, 99) if values else None,
+            "mean_ms": statistics.fmean(values) if values else None,
+        }
+    return results
+
+
+def print_results(results: dict, baseline: dict | None = None):
+    print(f"\n{'endpoint':<14} {'n':>6} {'err':>5} {'p50 ms':>10} {'p99 ms':>10}", end="")
+    print(f" {'Δp50':>9} {'Δp99':>9}" if baseline else "")
+    for name, stats in results["endpoints"].items():
+        p50, p99 = stats["p50_ms"], stats["p99_ms"]
+        line = (
+            f"{name:<14} {stats['requests']:>6} {stats['errors']:>5} "
+            f"{p50 if p50 is not None else float('nan'):>10.1f} {p99 if p99 is not None else float('nan'):>10.1f}"
+        )
+        before = (baseline or {}).get("endpoints", {}).get(name)
+        if before and before["p50_ms"] and p50 is not None:
+            line += f" {(p50 / before['p50_ms'] - 1) * 100:>+8.0f}% {(p99 / before['p99_ms'] - 1) * 100:>+8.0f}%"
+        print(line)
+    print(f"\nwall: {results['wall_s']:.1f}s, throughput: {results['throughput_rps']:.1f} req/s")
+    if baseline:
+        print(f"baseline throughput: {baseline['throughput_rps']:.1f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep-cache", action="store_true", help="Allow response-cache hits")
+    parser.add_argument("--save", help="Write results JSON to this path")
+    parser.add_argument("--compare", help="Results JSON from an earlier run to diff against")
+    args = parser.parse_args()
+
+    print(f"🔥 {args.requests} requests, concurrency {args.concurrency}, against {args.base_url}")
+    results = asyncio.run(run_load(args.base_url, args.concurrency, args.requests, args.seed, not args.keep_cache))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Saved results to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
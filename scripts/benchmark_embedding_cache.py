@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark the embedding cache encoding and batch dispatch.
+
+Reports bytes per cached vector and encode/decode throughput for the old JSON
+encoding vs float32/float16 bytes, simulated embed_batch throughput for the
+old sequential dispatch (0.5s sleeps) vs the concurrent rate-limited one, and,
+if a Redis is reachable, per-key GET vs MGET read throughput.
+
+Usage:
+  python3 scripts/benchmark_embedding_cache.py
+  python3 scripts/benchmark_embedding_cache.py --vectors=2000 --latency-ms=300 --redis-url=redis://localhost:6379/15
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "services" / "etl"))
+os.environ.setdefault("ADMIN_API_KEY", "benchmark-only")
+
+import numpy as np
+import redis
+
+from app.services.embedding_service import CACHE_DTYPES, EmbeddingService
+
+DIMENSIONS = 1536
+
+
+def random_vectors(n: int, seed: int) -> list[list[float]]:
+    """Unit-ish vectors with the value range of text-embedding-3-small."""
+    rng = random.Random(seed)
+    return [[rng.gauss(0, 0.025) for _ in range(DIMENSIONS)] for _ in range(n)]
+
+
+def throughput(fn, items) -> float:
+    """Items per second for fn over items."""
+    started = time.perf_counter()
+    for item in items:
+        fn(item)
+    return len(items) / (time.perf_counter() - started)
+
+
+def bench_encodings(vectors):
+    print(f"Encoding ({len(vectors)} vectors x {DIMENSIONS} dims):")
+    print(f"  {'encoding':<10}{'bytes/vector':>14}{'encode/s':>12}{'decode/s':>12}{'max abs err':>14}")
+
+    payloads = [json.dumps(v) for v in vectors]
+    print(
+        f"  {'json':<10}{sum(map(len, payloads)) / len(payloads):>14.0f}"
+        f"{throughput(json.dumps, vectors):>12.0f}{throughput(json.loads, payloads):>12.0f}{0:>14.2e}"
+    )
+    for name, dtype in CACHE_DTYPES.items():
+        encode = lambda v, dtype=dtype: np.asarray(v, dtype=dtype).tobytes()
+        decode = lambda raw, dtype=dtype: np.frombuffer(raw, dtype=dtype).astype(np.float64).tolist()
+        payloads = [encode(v) for v in vectors]
+        error = max(float(np.max(np.abs(np.asarray(decode(p)) - v))) for p, v in zip(payloads, vectors))
+        print(
+            f"  {name:<10}{len(payloads[0]):>14}"
+            f"{throughput(encode, vectors):>12.0f}{throughput(decode, payloads):>12.0f}{error:>14.2e}"
+        )
+
+
+def fake_api(latency_s: float):
+    def api_call(texts):
+        time.sleep(latency_s)
+        return [[0.0] * 8 for _ in texts], 50 * len(texts)
+    return api_call
+
+
+def bench_dispatch(n_texts: int, latency_s: float):
+    texts = [f"event {i} headline about model capabilities" for i in range(n_texts)]
+    batches = (n_texts + 99) // 100
+
+    # Old dispatch: one batch at a time with a fixed 0.5s pause between batches
+    sequential_s = batches * latency_s + (batches - 1) * 0.5
+
+    service = EmbeddingService()
+    service._api_call = fake_api(latency_s)
+    service._record_spend = lambda cost: None
+    started = time.perf_counter()
+    service.embed_batch(texts, use_cache=False, show_progress=False)
+    concurrent_s = time.perf_counter() - started
+
+    print(f"\nDispatch ({n_texts} uncached texts, {batches} batches, {latency_s * 1000:.0f}ms simulated API latency):")
+    print(f"  sequential + 0.5s sleeps: {sequential_s:8.2f} s  ({n_texts / sequential_s:8.0f} texts/s)")
+    print(
+        f"  concurrent x{service.max_concurrency}:          {concurrent_s:8.2f} s  "
+        f"({n_texts / concurrent_s:8.0f} texts/s)"
+    )
+
+
+def bench_redis(redis_url: str, vectors):
+    client = redis.from_url(redis_url)
+    try:
+        client.ping()
+    except redis.RedisError as e:
+        print(f"\nRedis read benchmark skipped ({e})")
+        return
+
+    service = EmbeddingService()
+    service.redis_client = client
+    texts = [f"benchmark-text-{i}" for i in range(len(vectors))]
+    service._set_cache_many(zip(texts, vectors))
+    keys = [service._cache_key(text) for text in texts]
+
+    started = time.perf_counter()
+    for key in keys:
+        client.get(key)
+    get_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    service._get_cached_many(texts)
+    mget_s = time.perf_counter() - started
+
+    print(f"\nRedis reads ({len(keys)} cached vectors, {service.cache_dtype}):")
+    print(f"  memory per key (MEMORY USAGE): {client.memory_usage(keys[0])} bytes")
+    print(f"  GET per key:      {len(keys) / get_s:10.0f} vectors/s (raw bytes, no decode)")
+    print(f"  MGET + decode:    {len(keys) / mget_s:10.0f} vectors/s")
+    client.delete(*keys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the embedding cache")
+    parser.add_argument("--vectors", type=int, default=500)
+    parser.add_argument("--texts", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=250)
+    parser.add_argument("--redis-url", default=None, help="Also benchmark reads against this Redis (use a scratch DB)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    vectors = random_vectors(args.vectors, args.seed)
+    bench_encodings(vectors)
+    bench_dispatch(args.texts, args.latency_ms / 1000)
+    if args.redis_url:
+        bench_redis(args.redis_url, vectors)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark near-duplicate story clustering (MinHash + LSH).
+
+Generates a synthetic corpus of stories, each reported by 1-4 "outlets"
+(reworded copies: dropped, swapped and substituted words, published within
+hours of each other), then reports:
+
+- signature + band key time for the whole corpus
+- index build time (clustering every event in publication order)
+- per-event query time against the full index (p50/p95)
+- pair precision/recall of the clusters against the true stories
+
+Usage:
+  python3 scripts/benchmark_event_clusters.py
+  python3 scripts/benchmark_event_clusters.py --events=100000 --queries=1000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "services" / "etl"))
+os.environ.setdefault("ADMIN_API_KEY", "benchmark-only")
+
+import numpy as np
+
+from app.services.event_clusters import StoryClusterer, band_keys, event_text, minhash_signature
+
+
+def reword(words: list[str], rng: random.Random, vocabulary: list[str]) -> list[str]:
+    """An outlet's version of a story: ~15% of words dropped, replaced or swapped."""
+    words = [w for w in words if rng.random() > 0.05]
+    words = [rng.choice(vocabulary) if rng.random() < 0.05 else w for w in words]
+    for _ in range(max(1, len(words) // 20)):
+        i = rng.randrange(len(words) - 1)
+        words[i], words[i + 1] = words[i + 1], words[i]
+    return words
+
+
+def synthetic_corpus(n_events: int, seed: int):
+    """[(id, title, summary, published_at, story)] in publication order."""
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(20000)]
+    start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    events, story = [], 0
+    while len(events) < n_events:
+        title = rng.sample(vocabulary, 10)
+        summary = rng.sample(vocabulary, 40)
+        published = start + timedelta(minutes=15 * story)
+        for _ in range(rng.choice([1, 1, 2, 3, 4])):
+            events.append((
+                " ".join(reword(title, rng, vocabulary)),
+                " ".join(reword(summary, rng, vocabulary)),
+                published + timedelta(hours=rng.uniform(0, 12)),
+                story,
+            ))
+        story += 1
+    events = sorted(events[:n_events], key=lambda event: event[2])
+    return [(i, *event) for i, event in enumerate(events)]
+
+
+def pair_scores(assigned: dict, truth: dict) -> tuple[float, float]:
+    """Precision/recall over same-cluster event pairs."""
+    def pairs(labels):
+        return sum(n * (n - 1) // 2 for n in Counter(labels.values()).values())
+
+    joint = Counter((assigned[i], truth[i]) for i in assigned)
+    both = sum(n * (n - 1) // 2 for n in joint.values())
+    return both / max(pairs(assigned), 1), both / max(pairs(truth), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MinHash/LSH story clustering")
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.events, args.seed)
+    print(f"Corpus: {len(corpus)} events, {len({event[4] for event in corpus})} stories")
+
+    started = time.perf_counter()
+    signatures = np.stack([minhash_signature(event_text(title, summary)) for _, title, summary, _, _ in corpus])
+    signature_s = time.perf_counter() - started
+    started = time.perf_counter()
+    keys = band_keys(signatures)
+    keys_s = time.perf_counter() - started
+    print(f"  signatures: {signature_s:.1f}s ({signature_s / len(corpus) * 1e6:.0f} us/event)")
+    print(f"  band keys:  {keys_s:.2f}s")
+
+    clusterer = StoryClusterer()
+    started = time.perf_counter()
+    assigned = {
+        event_id: clusterer.assign(event_id, signatures[event_id], published, keys[event_id])
+        for event_id, _, _, published, _ in corpus
+    }
+    build_s = time.perf_counter() - started
+    print(f"  index build (cluster all): {build_s:.1f}s ({build_s / len(corpus) * 1e6:.0f} us/event)")
+
+    rng = np.random.default_rng(args.seed)
+    latencies = []
+    for i in rng.integers(0, len(corpus), args.queries):
+        _, title, summary, published, _ = corpus[i]
+        started = time.perf_counter()
+        signature = minhash_signature(event_text(title, summary))
+        clusterer.matches(signature, published)
+        latencies.append((time.perf_counter() - started) * 1000)
+    print(
+        f"  per-event query (signature + LSH lookup, {len(clusterer)} indexed): "
+        f"p50 {np.percentile(latencies, 50):.2f}ms, p95 {np.percentile(latencies, 95):.2f}ms"
+    )
+
+    precision, recall = pair_scores(assigned, {event[0]: event[4] for event in corpus})
+    clusters = len(set(assigned.values()))
+    print(f"  clusters: {clusters} ({len(corpus) - clusters} events collapsed)")
+    print(f"  pair precision {precision:.3f}, pair recall {recall:.3f}")
+
+
+if __name__ == "__main__":
+    main()
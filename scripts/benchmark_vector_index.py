@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark the in-process vector index against brute-force cosine.
+
+Builds an index of clustered synthetic 1536-dim vectors in a temp directory
+and reports build time, per-query latency (p50/p95) and recall@k of IVF
+search at several nprobe values versus the exact scan, unfiltered and with a
+tier + date filter.
+
+Usage:
+  python3 scripts/benchmark_vector_index.py
+  python3 scripts/benchmark_vector_index.py --vectors=50000 --queries=200 --k=10
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "services" / "etl"))
+os.environ.setdefault("ADMIN_API_KEY", "benchmark-only")
+
+import numpy as np
+
+from app.services.embedding_backends import EMBEDDING_DIMENSIONS
+from app.services.vector_index import VectorIndex
+
+
+def synthetic_vectors(n: int, clusters: int, seed: int) -> np.ndarray:
+    """Topic-clustered vectors (embeddings of news are far from uniform)."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, EMBEDDING_DIMENSIONS)).astype(np.float32)
+    noise = rng.normal(scale=1.5, size=(n, EMBEDDING_DIMENSIONS)).astype(np.float32)
+    return centers[rng.integers(0, clusters, n)] + noise
+
+
+def time_queries(index, queries, k, **kwargs):
+    latencies, results = [], []
+    for query in queries:
+        started = time.perf_counter()
+        results.append({item_id for item_id, _ in index.search(query, k=k, **kwargs)})
+        latencies.append((time.perf_counter() - started) * 1000)
+    return np.percentile(latencies, 50), np.percentile(latencies, 95), results
+
+
+def report(label, index, queries, k, exact_results, **kwargs):
+    p50, p95, results = time_queries(index, queries, k, **kwargs)
+    recall = np.mean([len(a & e) / max(len(e), 1) for a, e in zip(results, exact_results)])
+    print(f"  {label:<22}{p50:>10.2f}{p95:>10.2f}{recall:>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the in-process vector index")
+    parser.add_argument("--vectors", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed + 1)
+    vectors = synthetic_vectors(args.vectors, args.clusters, args.seed)
+    queries = vectors[rng.integers(0, args.vectors, args.queries)] + rng.normal(
+        scale=1.0, size=(args.queries, EMBEDDING_DIMENSIONS)
+    ).astype(np.float32)
+    epoch = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    tiers = rng.choice(["A", "B", "C", "D"], size=args.vectors, p=[0.1, 0.3, 0.4, 0.2]).tolist()
+    published = [epoch + timedelta(days=int(d)) for d in rng.integers(0, 1000, args.vectors)]
+    filters = {"tiers": ["A", "B"], "start": epoch + timedelta(days=500)}
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = VectorIndex("events", directory=directory)
+        started = time.perf_counter()
+        index.upsert(list(range(args.vectors)), vectors, tiers=tiers, published_at=published)
+        upsert_s = time.perf_counter() - started
+        started = time.perf_counter()
+        built = index.build()
+        build_s = time.perf_counter() - started
+        size_mb = sum(f.stat().st_size for f in Path(directory).iterdir()) / 1e6
+
+        print(f"Index: {args.vectors} x {EMBEDDING_DIMENSIONS} float32, {built['lists']} IVF lists, {size_mb:.0f} MB on disk")
+        print(f"  upsert {upsert_s:.2f}s, build (compact + k-means) {build_s:.2f}s\n")
+
+        for label, kwargs in (("Unfiltered", {}), ("Tier A/B, last 500 days", filters)):
+            _, _, exact_results = time_queries(index, queries, args.k, exact=True, **kwargs)
+            print(f"{label} (k={args.k}, {args.queries} queries):")
+            print(f"  {'method':<22}{'p50 ms':>10}{'p95 ms':>10}{'recall':>10}")
+            report("brute force", index, queries, args.k, exact_results, exact=True, **kwargs)
+            for nprobe in (4, 8, 16, 32):
+                report(f"ivf nprobe={nprobe}", index, queries, args.k, exact_results, nprobe=nprobe, **kwargs)
+            print()
+
+
+if __name__ == "__main__":
+    main()
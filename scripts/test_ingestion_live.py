@@ -27,7 +27,7 @@ def test_arxiv_live():
     
     try:
         print("\n📡 Fetching arXiv papers via Atom API...")
-        papers = fetch_live_arxiv(max_results=10)
+        papers = fetch_live_arxiv(max_results=10) or []
         
         print(f"\n✅ Fetched {len(papers)} papers")
         
@@ -63,8 +63,7 @@ def test_company_blogs_live():
     
     try:
         print("\n📡 Fetching company blogs via RSS/Atom feeds...")
-        print("   (This may take ~45 seconds due to rate limiting)")
-        posts = fetch_live_company_blogs(max_results=10)
+        posts = fetch_live_company_blogs(max_results=10) or []
         
         print(f"\n✅ Fetched {len(posts)} blog posts")
         
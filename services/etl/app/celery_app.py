@@ -39,26 +39,11 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.fetch_feeds.fetch_all_feeds",
         "schedule": crontab(hour=6, minute=3),  # 6:03 AM UTC daily
     },
-    "fetch-swebench": {
-        "task": "fetch_swebench",
+    # Leaderboards: all scrapers concurrently on one shared headless browser
+    "fetch-leaderboards": {
+        "task": "fetch_leaderboards",
         "schedule": crontab(hour=7, minute=12),  # 7:12 AM UTC daily
     },
-    "fetch-osworld": {
-        "task": "fetch_osworld",
-        "schedule": crontab(hour=7, minute=28),  # 7:28 AM UTC daily
-    },
-    "fetch-webarena": {
-        "task": "fetch_webarena",
-        "schedule": crontab(hour=7, minute=41),  # 7:41 AM UTC daily
-    },
-    "fetch-gpqa": {
-        "task": "fetch_gpqa",
-        "schedule": crontab(hour=7, minute=54),  # 7:54 AM UTC daily
-    },
-    "fetch-hle": {
-        "task": "fetch_hle",
-        "schedule": crontab(hour=8, minute=2),  # 8:02 AM UTC daily (monitor-only)
-    },
     "snap-index-daily": {
         "task": "app.tasks.snap_index.compute_daily_snapshot",
         "schedule": crontab(hour=8, minute=5),  # 8:05 AM UTC daily (after all fetches)
@@ -1,5 +1,7 @@
 """Database connection and session management."""
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -17,6 +19,32 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def get_async_database_url(database_url: str) -> str:
+    """
+    Async driver URL for the same database.
+
+    Uses settings.async_database_url when set (e.g. a postgresql+asyncpg URL);
+    otherwise switches database_url to psycopg's async mode, which needs no
+    extra driver since psycopg 3 is already installed.
+    """
+    if settings.async_database_url:
+        return settings.async_database_url
+    url = make_url(database_url)
+    if url.drivername in ("postgresql", "postgres", "postgresql+psycopg", "postgresql+psycopg2"):
+        url = url.set(drivername="postgresql+psycopg_async")
+    return url.render_as_string(hide_password=False)
+
+
+async_engine = create_async_engine(
+    get_async_database_url(settings.database_url),
+    pool_pre_ping=True,
+    pool_size=10,
+    max_overflow=20,
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
 def get_db():
     """Get database session."""
     db = SessionLocal()
@@ -25,3 +53,13 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db():
+    """
+    Get async database session.
+
+    For async def handlers: queries are awaited, so a slow query no longer
+    blocks the event loop for every other request on the worker.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
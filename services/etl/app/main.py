@@ -8,24 +8,26 @@ import uuid
 from contextvars import ContextVar
 from datetime import UTC, date, datetime, timedelta
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Optional
 
+import numpy as np
 from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi_cache import FastAPICache
-from fastapi_cache.backends.redis import RedisBackend
 from fastapi_cache.decorator import cache
-from redis import asyncio as aioredis
+from pydantic import Field
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
-from sqlalchemy import and_, desc, func, or_
-from sqlalchemy.orm import Session, selectinload, joinedload
+from sqlalchemy import and_, desc, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager, joinedload
 
 # Add scoring package to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "packages" / "scoring" / "python"))
 
 from app.config import settings
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.models import (
     ChangelogEntry,
     Claim,
@@ -40,8 +42,22 @@ from app.models import (
     RoadmapPrediction,
     Signpost,
     SignpostContent,
+    SignpostCurrentValue,
     Source,
 )
+from app.services.event_clusters import collapse_story_clusters
+from app.services.index_history import build_index_history
+from app.services.scenario_scoring import CATEGORY_ORDER as SCENARIO_CATEGORIES
+from app.services.scenario_scoring import score_scenarios
+from app.services.signpost_values import mark_signposts_stale, tier_counts
+from app.services.snapshot_engine import PRESET_WEIGHTS
+from app.utils.cache import CACHE_PREFIX, TaggedRedisBackend, get_cache_redis, swr_cache, tagged_key_builder
+from app.utils.event_serialization import (
+    serialize_event,
+    serialize_feed_item,
+    serialize_signpost_link,
+    with_signpost_links,
+)
 from app.utils.query_helpers import query_active_events
 
 # Initialize Sentry monitoring
@@ -312,18 +328,24 @@ async def add_structlog_context(request: Request, call_next):
 async def startup():
     """Initialize FastAPI cache with Redis backend (or in-memory fallback)."""
     try:
-        redis = aioredis.from_url(settings.redis_url, encoding="utf-8", decode_responses=True)
-        FastAPICache.init(RedisBackend(redis), prefix="fastapi-cache")
+        FastAPICache.init(
+            TaggedRedisBackend(get_cache_redis()),
+            prefix=CACHE_PREFIX,
+            key_builder=tagged_key_builder,
+        )
         print(f"✓ FastAPI cache initialized with Redis: {settings.redis_url}")
     except Exception as e:
         print(f"⚠️  Could not connect to Redis for caching: {e}")
         print("   Falling back to in-memory cache")
         # Initialize with in-memory backend as fallback
         from fastapi_cache.backends.inmemory import InMemoryBackend
-        FastAPICache.init(InMemoryBackend(), prefix="fastapi-cache")
+        FastAPICache.init(InMemoryBackend(), prefix=CACHE_PREFIX, key_builder=tagged_key_builder)
         print("✓ FastAPI cache initialized with in-memory backend")
 
 
+INDEX_PRESETS = ("equal", "aschenbrenner", "cotra", "conservative", "custom")
+
+
 def generate_etag(content: str, preset: str = "equal") -> str:
     """
     Generate ETag from response content + preset.
@@ -457,13 +479,13 @@ async def health_full():
 
 @app.get("/v1/index")
 @limiter.limit(f"{settings.rate_limit_per_minute}/minute")
-@cache(expire=settings.index_cache_ttl_seconds)
+@swr_cache(expire=settings.index_cache_ttl_seconds)
 async def get_index(
     request: Request,
     response: Response,
     date_param: str | None = Query(None, alias="date"),
     preset: str = Query("equal", regex="^(equal|aschenbrenner|cotra|conservative|custom)$"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get AGI proximity index (overall + category scores).
@@ -483,16 +505,18 @@ async def get_index(
 
     # Get snapshot for date and preset
     snapshot = (
-        db.query(IndexSnapshot)
-        .filter(
-            and_(
-                IndexSnapshot.as_of_date <= target_date,
-                IndexSnapshot.preset == preset
+        await db.execute(
+            select(IndexSnapshot)
+            .where(
+                and_(
+                    IndexSnapshot.as_of_date <= target_date,
+                    IndexSnapshot.preset == preset
+                )
             )
+            .order_by(desc(IndexSnapshot.as_of_date))
+            .limit(1)
         )
-        .order_by(desc(IndexSnapshot.as_of_date))
-        .first()
-    )
+    ).scalar_one_or_none()
 
     if not snapshot:
         # No snapshot exists - return zeros with insufficient flags
@@ -574,82 +598,51 @@ async def get_index(
 
 @app.get("/v1/index/history")
 @limiter.limit(f"{settings.rate_limit_per_minute}/minute")
-@cache(expire=settings.index_cache_ttl_seconds)
+@swr_cache(expire=settings.index_cache_ttl_seconds)
 async def get_index_history(
     request: Request,
+    response: Response,
     preset: str = Query("equal", regex="^(equal|aschenbrenner|cotra|conservative|custom)$"),
+    presets: str | None = Query(None, description="Comma-separated presets to return together"),
     days: int = Query(90, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get historical index data for charting.
     
     Query params:
     - preset: Scoring preset (equal, aschenbrenner, cotra, conservative). Default: equal.
+    - presets: Optional comma-separated presets (e.g. "equal,cotra") returned together
+      under "series"; "history" always holds the first one.
     - days: Number of days to look back (1-365). Default: 90.
     
     Returns:
     Array of {date, overall, capabilities, agents, inputs, security, events} objects.
+    Snapshots and top A/B events are fetched with one query each for the whole window.
     """
+    requested = [p.strip() for p in presets.split(",") if p.strip()] if presets else [preset]
+    invalid = [p for p in requested if p not in INDEX_PRESETS]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid presets: {', '.join(invalid)}")
+
     # Calculate start date
     end_date = date.today()
     start_date = end_date - timedelta(days=days)
-    
-    # Get all snapshots for this preset in the date range
-    snapshots = (
-        db.query(IndexSnapshot)
-        .filter(
-            and_(
-                IndexSnapshot.preset == preset,
-                IndexSnapshot.as_of_date >= start_date,
-                IndexSnapshot.as_of_date <= end_date
-            )
-        )
-        .order_by(IndexSnapshot.as_of_date)
-        .all()
-    )
-    
-    # Build response with events on significant dates
-    history = []
-    for snapshot in snapshots:
-        # Get major events on this date (A/B tier only)
-        major_events = (
-            db.query(Event)
-            .filter(
-                and_(
-                    func.date(Event.published_at) == snapshot.as_of_date,
-                    Event.tier.in_(["A", "B"]),
-                    not_(Event.retracted)
-                )
-            )
-            .limit(3)
-            .all()
-        )
-        
-        history.append({
-            "date": str(snapshot.as_of_date),
-            "overall": float(snapshot.overall) if snapshot.overall else 0.0,
-            "capabilities": float(snapshot.capabilities) if snapshot.capabilities else 0.0,
-            "agents": float(snapshot.agents) if snapshot.agents else 0.0,
-            "inputs": float(snapshot.inputs) if snapshot.inputs else 0.0,
-            "security": float(snapshot.security) if snapshot.security else 0.0,
-            "events": [
-                {
-                    "id": e.id,
-                    "title": e.title,
-                    "tier": e.tier,
-                }
-                for e in major_events
-            ]
-        })
-    
-    return {
-        "preset": preset,
+
+    # The history service is written against a sync Session; run_sync drives it
+    # over the async connection so its queries don't block the event loop
+    series = await db.run_sync(build_index_history, requested, start_date, end_date)
+
+    result = {
+        "preset": requested[0],
         "days": days,
         "start_date": str(start_date),
         "end_date": str(end_date),
-        "history": history,
+        "history": series[requested[0]],
     }
+    if presets:
+        result["series"] = series
+    return result
 
 
 @app.get("/v1/index/custom")
@@ -748,7 +741,7 @@ async def get_custom_index(
 
 @app.get("/v1/signposts")
 @limiter.limit(f"{settings.rate_limit_per_minute}/minute")
-@cache(expire=settings.signposts_cache_ttl_seconds)
+@swr_cache(expire=settings.signposts_cache_ttl_seconds)
 async def list_signposts(
     request: Request,
     category: str | None = Query(None, regex="^(capabilities|agents|inputs|security|economic|research|geopolitical|safety_incidents)$"),
@@ -805,22 +798,8 @@ async def get_signpost(signpost_id: int, db: Session = Depends(get_db)):
     if not signpost:
         raise HTTPException(status_code=404, detail="Signpost not found")
 
-    # Count evidence by tier
-    evidence_counts = {"A": 0, "B": 0, "C": 0, "D": 0}
-
-    claim_signposts = (
-        db.query(ClaimSignpost)
-        .filter(ClaimSignpost.signpost_id == signpost_id)
-        .all()
-    )
-
-    for cs in claim_signposts:
-        claim = db.query(Claim).filter(Claim.id == cs.claim_id).first()
-        if claim and not claim.retracted:
-            source = db.query(Source).filter(Source.id == claim.source_id).first()
-            if source:
-                tier = source.credibility
-                evidence_counts[tier] = evidence_counts.get(tier, 0) + 1
+    # Evidence counts by tier, from the materialized signpost values
+    evidence_counts = tier_counts(db.get(SignpostCurrentValue, signpost_id))
 
     return {
         "id": signpost.id,
@@ -878,19 +857,20 @@ async def get_signpost_events_by_code(
     if not signpost:
         raise HTTPException(status_code=404, detail="Signpost not found")
 
-    # Get latest links for this signpost
+    # Get latest links for this signpost, with their events
     links = (
         db.query(EventSignpostLink)
+        .options(joinedload(EventSignpostLink.event))
         .filter(EventSignpostLink.signpost_id == signpost.id)
         .order_by(desc(EventSignpostLink.observed_at))
         .limit(100)
         .all()
     )
 
-    # Fetch corresponding events
+    # Group events by tier
     events_by_tier = {"A": [], "B": [], "C": [], "D": []}
     for link in links:
-        event = db.query(Event).filter(Event.id == link.event_id).first()
+        event = link.event
         if not event:
             continue
         item = {
@@ -1011,6 +991,7 @@ async def get_signpost_events(
         db.query(EventSignpostLink)
         .filter(EventSignpostLink.signpost_id == signpost.id)
         .join(Event)
+        .options(contains_eager(EventSignpostLink.event))
         .order_by(desc(Event.published_at))
         .limit(limit)
         .all()
@@ -1020,9 +1001,7 @@ async def get_signpost_events(
     events_by_tier = {"A": [], "B": [], "C": [], "D": []}
 
     for link in event_links:
-        event = db.query(Event).filter(Event.id == link.event_id).first()
-        if not event:
-            continue
+        event = link.event
 
         event_data = {
             "id": event.id,
@@ -1060,34 +1039,24 @@ async def get_pace_analysis(code: str, db: Session = Depends(get_db)):
     if not signpost:
         raise HTTPException(status_code=404, detail="Signpost not found")
 
-    # Get current value from latest claim
-    latest_claim_signpost = (
-        db.query(ClaimSignpost)
-        .filter(ClaimSignpost.signpost_id == signpost.id)
-        .join(Claim)
-        .filter(not Claim.retracted)
-        .order_by(desc(Claim.observed_at))
-        .first()
-    )
-
-    current_value = None
-    current_date = None
-    if latest_claim_signpost:
-        claim = db.query(Claim).filter(Claim.id == latest_claim_signpost.claim_id).first()
-        if claim:
-            current_value = float(claim.metric_value) if claim.metric_value else None
-            current_date = claim.observed_at.date()
+    # Current value: latest claim or event link, from the materialized signpost values
+    current = db.get(SignpostCurrentValue, signpost.id)
+    current_value = float(current.current_value) if current and current.current_value is not None else None
+    current_date = current.observed_at.date() if current and current.observed_at else None
 
-    # Get predictions
-    predictions = db.query(RoadmapPrediction).filter(
-        RoadmapPrediction.signpost_id == signpost.id
-    ).all()
+    # Get predictions with their roadmaps
+    predictions = (
+        db.query(RoadmapPrediction, Roadmap)
+        .outerjoin(Roadmap, Roadmap.id == RoadmapPrediction.roadmap_id)
+        .filter(RoadmapPrediction.signpost_id == signpost.id)
+        .all()
+    )
 
     # Calculate ahead/behind for each roadmap (simplified linear interpolation)
     today = date.today()
     pace_metrics = []
 
-    for pred in predictions:
+    for pred, roadmap in predictions:
         if current_value and pred.predicted_date and signpost.target_value:
             # Calculate progress (0-1)
             baseline = float(signpost.baseline_value) if signpost.baseline_value else 0.0
@@ -1110,8 +1079,6 @@ async def get_pace_analysis(code: str, db: Session = Depends(get_db)):
             else:
                 days_ahead = 0
 
-            roadmap = db.query(Roadmap).filter(Roadmap.id == pred.roadmap_id).first()
-
             pace_metrics.append({
                 "roadmap_name": roadmap.name if roadmap else None,
                 "roadmap_slug": roadmap.slug if roadmap else None,
@@ -1123,20 +1090,18 @@ async def get_pace_analysis(code: str, db: Session = Depends(get_db)):
             })
 
     # Get human-written analyses
-    analyses_records = db.query(PaceAnalysis).filter(
-        PaceAnalysis.signpost_id == signpost.id
-    ).all()
-
-    analyses = {}
-    for analysis in analyses_records:
-        roadmap = db.query(Roadmap).filter(Roadmap.id == analysis.roadmap_id).first()
-        if roadmap:
-            analyses[roadmap.slug] = analysis.analysis_text
+    analyses = dict(
+        db.query(Roadmap.slug, PaceAnalysis.analysis_text)
+        .join(Roadmap, Roadmap.id == PaceAnalysis.roadmap_id)
+        .filter(PaceAnalysis.signpost_id == signpost.id)
+        .all()
+    )
 
     return {
         "signpost_code": signpost.code,
         "current_value": current_value,
         "current_date": current_date.isoformat() if current_date else None,
+        "source_type": current.source_type if current else None,
         "pace_metrics": pace_metrics,
         "analyses": analyses,
     }
@@ -1404,7 +1369,8 @@ async def list_events(
     # Sprint 10.3: Advanced filters
     category: str | None = Query(None, regex="^(capabilities|agents|inputs|security)$"),
     min_significance: float | None = Query(None, ge=0, le=1),
-    db: Session = Depends(get_db),
+    collapse_stories: bool = False,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     List news events with optional filtering.
@@ -1418,6 +1384,7 @@ async def list_events(
     - cursor: Cursor for pagination (Sprint 9)
     - category: Filter by signpost category (Sprint 10.3)
     - min_significance: Minimum significance score 0-1 (Sprint 10.3)
+    - collapse_stories: One event per near-duplicate story cluster on the page
     
     Returns:
     - results: List of events
@@ -1429,11 +1396,7 @@ async def list_events(
     # PERFORMANCE: Eager load signpost_links to prevent N+1 queries
     # Without this: 100 events = 100+ separate queries for links
     # With selectinload: 100 events = 2 queries total
-    query = query_active_events(
-        db.query(Event).options(
-            selectinload(Event.signpost_links).joinedload(EventSignpostLink.signpost)
-        )
-    )
+    query = with_signpost_links(query_active_events(select(Event)))
 
     # Filter out synthetic events by default (can be overridden with include_synthetic param)
     # Evidence tier (aliases: outlet_cred, source_tier)
@@ -1448,11 +1411,11 @@ async def list_events(
     # Signpost filters
     if signpost_id:
         event_ids = (
-            db.query(EventSignpostLink.event_id)
-            .filter(EventSignpostLink.signpost_id == signpost_id)
-            .all()
-        )
-        event_ids = [e[0] for e in event_ids]
+            await db.execute(
+                select(EventSignpostLink.event_id)
+                .where(EventSignpostLink.signpost_id == signpost_id)
+            )
+        ).scalars().all()
         if event_ids:
             query = query.filter(Event.id.in_(event_ids))
         else:
@@ -1524,33 +1487,23 @@ async def list_events(
         )
 
     # Fetch limit + 1 to determine if there are more results
-    events = query.order_by(desc(Event.published_at), desc(Event.id)).offset(skip).limit(limit + 1).all()
+    events = (
+        await db.execute(query.order_by(desc(Event.published_at), desc(Event.id)).offset(skip).limit(limit + 1))
+    ).scalars().all()
     
     # Check if there are more results
     has_more = len(events) > limit
     if has_more:
         events = events[:limit]  # Trim to actual limit
 
-    # Server-side de-dup: prefer source_url if present; otherwise title+date key
+    # Server-side de-dup: story cluster if collapsing, else source_url if present; otherwise title+date key
     seen_keys = set()
     results = []
     for event in events:
-        # PERFORMANCE FIX: Use eager-loaded relationships instead of separate queries
-        # Old code did N+1 queries here - now data is already loaded
-        signpost_links = []
-        for link in event.signpost_links:  # Already loaded via selectinload
-            if link.signpost:  # Already loaded via joinedload
-                signpost_links.append({
-                    "signpost_id": link.signpost.id,
-                    "signpost_code": link.signpost.code,
-                    "signpost_name": link.signpost.name,
-                    # alias for web UI
-                    "signpost_title": link.signpost.name,
-                    "confidence": float(link.confidence) if link.confidence else None,
-                    "value": float(link.value) if link.value else None,
-                })
         # Build dedup key
-        if event.source_url:
+        if collapse_stories and event.story_cluster_id is not None:
+            key = ("story", event.story_cluster_id)
+        elif event.source_url:
             key = ("url", event.source_url)
         else:
             title_norm = (event.title or "").lower()
@@ -1561,22 +1514,8 @@ async def list_events(
             continue
         seen_keys.add(key)
 
-        results.append({
-            "id": event.id,
-            "title": event.title,
-            "summary": event.summary,
-            "source_url": event.source_url,
-            "publisher": event.publisher,
-            "published_at": event.published_at.isoformat() if event.published_at else None,
-            # aliases for web UI compatibility
-            "date": event.published_at.isoformat() if event.published_at else None,
-            "evidence_tier": event.evidence_tier,
-            "tier": event.evidence_tier,
-            "source_type": event.source_type,
-            "provisional": event.provisional,
-            "needs_review": event.needs_review,
-            "signpost_links": signpost_links,
-        })
+        # Links and signposts are already loaded; serializing issues no queries
+        results.append(serialize_event(event))
     
     # Sprint 9: Generate next_cursor if there are more results
     next_cursor = None
@@ -1602,33 +1541,20 @@ async def get_event(event_id: int, db: Session = Depends(get_db)):
     """Get detailed event information with signpost links, entities, and forecast comparison."""
     from app.services.forecast_comparison import get_forecast_comparison_for_event_link
 
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = with_signpost_links(db.query(Event)).filter(Event.id == event_id).first()
 
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    # Get signpost links
-    links = (
-        db.query(EventSignpostLink)
-        .filter(EventSignpostLink.event_id == event.id)
-        .all()
-    )
     signpost_links = []
-    for link in links:
-        signpost = db.query(Signpost).filter(Signpost.id == link.signpost_id).first()
-        if signpost:
+    for link in event.signpost_links:
+        if link.signpost:
             # Get forecast comparison for this link
-            forecast_comp = get_forecast_comparison_for_event_link(event.id, signpost.id, db)
+            forecast_comp = get_forecast_comparison_for_event_link(event.id, link.signpost_id, db)
 
             signpost_links.append({
-                "signpost_id": signpost.id,
-                "signpost_code": signpost.code,
-                "signpost_name": signpost.name,
-                "category": signpost.category,
-                "confidence": float(link.confidence) if link.confidence else None,
+                **serialize_signpost_link(link),
                 "rationale": link.rationale,
-                "value": float(link.value) if link.value else None,
-                "observed_at": link.observed_at.isoformat() if link.observed_at else None,
                 "forecast_comparison": forecast_comp if forecast_comp else None,
             })
 
@@ -1699,6 +1625,7 @@ async def events_feed(
     request: Request,
     audience: str = Query("public", regex="^(public|research)$"),
     include_research: bool | None = Query(None, description="Alias for research audience"),
+    collapse_stories: bool = False,
     db: Session = Depends(get_db),
 ):
     """
@@ -1706,6 +1633,7 @@ async def events_feed(
 
     Query params:
     - audience: 'public' (A/B tier only) or 'research' (A/B/C/D all tiers)
+    - collapse_stories: One item per near-duplicate story cluster
 
     Public mode: Safe for general consumption, A/B tier only
     Research mode: Includes C/D tier with clear tier labels
@@ -1714,44 +1642,18 @@ async def events_feed(
     if include_research is True:
         audience = "research"
 
+    # Links and their signposts load with the events (2 queries per page)
+    query = with_signpost_links(query_active_events(db.query(Event)))
     if audience == "public":
         # Public: Only A/B tier (verified sources)
-        query = query_active_events(db.query(Event)).filter(Event.evidence_tier.in_(["A", "B"]))
-    else:
-        # Research: All tiers (A/B/C/D)
-        query = query_active_events(db.query(Event))
+        query = query.filter(Event.evidence_tier.in_(["A", "B"]))
 
     # Order by published date
     events = query.order_by(desc(Event.published_at)).limit(100).all()
+    if collapse_stories:
+        events = collapse_story_clusters(events)
 
-    feed_items = []
-    for event in events:
-        # Get linked signposts
-        links = (
-            db.query(EventSignpostLink)
-            .filter(EventSignpostLink.event_id == event.id)
-            .all()
-        )
-
-        signposts = []
-        for link in links:
-            signpost = db.query(Signpost).filter(Signpost.id == link.signpost_id).first()
-            if signpost:
-                signposts.append({
-                    "code": signpost.code,
-                    "confidence": float(link.confidence) if link.confidence else None,
-                })
-
-        feed_items.append({
-            "title": event.title,
-            "summary": event.summary,
-            "url": event.source_url,
-            "publisher": event.publisher,
-            "date": event.published_at.isoformat() if event.published_at else None,
-            "tier": event.evidence_tier,
-            "provisional": event.provisional,
-            "signposts": signposts,
-        })
+    feed_items = [serialize_feed_item(event) for event in events]
 
     return {
         "version": "1.0",
@@ -1769,21 +1671,33 @@ async def events_feed(
 
 @app.get("/v1/roadmaps/compare")
 @limiter.limit(f"{settings.rate_limit_per_minute}/minute")
-@cache(expire=settings.index_cache_ttl_seconds)
-async def roadmaps_compare(request: Request, db: Session = Depends(get_db)):
+@swr_cache(expire=settings.index_cache_ttl_seconds)
+async def roadmaps_compare(
+    request: Request,
+    response: Response,
+    roadmap: str | None = Query(None, description="Only compare against this roadmap (slug)"),
+    db: Session = Depends(get_db),
+):
     """
     Compare all signposts against roadmap predictions.
 
+    Query params:
+    - roadmap: Restrict comparisons to one roadmap's predictions (slug)
+
     Returns:
         List of signposts with current values and forecast comparisons
         showing ahead/on_track/behind status for each roadmap.
     """
     from app.services.forecast_comparison import get_all_forecast_comparisons
 
-    comparisons = get_all_forecast_comparisons(db)
+    if roadmap is not None and not db.query(Roadmap.id).filter(Roadmap.slug == roadmap).first():
+        raise HTTPException(status_code=404, detail=f"Roadmap '{roadmap}' not found")
+
+    comparisons = get_all_forecast_comparisons(db, roadmap_slug=roadmap)
 
     return {
         "generated_at": datetime.utcnow().isoformat(),
+        "roadmap": roadmap,
         "signposts": comparisons,
     }
 
@@ -1901,11 +1815,16 @@ async def reject_event_mapping(
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    # Count links before deletion for audit
-    links_count = db.query(EventSignpostLink).filter(EventSignpostLink.event_id == event_id).count()
+    # Collect linked signposts before deletion for audit (bulk delete bypasses the ORM hooks)
+    linked_signpost_ids = [
+        row.signpost_id
+        for row in db.query(EventSignpostLink.signpost_id).filter(EventSignpostLink.event_id == event_id)
+    ]
+    links_count = len(linked_signpost_ids)
 
     # Delete all signpost links
     db.query(EventSignpostLink).filter(EventSignpostLink.event_id == event_id).delete()
+    mark_signposts_stale(db, linked_signpost_ids)
 
     # Mark as needs review with reason
     event.needs_review = True
@@ -2397,6 +2316,7 @@ async def retract_event(
         ).all()
 
         affected_signpost_ids = [link.signpost_id for link in affected_signposts]
+        affected_signpost_codes = [link.signpost.code for link in affected_signposts if link.signpost]
 
         # Create changelog entry
         changelog = ChangelogEntry(
@@ -2410,7 +2330,11 @@ async def retract_event(
         db.commit()
 
         # Invalidate caches for affected signposts
-        cache_count = await invalidate_signpost_caches(affected_signpost_ids)
+        cache_count = await invalidate_signpost_caches(affected_signpost_ids, affected_signpost_codes)
+
+        # Drop the event from in-process semantic search now (populate_embeddings also resyncs flags)
+        from app.services.vector_index import event_index
+        event_index.set_retracted([event_id])
 
         # Log retraction for audit trail
         logger.info(
@@ -3244,7 +3168,7 @@ async def search_events(
     q: str = Query(..., min_length=2, max_length=100, description="Search query"),
     limit: int = Query(20, le=50, description="Max results"),
     tier: str | None = Query(None, regex="^[ABCD]$", description="Filter by evidence tier"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Full-text search across events using PostgreSQL GIN indexes.
@@ -3266,7 +3190,7 @@ async def search_events(
     try:
         # Build full-text search query using PostgreSQL to_tsvector
         # Use plainto_tsquery for user-friendly query parsing
-        query = db.query(Event).filter(
+        query = select(Event).filter(
             or_(
                 func.to_tsvector('english', Event.title).op('@@')(
                     func.plainto_tsquery('english', q)
@@ -3284,40 +3208,13 @@ async def search_events(
         # Only active events
         query = query_active_events(query)
         
-        # Execute query with limit
-        events = query.order_by(desc(Event.published_at)).limit(limit).all()
+        # Execute query with limit; links and their signposts are loaded with
+        # the events (async sessions can't lazy-load them later)
+        events = (
+            await db.execute(with_signpost_links(query).order_by(desc(Event.published_at)).limit(limit))
+        ).scalars().all()
         
-        # Serialize results
-        results = []
-        for event in events:
-            # Get signpost links
-            links = (
-                db.query(EventSignpostLink)
-                .filter(EventSignpostLink.event_id == event.id)
-                .all()
-            )
-            signpost_links = []
-            for link in links:
-                signpost = db.query(Signpost).filter(Signpost.id == link.signpost_id).first()
-                if signpost:
-                    signpost_links.append({
-                        "signpost_id": signpost.id,
-                        "signpost_code": signpost.code,
-                        "signpost_name": signpost.name,
-                        "confidence": float(link.confidence) if link.confidence else None,
-                    })
-            
-            results.append({
-                "id": event.id,
-                "title": event.title,
-                "summary": event.summary,
-                "source_url": event.source_url,
-                "publisher": event.publisher,
-                "published_at": event.published_at.isoformat() if event.published_at else None,
-                "evidence_tier": event.evidence_tier,
-                "signpost_links": signpost_links,
-                "url_is_valid": event.url_is_valid,
-            })
+        results = [serialize_event(event) for event in events]
         
         return {
             "query": q,
@@ -3919,51 +3816,112 @@ def get_chat_suggestions():
 async def semantic_search(
     query: str = Query(..., min_length=3),
     limit: int = Query(10, ge=1, le=50),
+    tier: str | None = Query(None, regex="^[ABCD]$"),
+    start_date: str | None = None,
+    end_date: str | None = None,
+    include_retracted: bool = False,
     db: Session = Depends(get_db)
 ):
     """
     Semantic search across events and signposts using vector similarity.
     
     Phase 4: Hybrid search combining semantic (pgvector) + keyword matching.
+
+    Uses the in-process ANN index (app/services/vector_index.py) unless
+    settings.semantic_search_backend is "pgvector".
+
+    Query params:
+    - tier: Filter events by evidence tier (A/B/C/D)
+    - start_date / end_date: Filter events by published_at (YYYY-MM-DD)
+    - include_retracted: Include retracted events (default false)
     """
     from app.services.embedding_service import embedding_service
     from sqlalchemy import text
+
+    try:
+        start_dt = datetime.strptime(start_date, "%Y-%m-%d") if start_date else None
+        end_dt = datetime.strptime(end_date, "%Y-%m-%d") if end_date else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid start_date/end_date. Use YYYY-MM-DD")
     
     # Generate query embedding
     query_embedding = embedding_service.embed_single(query, use_cache=True)
-    
-    # Search events
-    event_query = text("""
-        SELECT 
-            id, title, summary, source_url, evidence_tier, published_at, publisher,
-            1 - (embedding <=> :query_embedding::vector) as similarity
-        FROM events
-        WHERE embedding IS NOT NULL
-            AND retracted = false
-        ORDER BY embedding <=> :query_embedding::vector
-        LIMIT :limit
-    """)
-    
-    event_results = db.execute(
-        event_query,
-        {"query_embedding": str(query_embedding), "limit": limit}
-    ).fetchall()
-    
-    # Search signposts
-    signpost_query = text("""
-        SELECT 
-            id, code, name, description, category,
-            1 - (embedding <=> :query_embedding::vector) as similarity
-        FROM signposts
-        WHERE embedding IS NOT NULL
-        ORDER BY embedding <=> :query_embedding::vector
-        LIMIT :limit
-    """)
-    
-    signpost_results = db.execute(
-        signpost_query,
-        {"query_embedding": str(query_embedding), "limit": limit // 2}
-    ).fetchall()
+
+    if settings.semantic_search_backend == "index":
+        from app.services.vector_index import event_index, signpost_index
+
+        event_hits = dict(event_index.search(
+            query_embedding,
+            k=limit,
+            tiers=[tier] if tier else None,
+            include_retracted=include_retracted,
+            start=start_dt,
+            end=end_dt,
+        ))
+        signpost_hits = dict(signpost_index.search(query_embedding, k=limit // 2))
+
+        # Hydrate from the database (also drops rows deleted/retracted since the index last synced)
+        event_query = db.query(Event).filter(Event.id.in_(list(event_hits)))
+        if not include_retracted:
+            event_query = event_query.filter(Event.retracted == False)  # noqa: E712
+        event_results = [
+            SimpleNamespace(
+                id=event.id, title=event.title, summary=event.summary, source_url=event.source_url,
+                evidence_tier=event.evidence_tier, published_at=event.published_at, publisher=event.publisher,
+                similarity=event_hits[event.id],
+            )
+            for event in event_query.all()
+        ] if event_hits else []
+        signpost_results = [
+            SimpleNamespace(
+                id=signpost.id, code=signpost.code, name=signpost.name, description=signpost.description,
+                category=signpost.category, similarity=signpost_hits[signpost.id],
+            )
+            for signpost in db.query(Signpost).filter(Signpost.id.in_(list(signpost_hits))).all()
+        ] if signpost_hits else []
+    else:
+        filters = ["embedding IS NOT NULL"]
+        params = {"query_embedding": str(query_embedding), "limit": limit}
+        if not include_retracted:
+            filters.append("retracted = false")
+        if tier:
+            filters.append("evidence_tier = :tier")
+            params["tier"] = tier
+        if start_dt:
+            filters.append("published_at >= :start_dt")
+            params["start_dt"] = start_dt
+        if end_dt:
+            filters.append("published_at <= :end_dt")
+            params["end_dt"] = end_dt
+
+        # Search events
+        event_query = text(f"""
+            SELECT 
+                id, title, summary, source_url, evidence_tier, published_at, publisher,
+                1 - (embedding <=> :query_embedding::vector) as similarity
+            FROM events
+            WHERE {" AND ".join(filters)}
+            ORDER BY embedding <=> :query_embedding::vector
+            LIMIT :limit
+        """)
+
+        event_results = db.execute(event_query, params).fetchall()
+
+        # Search signposts
+        signpost_query = text("""
+            SELECT 
+                id, code, name, description, category,
+                1 - (embedding <=> :query_embedding::vector) as similarity
+            FROM signposts
+            WHERE embedding IS NOT NULL
+            ORDER BY embedding <=> :query_embedding::vector
+            LIMIT :limit
+        """)
+
+        signpost_results = db.execute(
+            signpost_query,
+            {"query_embedding": str(query_embedding), "limit": limit // 2}
+        ).fetchall()
     
     # Format results
     events = [
@@ -4009,6 +3967,7 @@ async def semantic_search(
 # PHASE 4: SCENARIO EXPLORER
 # ========================================
 
+
 class ScenarioRequest(BaseModel):
     """Scenario request model."""
     signpost_progress: dict[str, float]  # signpost_code -> progress value (0-100)
@@ -4034,60 +3993,24 @@ def calculate_scenario(request: ScenarioRequest, db: Session = Depends(get_db)):
     # Fetch all signposts
     signposts = db.query(Signpost).all()
     
-    # Build category progress from scenario
-    category_progress = {
-        "capabilities": [],
-        "agents": [],
-        "inputs": [],
-        "security": []
+    scored = score_scenarios(signposts, [request.signpost_progress])
+    category_scores = {
+        category: float(score)
+        for category, score in zip(SCENARIO_CATEGORIES, scored["category_scores"][0])
     }
-    
+    overall = float(scored["overall"][0])
+    safety_margin = float(scored["safety_margin"][0])
+
+    # Per-category breakdown of the signposts the scenario actually set
+    category_progress = {category: [] for category in SCENARIO_CATEGORIES}
     for signpost in signposts:
-        # Use scenario value if provided, otherwise use 0
-        progress = request.signpost_progress.get(signpost.code, 0.0) / 100.0  # Convert to 0-1
-        
-        # Add to category
-        category = signpost.category
-        if category in category_progress:
-            category_progress[category].append({
+        if signpost.category in category_progress:
+            category_progress[signpost.category].append({
                 "code": signpost.code,
                 "name": signpost.name,
-                "progress": progress,
-                "first_class": signpost.first_class
+                "progress": request.signpost_progress.get(signpost.code, 0.0) / 100.0,
             })
-    
-    # Calculate category averages (weighted by first_class)
-    category_scores = {}
-    
-    for category, items in category_progress.items():
-        if not items:
-            category_scores[category] = 0.0
-            continue
-        
-        # Weight first-class signposts 2x
-        total_weight = 0
-        weighted_sum = 0
-        
-        for item in items:
-            weight = 2.0 if item["first_class"] else 1.0
-            weighted_sum += item["progress"] * weight
-            total_weight += weight
-        
-        category_scores[category] = weighted_sum / total_weight if total_weight > 0 else 0.0
-    
-    # Calculate overall index using harmonic mean of capabilities + inputs
-    cap = category_scores.get("capabilities", 0.0)
-    inp = category_scores.get("inputs", 0.0)
-    
-    if cap > 0 and inp > 0:
-        overall = 2 / (1/cap + 1/inp)
-    else:
-        overall = 0.0
-    
-    # Calculate safety margin
-    sec = category_scores.get("security", 0.0)
-    safety_margin = sec - cap
-    
+
     return {
         "overall_index": round(overall * 100, 2),
         "category_scores": {
@@ -4116,6 +4039,61 @@ def calculate_scenario(request: ScenarioRequest, db: Session = Depends(get_db)):
     }
 
 
+class ScenarioBatchRequest(BaseModel):
+    """Batch scenario request model."""
+    scenarios: list[dict[str, float]] = Field(..., max_length=10000)  # signpost_code -> progress (0-100)
+    presets: list[str] | None = None  # Preset names from weights.json; defaults to all
+
+
+@app.post("/v1/scenarios/calculate-batch", tags=["scenarios"])
+def calculate_scenarios_batch(request: ScenarioBatchRequest, db: Session = Depends(get_db)):
+    """
+    Calculate AGI proximity for many what-if scenarios in one vectorized pass.
+
+    Each scenario is scored like /v1/scenarios/calculate, plus the overall
+    index under every requested preset.
+
+    Example:
+    {
+        "scenarios": [
+            {"swe_bench_verified_90": 90.0},
+            {"swe_bench_verified_90": 60.0, "osworld_80": 75.0}
+        ],
+        "presets": ["equal", "aschenbrenner"]
+    }
+    """
+    preset_names = request.presets or list(PRESET_WEIGHTS)
+    unknown = [name for name in preset_names if name not in PRESET_WEIGHTS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown presets: {', '.join(unknown)}")
+
+    signposts = db.query(Signpost).all()
+    scored = score_scenarios(
+        signposts,
+        request.scenarios,
+        presets={name: PRESET_WEIGHTS[name] for name in preset_names},
+    )
+
+    category_scores = np.round(scored["category_scores"] * 100, 2).tolist()
+    overall = np.round(scored["overall"] * 100, 2).tolist()
+    safety_margin = np.round(scored["safety_margin"] * 100, 2).tolist()
+    preset_overall = np.round(scored["preset_overall"] * 100, 2).tolist()
+
+    return {
+        "count": len(request.scenarios),
+        "presets": preset_names,
+        "results": [
+            {
+                "overall_index": overall[i],
+                "category_scores": dict(zip(SCENARIO_CATEGORIES, category_scores[i])),
+                "safety_margin": safety_margin[i],
+                "preset_overall": dict(zip(preset_names, preset_overall[i])),
+            }
+            for i in range(len(request.scenarios))
+        ],
+    }
+
+
 # ========================================
 # PHASE 4: ADVANCED ANALYTICS
 # ========================================
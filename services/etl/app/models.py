@@ -3,6 +3,7 @@
 from pgvector.sqlalchemy import Vector
 from sqlalchemy import (
     TIMESTAMP,
+    BigInteger,
     Boolean,
     CheckConstraint,
     Column,
@@ -11,6 +12,7 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    LargeBinary,
     Numeric,
     String,
     Text,
@@ -341,6 +343,39 @@ class ClaimSignpost(Base):
     signpost = relationship("Signpost", back_populates="claim_signposts")
 
 
+class SignpostCurrentValue(Base):
+    """
+    Materialized per-signpost current value and evidence summary.
+
+    Maintained by app.services.signpost_values: refreshed for the affected
+    signposts whenever claims or event links are written, and rebuilt in
+    full before each daily snapshot.
+    """
+
+    __tablename__ = "signpost_current_values"
+
+    signpost_id = Column(Integer, ForeignKey("signposts.id", ondelete="CASCADE"), primary_key=True)
+    current_value = Column(Numeric, nullable=True)  # Latest observed value (claim or event link)
+    observed_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    source_type = Column(String(10), nullable=True)  # "claim" or "event"
+    max_value = Column(Numeric, nullable=True)  # Highest scorable A/B value (feeds the index)
+    best_tier = Column(String(1), nullable=True)  # Best tier among scorable A/B evidence
+    tier_a_count = Column(Integer, nullable=False, server_default="0")
+    tier_b_count = Column(Integer, nullable=False, server_default="0")
+    tier_c_count = Column(Integer, nullable=False, server_default="0")
+    tier_d_count = Column(Integer, nullable=False, server_default="0")
+    refreshed_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+    signpost = relationship("Signpost")
+
+    __table_args__ = (
+        CheckConstraint(
+            "source_type IS NULL OR source_type IN ('claim', 'event')",
+            name="check_signpost_current_value_source_type"
+        ),
+    )
+
+
 class IndexSnapshot(Base):
     """Index snapshot model."""
 
@@ -542,6 +577,10 @@ class Event(Base):
     url_status_code = Column(Integer, nullable=True)
     url_is_valid = Column(Boolean, nullable=False, server_default="true")
     url_error = Column(Text, nullable=True)
+
+    # Near-duplicate clustering (app/services/event_clusters.py)
+    minhash = Column(LargeBinary, nullable=True)  # 128 x uint32 MinHash signature
+    story_cluster_id = Column(Integer, nullable=True, index=True)  # id of the story's first event
     
     # DEFERRED TO PHASE 6: Vector embedding for semantic search
     # Status: Migration 022 removed placeholder column (pgvector not ready)
@@ -566,6 +605,15 @@ class Event(Base):
     )
 
 
+class EventLSHBucket(Base):
+    """LSH band bucket of an event's MinHash signature (near-duplicate candidate lookup)."""
+
+    __tablename__ = "event_lsh_buckets"
+
+    bucket = Column(BigInteger, primary_key=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+
 class EventSignpostLink(Base):
     """
     Link between events and signposts with confidence and extracted values.
@@ -9,12 +9,16 @@ Rate limiting: 10/minute, 50/hour per API key (stricter than public endpoints)
 
 from datetime import datetime, UTC
 from fastapi import APIRouter, Depends, Query, Header, HTTPException, Request
+from fastapi_cache import FastAPICache
 from sqlalchemy.orm import Session
 
 from app.auth import verify_api_key, limiter, api_key_or_ip
 from app.database import get_db
 from app.models import Event, EventSignpostLink, Signpost
+from app.services.signpost_values import mark_signposts_stale
 from app.utils.audit import log_admin_action
+from app.utils.cache import get_cache_stats
+from app.utils.robots_cache import get_robots_cache_stats
 
 # Admin router with authentication enforced at router level
 router = APIRouter(
@@ -182,11 +186,16 @@ async def reject_event_mapping(
         if not event:
             raise HTTPException(status_code=404, detail="Event not found")
 
-        # Count links before deletion
-        links_count = db.query(EventSignpostLink).filter(EventSignpostLink.event_id == event_id).count()
+        # Collect linked signposts before deletion (bulk delete bypasses the ORM hooks)
+        linked_signpost_ids = [
+            row.signpost_id
+            for row in db.query(EventSignpostLink.signpost_id).filter(EventSignpostLink.event_id == event_id)
+        ]
+        links_count = len(linked_signpost_ids)
 
         # Delete all signpost links
         db.query(EventSignpostLink).filter(EventSignpostLink.event_id == event_id).delete()
+        mark_signposts_stale(db, linked_signpost_ids)
 
         # Mark event as needs review
         event.needs_review = True
@@ -269,3 +278,32 @@ async def recompute_index(
         )
         raise HTTPException(status_code=500, detail=f"Error recomputing index: {str(e)}")
 
+
+@router.get("/cache/stats")
+async def cache_stats():
+    """
+    Response cache counters (admin only).
+
+    Returns:
+        Hits, misses, hit rate, invalidation calls and keys invalidated,
+        aggregated across all API workers and Celery tasks.
+    """
+    try:
+        return await get_cache_stats()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Cache stats unavailable: {str(e)}")
+
+
+@router.get("/robots/stats")
+def robots_cache_stats():
+    """
+    robots.txt policy cache counters (admin only).
+
+    Returns:
+        Lookups, local/shared hits, robots.txt fetches, fetch errors and hit
+        rate, aggregated across all API workers and Celery tasks.
+    """
+    try:
+        return get_robots_cache_stats()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"robots.txt cache stats unavailable: {str(e)}")
@@ -12,10 +12,11 @@ All endpoints are cached (Redis or in-memory) and rate-limited.
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_
+from sqlalchemy import func, desc, and_, select
 
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.auth import limiter, api_key_or_ip
 from app.models import Event, Signpost, EventSignpostLink
 from app.schemas.dashboard import (
@@ -27,6 +28,7 @@ from app.schemas.dashboard import (
     AnalysisSection,
     MetricKey
 )
+from app.utils.cache import swr_cache
 from fastapi_cache.decorator import cache
 
 router = APIRouter(prefix="/v1/dashboard", tags=["dashboard"])
@@ -34,10 +36,10 @@ router = APIRouter(prefix="/v1/dashboard", tags=["dashboard"])
 
 @router.get("/summary", response_model=HomepageSnapshot)
 @limiter.limit("60/minute", key_func=api_key_or_ip)
-@cache(expire=300)  # Cache for 5 minutes
+@swr_cache(expire=300)  # Fresh for ~5 minutes, then served stale while refreshing
 async def get_dashboard_summary(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get homepage snapshot with KPIs, featured charts, news, and analysis.
@@ -56,16 +58,20 @@ async def get_dashboard_summary(
     
     # KPI 1: Events last 7 days
     seven_days_ago = datetime.utcnow() - timedelta(days=7)
-    events_7d = db.query(Event).filter(
-        Event.published_at >= seven_days_ago,
-        Event.evidence_tier.in_(['A', 'B'])
-    ).count()
+    events_7d = await db.scalar(
+        select(func.count(Event.id)).where(
+            Event.published_at >= seven_days_ago,
+            Event.evidence_tier.in_(['A', 'B'])
+        )
+    )
     
     thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    events_30d = db.query(Event).filter(
-        Event.published_at >= thirty_days_ago,
-        Event.evidence_tier.in_(['A', 'B'])
-    ).count()
+    events_30d = await db.scalar(
+        select(func.count(Event.id)).where(
+            Event.published_at >= thirty_days_ago,
+            Event.evidence_tier.in_(['A', 'B'])
+        )
+    )
     
     events_delta = ((events_7d * 4.3 - events_30d) / events_30d * 100) if events_30d > 0 else 0
     
@@ -77,12 +83,14 @@ async def get_dashboard_summary(
     ))
     
     # KPI 2: Signposts with evidence
-    signposts_with_evidence = db.query(Signpost).join(
-        EventSignpostLink,
-        EventSignpostLink.signpost_id == Signpost.id
-    ).distinct().count()
+    signposts_with_evidence = await db.scalar(
+        select(func.count(func.distinct(Signpost.id))).join(
+            EventSignpostLink,
+            EventSignpostLink.signpost_id == Signpost.id
+        )
+    )
     
-    total_signposts = db.query(Signpost).count()
+    total_signposts = await db.scalar(select(func.count(Signpost.id)))
     
     kpis.append(KpiCard(
         key='signposts_completed',
@@ -112,9 +120,13 @@ async def get_dashboard_summary(
     ]
     
     # Build news feed from recent events
-    recent_events = db.query(Event).filter(
-        Event.evidence_tier.in_(['A', 'B'])
-    ).order_by(desc(Event.published_at)).limit(10).all()
+    recent_events = (
+        await db.execute(
+            select(Event).where(
+                Event.evidence_tier.in_(['A', 'B'])
+            ).order_by(desc(Event.published_at)).limit(10)
+        )
+    ).scalars().all()
     
     news = [
         NewsItem(
@@ -17,6 +17,7 @@ from app.database import get_db
 from app.auth import limiter, api_key_or_ip
 from app.models import Signpost, Forecast, Incident
 from app.utils.cache_helpers import add_cache_headers, get_ttl_with_jitter
+from app.utils.cache import swr_cache
 from fastapi_cache.decorator import cache
 
 
@@ -59,7 +60,7 @@ router = APIRouter(prefix="/v1/signposts", tags=["signposts"])
 
 @router.get("")
 @limiter.limit("60/minute", key_func=api_key_or_ip)
-@cache(expire=get_ttl_with_jitter(300))
+@swr_cache(expire=300)
 async def list_signposts(
     request: Request,
     response: Response,
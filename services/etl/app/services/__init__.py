@@ -2,13 +2,20 @@
 
 from .forecast_comparison import (
     compute_pace_status,
+    compute_pace_status_batch,
     get_all_forecast_comparisons,
     get_forecast_comparison_for_event_link,
 )
+from .signpost_values import (
+    mark_signposts_stale,
+    refresh_signpost_values,
+)
 
 __all__ = [
     "compute_pace_status",
+    "compute_pace_status_batch",
     "get_all_forecast_comparisons",
     "get_forecast_comparison_for_event_link",
+    "mark_signposts_stale",
+    "refresh_signpost_values",
 ]
-
@@ -0,0 +1,113 @@
+"""
+Response cache pre-warming.
+
+compute_daily_snapshot writes new IndexSnapshot rows right before the morning
+traffic spike. Instead of letting the first visitors pay for cold caches, the
+snapshot task replays the hot read requests through the API app in-process
+(ASGI, no network hop) with the admin API key in REFRESH_HEADER, which makes
+@swr_cache recompute each response and overwrite its entry - key, tags and TTL
+exactly as a real request would store them, so the ETags clients see match.
+
+Warmed: /v1/index for every preset in weights.json, /v1/index/history for
+each preset (and all presets together) over the common day windows, and
+/v1/roadmaps/compare.
+"""
+import asyncio
+import time
+
+import httpx
+import redis.asyncio as aioredis
+from fastapi_cache import FastAPICache
+
+from app.config import settings
+from app.services.snapshot_engine import PRESET_WEIGHTS
+from app.utils.cache import CACHE_PREFIX, REFRESH_HEADER, TaggedRedisBackend, tagged_key_builder
+
+# Day windows offered by the history chart (90 is the endpoint default)
+HISTORY_WINDOWS = (30, 90, 180, 365)
+
+# Concurrent warm-up requests (each holds a DB connection while it computes)
+WARMUP_CONCURRENCY = 4
+
+
+def warmup_targets(presets=None) -> list[tuple[str, dict]]:
+    """
+    Requests to replay after a snapshot.
+
+    Args:
+        presets: Preset names (defaults to every preset in weights.json)
+
+    Returns:
+        List of (path, query params)
+    """
+    presets = list(presets or PRESET_WEIGHTS)
+    targets = [("/v1/index", {"preset": preset}) for preset in presets]
+    for days in HISTORY_WINDOWS:
+        targets += [("/v1/index/history", {"preset": preset, "days": days}) for preset in presets]
+        if len(presets) > 1:
+            targets.append(("/v1/index/history", {"presets": ",".join(presets), "days": days}))
+    targets.append(("/v1/roadmaps/compare", {}))
+    return targets
+
+
+async def warm_caches(asgi_app=None, redis_client=None, presets=None) -> dict:
+    """
+    Recompute and store the hot cached responses.
+
+    Runs outside the API process (the Celery worker), so it initializes the
+    response cache on its own Redis client and disposes of the async engine's
+    connections afterwards: both are bound to this call's event loop.
+
+    Args:
+        asgi_app: App to replay requests against (defaults to the API app)
+        redis_client: Cache Redis client (defaults to a new client for this run)
+        presets: Presets to warm (defaults to every preset in weights.json)
+
+    Returns:
+        {"keys_warmed", "keys_failed", "by_endpoint", "etags", "duration_ms"}
+    """
+    own_app = asgi_app is None
+    own_redis = redis_client is None
+    if own_app:
+        from app.main import app as asgi_app
+    if own_redis:
+        redis_client = aioredis.from_url(settings.redis_url)
+
+    FastAPICache.reset()
+    FastAPICache.init(TaggedRedisBackend(redis_client), prefix=CACHE_PREFIX, key_builder=tagged_key_builder)
+
+    targets = warmup_targets(presets)
+    stats = {"keys_warmed": 0, "keys_failed": 0, "by_endpoint": {}, "etags": {}}
+    semaphore = asyncio.Semaphore(WARMUP_CONCURRENCY)
+    started = time.perf_counter()
+
+    async def warm(client: httpx.AsyncClient, path: str, params: dict):
+        async with semaphore:
+            try:
+                response = await client.get(path, params=params, headers={REFRESH_HEADER: settings.admin_api_key})
+            except Exception as e:
+                print(f"  ⚠️  Warm-up of {path} {params} failed: {e}")
+                stats["keys_failed"] += 1
+                return
+        if response.status_code != 200:
+            print(f"  ⚠️  Warm-up of {path} {params} returned {response.status_code}")
+            stats["keys_failed"] += 1
+            return
+        stats["keys_warmed"] += 1
+        stats["by_endpoint"][path] = stats["by_endpoint"].get(path, 0) + 1
+        stats["etags"][response.request.url.raw_path.decode()] = response.headers.get("etag")
+
+    try:
+        transport = httpx.ASGITransport(app=asgi_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://cache-warmup") as client:
+            await asyncio.gather(*(warm(client, path, params) for path, params in targets))
+    finally:
+        FastAPICache.reset()
+        if own_redis:
+            await redis_client.close()
+        if own_app:
+            from app.database import async_engine
+            await async_engine.dispose()
+
+    stats["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return stats
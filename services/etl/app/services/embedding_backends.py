@@ -0,0 +1,161 @@
+"""
+Embedding backends for EmbeddingService.
+
+A backend turns a batch of texts into vectors of a fixed dimensionality and
+reports the tokens it was billed for. EmbeddingService handles caching,
+batching, rate limiting and spend tracking on top of whichever backend
+settings.embedding_backend selects:
+
+- "openai": OpenAI text-embedding-3-small (the production default)
+- "local":  deterministic hashed n-gram projection on the CPU. No network,
+            no API key, no cost - for CI, load tests and provider outages.
+
+Both produce 1536-dim vectors, so the pgvector columns and queries don't
+change. The two vector spaces are not comparable, though: re-run
+populate_embeddings with force=True after switching backends.
+"""
+
+import hashlib
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+import openai
+from tenacity import retry, stop_after_attempt, wait_exponential
+
+from app.config import settings
+
+EMBEDDING_DIMENSIONS = 1536
+
+# (vectors, billed tokens)
+EmbeddingResult = Tuple[List[List[float]], int]
+
+
+class OpenAIEmbeddingBackend:
+    """OpenAI embeddings API."""
+
+    name = "openai"
+    model = "text-embedding-3-small"
+    cost_per_1k_tokens = 0.00002  # $0.00002 per 1K tokens for text-embedding-3-small
+    cacheable = True
+    rate_limited = True
+
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSIONS):
+        self.dimensions = dimensions
+        self._client = None
+
+    @property
+    def client(self) -> openai.OpenAI:
+        """OpenAI client, created on first API call (cache-only use needs no key)."""
+        if self._client is None:
+            self._client = openai.OpenAI(api_key=settings.openai_api_key)
+        return self._client
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10)
+    )
+    def embed(self, texts: List[str]) -> EmbeddingResult:
+        """Make API call with retry logic."""
+        response = self.client.embeddings.create(
+            model=self.model,
+            input=texts,
+            dimensions=self.dimensions
+        )
+        return [item.embedding for item in response.data], response.usage.total_tokens
+
+
+_WORD_RE = re.compile(r"\w+")
+
+# Relative weight of each feature family in the local projection
+FEATURE_WEIGHTS = {"w": 1.0, "b": 0.7, "c": 0.35}
+
+
+@lru_cache(maxsize=200_000)
+def _feature_slot(feature: str, dimensions: int) -> Tuple[int, float]:
+    """
+    Hash a feature to (dimension, signed weight).
+
+    The random sign keeps hash collisions from biasing dot products.
+    """
+    digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+    sign = 1.0 if digest >> 63 else -1.0
+    return digest % dimensions, sign * FEATURE_WEIGHTS[feature[0]]
+
+
+def text_features(text: str) -> Counter:
+    """
+    Count the n-gram features of a text.
+
+    Words ("w:") and word bigrams ("b:") capture topic and phrasing;
+    character trigrams of each word ("c:") put morphological variants
+    ("benchmark"/"benchmarks") and typos close together.
+    """
+    words = _WORD_RE.findall(text.lower())
+    features = Counter(f"w:{word}" for word in words)
+    for word in words:
+        padded = f"<{word}>"
+        features.update(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+    features.update(f"b:{first} {second}" for first, second in zip(words, words[1:]))
+    return features
+
+
+class LocalEmbeddingBackend:
+    """
+    Deterministic CPU embeddings: hashed n-gram features projected to 1536 dims.
+
+    Feature counts are log-scaled, weighted by feature family, hashed into the
+    vector with random signs and L2-normalized, so cosine distance in pgvector
+    behaves like TF-weighted n-gram overlap. Identical text always gives the
+    identical vector, on every machine.
+    """
+
+    name = "local"
+    model = "local-hashed-ngrams-v1"
+    cost_per_1k_tokens = 0.0
+    # Computing a vector is cheaper than a Redis round trip
+    cacheable = False
+    rate_limited = False
+
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSIONS):
+        self.dimensions = dimensions
+
+    def embed_one(self, text: str) -> List[float]:
+        vector = np.zeros(self.dimensions)
+        features = text_features(text)
+        if features:
+            slots = [_feature_slot(feature, self.dimensions) for feature in features]
+            indices = np.fromiter((index for index, _ in slots), dtype=np.int64, count=len(slots))
+            # Sublinear term frequency: repeated terms count, but don't dominate
+            counts = np.fromiter(features.values(), dtype=np.float64, count=len(slots))
+            weights = np.fromiter((weight for _, weight in slots), dtype=np.float64, count=len(slots))
+            np.add.at(vector, indices, weights * (1.0 + np.log(counts)))
+            norm = np.linalg.norm(vector)
+            if norm:
+                vector /= norm
+        return vector.tolist()
+
+    def embed(self, texts: List[str]) -> EmbeddingResult:
+        tokens = sum(len(_WORD_RE.findall(text)) for text in texts)
+        return [self.embed_one(text) for text in texts], tokens
+
+
+EMBEDDING_BACKENDS = {
+    OpenAIEmbeddingBackend.name: OpenAIEmbeddingBackend,
+    LocalEmbeddingBackend.name: LocalEmbeddingBackend,
+}
+
+
+def get_embedding_backend(name: str | None = None):
+    """
+    Instantiate an embedding backend.
+
+    Args:
+        name: "openai" or "local" (defaults to settings.embedding_backend)
+    """
+    name = (name or settings.embedding_backend).lower()
+    if name not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{name}' (expected one of {sorted(EMBEDDING_BACKENDS)})")
+    return EMBEDDING_BACKENDS[name]()
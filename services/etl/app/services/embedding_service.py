@@ -1,76 +1,165 @@
 """
 Embedding service for generating and caching vector embeddings.
 
-Uses OpenAI text-embedding-3-small for cost-effective semantic search.
+Uses OpenAI text-embedding-3-small for cost-effective semantic search, or
+a local deterministic backend for offline use (see embedding_backends).
 Supports batch processing, Redis caching, and retry logic.
+
+Cached vectors are stored as raw little-endian float32 bytes (6KB for 1536
+dims instead of ~30KB of JSON; float16 halves that again), read with one
+MGET and written with one pipeline per batch. Uncached batches are sent
+concurrently over a bounded thread pool, paced by a tokens-per-minute
+limiter rather than fixed sleeps.
 """
 
 import hashlib
-import json
-from typing import List, Optional
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
-import openai
+import numpy as np
 import redis
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.config import settings
+from app.services.embedding_backends import EmbeddingResult, get_embedding_backend
+
+# Cached vector encodings (explicit little-endian so any host decodes them)
+CACHE_DTYPES = {"float32": "<f4", "float16": "<f2"}
+
+# Keys per MGET when reading a large batch from the cache
+CACHE_READ_CHUNK = 1000
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for rate limiting (~4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+class TokenRateLimiter:
+    """
+    Thread-safe token bucket capping tokens sent per minute.
+
+    Callers acquire their estimated tokens before a request and settle the
+    difference once the API reports actual usage. The bucket holds at most
+    one minute's budget, so bursts never exceed the provider's TPM limit.
+    """
+
+    def __init__(self, tokens_per_minute: int, clock=time.monotonic, sleep=time.sleep):
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self.available = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: int) -> float:
+        """
+        Block until `tokens` can be sent.
+
+        Returns:
+            Seconds spent waiting
+        """
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.available >= tokens:
+                    self.available -= tokens
+                    return waited
+                wait = (tokens - self.available) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+    def settle(self, estimated: int, actual: int):
+        """Charge (or refund) the gap between the estimate and actual usage."""
+        with self._lock:
+            self._refill()
+            self.available = min(self.capacity, self.available - (actual - estimated))
 
 
 class EmbeddingService:
     """Service for generating and caching embeddings."""
 
-    def __init__(self):
-        """Initialize embedding service."""
-        self.client = openai.OpenAI(api_key=settings.openai_api_key)
-        self.redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+    def __init__(self, backend=None):
+        """
+        Initialize embedding service.
+
+        Args:
+            backend: Embedding backend (defaults to settings.embedding_backend)
+        """
+        self.backend = backend or get_embedding_backend()
+        # Binary client: cached vectors are raw bytes
+        self.redis_client = redis.from_url(settings.redis_url)
         
-        # OpenAI text-embedding-3-small config
-        self.model = "text-embedding-3-small"
-        self.dimensions = 1536
+        # Model config comes from the backend (the model is part of cache keys)
+        self.model = self.backend.model
+        self.dimensions = self.backend.dimensions
         self.batch_size = 100  # OpenAI allows up to 2048, but we'll be conservative
+        self.max_concurrency = max(settings.embedding_concurrency, 1)
+        self.rate_limiter = TokenRateLimiter(settings.embedding_tokens_per_minute)
         
         # Cost tracking
-        self.cost_per_1k_tokens = 0.00002  # $0.00002 per 1K tokens for text-embedding-3-small
+        self.cost_per_1k_tokens = self.backend.cost_per_1k_tokens
         
         # Cache TTL: 24 hours
         self.cache_ttl = 24 * 3600
+        self.cache_dtype = settings.embedding_cache_dtype
+        if self.cache_dtype not in CACHE_DTYPES:
+            raise ValueError(f"embedding_cache_dtype must be one of {sorted(CACHE_DTYPES)}")
 
     def _cache_key(self, text: str) -> str:
         """Generate cache key for text."""
         text_hash = hashlib.sha256(text.encode()).hexdigest()
-        return f"embedding:v1:{self.model}:{text_hash}"
+        return f"embedding:v2:{self.model}:{self.cache_dtype}:{text_hash}"
+
+    def encode_vector(self, embedding: List[float]) -> bytes:
+        """Pack an embedding into the cache's binary encoding."""
+        return np.asarray(embedding, dtype=CACHE_DTYPES[self.cache_dtype]).tobytes()
+
+    def decode_vector(self, raw: bytes) -> List[float]:
+        """Unpack a cached embedding."""
+        return np.frombuffer(raw, dtype=CACHE_DTYPES[self.cache_dtype]).astype(np.float64).tolist()
+
+    def _get_cached_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Cached embeddings for texts (None where missing), one MGET per chunk."""
+        cached = []
+        for start in range(0, len(texts), CACHE_READ_CHUNK):
+            keys = [self._cache_key(text) for text in texts[start:start + CACHE_READ_CHUNK]]
+            cached.extend(self.redis_client.mget(keys))
+        return [self.decode_vector(raw) if raw else None for raw in cached]
+
+    def _set_cache_many(self, items):
+        """Cache (text, embedding) pairs with TTL in one pipeline."""
+        pipe = self.redis_client.pipeline(transaction=False)
+        for text, embedding in items:
+            pipe.set(self._cache_key(text), self.encode_vector(embedding), ex=self.cache_ttl)
+        pipe.execute()
 
     def _get_cached(self, text: str) -> Optional[List[float]]:
         """Get cached embedding if available."""
-        key = self._cache_key(text)
-        cached = self.redis_client.get(key)
-        
-        if cached:
-            return json.loads(cached)
-        return None
+        return self._get_cached_many([text])[0]
 
     def _set_cache(self, text: str, embedding: List[float]):
         """Cache embedding with TTL."""
-        key = self._cache_key(text)
-        self.redis_client.setex(
-            key,
-            self.cache_ttl,
-            json.dumps(embedding)
-        )
-
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10)
-    )
-    def _api_call(self, texts: List[str]) -> dict:
-        """Make API call with retry logic."""
-        response = self.client.embeddings.create(
-            model=self.model,
-            input=texts,
-            dimensions=self.dimensions
-        )
-        return response
+        self._set_cache_many([(text, embedding)])
+
+    def _api_call(self, texts: List[str]) -> EmbeddingResult:
+        """Embed texts with the backend, paced by the token rate limiter."""
+        if not self.backend.rate_limited:
+            return self.backend.embed(texts)
+        estimated = sum(estimate_tokens(text) for text in texts)
+        self.rate_limiter.acquire(estimated)
+        vectors, tokens = self.backend.embed(texts)
+        self.rate_limiter.settle(estimated, tokens)
+        return vectors, tokens
 
     def embed_single(self, text: str, use_cache: bool = True) -> List[float]:
         """
@@ -86,6 +175,8 @@ class EmbeddingService:
         if not text or not text.strip():
             raise ValueError("Text cannot be empty")
         
+        use_cache = use_cache and self.backend.cacheable
+        
         # Check cache
         if use_cache:
             cached = self._get_cached(text)
@@ -95,15 +186,14 @@ class EmbeddingService:
         
         # Generate embedding
         try:
-            response = self._api_call([text])
-            embedding = response.data[0].embedding
+            vectors, tokens = self._api_call([text])
+            embedding = vectors[0]
             
             # Track cost
-            tokens = response.usage.total_tokens
             cost = (tokens / 1000) * self.cost_per_1k_tokens
-            self._record_spend(cost)
-            
-            print(f"💰 Embedding cost: ${cost:.6f} ({tokens} tokens)")
+            if cost:
+                self._record_spend(cost)
+                print(f"💰 Embedding cost: ${cost:.6f} ({tokens} tokens)")
             
             # Cache result
             if use_cache:
@@ -130,73 +220,60 @@ class EmbeddingService:
             show_progress: Whether to print progress
             
         Returns:
-            List of embedding vectors
+            List of embedding vectors (None for empty texts)
         """
         if not texts:
             return []
         
         embeddings = [None] * len(texts)
-        uncached_indices = []
-        uncached_texts = []
+        indices = [i for i, text in enumerate(texts) if text and text.strip()]
+        use_cache = use_cache and self.backend.cacheable
         
-        # Check cache for all texts
+        # Check cache for all texts at once
         if use_cache:
-            for i, text in enumerate(texts):
-                if not text or not text.strip():
-                    continue
-                    
-                cached = self._get_cached(text)
-                if cached:
-                    embeddings[i] = cached
-                else:
-                    uncached_indices.append(i)
-                    uncached_texts.append(text)
+            cached = self._get_cached_many([texts[i] for i in indices])
+            for i, embedding in zip(indices, cached):
+                embeddings[i] = embedding
+            uncached_indices = [i for i, embedding in zip(indices, cached) if embedding is None]
         else:
-            uncached_indices = list(range(len(texts)))
-            uncached_texts = texts
+            uncached_indices = indices
+        uncached_texts = [texts[i] for i in uncached_indices]
         
         if show_progress:
             print(f"📊 Batch embedding: {len(texts)} total, {len(uncached_texts)} uncached")
         
-        # Process uncached texts in batches
+        batches = [
+            (start, uncached_texts[start:start + self.batch_size])
+            for start in range(0, len(uncached_texts), self.batch_size)
+        ]
+        if not batches:
+            return embeddings
+        
+        # Process uncached texts in concurrent batches (paced by the token
+        # rate limiter instead of sleeping between batches)
         total_cost = 0.0
+        workers = min(self.max_concurrency, len(batches))
         
-        for batch_start in range(0, len(uncached_texts), self.batch_size):
-            batch_end = min(batch_start + self.batch_size, len(uncached_texts))
-            batch_texts = uncached_texts[batch_start:batch_end]
-            
-            if show_progress:
-                print(f"  Processing batch {batch_start // self.batch_size + 1}/{(len(uncached_texts) + self.batch_size - 1) // self.batch_size}...")
-            
-            try:
-                # API call
-                response = self._api_call(batch_texts)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embed") as pool:
+            results = pool.map(lambda batch: self._api_call(batch[1]), batches)
+            for n, ((batch_start, batch_texts), (batch_embeddings, tokens)) in enumerate(zip(batches, results), 1):
+                if show_progress:
+                    print(f"  Processed batch {n}/{len(batches)}")
                 
                 # Track cost
-                tokens = response.usage.total_tokens
                 cost = (tokens / 1000) * self.cost_per_1k_tokens
                 total_cost += cost
-                self._record_spend(cost)
+                if cost:
+                    self._record_spend(cost)
                 
                 # Store results
-                for i, embedding_obj in enumerate(response.data):
-                    original_index = uncached_indices[batch_start + i]
-                    embedding = embedding_obj.embedding
-                    embeddings[original_index] = embedding
-                    
-                    # Cache
-                    if use_cache:
-                        self._set_cache(batch_texts[i], embedding)
+                for i, embedding in enumerate(batch_embeddings):
+                    embeddings[uncached_indices[batch_start + i]] = embedding
                 
-                # Rate limiting (be nice to API)
-                if batch_end < len(uncached_texts):
-                    time.sleep(0.5)
-                    
-            except Exception as e:
-                print(f"❌ Batch embedding error at batch {batch_start}: {e}")
-                raise
-        
-        if show_progress and uncached_texts:
+                if use_cache:
+                    self._set_cache_many(zip(batch_texts, batch_embeddings))
+        
+        if show_progress:
             print(f"💰 Total embedding cost: ${total_cost:.6f}")
         
         return embeddings
@@ -4,18 +4,19 @@ Forecast comparison service for computing ahead/on/behind status.
 Compares current signpost progress against roadmap predictions
 to determine if we're ahead, on track, or behind projected timelines.
 """
+from collections.abc import Sequence
 from datetime import date
 
+import numpy as np
 from sqlalchemy.orm import Session
 
 from app.models import (
-    Claim,
-    ClaimSignpost,
     Event,
     EventSignpostLink,
     Roadmap,
     RoadmapPrediction,
     Signpost,
+    SignpostCurrentValue,
 )
 
 
@@ -140,21 +141,22 @@ def get_forecast_comparison_for_event_link(
     current_value = float(link.value)
     current_date = link.observed_at.date() if link.observed_at else date.today()
 
-    # Get predictions for this signpost
-    predictions = db.query(RoadmapPrediction).filter(
-        RoadmapPrediction.signpost_id == signpost_id
-    ).all()
+    # Get predictions for this signpost with their roadmaps
+    predictions = (
+        db.query(RoadmapPrediction, Roadmap)
+        .join(Roadmap, Roadmap.id == RoadmapPrediction.roadmap_id)
+        .filter(RoadmapPrediction.signpost_id == signpost_id)
+        .all()
+    )
 
     if not predictions:
         return []
 
     comparisons = []
-    for pred in predictions:
+    for pred, roadmap in predictions:
         if not pred.predicted_date:
             continue
 
-        roadmap = db.query(Roadmap).filter(Roadmap.id == pred.roadmap_id).first()
-
         pace_status = compute_pace_status(
             current_value=current_value,
             baseline_value=float(signpost.baseline_value) if signpost.baseline_value else 0.0,
@@ -165,8 +167,8 @@ def get_forecast_comparison_for_event_link(
         )
 
         comparisons.append({
-            "roadmap_name": roadmap.name if roadmap else None,
-            "roadmap_slug": roadmap.slug if roadmap else None,
+            "roadmap_name": roadmap.name,
+            "roadmap_slug": roadmap.slug,
             "prediction_text": pred.prediction_text,
             "predicted_date": pred.predicted_date.isoformat(),
             **pace_status
@@ -175,121 +177,128 @@ def get_forecast_comparison_for_event_link(
     return comparisons
 
 
-def get_all_forecast_comparisons(db: Session) -> list[dict]:
+def compute_pace_status_batch(
+    current_values: Sequence[float],
+    baseline_values: Sequence[float],
+    target_values: Sequence[float],
+    directions: Sequence[str],
+    current_dates: Sequence[date],
+    predicted_dates: Sequence[date],
+    baseline_date: date = date(2023, 1, 1)
+) -> list[dict]:
     """
-    Get forecast comparison for all signposts with current data.
+    Vectorized compute_pace_status over many (signpost, prediction) pairs.
 
-    Returns list of signpost comparisons (one per signpost with predictions).
+    All sequences are aligned, one entry per pair. Results match calling
+    compute_pace_status on each pair.
+
+    Returns:
+        One dict (status, days_ahead, progress, expected_progress) per pair
     """
-    # Get all signposts with predictions
-    signposts_with_preds = (
-        db.query(Signpost.id)
-        .join(RoadmapPrediction, RoadmapPrediction.signpost_id == Signpost.id)
-        .distinct()
-        .all()
-    )
+    if not len(current_values):
+        return []
 
-    signpost_ids = [s[0] for s in signposts_with_preds]
+    current = np.asarray(current_values, dtype=np.float64)
+    baseline = np.asarray(baseline_values, dtype=np.float64)
+    target = np.asarray(target_values, dtype=np.float64)
+    increasing = np.array([direction == ">=" for direction in directions])
+
+    # Progress, clamped; baseline == target is a binary completion check
+    span = np.where(increasing, target - baseline, baseline - target)
+    delta = np.where(increasing, current - baseline, baseline - current)
+    degenerate = span == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        progress = np.clip(delta / np.where(degenerate, 1.0, span), 0.0, 1.0)
+    reached = np.where(increasing, current >= target, current <= target)
+    progress = np.where(degenerate, reached.astype(np.float64), progress)
+
+    # Expected progress by linear interpolation; predictions in the past expect 100%
+    origin = baseline_date.toordinal()
+    total_days = np.array([d.toordinal() for d in predicted_dates]) - origin
+    elapsed_days = np.array([d.toordinal() for d in current_dates]) - origin
+    future = total_days > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = np.where(future, np.clip(elapsed_days / np.where(future, total_days, 1), 0.0, 1.0), 1.0)
+
+    days_ahead = np.where(future, np.trunc((progress - expected) * total_days), 0).astype(np.int64)
+
+    # ±7 days counts as on track
+    status = np.select([np.abs(days_ahead) <= 7, days_ahead > 0], ["on_track", "ahead"], "behind")
+
+    return [
+        {
+            "status": str(status[i]),
+            "days_ahead": int(days_ahead[i]),
+            "progress": round(float(progress[i]) * 100, 1),
+            "expected_progress": round(float(expected[i]) * 100, 1),
+        }
+        for i in range(len(current))
+    ]
+
+
+def get_all_forecast_comparisons(db: Session, roadmap_slug: str | None = None) -> list[dict]:
+    """
+    Get forecast comparison for all signposts with current data.
 
-    results = []
+    One query loads every dated prediction together with its roadmap, its
+    signpost and the signpost's materialized current value (latest claim or
+    event link value, see app.services.signpost_values); pace status for all
+    (signpost, prediction) pairs is then computed in one vectorized pass.
 
-    for signpost_id in signpost_ids:
-        signpost = db.query(Signpost).filter(Signpost.id == signpost_id).first()
-
-        # Get latest value from claims or events
-        latest_claim_value = None
-        latest_claim_date = None
-
-        # Try claims first
-        latest_claim_signpost = (
-            db.query(ClaimSignpost)
-            .filter(ClaimSignpost.signpost_id == signpost_id)
-            .join(Claim)
-            .filter(not Claim.retracted)
-            .order_by(Claim.observed_at.desc())
-            .first()
-        )
+    Args:
+        db: Database session
+        roadmap_slug: Only compare against this roadmap's predictions
 
-        if latest_claim_signpost:
-            claim = db.query(Claim).filter(Claim.id == latest_claim_signpost.claim_id).first()
-            if claim and claim.metric_value:
-                latest_claim_value = float(claim.metric_value)
-                latest_claim_date = claim.observed_at.date()
-
-        # Try events (take latest if more recent)
-        latest_event_link = (
-            db.query(EventSignpostLink)
-            .filter(EventSignpostLink.signpost_id == signpost_id)
-            .filter(EventSignpostLink.value.isnot(None))
-            .order_by(EventSignpostLink.observed_at.desc())
-            .first()
+    Returns list of signpost comparisons (one per signpost with predictions).
+    """
+    query = (
+        db.query(RoadmapPrediction, Roadmap, Signpost, SignpostCurrentValue)
+        .join(Roadmap, Roadmap.id == RoadmapPrediction.roadmap_id)
+        .join(Signpost, Signpost.id == RoadmapPrediction.signpost_id)
+        .join(SignpostCurrentValue, SignpostCurrentValue.signpost_id == Signpost.id)
+        .filter(
+            RoadmapPrediction.predicted_date.isnot(None),
+            SignpostCurrentValue.current_value.isnot(None),
         )
+    )
+    if roadmap_slug is not None:
+        query = query.filter(Roadmap.slug == roadmap_slug)
+    pairs = query.order_by(Signpost.id, RoadmapPrediction.id).all()
+
+    today = date.today()
+    statuses = compute_pace_status_batch(
+        current_values=[float(current.current_value) for _, _, _, current in pairs],
+        baseline_values=[float(sp.baseline_value) if sp.baseline_value else 0.0 for _, _, sp, _ in pairs],
+        target_values=[float(sp.target_value) if sp.target_value else 100.0 for _, _, sp, _ in pairs],
+        directions=[sp.direction for _, _, sp, _ in pairs],
+        current_dates=[current.observed_at.date() if current.observed_at else today for _, _, _, current in pairs],
+        predicted_dates=[pred.predicted_date for pred, _, _, _ in pairs],
+    )
 
-        current_value = None
-        current_date = None
-        source_type = None
-
-        if latest_event_link and latest_event_link.value:
-            event_value = float(latest_event_link.value)
-            event_date = latest_event_link.observed_at.date() if latest_event_link.observed_at else date.today()
-
-            # Use event if no claim or event is more recent
-            if not latest_claim_value or (latest_claim_date and event_date > latest_claim_date):
-                current_value = event_value
-                current_date = event_date
-                source_type = "event"
-            else:
-                current_value = latest_claim_value
-                current_date = latest_claim_date
-                source_type = "claim"
-        elif latest_claim_value:
-            current_value = latest_claim_value
-            current_date = latest_claim_date
-            source_type = "claim"
-
-        if not current_value:
-            continue
-
-        # Get predictions
-        predictions = db.query(RoadmapPrediction).filter(
-            RoadmapPrediction.signpost_id == signpost_id
-        ).all()
-
-        roadmap_comparisons = []
-        for pred in predictions:
-            if not pred.predicted_date:
-                continue
-
-            roadmap = db.query(Roadmap).filter(Roadmap.id == pred.roadmap_id).first()
-
-            pace_status = compute_pace_status(
-                current_value=current_value,
-                baseline_value=float(signpost.baseline_value) if signpost.baseline_value else 0.0,
-                target_value=float(signpost.target_value) if signpost.target_value else 100.0,
-                direction=signpost.direction,
-                current_date=current_date,
-                predicted_date=pred.predicted_date
-            )
-
-            roadmap_comparisons.append({
-                "roadmap_name": roadmap.name if roadmap else None,
-                "roadmap_slug": roadmap.slug if roadmap else None,
-                "prediction_text": pred.prediction_text,
-                "predicted_date": pred.predicted_date.isoformat(),
-                **pace_status
-            })
-
-        if roadmap_comparisons:
-            results.append({
+    results = []
+    by_signpost = {}
+    for (pred, roadmap, signpost, current), pace_status in zip(pairs, statuses):
+        entry = by_signpost.get(signpost.id)
+        if entry is None:
+            current_date = current.observed_at.date() if current.observed_at else today
+            entry = by_signpost[signpost.id] = {
                 "signpost_id": signpost.id,
                 "signpost_code": signpost.code,
                 "signpost_name": signpost.name,
                 "category": signpost.category,
-                "current_value": current_value,
+                "current_value": float(current.current_value),
                 "current_date": current_date.isoformat(),
-                "source_type": source_type,
-                "roadmap_comparisons": roadmap_comparisons
-            })
+                "source_type": current.source_type,
+                "roadmap_comparisons": [],
+            }
+            results.append(entry)
+
+        entry["roadmap_comparisons"].append({
+            "roadmap_name": roadmap.name,
+            "roadmap_slug": roadmap.slug,
+            "prediction_text": pred.prediction_text,
+            "predicted_date": pred.predicted_date.isoformat(),
+            **pace_status
+        })
 
     return results
-
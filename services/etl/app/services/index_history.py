@@ -0,0 +1,120 @@
+"""
+Index history service.
+
+Builds /v1/index/history responses with two queries for the whole window,
+no matter how many days or presets are requested: one for the snapshots of
+every requested preset, and one windowed query (ROW_NUMBER per day) for
+the top A/B events on each day. The two are joined in memory.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models import Event, IndexSnapshot
+
+EVENTS_PER_DAY = 3
+
+
+def top_events_by_day_query(db: Session, start_date: date, end_date: date, per_day: int = EVENTS_PER_DAY):
+    """
+    Build the windowed query for the top A/B events per publication day.
+
+    The window is filtered with a half-open published_at range so the
+    published_at index is usable; the date() cast only appears in the
+    PARTITION BY, not in the predicate.
+    """
+    event_day = func.date(Event.published_at).label("event_day")
+    rank = (
+        func.row_number()
+        .over(
+            partition_by=func.date(Event.published_at),
+            order_by=(Event.evidence_tier, Event.published_at.desc(), Event.id),
+        )
+        .label("rank")
+    )
+
+    ranked = (
+        db.query(Event.id, Event.title, Event.evidence_tier, event_day, rank)
+        .filter(
+            Event.published_at >= datetime.combine(start_date, datetime.min.time()),
+            Event.published_at < datetime.combine(end_date + timedelta(days=1), datetime.min.time()),
+            Event.evidence_tier.in_(["A", "B"]),
+            Event.retracted.is_(False),
+        )
+        .subquery()
+    )
+
+    return (
+        db.query(ranked.c.id, ranked.c.title, ranked.c.evidence_tier, ranked.c.event_day)
+        .filter(ranked.c.rank <= per_day)
+        .order_by(ranked.c.event_day, ranked.c.rank)
+    )
+
+
+def load_top_events_by_day(
+    db: Session, start_date: date, end_date: date, per_day: int = EVENTS_PER_DAY
+) -> dict[date, list[dict]]:
+    """Top A/B events per day for the whole window, keyed by day."""
+    events_by_day = defaultdict(list)
+    for event_id, title, tier, event_day in top_events_by_day_query(db, start_date, end_date, per_day):
+        if isinstance(event_day, str):
+            event_day = date.fromisoformat(event_day)
+        events_by_day[event_day].append({"id": event_id, "title": title, "tier": tier})
+    return events_by_day
+
+
+def load_snapshots_by_preset(
+    db: Session, presets: list[str], start_date: date, end_date: date
+) -> dict[str, list[IndexSnapshot]]:
+    """Snapshots for every requested preset in one query, ordered by date."""
+    snapshots = (
+        db.query(IndexSnapshot)
+        .filter(
+            IndexSnapshot.preset.in_(presets),
+            IndexSnapshot.as_of_date >= start_date,
+            IndexSnapshot.as_of_date <= end_date,
+        )
+        .order_by(IndexSnapshot.as_of_date)
+        .all()
+    )
+
+    by_preset = {preset: [] for preset in presets}
+    for snapshot in snapshots:
+        by_preset[snapshot.preset].append(snapshot)
+    return by_preset
+
+
+def assemble_history(snapshots: list[IndexSnapshot], events_by_day: dict[date, list[dict]]) -> list[dict]:
+    """Join snapshots with their day's events into history points."""
+    return [
+        {
+            "date": str(snapshot.as_of_date),
+            "overall": float(snapshot.overall) if snapshot.overall else 0.0,
+            "capabilities": float(snapshot.capabilities) if snapshot.capabilities else 0.0,
+            "agents": float(snapshot.agents) if snapshot.agents else 0.0,
+            "inputs": float(snapshot.inputs) if snapshot.inputs else 0.0,
+            "security": float(snapshot.security) if snapshot.security else 0.0,
+            "events": events_by_day.get(snapshot.as_of_date, []),
+        }
+        for snapshot in snapshots
+    ]
+
+
+def build_index_history(db: Session, presets: list[str], start_date: date, end_date: date) -> dict[str, list[dict]]:
+    """
+    History points for every preset over [start_date, end_date].
+
+    Returns:
+        {preset: [{date, overall, capabilities, agents, inputs, security, events}, ...]}
+    """
+    snapshots_by_preset = load_snapshots_by_preset(db, presets, start_date, end_date)
+    if not any(snapshots_by_preset.values()):
+        return {preset: [] for preset in presets}
+
+    events_by_day = load_top_events_by_day(db, start_date, end_date)
+    return {
+        preset: assemble_history(snapshots, events_by_day)
+        for preset, snapshots in snapshots_by_preset.items()
+    }
@@ -7,6 +7,7 @@ with citations from the event and signpost database.
 
 import hashlib
 import json
+from types import SimpleNamespace
 from typing import AsyncIterator, Dict, List, Optional
 
 import redis
@@ -14,7 +15,8 @@ from langchain.chains import ConversationalRetrievalChain
 from langchain.memory import ConversationBufferWindowMemory
 from langchain.prompts import PromptTemplate
 from langchain_community.vectorstores.pgvector import PGVector
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from langchain_core.embeddings import Embeddings
+from langchain_openai import ChatOpenAI
 from sqlalchemy import select, text
 
 from app.config import settings
@@ -22,6 +24,20 @@ from app.database import SessionLocal
 from app.models import Event, Signpost
 
 
+class ServiceEmbeddings(Embeddings):
+    """LangChain embeddings adapter over embedding_service (OpenAI or local backend)."""
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        from app.services.embedding_service import embedding_service
+
+        return embedding_service.embed_batch(texts, show_progress=False)
+
+    def embed_query(self, text: str) -> List[float]:
+        from app.services.embedding_service import embedding_service
+
+        return embedding_service.embed_single(text)
+
+
 class RAGChatbot:
     """RAG chatbot for AGI progress questions."""
 
@@ -37,12 +53,8 @@ class RAGChatbot:
             openai_api_key=settings.openai_api_key
         )
         
-        # Embeddings (must match embedding_service)
-        self.embeddings = OpenAIEmbeddings(
-            model="text-embedding-3-small",
-            dimensions=1536,
-            openai_api_key=settings.openai_api_key
-        )
+        # Embeddings (must match embedding_service, so go through it and its backend)
+        self.embeddings = ServiceEmbeddings()
         
         # Conversation memory (last 5 messages)
         self.memory_window = 5
@@ -177,12 +189,83 @@ Format your responses in Markdown with:
         top_k: int,
         db
     ) -> List[Dict]:
-        """Retrieve relevant sources using vector similarity."""
+        """
+        Retrieve relevant sources using vector similarity.
+
+        Searches the in-process ANN index (the store populate_embeddings
+        writes) unless settings.semantic_search_backend is "pgvector".
+        """
         from app.services.embedding_service import embedding_service
         
         # Generate query embedding
         query_embedding = embedding_service.embed_single(query, use_cache=True)
+
+        if settings.semantic_search_backend == "pgvector":
+            event_results, signpost_results = self._retrieve_pgvector(query_embedding, top_k, db)
+        else:
+            event_results, signpost_results = self._retrieve_index(query_embedding, top_k, db)
+        
+        # Format sources
+        sources = []
+        
+        for row in event_results:
+            sources.append({
+                "type": "event",
+                "id": row.id,
+                "title": row.title,
+                "summary": row.summary,
+                "url": row.source_url,
+                "tier": row.evidence_tier,
+                "published_at": row.published_at.isoformat() if row.published_at else None,
+                "publisher": row.publisher,
+                "similarity": float(row.similarity)
+            })
+        
+        for row in signpost_results:
+            sources.append({
+                "type": "signpost",
+                "id": row.id,
+                "code": row.code,
+                "name": row.name,
+                "description": row.description,
+                "category": row.category,
+                "explainer": row.short_explainer,
+                "similarity": float(row.similarity)
+            })
         
+        # Sort by similarity
+        sources.sort(key=lambda x: x["similarity"], reverse=True)
+        
+        return sources[:top_k]
+
+    def _retrieve_index(self, query_embedding: List[float], top_k: int, db):
+        """Nearest events and signposts from the in-process ANN index, hydrated from the database."""
+        from app.services.vector_index import event_index, signpost_index
+
+        event_hits = dict(event_index.search(query_embedding, k=top_k, tiers=["A", "B", "C"]))
+        signpost_hits = dict(signpost_index.search(query_embedding, k=top_k // 2))
+
+        # Hydrate from the database (also drops rows deleted/retracted since the index last synced)
+        event_results = [
+            SimpleNamespace(
+                id=event.id, title=event.title, summary=event.summary, source_url=event.source_url,
+                evidence_tier=event.evidence_tier, published_at=event.published_at, publisher=event.publisher,
+                similarity=event_hits[event.id],
+            )
+            for event in db.query(Event).filter(Event.id.in_(list(event_hits)), Event.retracted == False)  # noqa: E712
+        ] if event_hits else []
+        signpost_results = [
+            SimpleNamespace(
+                id=signpost.id, code=signpost.code, name=signpost.name, description=signpost.description,
+                category=signpost.category, short_explainer=signpost.short_explainer,
+                similarity=signpost_hits[signpost.id],
+            )
+            for signpost in db.query(Signpost).filter(Signpost.id.in_(list(signpost_hits)))
+        ] if signpost_hits else []
+        return event_results, signpost_results
+
+    def _retrieve_pgvector(self, query_embedding: List[float], top_k: int, db):
+        """Nearest events and signposts by pgvector cosine distance."""
         # Query events using cosine similarity
         event_query = text("""
             SELECT 
@@ -216,39 +299,7 @@ Format your responses in Markdown with:
             signpost_query,
             {"query_embedding": str(query_embedding), "limit": top_k // 2}
         ).fetchall()
-        
-        # Format sources
-        sources = []
-        
-        for row in event_results:
-            sources.append({
-                "type": "event",
-                "id": row.id,
-                "title": row.title,
-                "summary": row.summary,
-                "url": row.source_url,
-                "tier": row.evidence_tier,
-                "published_at": row.published_at.isoformat() if row.published_at else None,
-                "publisher": row.publisher,
-                "similarity": float(row.similarity)
-            })
-        
-        for row in signpost_results:
-            sources.append({
-                "type": "signpost",
-                "id": row.id,
-                "code": row.code,
-                "name": row.name,
-                "description": row.description,
-                "category": row.category,
-                "explainer": row.short_explainer,
-                "similarity": float(row.similarity)
-            })
-        
-        # Sort by similarity
-        sources.sort(key=lambda x: x["similarity"], reverse=True)
-        
-        return sources[:top_k]
+        return event_results, signpost_results
 
     def _build_context(self, sources: List[Dict]) -> str:
         """Build context string from retrieved sources."""
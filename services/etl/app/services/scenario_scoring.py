@@ -0,0 +1,104 @@
+"""
+Vectorized what-if scenario scoring.
+
+Scores many hypothetical signpost-progress scenarios in one pass using the
+batch API in packages/scoring/python/core.py, so the scenario explorer can
+evaluate thousands of scenarios per request.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from app.models import Signpost
+
+# Add scoring package to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent.parent / "packages" / "scoring" / "python"))
+
+try:
+    from core import (
+        CATEGORY_ORDER,
+        aggregate_category_batch,
+        build_category_weight_matrix,
+        build_preset_weight_matrix,
+        compute_index_from_categories_batch,
+        compute_overall_batch,
+    )
+except ImportError:
+    from packages.scoring.python.core import (
+        CATEGORY_ORDER,
+        aggregate_category_batch,
+        build_category_weight_matrix,
+        build_preset_weight_matrix,
+        compute_index_from_categories_batch,
+        compute_overall_batch,
+    )
+
+
+def build_scenario_matrix(signposts: list[Signpost], scenarios: list[dict[str, float]]) -> np.ndarray:
+    """
+    Build a (scenarios x signposts) progress matrix in 0-1 units.
+
+    Args:
+        signposts: Signposts defining the column order
+        scenarios: One {signpost_code: progress (0-100)} dict per scenario;
+            signposts missing from a scenario get 0 progress
+
+    Returns:
+        Progress matrix shaped (len(scenarios), len(signposts))
+    """
+    column = {signpost.code: i for i, signpost in enumerate(signposts)}
+    matrix = np.zeros((len(scenarios), len(signposts)), dtype=np.float64)
+
+    for row, scenario in enumerate(scenarios):
+        for code, progress in scenario.items():
+            i = column.get(code)
+            if i is not None:
+                matrix[row, i] = progress / 100.0
+
+    return matrix
+
+
+def score_scenarios(
+    signposts: list[Signpost],
+    scenarios: list[dict[str, float]],
+    presets: dict[str, dict[str, float]] | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Score every scenario (and optionally every preset) in one vectorized call.
+
+    Category scores are first-class-weighted (2x) means. ``overall`` is the
+    harmonic mean of capabilities and inputs, as in the single-scenario
+    calculator; ``preset_overall`` additionally blends capabilities and
+    agents with each preset's weights (compute_index_from_categories).
+
+    Returns:
+        {
+            "category_scores": (scenarios x 4) in CATEGORY_ORDER,
+            "overall": (scenarios,),
+            "safety_margin": (scenarios,),
+            "preset_overall": (scenarios x presets), only when presets given,
+        }
+    """
+    progress = build_scenario_matrix(signposts, scenarios)
+    weight_matrix = build_category_weight_matrix(
+        [signpost.category for signpost in signposts],
+        [2.0 if signpost.first_class else 1.0 for signpost in signposts],
+    )
+    category_scores = aggregate_category_batch(progress, weight_matrix)
+
+    capabilities = category_scores[:, CATEGORY_ORDER.index("capabilities")]
+    inputs = category_scores[:, CATEGORY_ORDER.index("inputs")]
+    security = category_scores[:, CATEGORY_ORDER.index("security")]
+
+    result = {
+        "category_scores": category_scores,
+        "overall": compute_overall_batch(capabilities, inputs),
+        "safety_margin": security - capabilities,
+    }
+
+    if presets:
+        preset_matrix = build_preset_weight_matrix(list(presets.values()))
+        result["preset_overall"] = compute_index_from_categories_batch(category_scores, preset_matrix)["overall"]
+
+    return result
@@ -0,0 +1,336 @@
+"""
+Materialized per-signpost current values.
+
+Snapshot scoring, the pace endpoint, the signpost detail endpoint and the
+roadmap comparison all need "the current value of a signpost". Instead of each
+walking ClaimSignpost -> Claim -> Source and EventSignpostLink per signpost,
+they read the signpost_current_values table, which holds per signpost:
+
+- current_value / observed_at / source_type: the latest claim or event link
+  value (the event link wins only if it is strictly more recent)
+- max_value / best_tier: the highest scorable A/B value and best tier, which
+  is what the index scores
+- tier_{a,b,c,d}_count: evidence counts by tier (claims by source
+  credibility, event links by link tier)
+
+refresh_signpost_values() recomputes rows for a set of signposts with a fixed
+number of aggregate queries and one upsert. Session hooks keep the table
+current: ORM writes to claims, claim/event links, claim values and event
+retractions mark their signposts stale, and stale signposts are refreshed in
+the same transaction just before it commits. Bulk Core statements bypass the
+ORM, so their callers use mark_signposts_stale(). The daily snapshot rebuilds
+every row to catch anything the hooks can't see (e.g. source credibility
+changes).
+"""
+from collections import defaultdict
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models import (
+    Claim,
+    ClaimSignpost,
+    Event,
+    EventSignpostLink,
+    Signpost,
+    SignpostCurrentValue,
+    Source,
+)
+
+EVIDENCE_TIERS = ("A", "B", "C", "D")
+SCORABLE_TIERS = ("A", "B")
+
+STALE_KEY = "stale_signpost_values"
+
+
+def _in(column, ids):
+    """Restrict a query to the given ids (no-op when ids is None)."""
+    return (column.in_(ids),) if ids is not None else ()
+
+
+def scorable_link_filters():
+    """Filters for event links whose value counts toward a signpost's max value."""
+    return (
+        Event.retracted.is_(False),
+        EventSignpostLink.tier.in_(SCORABLE_TIERS),
+        EventSignpostLink.provisional.is_(False),
+        EventSignpostLink.value.isnot(None),
+        EventSignpostLink.value != 0,
+    )
+
+
+def load_signpost_evidence(db: Session, signpost_ids: list[int] | None = None) -> dict:
+    """
+    Load the aggregates a signpost_current_values row is built from.
+
+    Six queries regardless of how many signposts are refreshed:
+    latest claim and latest event link per signpost (DISTINCT ON), max
+    scorable claim and link values, and claim and link counts by tier.
+
+    Args:
+        db: Database session
+        signpost_ids: Signposts to load, or None for all
+
+    Returns:
+        {"latest_claims", "latest_links", "max_values", "counts"} as lists of row tuples
+    """
+    latest_claims = db.execute(
+        select(ClaimSignpost.signpost_id, Claim.metric_value, Claim.observed_at)
+        .join(Claim, Claim.id == ClaimSignpost.claim_id)
+        .where(
+            Claim.retracted.isnot(True),
+            Claim.metric_value.isnot(None),
+            Claim.metric_value != 0,
+            *_in(ClaimSignpost.signpost_id, signpost_ids),
+        )
+        .order_by(ClaimSignpost.signpost_id, Claim.observed_at.desc(), Claim.id.desc())
+        .distinct(ClaimSignpost.signpost_id)
+    ).all()
+
+    link_observed_at = func.coalesce(EventSignpostLink.observed_at, Event.published_at)
+    latest_links = db.execute(
+        select(EventSignpostLink.signpost_id, EventSignpostLink.value, link_observed_at)
+        .join(Event, Event.id == EventSignpostLink.event_id)
+        .where(
+            Event.retracted.is_(False),
+            EventSignpostLink.value.isnot(None),
+            EventSignpostLink.value != 0,
+            *_in(EventSignpostLink.signpost_id, signpost_ids),
+        )
+        .order_by(EventSignpostLink.signpost_id, link_observed_at.desc().nulls_last(), EventSignpostLink.event_id.desc())
+        .distinct(EventSignpostLink.signpost_id)
+    ).all()
+
+    # Zero metric values are skipped, matching the scorer's truthiness check
+    claim_max = db.execute(
+        select(ClaimSignpost.signpost_id, func.max(Claim.metric_value), func.min(Source.credibility))
+        .join(Claim, Claim.id == ClaimSignpost.claim_id)
+        .join(Source, Source.id == Claim.source_id)
+        .where(
+            Claim.retracted.isnot(True),
+            Source.credibility.in_(SCORABLE_TIERS),
+            Claim.metric_value.isnot(None),
+            Claim.metric_value != 0,
+            *_in(ClaimSignpost.signpost_id, signpost_ids),
+        )
+        .group_by(ClaimSignpost.signpost_id)
+    ).all()
+    link_max = db.execute(
+        select(EventSignpostLink.signpost_id, func.max(EventSignpostLink.value), func.min(EventSignpostLink.tier))
+        .join(Event, Event.id == EventSignpostLink.event_id)
+        .where(*scorable_link_filters(), *_in(EventSignpostLink.signpost_id, signpost_ids))
+        .group_by(EventSignpostLink.signpost_id)
+    ).all()
+
+    claim_counts = db.execute(
+        select(ClaimSignpost.signpost_id, Source.credibility, func.count())
+        .join(Claim, Claim.id == ClaimSignpost.claim_id)
+        .join(Source, Source.id == Claim.source_id)
+        .where(Claim.retracted.isnot(True), *_in(ClaimSignpost.signpost_id, signpost_ids))
+        .group_by(ClaimSignpost.signpost_id, Source.credibility)
+    ).all()
+    link_counts = db.execute(
+        select(EventSignpostLink.signpost_id, EventSignpostLink.tier, func.count())
+        .join(Event, Event.id == EventSignpostLink.event_id)
+        .where(
+            Event.retracted.is_(False),
+            EventSignpostLink.tier.isnot(None),
+            *_in(EventSignpostLink.signpost_id, signpost_ids),
+        )
+        .group_by(EventSignpostLink.signpost_id, EventSignpostLink.tier)
+    ).all()
+
+    return {
+        "latest_claims": latest_claims,
+        "latest_links": latest_links,
+        "max_values": [*claim_max, *link_max],
+        "counts": [*claim_counts, *link_counts],
+    }
+
+
+def build_signpost_value_rows(signpost_ids: list[int], evidence: dict) -> list[dict]:
+    """
+    Combine loaded evidence into one signpost_current_values row per signpost.
+
+    Signposts without evidence still get a row (NULL values, zero counts) so
+    the table always covers every refreshed signpost.
+
+    Args:
+        signpost_ids: Signposts to build rows for
+        evidence: Output of load_signpost_evidence
+
+    Returns:
+        Row dicts keyed by SignpostCurrentValue column names
+    """
+    latest_claims = {sid: (value, observed_at) for sid, value, observed_at in evidence["latest_claims"]}
+    latest_links = {sid: (value, observed_at) for sid, value, observed_at in evidence["latest_links"]}
+
+    max_values, best_tiers = {}, {}
+    for signpost_id, value, tier in evidence["max_values"]:
+        max_values[signpost_id] = max(max_values.get(signpost_id, value), value)
+        best_tiers[signpost_id] = min(best_tiers.get(signpost_id, tier), tier)
+
+    counts = defaultdict(lambda: dict.fromkeys(EVIDENCE_TIERS, 0))
+    for signpost_id, tier, count in evidence["counts"]:
+        if tier in EVIDENCE_TIERS:
+            counts[signpost_id][tier] += count
+
+    rows = []
+    for signpost_id in signpost_ids:
+        claim = latest_claims.get(signpost_id)
+        link = latest_links.get(signpost_id)
+
+        # Event link wins only if strictly more recent than the latest claim
+        current, source_type = None, None
+        if link and (not claim or (link[1] and link[1].date() > claim[1].date())):
+            current, source_type = link, "event"
+        elif claim:
+            current, source_type = claim, "claim"
+
+        tier_counts = counts[signpost_id]
+        rows.append({
+            "signpost_id": signpost_id,
+            "current_value": current[0] if current else None,
+            "observed_at": current[1] if current else None,
+            "source_type": source_type,
+            "max_value": max_values.get(signpost_id),
+            "best_tier": best_tiers.get(signpost_id),
+            "tier_a_count": tier_counts["A"],
+            "tier_b_count": tier_counts["B"],
+            "tier_c_count": tier_counts["C"],
+            "tier_d_count": tier_counts["D"],
+        })
+
+    return rows
+
+
+def refresh_signpost_values(db: Session, signpost_ids=None) -> dict[str, int]:
+    """
+    Recompute signpost_current_values rows and upsert them.
+
+    Does not commit.
+
+    Args:
+        db: Database session
+        signpost_ids: Signposts to refresh, or None to rebuild every row
+
+    Returns:
+        {"signposts": number of rows written}
+    """
+    if signpost_ids is None:
+        ids = list(db.scalars(select(Signpost.id)))
+        evidence = load_signpost_evidence(db)
+    else:
+        ids = sorted(set(signpost_ids))
+        if not ids:
+            return {"signposts": 0}
+        evidence = load_signpost_evidence(db, ids)
+
+    rows = build_signpost_value_rows(ids, evidence)
+    if rows:
+        stmt = insert(SignpostCurrentValue).values(rows)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["signpost_id"],
+            set_={
+                **{column: stmt.excluded[column] for column in rows[0] if column != "signpost_id"},
+                "refreshed_at": func.now(),
+            },
+        ))
+
+    return {"signposts": len(rows)}
+
+
+def load_signpost_values(db: Session, signpost_ids=None) -> dict[int, SignpostCurrentValue]:
+    """Materialized rows keyed by signpost id (all rows when signpost_ids is None)."""
+    query = select(SignpostCurrentValue).where(*_in(SignpostCurrentValue.signpost_id, signpost_ids))
+    return {row.signpost_id: row for row in db.scalars(query)}
+
+
+def tier_counts(row: SignpostCurrentValue | None) -> dict[str, int]:
+    """Tier counts of a materialized row as {"A": n, "B": n, "C": n, "D": n}."""
+    if row is None:
+        return dict.fromkeys(EVIDENCE_TIERS, 0)
+    return {
+        "A": row.tier_a_count,
+        "B": row.tier_b_count,
+        "C": row.tier_c_count,
+        "D": row.tier_d_count,
+    }
+
+
+def _stale(session: Session) -> dict[str, set]:
+    return session.info.setdefault(STALE_KEY, {"signposts": set(), "claims": set(), "events": set()})
+
+
+def mark_signposts_stale(db: Session, signpost_ids) -> None:
+    """
+    Queue signposts for refresh when the session's transaction commits.
+
+    Needed after Core statements (bulk INSERT/UPDATE) that write claim or
+    event links, since those don't go through the ORM flush hooks.
+    """
+    signpost_ids = set(signpost_ids)
+    if signpost_ids:
+        _stale(db)["signposts"].update(signpost_ids)
+
+
+def _changed(obj, *attributes) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[attribute].history.has_changes() for attribute in attributes)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_stale_signposts(session, flush_context):
+    """Record signposts touched by this flush (new/dirty/deleted are still pre-flush here)."""
+    for obj in (*session.new, *session.deleted):
+        if isinstance(obj, (ClaimSignpost, EventSignpostLink)):
+            _stale(session)["signposts"].add(obj.signpost_id)
+
+    for obj in session.dirty:
+        if isinstance(obj, (ClaimSignpost, EventSignpostLink)):
+            _stale(session)["signposts"].add(obj.signpost_id)
+        elif isinstance(obj, Claim) and _changed(obj, "retracted", "metric_value", "observed_at", "source_id"):
+            _stale(session)["claims"].add(obj.id)
+        elif isinstance(obj, Event) and _changed(obj, "retracted", "published_at"):
+            _stale(session)["events"].add(obj.id)
+
+
+@event.listens_for(Session, "before_commit")
+def _refresh_stale_signposts(session):
+    """Refresh signposts marked stale during this transaction before it commits."""
+    if session.in_nested_transaction():
+        # SAVEPOINT release; wait for the outer commit
+        return
+
+    # Flush first so pending changes are collected before the stale set is taken
+    session.flush()
+    stale = session.info.pop(STALE_KEY, None)
+    if not stale:
+        return
+
+    signpost_ids = set(stale["signposts"])
+    if stale["claims"]:
+        signpost_ids.update(session.scalars(
+            select(ClaimSignpost.signpost_id).where(ClaimSignpost.claim_id.in_(stale["claims"]))
+        ))
+    if stale["events"]:
+        signpost_ids.update(session.scalars(
+            select(EventSignpostLink.signpost_id).where(EventSignpostLink.event_id.in_(stale["events"]))
+        ))
+    signpost_ids.discard(None)
+
+    try:
+        with session.begin_nested():
+            refresh_signpost_values(session, signpost_ids)
+    except SQLAlchemyError as e:
+        # Never block the write itself; the daily full rebuild repairs the rows
+        print(f"⚠️  Could not refresh signpost values for {len(signpost_ids)} signposts: {e}")
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_stale_signposts(session, previous_transaction):
+    """Forget stale signposts when the outer transaction rolls back."""
+    if previous_transaction.parent is None:
+        session.info.pop(STALE_KEY, None)
@@ -0,0 +1,554 @@
+"""
+Set-based snapshot engine for index computation.
+
+Loads signposts and their materialized current values (max values, best
+tiers and evidence counts from signpost_current_values) once and scores every
+preset from that single in-memory pass, instead of walking
+ClaimSignpost -> Claim -> Source row by row for each category and each preset.
+
+Historical backfill replays the same evidence chronologically, carrying
+running per-signpost maxima and tier counts forward day by day.
+"""
+import json
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import (
+    Claim,
+    ClaimSignpost,
+    Event,
+    EventSignpostLink,
+    IndexSnapshot,
+    Signpost,
+    Source,
+)
+from app.services.signpost_values import EVIDENCE_TIERS, load_signpost_values, tier_counts
+from app.utils.query_counter import count_queries
+
+# Add scoring package to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent.parent / "packages" / "scoring" / "python"))
+
+try:
+    from core import (
+        aggregate_category,
+        aggregate_category_batch,
+        build_category_weight_matrix,
+        build_preset_weight_matrix,
+        compute_confidence_bands,
+        compute_confidence_bands_monte_carlo,
+        compute_index_from_categories,
+        compute_signpost_progress,
+        compute_signpost_progress_batch,
+        encode_directions,
+        encode_tier_sigmas,
+        sample_index_distribution,
+    )
+except ImportError:
+    from packages.scoring.python.core import (
+        aggregate_category,
+        aggregate_category_batch,
+        build_category_weight_matrix,
+        build_preset_weight_matrix,
+        compute_confidence_bands,
+        compute_confidence_bands_monte_carlo,
+        compute_index_from_categories,
+        compute_signpost_progress,
+        compute_signpost_progress_batch,
+        encode_directions,
+        encode_tier_sigmas,
+        sample_index_distribution,
+    )
+
+
+# Load preset weights
+# Try Docker path first, fall back to development path
+docker_weights_path = Path("/app/packages/shared/config/weights.json")
+dev_weights_path = Path(__file__).parent.parent.parent.parent.parent / "packages" / "shared" / "config" / "weights.json"
+
+weights_path = docker_weights_path if docker_weights_path.exists() else dev_weights_path
+
+with open(weights_path) as f:
+    PRESET_WEIGHTS = json.load(f)
+
+SNAPSHOT_CATEGORIES = ("capabilities", "agents", "inputs", "security")
+
+
+def load_snapshot_signposts(db: Session) -> list[dict]:
+    """Load signposts in the snapshot categories as plain dicts."""
+    signpost_rows = (
+        db.query(
+            Signpost.id,
+            Signpost.code,
+            Signpost.category,
+            Signpost.direction,
+            Signpost.baseline_value,
+            Signpost.target_value,
+            Signpost.first_class,
+        )
+        .filter(Signpost.category.in_(SNAPSHOT_CATEGORIES))
+        .order_by(Signpost.id)
+        .all()
+    )
+
+    return [
+        {
+            "id": row.id,
+            "code": row.code,
+            "category": row.category,
+            "direction": row.direction,
+            "baseline": float(row.baseline_value) if row.baseline_value else 0.0,
+            "target": float(row.target_value) if row.target_value else 1.0,
+            "first_class": bool(row.first_class),
+        }
+        for row in signpost_rows
+    ]
+
+
+def load_snapshot_graph(db: Session) -> dict:
+    """
+    Load everything needed to score the index with two queries.
+
+    1. Signposts in the snapshot categories.
+    2. Their materialized current values (see app.services.signpost_values):
+       max metric value and best tier over scorable A/B claims and event
+       links, and evidence counts by tier, summed per category.
+
+    Returns:
+        {
+            "signposts": [{id, code, category, direction, baseline, target, first_class}, ...],
+            "max_values": {signpost_id: float},
+            "best_tiers": {signpost_id: "A" | "B"},
+            "evidence_counts": {category: {"A": n, "B": n, "C": n, "D": n}},
+        }
+    """
+    signposts = load_snapshot_signposts(db)
+    values = load_signpost_values(db, [signpost["id"] for signpost in signposts])
+
+    max_values = {}
+    best_tiers = {}
+    evidence_counts = {category: dict.fromkeys(EVIDENCE_TIERS, 0) for category in SNAPSHOT_CATEGORIES}
+    for signpost in signposts:
+        row = values.get(signpost["id"])
+        if row is None:
+            continue
+        if row.max_value is not None:
+            max_values[signpost["id"]] = float(row.max_value)
+            best_tiers[signpost["id"]] = row.best_tier
+        for tier, count in tier_counts(row).items():
+            evidence_counts[signpost["category"]][tier] += count
+
+    return {
+        "signposts": signposts,
+        "max_values": max_values,
+        "best_tiers": best_tiers,
+        "evidence_counts": evidence_counts,
+    }
+
+
+def _signpost_arrays(graph: dict) -> dict[str, np.ndarray]:
+    """Per-signpost input vectors for the batch scoring API."""
+    signposts = graph["signposts"]
+    return {
+        "observed": np.array([graph["max_values"].get(sp["id"], sp["baseline"]) for sp in signposts]),
+        "baseline": np.array([sp["baseline"] for sp in signposts]),
+        "target": np.array([sp["target"] for sp in signposts]),
+        "directions": encode_directions([sp["direction"] for sp in signposts]),
+        "category_weights": build_category_weight_matrix(
+            [sp["category"] for sp in signposts],
+            [2.0 if sp["first_class"] else 1.0 for sp in signposts],
+            SNAPSHOT_CATEGORIES,
+        ),
+    }
+
+
+def score_categories(graph: dict) -> dict[str, float]:
+    """
+    Compute category scores from a loaded graph in one vectorized pass.
+
+    Signposts without A/B evidence fall back to their baseline (zero progress).
+    First-class signposts are weighted 2x within their category.
+    """
+    if not graph["signposts"]:
+        return dict.fromkeys(SNAPSHOT_CATEGORIES, 0.0)
+
+    arrays = _signpost_arrays(graph)
+    progress = compute_signpost_progress_batch(
+        arrays["observed"], arrays["baseline"], arrays["target"], arrays["directions"]
+    )
+    scores = aggregate_category_batch(progress, arrays["category_weights"])
+
+    return {category: float(score) for category, score in zip(SNAPSHOT_CATEGORIES, scores)}
+
+
+def monte_carlo_band_presets(preset_names) -> list[str]:
+    """Presets configured (settings.monte_carlo_band_presets) to use Monte Carlo bands."""
+    configured = {name.strip() for name in settings.monte_carlo_band_presets.split(",") if name.strip()}
+    if "*" in configured:
+        return list(preset_names)
+    return [name for name in preset_names if name in configured]
+
+
+def compute_monte_carlo_bands(
+    graph: dict,
+    presets: dict[str, dict[str, float]],
+    n_samples: int = 10000,
+    seed: int | None = None,
+) -> dict[str, dict]:
+    """
+    Sample confidence bands for the given presets in one vectorized call.
+
+    Each signpost's observed value is drawn with noise scaled by its best
+    evidence tier (no A/B evidence = widest), and every draw is pushed
+    through category aggregation and the harmonic-mean overall.
+
+    Returns:
+        {preset: {metric: {lower, median, upper}}}
+    """
+    if not presets or not graph["signposts"]:
+        return {}
+
+    arrays = _signpost_arrays(graph)
+    samples = sample_index_distribution(
+        arrays["observed"],
+        arrays["baseline"],
+        arrays["target"],
+        arrays["directions"],
+        encode_tier_sigmas([graph["best_tiers"].get(sp["id"]) for sp in graph["signposts"]]),
+        arrays["category_weights"],
+        build_preset_weight_matrix(list(presets.values()), SNAPSHOT_CATEGORIES),
+        n_samples=n_samples,
+        seed=seed,
+    )
+    bands = compute_confidence_bands_monte_carlo(samples, category_order=SNAPSHOT_CATEGORIES)
+    return dict(zip(presets, bands))
+
+
+def score_preset(
+    category_scores: dict[str, float],
+    evidence_counts: dict[str, dict[str, int]],
+    preset_weights: dict[str, float],
+) -> dict:
+    """Combine category scores into index metrics and heuristic confidence bands for one preset."""
+    index_metrics = compute_index_from_categories(category_scores, preset_weights)
+    confidence_bands = compute_confidence_bands(
+        {
+            **category_scores,
+            "overall": index_metrics["overall"],
+            "safety_margin": index_metrics["safety_margin"],
+        },
+        evidence_counts,
+    )
+    return {
+        "category_scores": dict(category_scores),
+        "index_metrics": index_metrics,
+        "confidence_bands": confidence_bands,
+        "confidence_method": "heuristic",
+        "evidence_counts": evidence_counts,
+    }
+
+
+def score_presets(
+    graph: dict,
+    presets: dict[str, dict[str, float]],
+    monte_carlo_presets: list[str] | None = None,
+    n_samples: int = 10000,
+    seed: int | None = None,
+) -> dict[str, dict]:
+    """
+    Score every preset from a single graph.
+
+    Category scores don't depend on preset weights, so they are computed once
+    and only the index combination and confidence bands run per preset.
+    Presets listed in ``monte_carlo_presets`` get sampled bands instead of
+    the fixed-width heuristic.
+
+    Returns:
+        {preset: {"category_scores", "index_metrics", "confidence_bands",
+                  "confidence_method", "evidence_counts"}}
+    """
+    category_scores = score_categories(graph)
+    results = {
+        preset_name: score_preset(category_scores, graph["evidence_counts"], preset_weights)
+        for preset_name, preset_weights in presets.items()
+    }
+
+    sampled = compute_monte_carlo_bands(
+        graph,
+        {name: presets[name] for name in monte_carlo_presets or [] if name in presets},
+        n_samples=n_samples,
+        seed=seed,
+    )
+    for preset_name, bands in sampled.items():
+        results[preset_name]["confidence_bands"] = bands
+        results[preset_name]["confidence_method"] = "monte_carlo"
+
+    return results
+
+
+def run_snapshot_engine(db: Session, presets: dict[str, dict[str, float]]) -> dict:
+    """
+    Load the graph once and score all presets, reporting query counts and timings.
+
+    Returns:
+        {
+            "presets": {preset: {...}},  # see score_presets
+            "stats": {"queries", "signposts", "load_ms", "score_ms", "monte_carlo_presets"},
+        }
+    """
+    load_started = time.perf_counter()
+    with count_queries(db) as query_stats:
+        graph = load_snapshot_graph(db)
+    load_ms = (time.perf_counter() - load_started) * 1000
+
+    sampled_presets = monte_carlo_band_presets(presets)
+    score_started = time.perf_counter()
+    preset_results = score_presets(
+        graph, presets, monte_carlo_presets=sampled_presets, n_samples=settings.monte_carlo_samples
+    )
+    score_ms = (time.perf_counter() - score_started) * 1000
+
+    return {
+        "presets": preset_results,
+        "stats": {
+            "queries": query_stats["count"],
+            "signposts": len(graph["signposts"]),
+            "load_ms": round(load_ms, 2),
+            "score_ms": round(score_ms, 2),
+            "monte_carlo_presets": sampled_presets,
+        },
+    }
+
+
+def load_observations(db: Session, end_date: date) -> list[tuple]:
+    """
+    Load dated evidence for replay, sorted chronologically.
+
+    Claims are dated by Claim.observed_at; event links by
+    EventSignpostLink.observed_at, falling back to the event's published_at.
+
+    Returns:
+        [(observed_date, signpost_id, value, tier, scorable), ...] where
+        ``scorable`` marks rows whose value feeds the running maximum and
+        ``tier`` feeds the evidence counts.
+    """
+    cutoff = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+
+    claim_rows = (
+        db.query(ClaimSignpost.signpost_id, Claim.observed_at, Claim.metric_value, Source.credibility)
+        .join(Claim, Claim.id == ClaimSignpost.claim_id)
+        .join(Source, Source.id == Claim.source_id)
+        .filter(Claim.retracted.isnot(True), Claim.observed_at < cutoff)
+        .all()
+    )
+
+    link_observed_at = func.coalesce(EventSignpostLink.observed_at, Event.published_at)
+    link_rows = (
+        db.query(
+            EventSignpostLink.signpost_id,
+            link_observed_at,
+            EventSignpostLink.value,
+            EventSignpostLink.tier,
+            EventSignpostLink.provisional,
+        )
+        .join(Event, Event.id == EventSignpostLink.event_id)
+        .filter(Event.retracted.is_(False), link_observed_at.isnot(None), link_observed_at < cutoff)
+        .all()
+    )
+
+    observations = []
+    for signpost_id, observed_at, value, tier in claim_rows:
+        scorable = tier in ("A", "B") and bool(value)
+        observations.append((observed_at.date(), signpost_id, float(value) if value else None, tier, scorable))
+    for signpost_id, observed_at, value, tier, provisional in link_rows:
+        scorable = tier in ("A", "B") and not provisional and bool(value)
+        observations.append((observed_at.date(), signpost_id, float(value) if value else None, tier, scorable))
+
+    observations.sort(key=lambda obs: obs[0])
+    return observations
+
+
+def replay_snapshots(
+    signposts: list[dict],
+    observations: list[tuple],
+    presets: dict[str, dict[str, float]],
+    start_date: date,
+    end_date: date,
+):
+    """
+    Replay observations day by day and yield scored snapshots.
+
+    Evidence dated before ``start_date`` seeds the initial state. Each day
+    then folds in only that day's observations, updates the running max for
+    the touched signposts, and re-aggregates only the categories they belong
+    to before scoring every preset. Backfilled days use the heuristic
+    confidence bands.
+
+    Yields:
+        (as_of_date, {preset: result}) for every day in [start_date, end_date]
+    """
+    by_id = {signpost["id"]: signpost for signpost in signposts}
+    running_max: dict[int, float] = {}
+    evidence_counts = {category: dict.fromkeys(EVIDENCE_TIERS, 0) for category in SNAPSHOT_CATEGORIES}
+
+    progresses = {category: [] for category in SNAPSHOT_CATEGORIES}
+    weights = {category: [] for category in SNAPSHOT_CATEGORIES}
+    position = {}
+    for signpost in signposts:
+        category = signpost["category"]
+        position[signpost["id"]] = len(progresses[category])
+        progresses[category].append(
+            compute_signpost_progress(
+                signpost["baseline"], signpost["baseline"], signpost["target"], signpost["direction"]
+            )
+        )
+        weights[category].append(2.0 if signpost["first_class"] else 1.0)
+
+    def apply(observation) -> str | None:
+        _, signpost_id, value, tier, scorable = observation
+        signpost = by_id.get(signpost_id)
+        if signpost is None:
+            return None
+
+        category = signpost["category"]
+        if tier:
+            evidence_counts[category][tier] = evidence_counts[category].get(tier, 0) + 1
+
+        if scorable and value > running_max.get(signpost_id, float("-inf")):
+            running_max[signpost_id] = value
+            progresses[category][position[signpost_id]] = compute_signpost_progress(
+                value, signpost["baseline"], signpost["target"], signpost["direction"]
+            )
+        return category
+
+    cursor = 0
+    while cursor < len(observations) and observations[cursor][0] < start_date:
+        apply(observations[cursor])
+        cursor += 1
+
+    category_scores = {
+        category: aggregate_category(progresses[category], weights[category])
+        for category in SNAPSHOT_CATEGORIES
+    }
+
+    day = start_date
+    while day <= end_date:
+        dirty = set()
+        while cursor < len(observations) and observations[cursor][0] == day:
+            category = apply(observations[cursor])
+            if category:
+                dirty.add(category)
+            cursor += 1
+
+        for category in dirty:
+            category_scores[category] = aggregate_category(progresses[category], weights[category])
+
+        counts_today = {category: dict(counts) for category, counts in evidence_counts.items()}
+        yield day, {
+            preset_name: score_preset(category_scores, counts_today, preset_weights)
+            for preset_name, preset_weights in presets.items()
+        }
+        day += timedelta(days=1)
+
+
+def write_index_snapshots(db: Session, scored_by_date: dict[date, dict[str, dict]], **extra_details) -> dict:
+    """
+    Upsert IndexSnapshot rows for every (date, preset) pair.
+
+    Existing rows in the date range are loaded with one query and updated in
+    place; the caller is responsible for committing.
+
+    Returns:
+        {"created": n, "updated": n}
+    """
+    stats = {"created": 0, "updated": 0}
+    if not scored_by_date:
+        return stats
+
+    existing = {
+        (snap.as_of_date, snap.preset): snap
+        for snap in db.query(IndexSnapshot).filter(
+            IndexSnapshot.as_of_date >= min(scored_by_date),
+            IndexSnapshot.as_of_date <= max(scored_by_date),
+        )
+    }
+
+    for as_of_date, preset_results in scored_by_date.items():
+        for preset_name, scored in preset_results.items():
+            category_scores = scored["category_scores"]
+            index_metrics = scored["index_metrics"]
+            values = {
+                "capabilities": category_scores["capabilities"],
+                "agents": category_scores["agents"],
+                "inputs": category_scores["inputs"],
+                "security": category_scores["security"],
+                "overall": index_metrics["overall"],
+                "safety_margin": index_metrics["safety_margin"],
+                "details": {
+                    "confidence_bands": scored["confidence_bands"],
+                    "confidence_method": scored["confidence_method"],
+                    "evidence_counts": scored["evidence_counts"],
+                    **extra_details,
+                },
+            }
+
+            snapshot = existing.get((as_of_date, preset_name))
+            if snapshot:
+                for field, value in values.items():
+                    setattr(snapshot, field, value)
+                stats["updated"] += 1
+            else:
+                db.add(IndexSnapshot(as_of_date=as_of_date, preset=preset_name, **values))
+                stats["created"] += 1
+
+    return stats
+
+
+def backfill_index_snapshots(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    presets: dict[str, dict[str, float]],
+) -> dict:
+    """
+    Rebuild IndexSnapshot rows for a historical date range.
+
+    Loads signposts and all dated evidence once, replays it incrementally,
+    and upserts one snapshot per day per preset. Does not commit.
+
+    Returns:
+        {"days", "created", "updated", "observations", "queries", "load_ms", "replay_ms", "write_ms"}
+    """
+    if start_date > end_date:
+        raise ValueError(f"start_date {start_date} is after end_date {end_date}")
+
+    with count_queries(db) as query_stats:
+        load_started = time.perf_counter()
+        signposts = load_snapshot_signposts(db)
+        observations = load_observations(db, end_date)
+        load_ms = (time.perf_counter() - load_started) * 1000
+
+        replay_started = time.perf_counter()
+        scored_by_date = dict(replay_snapshots(signposts, observations, presets, start_date, end_date))
+        replay_ms = (time.perf_counter() - replay_started) * 1000
+
+        write_started = time.perf_counter()
+        write_stats = write_index_snapshots(db, scored_by_date, backfill=True)
+        db.flush()
+        write_ms = (time.perf_counter() - write_started) * 1000
+
+    return {
+        "days": len(scored_by_date),
+        **write_stats,
+        "observations": len(observations),
+        "queries": query_stats["count"],
+        "load_ms": round(load_ms, 2),
+        "replay_ms": round(replay_ms, 2),
+        "write_ms": round(write_ms, 2),
+    }
@@ -0,0 +1,444 @@
+"""
+In-process approximate nearest-neighbour index for semantic search.
+
+Embeddings live next to the app instead of in a pgvector column:
+
+- {name}.{generation}.f32: append-only float32 matrix, one L2-normalized row
+  per upsert, memory-mapped read-only by the API process
+- {name}.meta.npz: per-row id, evidence tier, retracted flag, published_at,
+  liveness and IVF list, plus the IVF centroids. Replaced atomically, so a
+  reader always sees a consistent prefix of the matrix.
+
+Search is exact (one matrix-vector product) below IVF_MIN_VECTORS rows; above
+it, an IVF index (spherical k-means, sqrt(n) lists) scores only the rows in
+the nprobe lists closest to the query. Filters (tier, retracted, date) are
+evaluated as a row mask before scoring, and a filter that leaves fewer rows
+than the probed lists hold is answered exactly.
+
+Writers (populate_embeddings, embed_single_event, retractions) serialize on a
+per-index file lock. Replaced and removed rows are only marked dead; build()
+compacts them into a new generation and retrains the centroids.
+"""
+
+import fcntl
+import os
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.services.embedding_backends import EMBEDDING_DIMENSIONS
+
+# Evidence tiers, stored as 1..4 (0 = no tier)
+TIERS = ("A", "B", "C", "D")
+NO_DATE = np.iinfo(np.int64).min
+
+# Below this many rows exact search is already ~1ms: don't train an IVF
+IVF_MIN_VECTORS = 2000
+DEFAULT_NPROBE = 8
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 64
+
+# build() is due when the index doubled since training or a quarter of it is dead
+REBUILD_GROWTH = 2.0
+REBUILD_DEAD_FRACTION = 0.25
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows (zero rows stay zero)."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def to_epoch(value) -> int:
+    """datetime/date/ISO string -> epoch seconds (NO_DATE for None)."""
+    if value is None:
+        return NO_DATE
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def train_centroids(vectors: np.ndarray, nlist: int, seed: int = 0) -> np.ndarray:
+    """
+    Spherical k-means on a sample of the rows.
+
+    Args:
+        vectors: Normalized rows
+        nlist: Number of centroids
+        seed: RNG seed (same data and seed give the same centroids)
+
+    Returns:
+        (nlist, dimensions) float32 normalized centroids
+    """
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), nlist * KMEANS_SAMPLE_PER_LIST)
+    sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))])
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+    for _ in range(KMEANS_ITERATIONS):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        order = np.argsort(assignment, kind="stable")
+        counts = np.bincount(assignment, minlength=nlist)
+        sums = np.zeros_like(centroids)
+        filled = counts > 0
+        sums[filled] = np.add.reduceat(sample[order], np.cumsum(counts)[filled] - counts[filled])
+        # Reseed empty lists from random sample rows
+        sums[~filled] = sample[rng.choice(sample_size, int((~filled).sum()))]
+        centroids = normalize_rows(sums).astype(np.float32)
+    return centroids
+
+
+class VectorIndex:
+    """Memory-mapped vector store with an IVF index and metadata filters."""
+
+    def __init__(self, name: str, directory: str | Path | None = None, dimensions: int = EMBEDDING_DIMENSIONS):
+        """
+        Args:
+            name: Index name ("events", "signposts"), used for the file names
+            directory: Storage directory (defaults to settings.vector_index_dir)
+            dimensions: Vector dimensionality
+        """
+        self.name = name
+        self.directory = Path(directory or settings.vector_index_dir)
+        self.dimensions = dimensions
+        self.meta_path = self.directory / f"{name}.meta.npz"
+        self.lock_path = self.directory / f"{name}.lock"
+        self._signature = None
+        self._load_empty()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _vectors_path(self, generation: int) -> Path:
+        return self.directory / f"{self.name}.{generation}.f32"
+
+    def _load_empty(self):
+        self.generation = 0
+        self.vectors = np.zeros((0, self.dimensions), dtype=np.float32)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.tiers = np.zeros(0, dtype=np.uint8)
+        self.retracted = np.zeros(0, dtype=bool)
+        self.published = np.zeros(0, dtype=np.int64)
+        self.live = np.zeros(0, dtype=bool)
+        self.lists = np.zeros(0, dtype=np.int32)
+        self.centroids = np.zeros((0, self.dimensions), dtype=np.float32)
+        self.trained_rows = 0
+        self._index()
+
+    def _index(self):
+        """Derive the id -> row map and the per-list row arrays."""
+        live_rows = np.flatnonzero(self.live)
+        self._row_of = dict(zip(self.ids[live_rows].tolist(), live_rows.tolist()))
+        if len(self.centroids):
+            order = live_rows[np.argsort(self.lists[live_rows], kind="stable")]
+            counts = np.bincount(self.lists[live_rows], minlength=len(self.centroids))
+            self._list_rows = np.split(order, np.cumsum(counts)[:-1])
+        else:
+            self._list_rows = []
+
+    def refresh(self):
+        """Reload if another process changed the index since the last load."""
+        try:
+            stat = os.stat(self.meta_path)
+        except FileNotFoundError:
+            if self._signature is not None:
+                self._signature = None
+                self._load_empty()
+            return
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if signature == self._signature:
+            return
+
+        with np.load(self.meta_path) as meta:
+            self.generation = int(meta["generation"])
+            self.ids = meta["ids"]
+            self.tiers = meta["tiers"]
+            self.retracted = meta["retracted"]
+            self.published = meta["published"]
+            self.live = meta["live"]
+            self.lists = meta["lists"]
+            self.centroids = meta["centroids"]
+            self.trained_rows = int(meta["trained_rows"])
+        if len(self.ids):
+            self.vectors = np.memmap(
+                self._vectors_path(self.generation), dtype="<f4", mode="r", shape=(len(self.ids), self.dimensions)
+            )
+        else:
+            self.vectors = np.zeros((0, self.dimensions), dtype=np.float32)
+        self._index()
+        self._signature = signature
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._row_of)
+
+    def __contains__(self, item_id: int) -> bool:
+        self.refresh()
+        return item_id in self._row_of
+
+    def indexed_ids(self) -> set[int]:
+        """Ids with a live vector."""
+        self.refresh()
+        return set(self._row_of)
+
+    def get(self, item_id: int) -> Optional[List[float]]:
+        """Stored (normalized) vector for an id, or None."""
+        self.refresh()
+        row = self._row_of.get(item_id)
+        return None if row is None else self.vectors[row].tolist()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _write_lock(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self.refresh()
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _write_meta(self, **arrays):
+        """Atomically replace the metadata (the commit point of every write)."""
+        fields = {
+            "generation": self.generation,
+            "ids": self.ids,
+            "tiers": self.tiers,
+            "retracted": self.retracted,
+            "published": self.published,
+            "live": self.live,
+            "lists": self.lists,
+            "centroids": self.centroids,
+            "trained_rows": self.trained_rows,
+        }
+        fields.update(arrays)
+        tmp_path = self.meta_path.with_name(f"{self.meta_path.name}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **fields)
+        os.replace(tmp_path, self.meta_path)
+        self._signature = None
+        self.refresh()
+
+    def _assign(self, vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        if not len(centroids):
+            return np.full(len(vectors), -1, dtype=np.int32)
+        return np.argmax(vectors @ centroids.T, axis=1).astype(np.int32)
+
+    def upsert(
+        self,
+        ids: Sequence[int],
+        vectors: Sequence[Sequence[float]],
+        tiers: Optional[Sequence[Optional[str]]] = None,
+        retracted: Optional[Sequence[bool]] = None,
+        published_at: Optional[Sequence] = None,
+    ) -> int:
+        """
+        Add or replace vectors.
+
+        Args:
+            ids: Item ids (a repeated id keeps its last vector)
+            vectors: One vector per id
+            tiers: Evidence tier per id ("A"-"D" or None)
+            retracted: Retracted flag per id
+            published_at: Publication datetime per id (or None)
+
+        Returns:
+            Number of vectors written
+        """
+        count = len(ids)
+        if not count:
+            return 0
+        tiers = tiers if tiers is not None else [None] * count
+        retracted = retracted if retracted is not None else [False] * count
+        published_at = published_at if published_at is not None else [None] * count
+
+        # Last occurrence of each id wins
+        positions = sorted({item_id: position for position, item_id in enumerate(ids)}.values())
+        block = normalize_rows(np.asarray([vectors[p] for p in positions], dtype=np.float32).reshape(-1, self.dimensions))
+        new_ids = np.asarray([ids[p] for p in positions], dtype=np.int64)
+
+        with self._write_lock():
+            rows = len(self.ids)
+            path = self._vectors_path(self.generation)
+            with open(path, "ab") as f:
+                # Drop rows of an interrupted write that never reached the metadata
+                f.truncate(rows * self.dimensions * 4)
+                f.write(block.astype("<f4").tobytes())
+
+            live = self.live.copy()
+            live[[self._row_of[i] for i in new_ids.tolist() if i in self._row_of]] = False
+            self._write_meta(
+                ids=np.concatenate([self.ids, new_ids]),
+                tiers=np.concatenate([self.tiers, [TIERS.index(tiers[p]) + 1 if tiers[p] in TIERS else 0 for p in positions]]).astype(np.uint8),
+                retracted=np.concatenate([self.retracted, [bool(retracted[p]) for p in positions]]).astype(bool),
+                published=np.concatenate([self.published, [to_epoch(published_at[p]) for p in positions]]).astype(np.int64),
+                live=np.concatenate([live, np.ones(len(positions), dtype=bool)]),
+                lists=np.concatenate([self.lists, self._assign(block, self.centroids)]),
+            )
+        return len(positions)
+
+    def set_retracted(self, ids: Sequence[int], retracted: bool = True) -> int:
+        """Flag items as retracted (or not). Returns the number of indexed ids updated."""
+        with self._write_lock():
+            rows = [self._row_of[i] for i in ids if i in self._row_of]
+            if rows:
+                flags = self.retracted.copy()
+                flags[rows] = retracted
+                self._write_meta(retracted=flags)
+        return len(rows)
+
+    def remove(self, ids: Sequence[int]) -> int:
+        """Drop items from search. Returns the number of indexed ids removed."""
+        with self._write_lock():
+            rows = [self._row_of[i] for i in ids if i in self._row_of]
+            if rows:
+                live = self.live.copy()
+                live[rows] = False
+                self._write_meta(live=live)
+        return len(rows)
+
+    def needs_rebuild(self) -> bool:
+        """Whether build() would compact dead rows or (re)train the IVF lists."""
+        self.refresh()
+        total, live = len(self.ids), len(self._row_of)
+        if total and (total - live) / total > REBUILD_DEAD_FRACTION:
+            return True
+        if live < IVF_MIN_VECTORS:
+            return len(self.centroids) > 0
+        return not len(self.centroids) or live > REBUILD_GROWTH * self.trained_rows
+
+    def build(self, nlist: Optional[int] = None, seed: int = 0) -> dict:
+        """
+        Compact dead rows into a new generation and retrain the IVF lists.
+
+        Args:
+            nlist: Number of IVF lists (defaults to sqrt(live rows))
+            seed: k-means seed
+
+        Returns:
+            {"rows", "lists", "generation"}
+        """
+        with self._write_lock():
+            keep = np.flatnonzero(self.live)
+            vectors = np.asarray(self.vectors[keep], dtype=np.float32)
+            if len(keep) >= IVF_MIN_VECTORS:
+                centroids = train_centroids(vectors, nlist or int(round(np.sqrt(len(keep)))), seed)
+            else:
+                centroids = np.zeros((0, self.dimensions), dtype=np.float32)
+
+            old_path = self._vectors_path(self.generation)
+            self.generation += 1
+            with open(self._vectors_path(self.generation), "wb") as f:
+                f.write(vectors.astype("<f4").tobytes())
+            self._write_meta(
+                ids=self.ids[keep],
+                tiers=self.tiers[keep],
+                retracted=self.retracted[keep],
+                published=self.published[keep],
+                live=np.ones(len(keep), dtype=bool),
+                lists=self._assign(vectors, centroids),
+                centroids=centroids,
+                trained_rows=len(keep) if len(centroids) else 0,
+            )
+            # Readers still mapping the old generation keep their (unlinked) copy
+            old_path.unlink(missing_ok=True)
+        return {"rows": len(keep), "lists": len(centroids), "generation": self.generation}
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _filter_mask(self, tiers, include_retracted, start, end) -> np.ndarray:
+        mask = self.live.copy()
+        if tiers:
+            mask &= np.isin(self.tiers, [TIERS.index(tier) + 1 for tier in tiers])
+        if not include_retracted:
+            mask &= ~self.retracted
+        if start is not None:
+            mask &= self.published >= to_epoch(start)
+        if end is not None:
+            mask &= (self.published != NO_DATE) & (self.published <= to_epoch(end))
+        return mask
+
+    def search(
+        self,
+        query: Sequence[float],
+        k: int = 10,
+        tiers: Optional[Sequence[str]] = None,
+        include_retracted: bool = False,
+        start: date | datetime | None = None,
+        end: date | datetime | None = None,
+        nprobe: int = DEFAULT_NPROBE,
+        exact: bool = False,
+    ) -> List[Tuple[int, float]]:
+        """
+        Top-k items by cosine similarity.
+
+        Args:
+            query: Query embedding
+            k: Number of results
+            tiers: Only these evidence tiers
+            include_retracted: Include retracted items
+            start: Only items published at or after this
+            end: Only items published at or before this
+            nprobe: IVF lists to scan (more = better recall, slower)
+            exact: Score every matching row (brute force)
+
+        Returns:
+            List of (id, similarity), best first
+        """
+        self.refresh()
+        if not self._row_of or k <= 0:
+            return []
+        q = normalize_rows(np.asarray(query, dtype=np.float32).reshape(1, -1))[0]
+        mask = self._filter_mask(tiers, include_retracted, start, end)
+        selected = int(mask.sum())
+        if not selected:
+            return []
+
+        candidates = None
+        if not exact and len(self.centroids):
+            order = np.argsort(-(self.centroids @ q))
+            probes = min(nprobe, len(order))
+            while True:
+                rows = np.concatenate([self._list_rows[i] for i in order[:probes]])
+                # A selective filter is cheaper (and exact) to scan directly
+                if selected <= len(rows):
+                    break
+                candidates = rows[mask[rows]]
+                if len(candidates) >= k or probes == len(order):
+                    break
+                probes = min(probes * 2, len(order))
+                candidates = None
+
+        if candidates is None:
+            if selected == len(self.ids):
+                scores = np.asarray(self.vectors @ q)
+                candidates = np.arange(len(self.ids))
+            else:
+                candidates = np.flatnonzero(mask)
+                scores = np.asarray(self.vectors[candidates] @ q)
+        else:
+            scores = np.asarray(self.vectors[candidates] @ q)
+
+        top = min(k, len(candidates))
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [(int(self.ids[candidates[i]]), float(scores[i])) for i in best]
+
+
+event_index = VectorIndex("events")
+signpost_index = VectorIndex("signposts")
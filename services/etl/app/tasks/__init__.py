@@ -5,6 +5,7 @@ from app.tasks.extract_claims import *  # noqa: F401, F403
 from app.tasks.fetch_feeds import *  # noqa: F401, F403
 from app.tasks.fetch_gpqa import *  # noqa: F401, F403
 from app.tasks.fetch_hle import *  # noqa: F401, F403
+from app.tasks.fetch_leaderboards import *  # noqa: F401, F403
 from app.tasks.fetch_osworld import *  # noqa: F401, F403
 from app.tasks.fetch_swebench import *  # noqa: F401, F403
 from app.tasks.fetch_webarena import *  # noqa: F401, F403
@@ -2,7 +2,7 @@
 Generate LLM-powered event analysis (Phase 1).
 
 Priority: Background (12h schedule)
-Sources: A/B tier events without analysis
+Sources: A/B tier events without analysis (one per near-duplicate story cluster)
 LLM: OpenAI gpt-4o-mini (cost-effective)
 
 Prompt Version: v1 (2025-10-20)
@@ -36,6 +36,7 @@ from datetime import UTC, datetime, timedelta
 
 import openai
 from celery import shared_task
+from sqlalchemy import or_
 
 from app.config import settings
 from app.database import SessionLocal
@@ -292,6 +293,14 @@ def generate_event_analysis_task():
         # Subquery: events with existing analysis
         analyzed_event_ids = db.query(EventAnalysis.event_id).distinct()
 
+        # Subquery: story clusters already analyzed (near-duplicates from other outlets)
+        analyzed_cluster_ids = (
+            db.query(Event.story_cluster_id)
+            .join(EventAnalysis, EventAnalysis.event_id == Event.id)
+            .filter(Event.story_cluster_id.isnot(None))
+            .distinct()
+        )
+
         # Query: A/B tier events without analysis
         events_to_analyze = (
             db.query(Event)
@@ -299,6 +308,7 @@ def generate_event_analysis_task():
                 Event.evidence_tier.in_(["A", "B"]),
                 Event.published_at >= cutoff_date,
                 Event.id.notin_(analyzed_event_ids),
+                or_(Event.story_cluster_id.is_(None), Event.story_cluster_id.notin_(analyzed_cluster_ids)),
             )
             .order_by(Event.published_at.desc())
             .limit(BATCH_SIZE)
@@ -307,7 +317,15 @@ def generate_event_analysis_task():
 
         print(f"📊 Found {len(events_to_analyze)} A/B tier events to analyze (last {LOOKBACK_DAYS} days)")
 
+        analyzed_clusters = set()
         for event in events_to_analyze:
+            # One analysis per story: skip near-duplicates of an event analyzed this run
+            if event.story_cluster_id is not None:
+                if event.story_cluster_id in analyzed_clusters:
+                    stats["skipped"] += 1
+                    continue
+                analyzed_clusters.add(event.story_cluster_id)
+
             # Re-check budget before each event (in case we crossed threshold)
             budget = check_budget()
             if budget["blocked"]:
@@ -6,14 +6,14 @@ from pathlib import Path
 
 from celery import shared_task
 from playwright.async_api import TimeoutError as PlaywrightTimeout
-from playwright.async_api import async_playwright
 
 from app.database import SessionLocal
 from app.models import Claim, ClaimSignpost, Signpost, Source
-from app.utils import check_robots_txt, get_user_agent, should_scrape_real
+from app.utils import should_scrape_real
+from app.utils.scraper_runtime import BrowserPool, fetch_page, parse_tables
 
 
-async def fetch_gpqa_leaderboard() -> list[dict] | None:
+async def fetch_gpqa_leaderboard(pool: BrowserPool | None = None) -> list[dict] | None:
     """
     Fetch GPQA-Diamond leaderboard from Artificial Analysis.
 
@@ -33,107 +33,17 @@ async def fetch_gpqa_leaderboard() -> list[dict] | None:
             # In production, parse the cached HTML here
             return []
 
-    # Check robots.txt
-    if not check_robots_txt(url):
-        print(f"❌ Scraping disallowed by robots.txt: {url}")
-        return None
-
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-
-            # Set User-Agent
-            await page.set_extra_http_headers({"User-Agent": get_user_agent()})
-
-            # Navigate to GPQA-Diamond evaluation page
-            await page.goto(url, timeout=30000)
-            await page.wait_for_load_state("networkidle", timeout=15000)
-
-            # Cache HTML snapshot
-            cache_dir = Path(__file__).parent.parent.parent.parent.parent / "infra" / "cache"
-            cache_dir.mkdir(parents=True, exist_ok=True)
-
-            timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
-            cache_file = cache_dir / f"gpqa_{timestamp}.html"
-
-            html = await page.content()
-            with open(cache_file, "w", encoding="utf-8") as f:
-                f.write(html)
-
-            print(f"✓ Cached HTML to {cache_file}")
-
-            # Parse leaderboard
-            results = []
-
-            # Look for table or card-based layout
-            # Artificial Analysis uses a custom layout, try multiple strategies
-
-            # Strategy 1: Look for table
-            tables = page.locator('table')
-            table_count = await tables.count()
-            print(f"Found {table_count} tables")
-
-            if table_count > 0:
-                table = tables.first
-                rows = table.locator('tbody tr, tr')
-                row_count = await rows.count()
-                print(f"Table has {row_count} rows")
-
-                for i in range(min(row_count, 15)):  # Top 15 models
-                    row = rows.nth(i)
-                    cells = row.locator('td, th')
-                    cell_count = await cells.count()
-
-                    if cell_count >= 2:
-                        model_name = await cells.nth(0).text_content()
-                        score_text = await cells.nth(1).text_content()
-
-                        try:
-                            # Extract percentage (e.g., "75.3%" -> 75.3 or "0.753" -> 75.3)
-                            score_clean = score_text.strip().replace('%', '')
-                            score = float(score_clean)
-
-                            # Convert to percentage if decimal
-                            if score < 1.0:
-                                score = score * 100
-
-                            # Check if this entry has a paper link (makes it A-tier)
-                            row_html = await row.inner_html()
-                            has_paper_link = 'arxiv.org' in row_html or 'paper' in row_html.lower()
-                            credibility = 'A' if has_paper_link else 'B'
-
-                            results.append({
-                                'model_name': model_name.strip(),
-                                'accuracy': score,
-                                'metric_name': 'Accuracy',
-                                'date': datetime.now(UTC),
-                                'credibility': credibility,
-                                'has_paper': has_paper_link,
-                            })
-                            print(f"  ✓ Parsed: {model_name.strip()} = {score}% (tier {credibility})")
-                        except (ValueError, AttributeError) as e:
-                            print(f"  ⚠️  Could not parse score from '{score_text}': {e}")
-
-            # Strategy 2: Look for divs/cards (if table parsing failed)
-            if not results:
-                print("⚠️  Table parsing yielded no results, trying card layout...")
-                cards = page.locator('[data-model], .model-card, div[class*="model"]')
-                card_count = await cards.count()
-                print(f"Found {card_count} potential model cards")
-
-                # This would need custom parsing based on actual HTML structure
-                # For now, log a warning
-                if card_count > 0:
-                    print("⚠️  Card-based layout detected but parser not implemented")
-
-            await browser.close()
-
-            if not results:
-                print("⚠️  No results parsed - HTML structure may have changed")
-                return None
-
-            return results
+        page = await fetch_page(url, "gpqa", pool)
+        if page is None:
+            return None
+        results = parse_gpqa_html(page["html"])
+
+        if not results:
+            print("⚠️  No results parsed - HTML structure may have changed")
+            return None
+
+        return results
 
     except PlaywrightTimeout as e:
         print(f"❌ Timeout fetching GPQA: {e}")
@@ -143,6 +53,60 @@ async def fetch_gpqa_leaderboard() -> list[dict] | None:
         return None
 
 
+def parse_gpqa_html(html: str) -> list[dict]:
+    """Top 15 entries of the first leaderboard table."""
+    results = []
+
+    # Artificial Analysis uses a custom layout; only the table layout is parsed
+    tables = parse_tables(html)
+    print(f"Found {len(tables)} tables")
+
+    if tables:
+        rows = tables[0]
+        print(f"Table has {len(rows)} rows")
+
+        for row in rows[:15]:  # Top 15 models
+            cells = row["cells"]
+            if len(cells) < 2:
+                continue
+            model_name, score_text = cells[0], cells[1]
+
+            try:
+                # Extract percentage (e.g., "75.3%" -> 75.3 or "0.753" -> 75.3)
+                score_clean = score_text.strip().replace('%', '')
+                score = float(score_clean)
+            except ValueError as e:
+                print(f"  ⚠️  Could not parse score from '{score_text}': {e}")
+                continue
+
+            # Convert to percentage if decimal
+            if score < 1.0:
+                score = score * 100
+
+            # Check if this entry has a paper link (makes it A-tier)
+            has_paper_link = (
+                any('arxiv.org' in link or 'paper' in link.lower() for link in row["links"])
+                or 'paper' in row["text"].lower()
+            )
+            credibility = 'A' if has_paper_link else 'B'
+
+            results.append({
+                'model_name': model_name.strip(),
+                'accuracy': score,
+                'metric_name': 'Accuracy',
+                'date': datetime.now(UTC),
+                'credibility': credibility,
+                'has_paper': has_paper_link,
+            })
+            print(f"  ✓ Parsed: {model_name.strip()} = {score}% (tier {credibility})")
+
+    if not results:
+        # Card-based layouts would need custom parsing based on actual HTML structure
+        print("⚠️  Table parsing yielded no results (card layout parser not implemented)")
+
+    return results
+
+
 def create_or_update_claim(db, source: Source, data: dict) -> Claim | None:
     """Create or update a claim from GPQA data."""
 
@@ -178,19 +142,11 @@ def create_or_update_claim(db, source: Source, data: dict) -> Claim | None:
     return claim
 
 
-@shared_task(bind=True, name='fetch_gpqa')
-def fetch_gpqa(self):
-    """
-    Celery task to fetch GPQA-Diamond leaderboard data.
-
-    Scrapes artificialanalysis.ai for GPQA-Diamond accuracy scores.
-    Creates claims with tier B by default (leaderboard), A if backed by paper.
-
-    Note: B-tier evidence shows as "provisional" in UI and does NOT move main gauges.
-    """
-    print("\n" + "="*60)
-    print("🌐 Starting GPQA-Diamond leaderboard fetch")
-    print("="*60)
+def store_gpqa_results(results: list[dict] | None) -> dict:
+    """Store fetched GPQA-Diamond entries as claims (task result dict)."""
+    if not results:
+        print("⚠️  No results to process")
+        return {"status": "no_data", "claims_created": 0}
 
     db = SessionLocal()
 
@@ -212,14 +168,6 @@ def fetch_gpqa(self):
         else:
             print(f"✓ Using existing source ID {source.id}")
 
-        # Fetch leaderboard data
-        loop = asyncio.get_event_loop()
-        results = loop.run_until_complete(fetch_gpqa_leaderboard())
-
-        if not results:
-            print("⚠️  No results to process")
-            return {"status": "no_data", "claims_created": 0}
-
         print(f"\n📊 Processing {len(results)} results...")
 
         claims_created = 0
@@ -305,6 +253,23 @@ def fetch_gpqa(self):
         db.close()
 
 
+@shared_task(bind=True, name='fetch_gpqa')
+def fetch_gpqa(self):
+    """
+    Celery task to fetch GPQA-Diamond leaderboard data.
+
+    Scrapes artificialanalysis.ai for GPQA-Diamond accuracy scores.
+    Creates claims with tier B by default (leaderboard), A if backed by paper.
+
+    Note: B-tier evidence shows as "provisional" in UI and does NOT move main gauges.
+    """
+    print("\n" + "="*60)
+    print("🌐 Starting GPQA-Diamond leaderboard fetch")
+    print("="*60)
+
+    return store_gpqa_results(asyncio.run(fetch_gpqa_leaderboard()))
+
+
 if __name__ == "__main__":
     # For testing
     fetch_gpqa()
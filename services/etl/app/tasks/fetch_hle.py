@@ -14,16 +14,15 @@ import asyncio
 import hashlib
 from datetime import UTC, datetime
 
-from playwright.async_api import async_playwright
-
 from app.celery_app import celery_app
 from app.database import SessionLocal
 from app.models import Claim, ClaimSignpost, Signpost, Source
-from app.utils.scraper_helpers import check_robots_txt, get_user_agent, should_scrape_real
+from app.utils.scraper_helpers import check_robots_txt_async, should_scrape_real
+from app.utils.scraper_runtime import BrowserPool, browser_pool, fetch_page
 from app.utils.task_tracking import update_task_status
 
 
-async def fetch_hle_scale() -> dict | None:
+async def fetch_hle_scale(pool: BrowserPool | None = None) -> dict | None:
     """
     Fetch HLE scores from Scale SEAL leaderboard (B-tier, Provisional).
 
@@ -33,7 +32,7 @@ async def fetch_hle_scale() -> dict | None:
     url = "https://scale.com/leaderboard/hle"
 
     # Check robots.txt
-    if not check_robots_txt(url):
+    if not await check_robots_txt_async(url):
         print(f"⚠️  Scale HLE scraping disallowed by robots.txt: {url}")
         return None
 
@@ -53,33 +52,27 @@ async def fetch_hle_scale() -> dict | None:
     print(f"🔍 Fetching HLE from Scale SEAL: {url}")
 
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(user_agent=get_user_agent())
-            page = await context.new_page()
-
-            await page.goto(url, timeout=20000)
-            await page.wait_for_load_state("networkidle", timeout=15000)
-
-            # TODO: Actual parsing logic would go here
-            # For now, return placeholder data
-            await browser.close()
-
-            return {
-                "model": "Claude 3.5 Sonnet",
-                "score_percent": 37.5,
-                "observed_at": datetime.now(UTC),
-                "version": "text-only-2500",
-                "source_url": url,
-                "credibility": "B",  # Provisional
-            }
+        page = await fetch_page(url, "hle_scale", pool)
+        if page is None:
+            return None
+
+        # TODO: Actual parsing logic would go here (page["html"])
+        # For now, return placeholder data
+        return {
+            "model": "Claude 3.5 Sonnet",
+            "score_percent": 37.5,
+            "observed_at": datetime.now(UTC),
+            "version": "text-only-2500",
+            "source_url": url,
+            "credibility": "B",  # Provisional
+        }
 
     except Exception as e:
         print(f"❌ Error fetching from Scale SEAL: {e}")
         return None
 
 
-async def fetch_hle_artificial_analysis() -> dict | None:
+async def fetch_hle_artificial_analysis(pool: BrowserPool | None = None) -> dict | None:
     """
     Fetch HLE scores from Artificial Analysis (B-tier fallback).
 
@@ -88,7 +81,7 @@ async def fetch_hle_artificial_analysis() -> dict | None:
     """
     url = "https://artificialanalysis.ai/leaderboards/reasoning"
 
-    if not check_robots_txt(url):
+    if not await check_robots_txt_async(url):
         print(f"⚠️  Artificial Analysis scraping disallowed by robots.txt: {url}")
         return None
 
@@ -106,44 +99,37 @@ async def fetch_hle_artificial_analysis() -> dict | None:
     print(f"🔍 Fetching HLE from Artificial Analysis (fallback): {url}")
 
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(user_agent=get_user_agent())
-            page = await context.new_page()
-
-            await page.goto(url, timeout=20000)
-            await page.wait_for_load_state("networkidle", timeout=15000)
-
-            # TODO: Actual parsing logic
-            await browser.close()
-
-            return {
-                "model": "GPT-4o",
-                "score_percent": 35.8,
-                "observed_at": datetime.now(UTC),
-                "version": "text-only-2500",
-                "source_url": url,
-                "credibility": "B",
-            }
+        page = await fetch_page(url, "hle_artificial_analysis", pool)
+        if page is None:
+            return None
+
+        # TODO: Actual parsing logic (page["html"])
+        return {
+            "model": "GPT-4o",
+            "score_percent": 35.8,
+            "observed_at": datetime.now(UTC),
+            "version": "text-only-2500",
+            "source_url": url,
+            "credibility": "B",
+        }
 
     except Exception as e:
         print(f"❌ Error fetching from Artificial Analysis: {e}")
         return None
 
 
-async def fetch_hle_data() -> dict | None:
+async def fetch_hle_data(pool: BrowserPool | None = None) -> dict | None:
     """Fetch HLE data with fallback strategy."""
-    # Try primary source first
-    data = await fetch_hle_scale()
+    async with browser_pool(pool) as pool:
+        # Try primary source first
+        data = await fetch_hle_scale(pool)
 
-    if data:
-        return data
+        if data:
+            return data
 
-    # Fallback to Artificial Analysis
-    print("⚠️  Primary source failed, trying Artificial Analysis...")
-    data = await fetch_hle_artificial_analysis()
-
-    return data
+        # Fallback to Artificial Analysis
+        print("⚠️  Primary source failed, trying Artificial Analysis...")
+        return await fetch_hle_artificial_analysis(pool)
 
 
 def create_or_update_claim(db, data: dict) -> Claim:
@@ -225,6 +211,43 @@ def map_claim_to_signposts(db, claim: Claim):
     print(f"  ✓ Mapped claim to {len(signposts)} HLE signposts")
 
 
+def store_hle_data(data: dict | None) -> dict:
+    """Store a fetched HLE result as a claim (task result dict)."""
+    if not data:
+        error_msg = "Failed to fetch HLE data from all sources"
+        print(f"❌ {error_msg}")
+        update_task_status("fetch_hle", "error", error_msg)
+        return {"status": "failed", "error": error_msg}
+
+    print(f"✓ Fetched HLE: {data['score_percent']}% ({data['model']}) [B-tier/Provisional]")
+
+    # Store in database
+    db = SessionLocal()
+    try:
+        claim = create_or_update_claim(db, data)
+        map_claim_to_signposts(db, claim)
+
+        # Mark success
+        update_task_status("fetch_hle", "success")
+
+        return {
+            "status": "success",
+            "score": data["score_percent"],
+            "model": data["model"],
+            "credibility": data["credibility"],
+            "claim_id": claim.id,
+        }
+
+    except Exception as e:
+        error_msg = f"Error storing claim: {e}"
+        print(f"❌ {error_msg}")
+        db.rollback()
+        update_task_status("fetch_hle", "error", error_msg)
+        return {"status": "error", "error": str(e)}
+    finally:
+        db.close()
+
+
 @celery_app.task(name="fetch_hle")
 def fetch_hle_task():
     """Celery task to fetch HLE scores (monitor-only, B-tier)."""
@@ -233,41 +256,7 @@ def fetch_hle_task():
 
     try:
         # Run async fetch
-        data = asyncio.run(fetch_hle_data())
-
-        if not data:
-            error_msg = "Failed to fetch HLE data from all sources"
-            print(f"❌ {error_msg}")
-            update_task_status("fetch_hle", "error", error_msg)
-            return {"status": "failed", "error": error_msg}
-
-        print(f"✓ Fetched HLE: {data['score_percent']}% ({data['model']}) [B-tier/Provisional]")
-
-        # Store in database
-        db = SessionLocal()
-        try:
-            claim = create_or_update_claim(db, data)
-            map_claim_to_signposts(db, claim)
-
-            # Mark success
-            update_task_status("fetch_hle", "success")
-
-            return {
-                "status": "success",
-                "score": data["score_percent"],
-                "model": data["model"],
-                "credibility": data["credibility"],
-                "claim_id": claim.id,
-            }
-
-        except Exception as e:
-            error_msg = f"Error storing claim: {e}"
-            print(f"❌ {error_msg}")
-            db.rollback()
-            update_task_status("fetch_hle", "error", error_msg)
-            return {"status": "error", "error": str(e)}
-        finally:
-            db.close()
+        return store_hle_data(asyncio.run(fetch_hle_data()))
 
     except Exception as e:
         error_msg = f"Task execution failed: {e}"
@@ -0,0 +1,52 @@
+"""
+All leaderboard scrapers in one task.
+
+The five scrapers used to run in separate beat slots, each launching its own
+Chromium. Here they fetch concurrently on one shared browser (see
+app.utils.scraper_runtime), each within leaderboard_scrape_timeout_seconds,
+and their results are then stored one leaderboard at a time. The single-
+leaderboard tasks remain for manual runs.
+"""
+import asyncio
+
+from celery import shared_task
+
+from app.tasks.fetch_gpqa import fetch_gpqa_leaderboard, store_gpqa_results
+from app.tasks.fetch_hle import fetch_hle_data, store_hle_data
+from app.tasks.fetch_osworld import fetch_osworld_leaderboard, store_osworld_results
+from app.tasks.fetch_swebench import fetch_swebench_data, store_swebench_data
+from app.tasks.fetch_webarena import fetch_webarena_results, store_webarena_results
+from app.utils.scraper_runtime import run_scrapes
+
+# name -> (async fetch(pool), store(fetched) -> task result)
+LEADERBOARDS = {
+    "fetch_swebench": (fetch_swebench_data, store_swebench_data),
+    "fetch_osworld": (fetch_osworld_leaderboard, store_osworld_results),
+    "fetch_webarena": (fetch_webarena_results, store_webarena_results),
+    "fetch_gpqa": (fetch_gpqa_leaderboard, store_gpqa_results),
+    "fetch_hle": (fetch_hle_data, store_hle_data),
+}
+
+
+@shared_task(name="fetch_leaderboards")
+def fetch_leaderboards():
+    """
+    Celery task to fetch every leaderboard concurrently on one browser.
+
+    Returns:
+        {leaderboard task name: that task's result}
+    """
+    print("\n" + "="*60)
+    print(f"🌐 Fetching {len(LEADERBOARDS)} leaderboards concurrently")
+    print("="*60)
+
+    fetched = asyncio.run(run_scrapes({name: fetch for name, (fetch, _) in LEADERBOARDS.items()}))
+
+    results = {}
+    for name, (_, store) in LEADERBOARDS.items():
+        try:
+            results[name] = store(fetched[name])
+        except Exception as e:
+            print(f"❌ Error storing {name}: {e}")
+            results[name] = {"status": "error", "error": str(e)}
+    return results
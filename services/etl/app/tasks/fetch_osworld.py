@@ -6,14 +6,14 @@ from pathlib import Path
 
 from celery import shared_task
 from playwright.async_api import TimeoutError as PlaywrightTimeout
-from playwright.async_api import async_playwright
 
 from app.database import SessionLocal
 from app.models import Claim, ClaimSignpost, Signpost, Source
-from app.utils import check_robots_txt, get_user_agent, should_scrape_real
+from app.utils import should_scrape_real
+from app.utils.scraper_runtime import BrowserPool, fetch_page, parse_tables
 
 
-async def fetch_osworld_leaderboard() -> list[dict] | None:
+async def fetch_osworld_leaderboard(pool: BrowserPool | None = None) -> list[dict] | None:
     """
     Fetch OSWorld leaderboard from os-world.github.io.
 
@@ -33,93 +33,17 @@ async def fetch_osworld_leaderboard() -> list[dict] | None:
             # For now, return empty to avoid errors
             return []
 
-    # Check robots.txt
-    if not check_robots_txt(url):
-        print(f"❌ Scraping disallowed by robots.txt: {url}")
-        return None
-
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-
-            # Set User-Agent
-            await page.set_extra_http_headers({"User-Agent": get_user_agent()})
-
-            # Navigate to OSWorld site
-            await page.goto(url, timeout=30000)
-            await page.wait_for_load_state("networkidle", timeout=15000)
-
-            # Cache HTML snapshot
-            cache_dir = Path(__file__).parent.parent.parent.parent.parent / "infra" / "cache"
-            cache_dir.mkdir(parents=True, exist_ok=True)
-
-            timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
-            cache_file = cache_dir / f"osworld_{timestamp}.html"
-
-            html = await page.content()
-            with open(cache_file, "w", encoding="utf-8") as f:
-                f.write(html)
-
-            print(f"✓ Cached HTML to {cache_file}")
-
-            # Parse leaderboard
-            # Look for table or list with model names and scores
-            results = []
-
-            # Try to find leaderboard section
-            # Strategy 1: Look for "leaderboard" or "results" heading
-            leaderboard_sections = await page.locator('h2, h3').all_text_contents()
-            print(f"Found sections: {leaderboard_sections[:5]}")
-
-            # Strategy 2: Look for tables with scores
-            tables = page.locator('table')
-            table_count = await tables.count()
-            print(f"Found {table_count} tables")
-
-            if table_count > 0:
-                # Parse first table (usually the main leaderboard)
-                table = tables.first
-                rows = table.locator('tbody tr')
-                row_count = await rows.count()
-                print(f"Table has {row_count} rows")
-
-                for i in range(min(row_count, 10)):  # Limit to top 10
-                    row = rows.nth(i)
-                    cells = row.locator('td')
-                    cell_count = await cells.count()
-
-                    if cell_count >= 2:
-                        model_name = await cells.nth(0).text_content()
-                        score_text = await cells.nth(1).text_content()
-
-                        # Extract percentage (e.g., "45.2%" -> 45.2)
-                        try:
-                            score = float(score_text.strip().replace('%', ''))
-
-                            # Check if this is OSWorld-Verified or regular OSWorld
-                            # Look for "verified" in row or nearby text
-                            row_text = await row.text_content()
-                            is_verified = 'verified' in row_text.lower()
-
-                            results.append({
-                                'model_name': model_name.strip(),
-                                'task_success_rate': score,
-                                'benchmark_version': 'verified' if is_verified else 'standard',
-                                'metric_name': 'Task Success Rate',
-                                'date': datetime.now(UTC),
-                            })
-                            print(f"  ✓ Parsed: {model_name.strip()} = {score}% ({'verified' if is_verified else 'standard'})")
-                        except (ValueError, AttributeError) as e:
-                            print(f"  ⚠️  Could not parse score from '{score_text}': {e}")
-
-            await browser.close()
-
-            if not results:
-                print("⚠️  No results parsed - HTML structure may have changed")
-                return None
-
-            return results
+        page = await fetch_page(url, "osworld", pool)
+        if page is None:
+            return None
+        results = parse_osworld_html(page["html"])
+
+        if not results:
+            print("⚠️  No results parsed - HTML structure may have changed")
+            return None
+
+        return results
 
     except PlaywrightTimeout as e:
         print(f"❌ Timeout fetching OSWorld: {e}")
@@ -129,6 +53,48 @@ async def fetch_osworld_leaderboard() -> list[dict] | None:
         return None
 
 
+def parse_osworld_html(html: str) -> list[dict]:
+    """Top 10 entries of the first leaderboard table."""
+    results = []
+
+    # Look for tables with scores (first table is usually the main leaderboard)
+    tables = parse_tables(html)
+    print(f"Found {len(tables)} tables")
+    if not tables:
+        return results
+
+    rows = [row for row in tables[0] if not row["header"]]
+    print(f"Table has {len(rows)} rows")
+
+    for row in rows[:10]:  # Limit to top 10
+        cells = row["cells"]
+        if len(cells) < 2:
+            continue
+        model_name, score_text = cells[0], cells[1]
+
+        # Extract percentage (e.g., "45.2%" -> 45.2)
+        try:
+            score = float(score_text.strip().replace('%', ''))
+        except ValueError as e:
+            print(f"  ⚠️  Could not parse score from '{score_text}': {e}")
+            continue
+
+        # Check if this is OSWorld-Verified or regular OSWorld
+        # Look for "verified" in row text
+        is_verified = 'verified' in row["text"].lower()
+
+        results.append({
+            'model_name': model_name.strip(),
+            'task_success_rate': score,
+            'benchmark_version': 'verified' if is_verified else 'standard',
+            'metric_name': 'Task Success Rate',
+            'date': datetime.now(UTC),
+        })
+        print(f"  ✓ Parsed: {model_name.strip()} = {score}% ({'verified' if is_verified else 'standard'})")
+
+    return results
+
+
 def create_or_update_claim(db, source: Source, data: dict) -> Claim | None:
     """Create or update a claim from OSWorld data."""
 
@@ -164,17 +130,11 @@ def create_or_update_claim(db, source: Source, data: dict) -> Claim | None:
     return claim
 
 
-@shared_task(bind=True, name='fetch_osworld')
-def fetch_osworld(self):
-    """
-    Celery task to fetch OSWorld leaderboard data.
-
-    Scrapes os-world.github.io for task success rates and creates claims.
-    Respects SCRAPE_REAL env var (defaults to false, uses cached data).
-    """
-    print("\n" + "="*60)
-    print("🌐 Starting OSWorld leaderboard fetch")
-    print("="*60)
+def store_osworld_results(results: list[dict] | None) -> dict:
+    """Store fetched OSWorld entries as claims (task result dict)."""
+    if not results:
+        print("⚠️  No results to process")
+        return {"status": "no_data", "claims_created": 0}
 
     db = SessionLocal()
 
@@ -196,14 +156,6 @@ def fetch_osworld(self):
         else:
             print(f"✓ Using existing source ID {source.id}")
 
-        # Fetch leaderboard data
-        loop = asyncio.get_event_loop()
-        results = loop.run_until_complete(fetch_osworld_leaderboard())
-
-        if not results:
-            print("⚠️  No results to process")
-            return {"status": "no_data", "claims_created": 0}
-
         print(f"\n📊 Processing {len(results)} results...")
 
         claims_created = 0
@@ -273,6 +225,21 @@ def fetch_osworld(self):
         db.close()
 
 
+@shared_task(bind=True, name='fetch_osworld')
+def fetch_osworld(self):
+    """
+    Celery task to fetch OSWorld leaderboard data.
+
+    Scrapes os-world.github.io for task success rates and creates claims.
+    Respects SCRAPE_REAL env var (defaults to false, uses cached data).
+    """
+    print("\n" + "="*60)
+    print("🌐 Starting OSWorld leaderboard fetch")
+    print("="*60)
+
+    return store_osworld_results(asyncio.run(fetch_osworld_leaderboard()))
+
+
 if __name__ == "__main__":
     # For testing
     fetch_osworld()
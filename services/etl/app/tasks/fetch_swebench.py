@@ -2,129 +2,80 @@
 import asyncio
 import hashlib
 from datetime import UTC, datetime
-from pathlib import Path
-
-from playwright.async_api import async_playwright
 
 from app.celery_app import celery_app
 from app.database import SessionLocal
 from app.models import Claim, ClaimSignpost, Signpost, Source
+from app.utils.scraper_runtime import BrowserPool, browser_pool, fetch_page, parse_tables
+
+
+def parse_swebench_html(html: str) -> dict | None:
+    """Top entry of the first leaderboard table ({"score", "model"}), or None."""
+    tables = parse_tables(html)
+    # First data row of the first table (typically the top performer)
+    first_row = next((row for row in tables[0] if not row["header"]), None) if tables else None
+    cells = first_row["cells"] if first_row else []
+
+    # Parse the score - typically in format like "65.0" or "65.0%"
+    score = None
+    for cell in cells:
+        # Try to find a percentage value
+        if '%' in cell or any(c.isdigit() for c in cell):
+            try:
+                score = float(cell.replace('%', '').strip())
+                break
+            except ValueError:
+                continue
+
+    if score is None:
+        return None
+    # First cell is usually the model name
+    return {"score": score, "model": cells[0].strip() or "Unknown"}
 
 
-async def fetch_swebench_primary() -> dict | None:
+async def fetch_swebench_primary(pool: BrowserPool | None = None) -> dict | None:
     """Fetch SWE-bench Verified score from primary source (swebench.com)."""
     print("🔍 Fetching SWE-bench Verified from swebench.com...")
 
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-
-            # Navigate to SWE-bench leaderboard
-            await page.goto("https://www.swebench.com/", timeout=30000)
-
-            # Wait for content to load
-            await page.wait_for_load_state("networkidle", timeout=15000)
-
-            # Cache HTML snapshot
-            cache_dir = Path(__file__).parent.parent.parent.parent.parent / "infra" / "cache"
-            cache_dir.mkdir(parents=True, exist_ok=True)
-
-            timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
-            cache_file = cache_dir / f"swebench_{timestamp}.html"
-
-            html = await page.content()
-            with open(cache_file, "w") as f:
-                f.write(html)
-
-            print(f"✓ Cached HTML to {cache_file}")
-
-            # Try to find "Verified" section - look for the verified leaderboard
-            # Strategy: Look for text containing "Verified" or "SWE-bench Verified"
-            page.locator('text=/verified/i').first
-
-            # Get the table or list near the verified section
-            # Look for the highest score in a table
-            table = page.locator('table').first
-
-            # Extract first row data (typically the top performer)
-            first_row = table.locator('tr').nth(1)  # Skip header
-            cells = await first_row.locator('td').all_text_contents() if await first_row.count() > 0 else []
-
-            # Parse the score - typically in format like "65.0" or "65.0%"
-            score = None
-            model_name = None
-
-            for cell in cells:
-                # Try to find a percentage value
-                if '%' in cell or any(c.isdigit() for c in cell):
-                    try:
-                        # Extract numeric value
-                        score_str = cell.replace('%', '').strip()
-                        score = float(score_str)
-                        break
-                    except ValueError:
-                        continue
-
-            # If we found cells, first one is usually the model name
-            if cells:
-                model_name = cells[0].strip() if cells else "Unknown"
-
-            await browser.close()
-
-            if score is not None:
-                return {
-                    "score": score,
-                    "model": model_name,
-                    "metric_name": "SWE-bench Verified",
-                    "source_url": "https://www.swebench.com/",
-                    "timestamp": datetime.now(UTC),
-                }
-
-            print("⚠️ Could not parse score from swebench.com")
-            return None
+        page = await fetch_page("https://www.swebench.com/", "swebench", pool)
+        parsed = parse_swebench_html(page["html"]) if page else None
+
+        if parsed is not None:
+            return {
+                **parsed,
+                "metric_name": "SWE-bench Verified",
+                "source_url": "https://www.swebench.com/",
+                "timestamp": datetime.now(UTC),
+            }
+
+        print("⚠️ Could not parse score from swebench.com")
+        return None
 
     except Exception as e:
         print(f"⚠️ Error fetching from swebench.com: {e}")
         return None
 
 
-async def fetch_swebench_fallback() -> dict | None:
+async def fetch_swebench_fallback(pool: BrowserPool | None = None) -> dict | None:
     """Fetch SWE-bench Verified from fallback source (Epoch AI)."""
     print("🔍 Fetching SWE-bench Verified from Epoch AI fallback...")
 
-    try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-
-            # Navigate to Epoch AI's SWE-bench page
-            await page.goto("https://epochai.org/mli/swebench", timeout=30000)
-            await page.wait_for_load_state("networkidle", timeout=15000)
-
-            # Look for verified results
-            # This is a placeholder - actual selectors would need to be determined
-            # by inspecting the Epoch AI page
+    # Epoch AI's SWE-bench page: selectors for verified results still need to be
+    # determined by inspecting the page, so don't spend a fetch on it yet
+    print("⚠️ Epoch AI fallback not fully implemented - needs page inspection")
+    return None
 
-            await browser.close()
 
-            # For now, return None as we'd need to inspect the actual page structure
-            print("⚠️ Epoch AI fallback not fully implemented - needs page inspection")
-            return None
-
-    except Exception as e:
-        print(f"⚠️ Error fetching from Epoch AI: {e}")
-        return None
-
-
-async def fetch_swebench_data() -> dict | None:
+async def fetch_swebench_data(pool: BrowserPool | None = None) -> dict | None:
     """Fetch SWE-bench Verified data with primary source and fallback."""
-    # Try primary source first
-    data = await fetch_swebench_primary()
+    async with browser_pool(pool) as pool:
+        # Try primary source first
+        data = await fetch_swebench_primary(pool)
 
-    if data is None:
-        # Fallback to Epoch AI
-        data = await fetch_swebench_fallback()
+        if data is None:
+            # Fallback to Epoch AI
+            data = await fetch_swebench_fallback(pool)
 
     return data
 
@@ -210,55 +161,60 @@ def map_claim_to_signposts(db, claim: Claim):
     print(f"✓ Mapped claim to {len(signposts)} signposts")
 
 
-@celery_app.task(name="app.tasks.fetch_swebench.fetch_swebench_verified")
-def fetch_swebench_verified():
-    """Celery task to fetch SWE-bench Verified scores."""
+def store_swebench_data(data: dict | None) -> dict:
+    """Store a fetched SWE-bench result as a claim (task result dict)."""
     from app.utils.task_tracking import update_task_status
 
-    print("📊 Starting SWE-bench Verified fetch task...")
+    if not data:
+        error_msg = "Failed to fetch SWE-bench data from all sources"
+        print(f"❌ {error_msg}")
+        update_task_status("fetch_swebench", "error", error_msg)
+        return {"status": "failed", "error": error_msg}
+
+    print(f"✓ Fetched SWE-bench Verified: {data['score']}% ({data['model']})")
 
+    # Store in database
+    db = SessionLocal()
     try:
-        # Run async fetch
-        data = asyncio.run(fetch_swebench_data())
+        claim = create_or_update_claim(db, data)
+        print(f"✓ Created claim ID {claim.id}")
 
-        if not data:
-            error_msg = "Failed to fetch SWE-bench data from all sources"
-            print(f"❌ {error_msg}")
-            update_task_status("fetch_swebench", "error", error_msg)
-            return {"status": "failed", "error": error_msg}
+        map_claim_to_signposts(db, claim)
 
-        print(f"✓ Fetched SWE-bench Verified: {data['score']}% ({data['model']})")
+        # Trigger snapshot recomputation
+        from app.tasks.snap_index import compute_daily_snapshot
+        compute_daily_snapshot()
 
-        # Store in database
-        db = SessionLocal()
-        try:
-            claim = create_or_update_claim(db, data)
-            print(f"✓ Created claim ID {claim.id}")
+        # Mark success
+        update_task_status("fetch_swebench", "success")
 
-            map_claim_to_signposts(db, claim)
+        return {
+            "status": "success",
+            "score": data["score"],
+            "model": data["model"],
+            "claim_id": claim.id,
+        }
 
-            # Trigger snapshot recomputation
-            from app.tasks.snap_index import compute_daily_snapshot
-            compute_daily_snapshot()
+    except Exception as e:
+        error_msg = f"Error storing claim: {e}"
+        print(f"❌ {error_msg}")
+        db.rollback()
+        update_task_status("fetch_swebench", "error", error_msg)
+        return {"status": "error", "error": str(e)}
+    finally:
+        db.close()
 
-            # Mark success
-            update_task_status("fetch_swebench", "success")
 
-            return {
-                "status": "success",
-                "score": data["score"],
-                "model": data["model"],
-                "claim_id": claim.id,
-            }
+@celery_app.task(name="app.tasks.fetch_swebench.fetch_swebench_verified")
+def fetch_swebench_verified():
+    """Celery task to fetch SWE-bench Verified scores."""
+    from app.utils.task_tracking import update_task_status
 
-        except Exception as e:
-            error_msg = f"Error storing claim: {e}"
-            print(f"❌ {error_msg}")
-            db.rollback()
-            update_task_status("fetch_swebench", "error", error_msg)
-            return {"status": "error", "error": str(e)}
-        finally:
-            db.close()
+    print("📊 Starting SWE-bench Verified fetch task...")
+
+    try:
+        # Run async fetch
+        return store_swebench_data(asyncio.run(fetch_swebench_data()))
 
     except Exception as e:
         error_msg = f"Task execution failed: {e}"
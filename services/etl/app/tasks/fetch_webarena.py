@@ -7,11 +7,11 @@ from pathlib import Path
 
 from celery import shared_task
 from playwright.async_api import TimeoutError as PlaywrightTimeout
-from playwright.async_api import async_playwright
 
 from app.database import SessionLocal
 from app.models import Claim, ClaimSignpost, Signpost, Source
-from app.utils import check_robots_txt, get_user_agent, should_scrape_real
+from app.utils import should_scrape_real
+from app.utils.scraper_runtime import BrowserPool, fetch_page, parse_tables
 
 
 def load_fixture() -> list[dict]:
@@ -29,7 +29,7 @@ def load_fixture() -> list[dict]:
     return data
 
 
-async def scrape_webarena_github() -> list[dict] | None:
+async def scrape_webarena_github(pool: BrowserPool | None = None) -> list[dict] | None:
     """
     Scrape WebArena leaderboard from GitHub repo (optional, if SCRAPE_REAL=true).
 
@@ -39,79 +39,12 @@ async def scrape_webarena_github() -> list[dict] | None:
     url = "https://github.com/web-arena-x/webarena"
     print(f"🔍 Scraping WebArena from {url}...")
 
-    # Check robots.txt
-    if not check_robots_txt(url):
-        print(f"❌ Scraping disallowed by robots.txt: {url}")
-        return None
-
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-
-            # Set User-Agent
-            await page.set_extra_http_headers({"User-Agent": get_user_agent()})
-
-            # Navigate to WebArena repo
-            await page.goto(url, timeout=30000)
-            await page.wait_for_load_state("networkidle", timeout=15000)
-
-            # Cache HTML
-            cache_dir = Path(__file__).parent.parent.parent.parent.parent / "infra" / "cache"
-            cache_dir.mkdir(parents=True, exist_ok=True)
-
-            timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
-            cache_file = cache_dir / f"webarena_github_{timestamp}.html"
-
-            html = await page.content()
-            with open(cache_file, "w", encoding="utf-8") as f:
-                f.write(html)
-
-            print(f"✓ Cached HTML to {cache_file}")
-
-            # Try to parse README for leaderboard table
-            # This is fragile and may need updates if repo structure changes
-            readme_section = page.locator('article.markdown-body')
-
-            # Look for tables
-            tables = readme_section.locator('table')
-            table_count = await tables.count()
-            print(f"Found {table_count} tables in README")
-
-            results = []
-
-            if table_count > 0:
-                # Try first table
-                table = tables.first
-                rows = table.locator('tbody tr')
-                row_count = await rows.count()
-
-                for i in range(min(row_count, 10)):
-                    row = rows.nth(i)
-                    cells = row.locator('td')
-                    cell_count = await cells.count()
-
-                    if cell_count >= 2:
-                        model_name = await cells.nth(0).text_content()
-                        score_text = await cells.nth(1).text_content()
-
-                        try:
-                            score = float(score_text.strip().replace('%', ''))
-
-                            results.append({
-                                'model_name': model_name.strip(),
-                                'task_success_rate': score,
-                                'benchmark': 'WebArena',
-                                'date': datetime.now(UTC),
-                                'source': 'GitHub repo',
-                                'credibility': 'B',  # GitHub repo = B-tier unless paper cited
-                            })
-                            print(f"  ✓ Parsed: {model_name.strip()} = {score}%")
-                        except (ValueError, AttributeError) as e:
-                            print(f"  ⚠️  Could not parse score: {e}")
-
-            await browser.close()
-            return results if results else None
+        page = await fetch_page(url, "webarena_github", pool)
+        if page is None:
+            return None
+        results = parse_webarena_html(page["html"])
+        return results if results else None
 
     except PlaywrightTimeout as e:
         print(f"❌ Timeout scraping GitHub: {e}")
@@ -121,6 +54,65 @@ async def scrape_webarena_github() -> list[dict] | None:
         return None
 
 
+def parse_webarena_html(html: str) -> list[dict]:
+    """Top 10 entries of the first table in the repo README."""
+    # Only tables inside the README (article.markdown-body) count
+    # This is fragile and may need updates if repo structure changes
+    readme_start = html.find("markdown-body")
+    tables = parse_tables(html[readme_start:] if readme_start != -1 else html)
+    print(f"Found {len(tables)} tables in README")
+
+    results = []
+    if not tables:
+        return results
+
+    # Try first table
+    rows = [row for row in tables[0] if not row["header"]]
+    for row in rows[:10]:
+        cells = row["cells"]
+        if len(cells) < 2:
+            continue
+        model_name, score_text = cells[0], cells[1]
+
+        try:
+            score = float(score_text.strip().replace('%', ''))
+        except ValueError as e:
+            print(f"  ⚠️  Could not parse score: {e}")
+            continue
+
+        results.append({
+            'model_name': model_name.strip(),
+            'task_success_rate': score,
+            'benchmark': 'WebArena',
+            'date': datetime.now(UTC),
+            'source': 'GitHub repo',
+            'credibility': 'B',  # GitHub repo = B-tier unless paper cited
+        })
+        print(f"  ✓ Parsed: {model_name.strip()} = {score}%")
+
+    return results
+
+
+async def fetch_webarena_results(pool: BrowserPool | None = None) -> list[dict]:
+    """
+    WebArena leaderboard entries: GitHub scrape if SCRAPE_REAL=true, else
+    (or if the scrape fails) the fixture.
+    """
+    # Decide on data source
+    if should_scrape_real():
+        print("⚠️  SCRAPE_REAL=true, attempting GitHub scrape...")
+        results = await scrape_webarena_github(pool)
+
+        if not results:
+            print("⚠️  GitHub scrape failed, falling back to fixture")
+            results = load_fixture()
+    else:
+        print("✓ Using fixture data (SCRAPE_REAL=false)")
+        results = load_fixture()
+
+    return results
+
+
 def create_or_update_claim(db, source: Source, data: dict) -> Claim | None:
     """Create or update a claim from WebArena data."""
 
@@ -162,40 +154,15 @@ def create_or_update_claim(db, source: Source, data: dict) -> Claim | None:
     return claim
 
 
-@shared_task(bind=True, name='fetch_webarena')
-def fetch_webarena(self):
-    """
-    Celery task to fetch WebArena/VisualWebArena leaderboard data.
-
-    Primary mode: Load from fixture (infra/fixtures/webarena_leaderboard.json)
-    Optional: Scrape GitHub repo if SCRAPE_REAL=true (fragile, use with caution)
-
-    Creates claims with tier B (lab blog/model card) or A (if paper cited).
-    """
-    print("\n" + "="*60)
-    print("🌐 Starting WebArena leaderboard fetch")
-    print("="*60)
+def store_webarena_results(results: list[dict] | None) -> dict:
+    """Store WebArena entries as claims (task result dict)."""
+    if not results:
+        print("⚠️  No results to process")
+        return {"status": "no_data", "claims_created": 0}
 
     db = SessionLocal()
 
     try:
-        # Decide on data source
-        if should_scrape_real():
-            print("⚠️  SCRAPE_REAL=true, attempting GitHub scrape...")
-            loop = asyncio.get_event_loop()
-            results = loop.run_until_complete(scrape_webarena_github())
-
-            if not results:
-                print("⚠️  GitHub scrape failed, falling back to fixture")
-                results = load_fixture()
-        else:
-            print("✓ Using fixture data (SCRAPE_REAL=false)")
-            results = load_fixture()
-
-        if not results:
-            print("⚠️  No results to process")
-            return {"status": "no_data", "claims_created": 0}
-
         print(f"\n📊 Processing {len(results)} results...")
 
         claims_created = 0
@@ -290,6 +257,23 @@ def fetch_webarena(self):
         db.close()
 
 
+@shared_task(bind=True, name='fetch_webarena')
+def fetch_webarena(self):
+    """
+    Celery task to fetch WebArena/VisualWebArena leaderboard data.
+
+    Primary mode: Load from fixture (infra/fixtures/webarena_leaderboard.json)
+    Optional: Scrape GitHub repo if SCRAPE_REAL=true (fragile, use with caution)
+
+    Creates claims with tier B (lab blog/model card) or A (if paper cited).
+    """
+    print("\n" + "="*60)
+    print("🌐 Starting WebArena leaderboard fetch")
+    print("="*60)
+
+    return store_webarena_results(asyncio.run(fetch_webarena_results()))
+
+
 if __name__ == "__main__":
     # For testing
     fetch_webarena()
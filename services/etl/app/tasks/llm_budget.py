@@ -10,6 +10,22 @@ BUDGET_DATE_KEY = "llm_spend_date"
 
 # Lazy initialization to prevent import-time crash
 _redis_client = None
+_reserve_script = None
+
+# Atomically reset on a new day, then add ARGV[1] only if it fits under ARGV[3].
+# KEYS: spend key, date key. ARGV: amount, today, daily limit. Returns 1 if reserved.
+RESERVE_SPEND_LUA = """
+if redis.call('GET', KEYS[2]) ~= ARGV[2] then
+    redis.call('SET', KEYS[1], '0.0')
+    redis.call('SET', KEYS[2], ARGV[2])
+end
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if current + tonumber(ARGV[1]) > tonumber(ARGV[3]) then
+    return 0
+end
+redis.call('INCRBYFLOAT', KEYS[1], ARGV[1])
+return 1
+"""
 
 
 def get_redis_client():
@@ -79,3 +95,46 @@ def get_remaining_budget() -> float:
     """Get remaining budget for today."""
     current = get_daily_spend()
     return max(0.0, settings.llm_budget_daily_usd - current)
+
+
+def reserve_spend(amount: float) -> bool:
+    """
+    Atomically reserve spend against today's budget before making a call.
+
+    Unlike can_spend() followed by add_spend(), the check and the increment
+    run as one Redis script, so concurrent workers can't overshoot the daily
+    limit. Release the reservation with release_spend() if the call fails.
+
+    Returns:
+        True if the amount was reserved (or budget tracking is disabled)
+    """
+    global _reserve_script
+    client = get_redis_client()
+    if not client:
+        return True
+
+    try:
+        if _reserve_script is None:
+            _reserve_script = client.register_script(RESERVE_SPEND_LUA)
+        today = datetime.utcnow().date().isoformat()
+        reserved = _reserve_script(
+            keys=[BUDGET_KEY, BUDGET_DATE_KEY],
+            args=[amount, today, settings.llm_budget_daily_usd],
+        )
+        return bool(reserved)
+    except Exception as e:
+        # Same policy as get_daily_spend(): a Redis error doesn't block processing
+        print(f"⚠️  Error reserving budget: {e}")
+        return True
+
+
+def release_spend(amount: float):
+    """Return a reservation made by reserve_spend() for a call that didn't complete."""
+    client = get_redis_client()
+    if not client:
+        return
+
+    try:
+        client.incrbyfloat(BUDGET_KEY, -amount)
+    except Exception as e:
+        print(f"⚠️  Error releasing budget: {e}")
@@ -4,6 +4,8 @@ Celery task to check B-tier corroboration with A-tier evidence.
 Scheduled to run daily to catch new A-tier evidence that corroborates
 existing B-tier provisional links within the 14-day window.
 """
+from datetime import datetime
+
 from celery import shared_task
 
 from app.database import SessionLocal
@@ -14,7 +16,7 @@ from app.utils.b_tier_corroboration import (
 
 
 @shared_task(name="check_b_tier_corroboration")
-def check_b_tier_corroboration_task():
+def check_b_tier_corroboration_task(since: str | None = None):
     """
     Check all B-tier provisional links for A-tier corroboration.
 
@@ -24,6 +26,9 @@ def check_b_tier_corroboration_task():
       - Set provisional=False
       - Boost confidence +0.1 (capped at 0.95)
 
+    Args:
+        since: Optional ISO timestamp; only links touched since then are checked
+
     Returns:
         Statistics dict with corroboration counts
     """
@@ -32,7 +37,7 @@ def check_b_tier_corroboration_task():
     db = SessionLocal()
 
     try:
-        stats = check_b_tier_corroboration(db)
+        stats = check_b_tier_corroboration(db, since=datetime.fromisoformat(since) if since else None)
 
         # Also report on uncorroborated B-tier links after 14 days
         uncorroborated = find_uncorroborated_b_tier_links(db, days_old=14)
@@ -7,6 +7,7 @@ from app.celery_app import celery_app
 from app.config import settings
 from app.database import SessionLocal
 from app.models import Event, EventSignpostLink, Signpost
+from app.services.signpost_values import mark_signposts_stale
 from app.tasks.llm_budget import add_spend, can_spend
 
 
@@ -147,7 +148,11 @@ def map_event_to_signposts(event_id: int):
             print(f"⚠️  No mappings generated for event {event.id}")
             return
 
-        # Clear existing mappings for this event
+        # Clear existing mappings for this event (bulk delete bypasses the ORM hooks)
+        mark_signposts_stale(db, [
+            row.signpost_id
+            for row in db.query(EventSignpostLink.signpost_id).filter(EventSignpostLink.event_id == event_id)
+        ])
         db.query(EventSignpostLink).filter(EventSignpostLink.event_id == event_id).delete()
 
         # Create new mappings
@@ -9,13 +9,14 @@ import json
 from datetime import UTC, datetime
 from pathlib import Path
 
-import feedparser
 from celery import shared_task
 
 from app.config import settings
 from app.database import SessionLocal
-from app.models import Event, IngestRun
+from app.models import IngestRun
 from app.tasks.healthchecks import ping_healthcheck_url
+from app.utils.event_writer import upsert_events
+from app.utils.feed_scheduler import any_feed_responded, fetch_feeds_sync, load_feed_validators, save_feed_validators
 from app.utils.fetcher import (
     compute_content_hash,
     compute_dedup_hash,
@@ -37,28 +38,40 @@ def load_fixture_data() -> list[dict]:
         return json.load(f)
 
 
-def fetch_live_arxiv(max_results: int = 50) -> list[dict]:
-    """
-    Fetch recent arXiv entries for target categories via Atom feed (Sprint 7.1).
-    
-    Rate limiting: Built into arXiv API (max 1 request per 3 seconds)
-    Robots.txt: Uses official export API endpoint
-    Categories: cs.AI, cs.CL, cs.LG, cs.CV
-    """
-    import time
-    # Sprint 7.1: Respect arXiv rate limits (3 second delay)
-    time.sleep(3.0)
-    
+def arxiv_feed_url(max_results: int = 50) -> str:
+    """arXiv export API query for the target categories, newest first."""
     # Use HTTPS to avoid 301 redirect
-    base = (
+    return (
         "https://export.arxiv.org/api/query?"
         "search_query=cat:cs.AI+OR+cat:cs.CL+OR+cat:cs.LG+OR+cat:cs.CV"
         "&sortBy=submittedDate&sortOrder=descending"
         f"&max_results={max_results}"
     )
-    feed = feedparser.parse(base)
+
+
+def fetch_live_arxiv(max_results: int = 50, validators: dict | None = None) -> list[dict] | None:
+    """
+    Fetch recent arXiv entries for target categories via Atom feed (Sprint 7.1).
+    
+    Rate limiting: Built into arXiv API (max 1 request per 3 seconds, enforced per host by the feed scheduler)
+    Robots.txt: Uses official export API endpoint
+    Categories: cs.AI, cs.CL, cs.LG, cs.CV
+
+    Args:
+        max_results: Number of entries to request
+        validators: Stored feed validators for conditional GET (see
+            app.utils.feed_scheduler); updated in place. None fetches in full.
+
+    Returns:
+        New entries (empty if the feed was unchanged), or None if it could not be fetched
+    """
+    url = arxiv_feed_url(max_results)
+    results = fetch_feeds_sync([url], validators)
+    if not any_feed_responded(results):
+        return None
+
     items: list[dict] = []
-    for entry in feed.entries:
+    for entry in results[url]["entries"]:
         title = entry.get("title", "").strip()
         summary = entry.get("summary", "").strip()
         link = entry.get("link")
@@ -127,68 +140,6 @@ def normalize_event_data(raw_data: dict) -> dict:
     }
 
 
-def create_or_update_event(db, event_data: dict) -> tuple[Event, bool]:
-    """
-    Idempotently create or update an event using dedup_hash, content_hash, or URL.
-
-    Phase A: Prioritize dedup_hash for robust deduplication.
-    
-    Security: Handles race conditions via UNIQUE constraint on dedup_hash.
-    If two workers try to insert simultaneously, one gets IntegrityError and retries.
-
-    Args:
-        db: Database session
-        event_data: Normalized event data dict
-
-    Returns:
-        Tuple of (event, is_new) where is_new is True if event was just created
-    """
-    from sqlalchemy.exc import IntegrityError
-    
-    dedup_hash = event_data.get("dedup_hash")
-    content_hash = event_data.get("content_hash")
-    source_url = event_data["source_url"]
-
-    # Check for duplicates by dedup_hash (Phase A: most robust)
-    existing = None
-    if dedup_hash:
-        existing = db.query(Event).filter(Event.dedup_hash == dedup_hash).first()
-
-    # Fallback to content_hash
-    if not existing and content_hash:
-        existing = db.query(Event).filter(Event.content_hash == content_hash).first()
-
-    # Fallback to URL
-    if not existing:
-        existing = db.query(Event).filter(Event.source_url == source_url).first()
-
-    if existing:
-        # Update existing event (e.g., if summary/title changed)
-        for key, value in event_data.items():
-            if value is not None:
-                setattr(existing, key, value)
-        return existing, False
-    else:
-        try:
-            new_event = Event(**event_data)
-            db.add(new_event)
-            db.flush()
-            return new_event, True
-        except IntegrityError:
-            # Race condition: Another worker inserted this event between our check and insert
-            # UNIQUE constraint on dedup_hash or source_url caught it
-            # Rollback and retry the query to get the existing event
-            db.rollback()
-            existing = db.query(Event).filter(Event.dedup_hash == dedup_hash).first()
-            if not existing:
-                existing = db.query(Event).filter(Event.source_url == source_url).first()
-            if existing:
-                return existing, False
-            else:
-                # Shouldn't happen, but re-raise if we still can't find it
-                raise
-
-
 @shared_task(name="ingest_arxiv")
 def ingest_arxiv_task():
     """
@@ -214,10 +165,12 @@ def ingest_arxiv_task():
 
     try:
         use_live = settings.scrape_real
+        validators = {}
 
         if use_live:
             print("🔵 Live mode: Fetching recent arXiv entries via Atom API")
-            raw_data = fetch_live_arxiv()
+            validators = load_feed_validators([arxiv_feed_url()])
+            raw_data = fetch_live_arxiv(validators=validators) or []
         else:
             print("🟢 Fixture mode: Loading arXiv fixtures")
             raw_data = load_fixture_data()
@@ -225,27 +178,25 @@ def ingest_arxiv_task():
 
         print(f"📄 Processing {len(raw_data)} arXiv papers...")
 
+        rows = []
         for item in raw_data:
             try:
                 # Normalize to event schema
-                event_data = normalize_event_data(item)
-
-                # Create or update event (with deduplication)
-                event, is_new = create_or_update_event(db, event_data)
-
-                if is_new:
-                    stats["inserted"] += 1
-                    print(f"  ✓ Inserted: {event.title[:60]}...")
-                else:
-                    stats["skipped"] += 1
-                    print(f"  ⊘ Skipped (duplicate): {event.title[:60]}...")
+                rows.append(normalize_event_data(item))
 
             except Exception as e:
                 stats["errors"] += 1
                 print(f"  ❌ Error processing item: {e}")
                 continue
 
+        # Write the whole feed as batched upserts
+        write_stats = upsert_events(db, rows)
+        for key in ("inserted", "updated", "errors"):
+            stats[key] += write_stats[key]
+
         db.commit()
+        # Only now may an unchanged feed be skipped with a 304 next run
+        save_feed_validators(validators)
 
         # Update ingest run
         run.finished_at = datetime.now(UTC)
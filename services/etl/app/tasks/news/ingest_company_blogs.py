@@ -11,14 +11,14 @@ from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from urllib.parse import urlparse
 
-import feedparser
 from celery import shared_task
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.config import settings
 from app.database import SessionLocal
-from app.models import Event, IngestRun
+from app.models import IngestRun
 from app.tasks.healthchecks import ping_healthcheck_url
+from app.utils.event_writer import upsert_events
+from app.utils.feed_scheduler import any_feed_responded, fetch_feeds_sync, load_feed_validators, save_feed_validators
 from app.utils.fetcher import compute_dedup_hash
 
 ALLOWED_PUBLISHERS = {
@@ -104,76 +104,81 @@ def generate_synthetic_blog_events(total: int) -> list[dict]:
     return items
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-def fetch_live_company_blogs(max_results: int = 150) -> list[dict]:
+BLOG_FEEDS = [
+    # Major AI Labs (Sprint 7.1 required)
+    "https://openai.com/blog/rss.xml",
+    "https://www.anthropic.com/news/rss.xml",
+    "https://deepmind.google/discover/feeds/blog.xml",
+    "https://ai.meta.com/blog/feed/",
+    "https://cohere.com/blog/rss.xml",
+    "https://mistral.ai/feed/",
+    # Additional Labs
+    "https://www.adept.ai/blog/rss.xml",  # Sprint 7.1: Added Adept
+    # Research Orgs
+    "https://www.microsoft.com/en-us/research/feed/",
+    "https://blog.research.google/feeds/posts/default",
+    # AI Safety/Alignment
+    "https://www.anthropic.com/research/rss.xml",
+    "https://openai.com/research/rss.xml",
+    # Open Source
+    "https://huggingface.co/blog/feed.xml",
+    # Compute/Infrastructure
+    "https://www.nvidia.com/en-us/about-nvidia/ai-computing/rss/",
+]
+
+
+def fetch_live_company_blogs(max_results: int = 150, validators: dict | None = None) -> list[dict] | None:
     """
     Fetch live company blog/news posts via RSS/Atom (Sprint 7.1).
     
-    Rate limiting: 3 second delay between requests (as per task requirements)
-    Robots.txt: All feeds use official RSS endpoints
+    Rate limiting: 3 second delay between requests to the same host; hosts are fetched concurrently
+    Robots.txt: All feeds use official RSS endpoints (checked by fetch_with_envelope)
     User-Agent: Identifies as AGI-Signpost-Tracker
+
+    Args:
+        max_results: Maximum entries per feed
+        validators: Stored feed validators for conditional GET (see
+            app.utils.feed_scheduler); updated in place. None fetches every feed in full.
+
+    Returns:
+        New posts (empty if every feed was unchanged), or None if no feed could be fetched
     """
-    import time
-    feeds = [
-        # Major AI Labs (Sprint 7.1 required)
-        "https://openai.com/blog/rss.xml",
-        "https://www.anthropic.com/news/rss.xml",
-        "https://deepmind.google/discover/feeds/blog.xml",
-        "https://ai.meta.com/blog/feed/",
-        "https://cohere.com/blog/rss.xml",
-        "https://mistral.ai/feed/",
-        # Additional Labs
-        "https://www.adept.ai/blog/rss.xml",  # Sprint 7.1: Added Adept
-        # Research Orgs
-        "https://www.microsoft.com/en-us/research/feed/",
-        "https://blog.research.google/feeds/posts/default",
-        # AI Safety/Alignment
-        "https://www.anthropic.com/research/rss.xml",
-        "https://openai.com/research/rss.xml",
-        # Open Source
-        "https://huggingface.co/blog/feed.xml",
-        # Compute/Infrastructure
-        "https://www.nvidia.com/en-us/about-nvidia/ai-computing/rss/",
-    ]
+    results = fetch_feeds_sync(BLOG_FEEDS, validators)
+    if not any_feed_responded(results):
+        return None
+
     items: list[dict] = []
-    for url in feeds:
-        try:
-            # Sprint 7.1: Rate limiting - 3 seconds between requests
-            time.sleep(3.0)
-            feed = feedparser.parse(url, agent="AGI-Signpost-Tracker/1.0 (+https://github.com/hankthevc/AGITracker)")
-            for entry in feed.entries[:max_results]:
-                title = entry.get("title", "").strip()
-                summary = entry.get("summary", "").strip()
-                link = entry.get("link")
-                published = entry.get("published") or entry.get("updated")
-                # Infer publisher from hostname
-                host = None
-                try:
-                    host = urlparse(link).hostname or ""
-                except Exception:
-                    host = ""
-                publisher = (
-                    "OpenAI" if "openai.com" in host else
-                    "Anthropic" if "anthropic.com" in host else
-                    "Google DeepMind" if ("deepmind.google" in host or "deepmind.com" in host) else
-                    "Meta AI" if ("ai.meta.com" in host or host.endswith("meta.com")) else
-                    "Cohere" if "cohere.com" in host else
-                    "Mistral" if "mistral.ai" in host else
-                    "xAI" if host.endswith("x.ai") else
-                    None
-                )
-                items.append(
-                    {
-                        "title": title,
-                        "summary": summary,
-                        "url": link,
-                        "publisher": publisher,
-                        "published_at": published,
-                    }
-                )
-        except Exception as e:
-            print(f"  ⚠️  Failed to fetch {url}: {e}")
-            continue
+    for url in BLOG_FEEDS:
+        for entry in results[url]["entries"][:max_results]:
+            title = entry.get("title", "").strip()
+            summary = entry.get("summary", "").strip()
+            link = entry.get("link")
+            published = entry.get("published") or entry.get("updated")
+            # Infer publisher from hostname
+            host = None
+            try:
+                host = urlparse(link).hostname or ""
+            except Exception:
+                host = ""
+            publisher = (
+                "OpenAI" if "openai.com" in host else
+                "Anthropic" if "anthropic.com" in host else
+                "Google DeepMind" if ("deepmind.google" in host or "deepmind.com" in host) else
+                "Meta AI" if ("ai.meta.com" in host or host.endswith("meta.com")) else
+                "Cohere" if "cohere.com" in host else
+                "Mistral" if "mistral.ai" in host else
+                "xAI" if host.endswith("x.ai") else
+                None
+            )
+            items.append(
+                {
+                    "title": title,
+                    "summary": summary,
+                    "url": link,
+                    "publisher": publisher,
+                    "published_at": published,
+                }
+            )
     return items
 
 
@@ -220,59 +225,6 @@ def normalize_event_data(raw_data: dict) -> dict:
     }
 
 
-def create_or_update_event(db, event_data: dict) -> tuple[Event, bool]:
-    """
-    Idempotently create or update an event using dedup_hash or URL for deduplication.
-
-    Phase A: Prioritize dedup_hash for robust deduplication.
-    
-    Security: Handles race conditions via UNIQUE constraint on dedup_hash.
-    If two workers try to insert simultaneously, one gets IntegrityError and retries.
-
-    Returns:
-        Tuple of (event, is_new) where is_new is True if event was just created
-    """
-    from sqlalchemy.exc import IntegrityError
-    
-    dedup_hash = event_data.get("dedup_hash")
-    source_url = event_data["source_url"]
-
-    # Check for duplicates by dedup_hash (Phase A: most robust)
-    existing = None
-    if dedup_hash:
-        existing = db.query(Event).filter(Event.dedup_hash == dedup_hash).first()
-
-    # Fallback to URL
-    if not existing:
-        existing = db.query(Event).filter(Event.source_url == source_url).first()
-
-    if existing:
-        # Update existing event
-        for key, value in event_data.items():
-            if value is not None:  # Only update non-null values
-                setattr(existing, key, value)
-        return existing, False
-    else:
-        try:
-            # Create new event
-            new_event = Event(**event_data)
-            db.add(new_event)
-            db.flush()
-            return new_event, True
-        except IntegrityError:
-            # Race condition: Another worker inserted between check and insert
-            # UNIQUE constraint on dedup_hash or source_url caught it
-            db.rollback()
-            existing = db.query(Event).filter(Event.dedup_hash == dedup_hash).first()
-            if not existing:
-                existing = db.query(Event).filter(Event.source_url == source_url).first()
-            if existing:
-                return existing, False
-            else:
-                # Shouldn't happen, but re-raise if we still can't find it
-                raise
-
-
 @shared_task(name="ingest_company_blogs")
 def ingest_company_blogs_task():
     """
@@ -299,12 +251,14 @@ def ingest_company_blogs_task():
     try:
         # Determine if we should use live or fixture data
         use_live = settings.scrape_real
+        validators = {}
 
         if use_live:
             print("🔵 Live mode: Fetching company blogs via RSS/Atom feeds")
-            raw_data = fetch_live_company_blogs()
-            if not raw_data:
-                print("  ⚠️  Live blog feeds returned 0 items; falling back to fixtures")
+            validators = load_feed_validators(BLOG_FEEDS)
+            raw_data = fetch_live_company_blogs(validators=validators)
+            if raw_data is None:
+                print("  ⚠️  No blog feed could be fetched; falling back to fixtures")
                 raw_data = load_fixture_data()
         else:
             print("🟢 Fixture mode: Loading company blog fixtures")
@@ -312,6 +266,7 @@ def ingest_company_blogs_task():
 
         print(f"📰 Processing {len(raw_data)} company blog posts...")
 
+        rows = []
         for item in raw_data:
             try:
                 # Validate publisher is in allowlist
@@ -321,24 +276,21 @@ def ingest_company_blogs_task():
                     continue
 
                 # Normalize to event schema
-                event_data = normalize_event_data(item)
-
-                # Create or update event
-                event, is_new = create_or_update_event(db, event_data)
-
-                if is_new:
-                    stats["inserted"] += 1
-                    print(f"  ✓ Inserted: {event.title[:60]}...")
-                else:
-                    stats["skipped"] += 1
-                    print(f"  ⊘ Skipped (duplicate): {event.title[:60]}...")
+                rows.append(normalize_event_data(item))
 
             except Exception as e:
                 stats["errors"] += 1
                 print(f"  ❌ Error processing item: {e}")
                 continue
 
+        # Write the whole feed as batched upserts
+        write_stats = upsert_events(db, rows)
+        for key in ("inserted", "updated", "errors"):
+            stats[key] += write_stats[key]
+
         db.commit()
+        # Only now may unchanged feeds be skipped with a 304 next run
+        save_feed_validators(validators)
 
         # Update ingest run
         run.finished_at = datetime.now(UTC)
@@ -9,12 +9,13 @@ import json
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
-import feedparser
 from celery import shared_task
 
 from app.config import settings
 from app.database import SessionLocal
-from app.models import Event, IngestRun
+from app.models import IngestRun
+from app.utils.event_writer import upsert_events
+from app.utils.feed_scheduler import any_feed_responded, fetch_feeds_sync, load_feed_validators, save_feed_validators
 from app.utils.fetcher import (
     compute_content_hash,
     compute_dedup_hash,
@@ -53,41 +54,48 @@ def generate_synthetic_press(total: int) -> list[dict]:
     return items
 
 
-def fetch_live_press(max_results: int = 100) -> list[dict]:
+PRESS_FEEDS = [
+    ("https://feeds.reuters.com/reuters/technologyNews", "Reuters"),
+    # Note: AP doesn't have a public RSS feed available
+    # We'll rely on Reuters for now
+]
+
+
+def fetch_live_press(max_results: int = 100, validators: dict | None = None) -> list[dict] | None:
     """
     Fetch live press articles from Reuters and AP (Sprint 7.1).
     
-    Rate limiting: 3 seconds between requests
-    Robots.txt: Uses official RSS feeds
+    Rate limiting: 3 seconds between requests to the same host; hosts are fetched concurrently
+    Robots.txt: Uses official RSS feeds (checked by fetch_with_envelope)
+
+    Args:
+        max_results: Maximum entries per feed
+        validators: Stored feed validators for conditional GET (see
+            app.utils.feed_scheduler); updated in place. None fetches every feed in full.
+
+    Returns:
+        New articles (empty if every feed was unchanged), or None if no feed could be fetched
     """
-    import time
-    feeds = [
-        ("https://feeds.reuters.com/reuters/technologyNews", "Reuters"),
-        # Note: AP doesn't have a public RSS feed available
-        # We'll rely on Reuters for now
-    ]
+    results = fetch_feeds_sync([url for url, _ in PRESS_FEEDS], validators)
+    if not any_feed_responded(results):
+        return None
+
     items: list[dict] = []
-    for url, publisher in feeds:
-        try:
-            # Sprint 7.1: Rate limiting - 3 seconds between requests
-            time.sleep(3.0)
-            feed = feedparser.parse(url)
-            for entry in feed.entries[:max_results]:
-                title = entry.get("title", "").strip()
-                summary = entry.get("summary", "").strip()
-                link = entry.get("link")
-                published = entry.get("published") or entry.get("updated")
-                items.append(
-                    {
-                        "title": title,
-                        "summary": summary,
-                        "url": link,
-                        "publisher": publisher,  # Use publisher from feed list
-                        "published_at": published,
-                    }
-                )
-        except Exception:
-            continue
+    for url, publisher in PRESS_FEEDS:
+        for entry in results[url]["entries"][:max_results]:
+            title = entry.get("title", "").strip()
+            summary = entry.get("summary", "").strip()
+            link = entry.get("link")
+            published = entry.get("published") or entry.get("updated")
+            items.append(
+                {
+                    "title": title,
+                    "summary": summary,
+                    "url": link,
+                    "publisher": publisher,  # Use publisher from feed list
+                    "published_at": published,
+                }
+            )
     return items
 
 
@@ -137,49 +145,6 @@ def normalize_event_data(raw_data: dict) -> dict:
     }
 
 
-def create_or_update_event(db, event_data: dict) -> tuple[Event, bool]:
-    """
-    Idempotently create or update event using dedup_hash, content_hash, or URL.
-
-    Phase A: Prioritize dedup_hash for robust deduplication.
-
-    Args:
-        db: Database session
-        event_data: Normalized event data dict
-
-    Returns:
-        Tuple of (event, is_new) where is_new is True if event was just created
-    """
-    dedup_hash = event_data.get("dedup_hash")
-    content_hash = event_data.get("content_hash")
-    source_url = event_data["source_url"]
-
-    # Check for duplicates by dedup_hash (Phase A: most robust)
-    existing = None
-    if dedup_hash:
-        existing = db.query(Event).filter(Event.dedup_hash == dedup_hash).first()
-
-    # Fallback to content_hash
-    if not existing and content_hash:
-        existing = db.query(Event).filter(Event.content_hash == content_hash).first()
-
-    # Fallback to URL
-    if not existing:
-        existing = db.query(Event).filter(Event.source_url == source_url).first()
-
-    if existing:
-        # Update existing event
-        for key, value in event_data.items():
-            if value is not None:
-                setattr(existing, key, value)
-        return existing, False
-    else:
-        new_event = Event(**event_data)
-        db.add(new_event)
-        db.flush()
-        return new_event, True
-
-
 @shared_task(name="ingest_press_reuters_ap")
 def ingest_press_reuters_ap_task():
     """
@@ -204,12 +169,14 @@ def ingest_press_reuters_ap_task():
 
     try:
         use_live = settings.scrape_real
+        validators = {}
 
         if use_live:
             print("🔵 Live mode: Fetching press (Reuters Technology RSS)")
-            raw_data = fetch_live_press()
-            if not raw_data:
-                print("  ⚠️  Live press feed returned 0 items; falling back to fixtures")
+            validators = load_feed_validators([url for url, _ in PRESS_FEEDS])
+            raw_data = fetch_live_press(validators=validators)
+            if raw_data is None:
+                print("  ⚠️  No press feed could be fetched; falling back to fixtures")
                 raw_data = load_fixture_data()
         else:
             print("🟢 Fixture mode: Loading press fixtures")
@@ -217,6 +184,7 @@ def ingest_press_reuters_ap_task():
 
         print(f"📰 Processing {len(raw_data)} press articles (C-tier, for 'if true' analysis only)...")
 
+        rows = []
         for item in raw_data:
             try:
                 # Validate publisher
@@ -224,21 +192,20 @@ def ingest_press_reuters_ap_task():
                     stats["skipped"] += 1
                     continue
 
-                event_data = normalize_event_data(item)
-                event, is_new = create_or_update_event(db, event_data)
-
-                if is_new:
-                    stats["inserted"] += 1
-                    print(f"  ✓ Inserted (C-tier): {event.title[:60]}...")
-                else:
-                    stats["skipped"] += 1
-                    print(f"  ⊘ Skipped (duplicate): {event.title[:60]}...")
+                rows.append(normalize_event_data(item))
 
             except Exception:
                 stats["errors"] += 1
                 continue
 
+        # Write the whole feed as batched upserts
+        write_stats = upsert_events(db, rows)
+        for key in ("inserted", "updated", "errors"):
+            stats[key] += write_stats[key]
+
         db.commit()
+        # Only now may unchanged feeds be skipped with a 304 next run
+        save_feed_validators(validators)
 
         # Update ingest run
         run.finished_at = datetime.now(UTC)
@@ -13,7 +13,8 @@ from pathlib import Path
 from celery import shared_task
 
 from app.database import SessionLocal
-from app.models import Event, IngestRun
+from app.models import IngestRun
+from app.utils.event_writer import upsert_events
 
 ALLOWED_SOCIAL = {"Twitter", "Reddit"}
 
@@ -53,22 +54,6 @@ def normalize_event_data(raw_data: dict) -> dict:
     }
 
 
-def create_or_update_event(db, event_data: dict) -> Event:
-    """Idempotently create or update event."""
-    existing = db.query(Event).filter(Event.source_url == event_data["source_url"]).first()
-
-    if existing:
-        for key, value in event_data.items():
-            if value is not None:
-                setattr(existing, key, value)
-        return existing
-    else:
-        new_event = Event(**event_data)
-        db.add(new_event)
-        db.flush()
-        return new_event
-
-
 @shared_task(name="ingest_social")
 def ingest_social_task():
     """
@@ -102,25 +87,24 @@ def ingest_social_task():
 
         print(f"💬 Processing {len(raw_data)} social posts (D-tier, NEVER moves gauges)...")
 
+        rows = []
         for item in raw_data:
             try:
                 if item.get("publisher") not in ALLOWED_SOCIAL:
                     stats["skipped"] += 1
                     continue
 
-                event_data = normalize_event_data(item)
-                event = create_or_update_event(db, event_data)
-
-                if event.id and event.ingested_at.date() == datetime.now(UTC).date():
-                    stats["inserted"] += 1
-                    print(f"  ✓ Inserted (D-tier): {event.title[:60]}...")
-                else:
-                    stats["updated"] += 1
+                rows.append(normalize_event_data(item))
 
             except Exception:
                 stats["errors"] += 1
                 continue
 
+        # Write the whole feed as batched upserts
+        write_stats = upsert_events(db, rows)
+        for key in ("inserted", "updated", "errors"):
+            stats[key] += write_stats[key]
+
         db.commit()
 
         # Update ingest run
@@ -1,6 +1,10 @@
 """
 Celery task to populate vector embeddings for events and signposts.
 
+Vectors are stored in the in-process ANN index (app/services/vector_index.py)
+used by /v1/search/semantic; the task also resyncs retraction flags and
+rebuilds the index when it has grown or accumulated replaced rows.
+
 Priority: 2
 Sources: Database (events, signposts)
 Schedule: Daily at 3:00 AM UTC
@@ -10,11 +14,18 @@ from datetime import datetime, timezone
 from typing import List, Tuple
 
 from celery import shared_task
-from sqlalchemy import select
+from sqlalchemy import false, func, select, tuple_
 
 from app.database import SessionLocal
 from app.models import Event, IngestRun, Signpost
 from app.services.embedding_service import embedding_service
+from app.services.vector_index import event_index, signpost_index
+
+# Candidate rows read per keyset page when skipping already-indexed ids
+KEYSET_PAGE_SIZE = 1000
+
+# Undated events sort last
+UNDATED = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
 
 @shared_task(name="populate_embeddings")
@@ -34,6 +45,8 @@ def populate_embeddings(limit: int = 100, force: bool = False):
         "events_processed": 0,
         "signposts_processed": 0,
         "total_cost_usd": 0.0,
+        "retractions_synced": 0,
+        "index_rebuilds": {},
         "errors": 0
     }
     
@@ -57,6 +70,13 @@ def populate_embeddings(limit: int = 100, force: bool = False):
         signposts_processed = _process_signposts(db, limit, force)
         stats["signposts_processed"] = signposts_processed
         
+        # Keep retraction flags current and retrain/compact the indexes when due
+        retracted_ids = db.execute(select(Event.id).where(Event.retracted.is_(True))).scalars().all()
+        stats["retractions_synced"] = event_index.set_retracted(retracted_ids)
+        for index in (event_index, signpost_index):
+            if index.needs_rebuild():
+                stats["index_rebuilds"][index.name] = index.build()
+
         # Get total cost
         stats["total_cost_usd"] = embedding_service.get_daily_spend()
         
@@ -82,20 +102,47 @@ def populate_embeddings(limit: int = 100, force: bool = False):
         db.close()
 
 
+def _unindexed_ids(db, keys, filters, indexed_ids: set[int], limit: int, page_size: int = KEYSET_PAGE_SIZE) -> list[int]:
+    """
+    Ids of the first `limit` rows not in indexed_ids, ordered by keys descending.
+
+    Walks keyset pages and skips indexed ids in Python: a NOT IN over the
+    index would send one bind parameter per indexed id (Postgres caps a
+    statement at 65,535).
+
+    Args:
+        keys: Sort columns, most significant first; the last one must be the id
+        filters: WHERE clauses
+    """
+    ids, last = [], None
+    while len(ids) < limit:
+        query = select(*keys).where(*filters)
+        if last is not None:
+            query = query.where(tuple_(*keys) < tuple_(*last))
+        rows = db.execute(query.order_by(*(key.desc() for key in keys)).limit(page_size)).all()
+        ids.extend(row[-1] for row in rows if row[-1] not in indexed_ids)
+        if len(rows) < page_size:
+            break
+        last = tuple(rows[-1])
+    return ids[:limit]
+
+
+def _load_in_order(db, model, ids: list[int]) -> list:
+    rows = {row.id: row for row in db.execute(select(model).where(model.id.in_(ids))).scalars()}
+    return [rows[item_id] for item_id in ids if item_id in rows]
+
+
 def _process_events(db, limit: int, force: bool) -> int:
     """Process event embeddings."""
-    # Query events without embeddings (or all if force=True)
-    query = select(Event).where(Event.retracted == False)
-    
-    if not force:
-        query = query.where(Event.embedding == None)
-    
-    # Get A/B tier events first (most important)
-    query = query.where(Event.evidence_tier.in_(["A", "B"]))
-    query = query.order_by(Event.published_at.desc())
-    query = query.limit(limit)
-    
-    events = db.execute(query).scalars().all()
+    # Events without embeddings (or all if force=True), A/B tier first (most important), newest first
+    ids = _unindexed_ids(
+        db,
+        (func.coalesce(Event.published_at, UNDATED), Event.id),
+        (Event.retracted.is_(False), Event.evidence_tier.in_(["A", "B"])),
+        set() if force else event_index.indexed_ids(),
+        limit,
+    )
+    events = _load_in_order(db, Event, ids)
     
     if not events:
         print("  No events to process")
@@ -120,12 +167,16 @@ def _process_events(db, limit: int, force: bool) -> int:
     try:
         embeddings = embedding_service.embed_batch(event_texts, use_cache=True)
         
-        # Update events
-        for event, embedding in zip(events, embeddings):
-            if embedding:
-                event.embedding = embedding
+        # Update the index
+        embedded = [(event, embedding) for event, embedding in zip(events, embeddings) if embedding]
+        event_index.upsert(
+            [event.id for event, _ in embedded],
+            [embedding for _, embedding in embedded],
+            tiers=[event.evidence_tier for event, _ in embedded],
+            retracted=[event.retracted for event, _ in embedded],
+            published_at=[event.published_at for event, _ in embedded],
+        )
         
-        db.commit()
         print(f"  ✅ Updated {len(events)} event embeddings")
         return len(events)
         
@@ -137,17 +188,15 @@ def _process_events(db, limit: int, force: bool) -> int:
 
 def _process_signposts(db, limit: int, force: bool) -> int:
     """Process signpost embeddings."""
-    # Query signposts without embeddings (or all if force=True)
-    query = select(Signpost)
-    
-    if not force:
-        query = query.where(Signpost.embedding == None)
-    
-    # Prioritize first-class signposts
-    query = query.order_by(Signpost.first_class.desc())
-    query = query.limit(limit)
-    
-    signposts = db.execute(query).scalars().all()
+    # Signposts without embeddings (or all if force=True), first-class signposts first
+    ids = _unindexed_ids(
+        db,
+        (func.coalesce(Signpost.first_class, false()), Signpost.id),
+        (),
+        set() if force else signpost_index.indexed_ids(),
+        limit,
+    )
+    signposts = _load_in_order(db, Signpost, ids)
     
     if not signposts:
         print("  No signposts to process")
@@ -174,12 +223,13 @@ def _process_signposts(db, limit: int, force: bool) -> int:
     try:
         embeddings = embedding_service.embed_batch(signpost_texts, use_cache=True)
         
-        # Update signposts
-        for signpost, embedding in zip(signposts, embeddings):
-            if embedding:
-                signpost.embedding = embedding
+        # Update the index
+        embedded = [(signpost, embedding) for signpost, embedding in zip(signposts, embeddings) if embedding]
+        signpost_index.upsert(
+            [signpost.id for signpost, _ in embedded],
+            [embedding for _, embedding in embedded],
+        )
         
-        db.commit()
         print(f"  ✅ Updated {len(signposts)} signpost embeddings")
         return len(signposts)
         
@@ -220,9 +270,14 @@ def embed_single_event(event_id: int):
         # Generate embedding
         embedding = embedding_service.embed_single(text, use_cache=True)
         
-        # Update event
-        event.embedding = embedding
-        db.commit()
+        # Update the index
+        event_index.upsert(
+            [event.id],
+            [embedding],
+            tiers=[event.evidence_tier],
+            retracted=[event.retracted],
+            published_at=[event.published_at],
+        )
         
         print(f"✅ Embedded event {event_id}")
         return {"success": True, "event_id": event_id}
@@ -1,221 +1,151 @@
 """Index snapshot computation tasks."""
-import json
-import sys
+import asyncio
 from datetime import date, datetime, timedelta
-from pathlib import Path
 
 from sqlalchemy import and_
 
-# Add scoring package to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent.parent / "packages" / "scoring" / "python"))
-
 from app.celery_app import celery_app
 from app.database import SessionLocal
 from app.models import (
     ChangelogEntry,
-    Claim,
-    ClaimSignpost,
     IndexSnapshot,
-    Signpost,
-    Source,
     WeeklyDigest,
 )
+from app.services.cache_warmup import warm_caches
+from app.services.signpost_values import refresh_signpost_values
+from app.services.snapshot_engine import (
+    PRESET_WEIGHTS,
+    backfill_index_snapshots,
+    run_snapshot_engine,
+    write_index_snapshots,
+)
 
-try:
-    from core import (
-        aggregate_category,
-        compute_confidence_bands,
-        compute_index_from_categories,
-        compute_signpost_progress,
-    )
-except ImportError:
-    from packages.scoring.python.core import (
-        aggregate_category,
-        compute_confidence_bands,
-        compute_index_from_categories,
-        compute_signpost_progress,
-    )
-
-
-# Load preset weights
-# Try Docker path first, fall back to development path
-docker_weights_path = Path("/app/packages/shared/config/weights.json")
-dev_weights_path = Path(__file__).parent.parent.parent.parent.parent / "packages" / "shared" / "config" / "weights.json"
-
-weights_path = docker_weights_path if docker_weights_path.exists() else dev_weights_path
-
-with open(weights_path) as f:
-    PRESET_WEIGHTS = json.load(f)
-
-
-def compute_signpost_current_value(signpost: Signpost, db) -> float:
-    """Get current observed value for a signpost from latest A/B claims."""
-    # Get all A/B tier claims linked to this signpost
-    claim_signposts = (
-        db.query(ClaimSignpost)
-        .filter(ClaimSignpost.signpost_id == signpost.id)
-        .all()
-    )
-
-    values = []
-    for cs in claim_signposts:
-        claim = db.query(Claim).filter(Claim.id == cs.claim_id, not Claim.retracted).first()
-        if not claim:
-            continue
-
-        source = db.query(Source).filter(Source.id == claim.source_id).first()
-        if not source or source.credibility not in ["A", "B"]:
-            continue
-
-        if claim.metric_value:
-            values.append(float(claim.metric_value))
-
-    if not values:
-        # No data - return baseline
-        return float(signpost.baseline_value) if signpost.baseline_value else 0.0
-
-    # Return max value (most optimistic reading)
-    return max(values)
-
-
-def compute_category_score(category: str, db, preset_weights: dict[str, float]) -> float:
-    """Compute aggregate score for a category."""
-    signposts = db.query(Signpost).filter(Signpost.category == category).all()
-
-    if not signposts:
-        return 0.0
 
-    progresses = []
-    weights = []
+@celery_app.task(name="app.tasks.snap_index.compute_daily_snapshot")
+def compute_daily_snapshot():
+    """Compute and store daily index snapshot for all presets."""
+    print(f"📊 Computing daily snapshot for {date.today()}...")
 
-    for signpost in signposts:
-        current_value = compute_signpost_current_value(signpost, db)
+    db = SessionLocal()
+    write_stats = {"created": 0, "updated": 0}
+    engine_stats = {}
+    warmup_stats = None
 
-        progress = compute_signpost_progress(
-            observed=current_value,
-            baseline=float(signpost.baseline_value) if signpost.baseline_value else 0.0,
-            target=float(signpost.target_value) if signpost.target_value else 1.0,
-            direction=signpost.direction,
+    try:
+        # Rebuild the materialized signpost values (catches drift the write hooks can't see)
+        value_stats = refresh_signpost_values(db)
+        print(f"  Refreshed current values for {value_stats['signposts']} signposts")
+
+        # Load signposts and their current values once and score every preset from them
+        engine_result = run_snapshot_engine(db, PRESET_WEIGHTS)
+        engine_stats = engine_result["stats"]
+        print(
+            f"  Snapshot engine: {engine_stats['queries']} queries, "
+            f"{engine_stats['signposts']} signposts, "
+            f"load {engine_stats['load_ms']}ms, score {engine_stats['score_ms']}ms"
         )
 
-        progresses.append(progress)
-        # Weight first-class signposts 2x
-        weight = 2.0 if signpost.first_class else 1.0
-        weights.append(weight)
-
-    return aggregate_category(progresses, weights)
+        write_stats = write_index_snapshots(db, {date.today(): engine_result["presets"]})
 
+        db.commit()
+        print(f"✓ Created {write_stats['created']}, updated {write_stats['updated']} snapshots")
 
-def count_evidence_by_tier(category: str, db) -> dict[str, int]:
-    """Count A/B/C/D tier evidence for a category."""
-    signposts = db.query(Signpost).filter(Signpost.category == category).all()
-    signpost_ids = [s.id for s in signposts]
+        # Check for significant deltas and create changelog entries
+        check_for_significant_changes(db)
 
-    counts = {"A": 0, "B": 0, "C": 0, "D": 0}
+    except Exception as e:
+        print(f"Error computing snapshot: {e}")
+        db.rollback()
+    finally:
+        db.close()
 
-    for signpost_id in signpost_ids:
-        claim_signposts = (
-            db.query(ClaimSignpost)
-            .filter(ClaimSignpost.signpost_id == signpost_id)
-            .all()
-        )
+    # Same-day recomputes only update rows, but the cached responses are just as stale
+    if write_stats["created"] + write_stats["updated"]:
+        warmup_stats = warm_response_caches()
 
-        for cs in claim_signposts:
-            claim = db.query(Claim).filter(Claim.id == cs.claim_id, not Claim.retracted).first()
-            if not claim:
-                continue
+    return {
+        "snapshots_created": write_stats["created"],
+        "snapshots_updated": write_stats["updated"],
+        "engine": engine_stats,
+        "cache_warmup": warmup_stats,
+    }
 
-            source = db.query(Source).filter(Source.id == claim.source_id).first()
-            if source:
-                tier = source.credibility
-                counts[tier] = counts.get(tier, 0) + 1
 
-    return counts
+def warm_response_caches() -> dict | None:
+    """Pre-warm the hot API responses from the new snapshots (see app.services.cache_warmup)."""
+    try:
+        asyncio.get_running_loop()
+        # Called from an API handler (e.g. /v1/admin/recompute), which purges the cache itself
+        print("  Skipping cache warm-up inside a running event loop")
+        return None
+    except RuntimeError:
+        pass
 
+    try:
+        stats = asyncio.run(warm_caches())
+    except Exception as e:
+        print(f"⚠️  Cache warm-up failed: {e}")
+        return None
+
+    stats.pop("etags")
+    endpoints = ", ".join(f"{path} x{count}" for path, count in stats["by_endpoint"].items())
+    print(
+        f"✓ Warmed {stats['keys_warmed']} cache keys in {stats['duration_ms']}ms "
+        f"({stats['keys_failed']} failed): {endpoints}"
+    )
+    return stats
 
-@celery_app.task(name="app.tasks.snap_index.compute_daily_snapshot")
-def compute_daily_snapshot():
-    """Compute and store daily index snapshot for all presets."""
-    print(f"📊 Computing daily snapshot for {date.today()}...")
 
+@celery_app.task(name="app.tasks.snap_index.refresh_signpost_values")
+def refresh_signpost_values_task():
+    """Rebuild the materialized current value of every signpost."""
     db = SessionLocal()
-    snapshots_created = 0
 
     try:
-        for preset_name, preset_weights in PRESET_WEIGHTS.items():
-            # Compute category scores
-            category_scores = {}
-            evidence_counts = {}
-
-            for category in ["capabilities", "agents", "inputs", "security"]:
-                category_scores[category] = compute_category_score(category, db, preset_weights)
-                evidence_counts[category] = count_evidence_by_tier(category, db)
-
-            # Compute overall index
-            index_metrics = compute_index_from_categories(category_scores, preset_weights)
-
-            # Compute confidence bands
-            confidence_bands = compute_confidence_bands(
-                {**category_scores, "overall": index_metrics["overall"], "safety_margin": index_metrics["safety_margin"]},
-                evidence_counts
-            )
+        stats = refresh_signpost_values(db)
+        db.commit()
+        print(f"✓ Refreshed current values for {stats['signposts']} signposts")
+        return stats
+    except Exception as e:
+        print(f"Error refreshing signpost values: {e}")
+        db.rollback()
+        return {"status": "error", "error": str(e)}
+    finally:
+        db.close()
 
-            # Check if snapshot for today already exists
-            today = date.today()
-            existing = (
-                db.query(IndexSnapshot)
-                .filter(and_(
-                    IndexSnapshot.as_of_date == today,
-                    IndexSnapshot.preset == preset_name
-                ))
-                .first()
-            )
 
-            if existing:
-                # Update existing
-                existing.capabilities = category_scores["capabilities"]
-                existing.agents = category_scores["agents"]
-                existing.inputs = category_scores["inputs"]
-                existing.security = category_scores["security"]
-                existing.overall = index_metrics["overall"]
-                existing.safety_margin = index_metrics["safety_margin"]
-                existing.details = {
-                    "confidence_bands": confidence_bands,
-                    "evidence_counts": evidence_counts,
-                }
-            else:
-                # Create new snapshot
-                snapshot = IndexSnapshot(
-                    as_of_date=today,
-                    capabilities=category_scores["capabilities"],
-                    agents=category_scores["agents"],
-                    inputs=category_scores["inputs"],
-                    security=category_scores["security"],
-                    overall=index_metrics["overall"],
-                    safety_margin=index_metrics["safety_margin"],
-                    preset=preset_name,
-                    details={
-                        "confidence_bands": confidence_bands,
-                        "evidence_counts": evidence_counts,
-                    },
-                )
-                db.add(snapshot)
-                snapshots_created += 1
+@celery_app.task(name="app.tasks.snap_index.backfill_index_snapshots")
+def backfill_snapshots(start_date: str, end_date: str | None = None):
+    """
+    Rebuild historical index snapshots for every preset over a date range.
 
-        db.commit()
-        print(f"✓ Created/updated {snapshots_created} snapshots")
+    Args:
+        start_date: First day to rebuild (ISO format, e.g. "2024-01-01")
+        end_date: Last day to rebuild (ISO format). Defaults to today.
+    """
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date) if end_date else date.today()
+    print(f"📊 Backfilling index snapshots from {start} to {end}...")
 
-        # Check for significant deltas and create changelog entries
-        check_for_significant_changes(db)
+    db = SessionLocal()
 
+    try:
+        stats = backfill_index_snapshots(db, start, end, PRESET_WEIGHTS)
+        db.commit()
+        print(
+            f"✓ Backfilled {stats['days']} days x {len(PRESET_WEIGHTS)} presets "
+            f"({stats['created']} created, {stats['updated']} updated) from "
+            f"{stats['observations']} observations in {stats['queries']} queries "
+            f"(load {stats['load_ms']}ms, replay {stats['replay_ms']}ms, write {stats['write_ms']}ms)"
+        )
+        return stats
     except Exception as e:
-        print(f"Error computing snapshot: {e}")
+        print(f"Error backfilling snapshots: {e}")
         db.rollback()
+        return {"status": "error", "error": str(e)}
     finally:
         db.close()
 
-    return {"snapshots": snapshots_created}
-
 
 def check_for_significant_changes(db):
     """Check for significant index changes and create changelog entries."""
@@ -2,28 +2,145 @@
 Celery task for validating event source URLs (Sprint 10).
 
 Runs weekly to check all event URLs are accessible.
+
+Only URLs that are due are checked: never validated first, then the
+longest since their last check (older than url_validation_max_age_days),
+so an interrupted or capped run resumes where it stopped. URLs are checked
+through the concurrent engine in app.utils.url_validator, and results are
+written back in bulk UPDATE batches as they come in.
 """
-import time
-from datetime import datetime, UTC
+import asyncio
+from datetime import datetime, timedelta, UTC
 
 import structlog
+from sqlalchemy import or_, select, update
 from sqlalchemy.orm import Session
 
 from app.celery_app import celery_app
+from app.config import settings
 from app.database import get_db
 from app.models import Event
-from app.utils.url_validator import validate_url
+from app.utils.url_validator import validate_url, validate_urls
 
 logger = structlog.get_logger(__name__)
 
+UPDATE_BATCH_SIZE = 500  # Events per bulk UPDATE
+
+
+def select_due_urls(db: Session, max_age_days: int, max_events: int | None = None) -> dict[str, int]:
+    """
+    Events whose source URL is due for validation, most overdue first.
+
+    Args:
+        db: Database session
+        max_age_days: Re-check URLs last validated longer ago than this
+        max_events: Cap on events selected (None for all due)
+
+    Returns:
+        {url: event id} in priority order (never validated, then oldest check)
+    """
+    cutoff = datetime.now(UTC) - timedelta(days=max_age_days)
+    query = (
+        select(Event.id, Event.source_url)
+        .where(
+            Event.source_url.isnot(None),
+            or_(Event.url_validated_at.is_(None), Event.url_validated_at < cutoff),
+        )
+        .order_by(Event.url_validated_at.asc().nulls_first(), Event.id)
+        .limit(max_events)
+    )
+    return {url: event_id for event_id, url in db.execute(query)}
+
+
+def write_url_results(db: Session, due: dict[str, int], results: list[tuple[str, dict]]) -> int:
+    """
+    Write validation results to their events (one bulk UPDATE).
+
+    Returns:
+        Number of events updated
+    """
+    rows = [
+        {
+            "id": due[url],
+            "url_validated_at": result["checked_at"],
+            "url_status_code": result["status_code"],
+            "url_is_valid": result["valid"],
+            "url_error": result["error"],
+        }
+        for url, result in results
+    ]
+    if rows:
+        db.execute(update(Event), rows)
+        db.commit()
+    return len(rows)
+
+
+def validate_due_event_urls(
+    db: Session,
+    max_age_days: int | None = None,
+    max_events: int | None = None,
+    batch_size: int = UPDATE_BATCH_SIZE,
+    **engine_options,
+) -> dict:
+    """
+    Validate the source URLs that are due and store the results.
+
+    Args:
+        db: Database session
+        max_age_days: Re-check age (default: settings.url_validation_max_age_days)
+        max_events: Cap on events checked this run (None for all due)
+        batch_size: Events per bulk UPDATE
+        **engine_options: Passed to validate_urls (concurrency, per_host, host_interval, client, timeout)
+
+    Returns:
+        Dict with validation statistics
+    """
+    if max_age_days is None:
+        max_age_days = settings.url_validation_max_age_days
+    due = select_due_urls(db, max_age_days, max_events)
+    logger.info("Found events to validate", count=len(due))
+
+    counts = {"valid": 0, "invalid": 0, "errors": 0}
+    pending = []
+
+    def flush():
+        batch = pending[:]
+        pending.clear()
+        try:
+            write_url_results(db, due, batch)
+        except Exception as e:
+            db.rollback()
+            counts["errors"] += len(batch)
+            logger.error("Error writing URL validation results", urls=len(batch), error=str(e))
+
+    def on_result(url: str, result: dict):
+        counts["valid" if result["valid"] else "invalid"] += 1
+        if not result["valid"]:
+            logger.warning("URL invalid", url=url, error=result["error"], status_code=result["status_code"])
+        pending.append((url, result))
+        if len(pending) >= batch_size:
+            flush()
+
+    asyncio.run(validate_urls(list(due), on_result=on_result, **engine_options))
+    flush()
+
+    return {
+        "checked": len(due),
+        **counts,
+        "completed_at": datetime.now(UTC).isoformat()
+    }
+
 
 @celery_app.task(name="validate_event_urls")
-def validate_event_urls():
+def validate_event_urls(max_events: int | None = None):
     """
-    Validate URLs for all events.
+    Validate URLs for all events that are due.
     
-    Checks each event's source_url is accessible and updates validation fields.
+    Checks each due event's source_url is accessible and updates validation fields.
     Runs weekly on Sundays at 3 AM UTC.
+
+    Args:
+        max_events: Cap on events checked this run (None for all due)
     
     Returns:
         Dict with validation statistics
@@ -33,70 +150,8 @@ def validate_event_urls():
     db: Session = next(get_db())
     
     try:
-        # Get all events with URLs
-        events = db.query(Event).filter(Event.source_url.isnot(None)).all()
-        total_events = len(events)
-        
-        logger.info("Found events to validate", count=total_events)
-        
-        valid_count = 0
-        invalid_count = 0
-        error_count = 0
-        
-        for i, event in enumerate(events, 1):
-            try:
-                logger.debug("Validating event URL", 
-                           event_id=event.id, 
-                           url=event.source_url,
-                           progress=f"{i}/{total_events}")
-                
-                # Validate URL
-                result = validate_url(event.source_url, timeout=10)
-                
-                # Update event fields
-                event.url_validated_at = result["checked_at"]
-                event.url_status_code = result["status_code"]
-                event.url_is_valid = result["valid"]
-                event.url_error = result["error"]
-                
-                if result["valid"]:
-                    valid_count += 1
-                    logger.debug("URL valid", 
-                               event_id=event.id, 
-                               status_code=result["status_code"])
-                else:
-                    invalid_count += 1
-                    logger.warning("URL invalid", 
-                                 event_id=event.id, 
-                                 error=result["error"],
-                                 status_code=result["status_code"])
-                
-                # Rate limiting: Max 2 requests per second
-                if i < total_events:
-                    time.sleep(0.5)
-                    
-            except Exception as e:
-                error_count += 1
-                logger.error("Error validating URL", 
-                           event_id=event.id,
-                           url=event.source_url,
-                           error=str(e))
-                # Continue with next event
-                continue
-        
-        # Commit all changes
-        db.commit()
-        
-        result = {
-            "checked": total_events,
-            "valid": valid_count,
-            "invalid": invalid_count,
-            "errors": error_count,
-            "completed_at": datetime.now(UTC).isoformat()
-        }
-        
+        result = validate_due_event_urls(db, max_events=max_events)
         logger.info("URL validation completed", **result)
-        
         return result
         
     except Exception as e:
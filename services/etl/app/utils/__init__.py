@@ -2,12 +2,14 @@
 
 from app.utils.scraper_helpers import (
     check_robots_txt,
+    check_robots_txt_async,
     get_user_agent,
     should_scrape_real,
 )
 
 __all__ = [
     "check_robots_txt",
+    "check_robots_txt_async",
     "get_user_agent",
     "should_scrape_real",
 ]
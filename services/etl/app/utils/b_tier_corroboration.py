@@ -7,15 +7,77 @@ Policy:
   - Set provisional=False
   - Boost confidence by +0.1 (capped at 0.95)
   - Update rationale with corroboration note
+
+Corroboration is set-based: candidate B-tier links and the A-tier links on
+their signposts are loaded with two queries, matched in memory per signpost
+over links sorted by observed_at, and upgraded with one bulk UPDATE.
 """
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 from datetime import UTC, datetime, timedelta
 
+from sqlalchemy import func, or_, select, update
 from sqlalchemy.orm import Session
 
 from app.models import Event, EventSignpostLink
+from app.services.signpost_values import mark_signposts_stale
+
+CORROBORATION_WINDOW = timedelta(days=14)
+
+
+def find_corroborations(
+    b_links: list[tuple],
+    a_links: list[tuple],
+    window: timedelta = CORROBORATION_WINDOW,
+) -> dict[tuple[int, int], int]:
+    """
+    Match B-tier links to corroborating A-tier links on the same signpost.
+
+    A-tier links are grouped by signpost and sorted by observed_at; each
+    B-tier link then binary-searches its signpost's list for the ±window
+    range and takes the closest A-tier link in it. B-tier links without an
+    observed_at are corroborated by any A-tier link on the signpost.
 
+    Args:
+        b_links: (event_id, signpost_id, observed_at) per B-tier link
+        a_links: (event_id, signpost_id, observed_at) per A-tier link
+        window: Maximum distance between the two observations
 
-def check_b_tier_corroboration(db: Session) -> dict[str, int]:
+    Returns:
+        {(b_event_id, signpost_id): a_event_id} for corroborated links
+    """
+    dated = defaultdict(list)
+    undated = {}
+    for event_id, signpost_id, observed_at in sorted(
+        a_links, key=lambda link: (link[1], link[2] is None, link[2] or datetime.min, link[0])
+    ):
+        if observed_at is None:
+            undated.setdefault(signpost_id, event_id)
+        else:
+            dated[signpost_id].append((observed_at, event_id))
+
+    times = {signpost_id: [t for t, _ in candidates] for signpost_id, candidates in dated.items()}
+
+    matches = {}
+    for event_id, signpost_id, observed_at in b_links:
+        candidates = dated.get(signpost_id, [])
+
+        if observed_at is None:
+            a_event_id = candidates[0][1] if candidates else undated.get(signpost_id)
+            if a_event_id is not None:
+                matches[(event_id, signpost_id)] = a_event_id
+            continue
+
+        lo = bisect_left(times.get(signpost_id, []), observed_at - window)
+        hi = bisect_right(times.get(signpost_id, []), observed_at + window)
+        if lo < hi:
+            _, a_event_id = min(candidates[lo:hi], key=lambda c: (abs(c[0] - observed_at), c[1]))
+            matches[(event_id, signpost_id)] = a_event_id
+
+    return matches
+
+
+def check_b_tier_corroboration(db: Session, since: datetime | None = None) -> dict[str, int]:
     """
     Check if any B-tier links can be corroborated by A-tier evidence.
 
@@ -27,70 +89,95 @@ def check_b_tier_corroboration(db: Session) -> dict[str, int]:
 
     Args:
         db: Database session
+        since: If given, only consider links touched since then: B-tier links
+            created at or after it, plus provisional B-tier links on signposts
+            that received A-tier links since. None checks every provisional link.
 
     Returns:
         Statistics dict with count of corroborated links
     """
     stats = {"checked": 0, "corroborated": 0, "already_corroborated": 0}
 
-    # Find all B-tier provisional links
-    b_links = db.query(EventSignpostLink).join(Event).filter(
-        EventSignpostLink.tier == "B",
-        EventSignpostLink.provisional,
-        not Event.retracted
-    ).all()
+    a_filters = (
+        EventSignpostLink.tier == "A",
+        EventSignpostLink.provisional.is_(False),
+        Event.retracted.is_(False),
+    )
+
+    b_query = (
+        select(
+            EventSignpostLink.event_id,
+            EventSignpostLink.signpost_id,
+            EventSignpostLink.observed_at,
+            EventSignpostLink.confidence,
+            EventSignpostLink.rationale,
+        )
+        .join(Event, Event.id == EventSignpostLink.event_id)
+        .where(
+            EventSignpostLink.tier == "B",
+            EventSignpostLink.provisional.is_(True),
+            Event.retracted.is_(False),
+        )
+    )
+    if since is not None:
+        new_a_signposts = (
+            select(EventSignpostLink.signpost_id)
+            .join(Event, Event.id == EventSignpostLink.event_id)
+            .where(*a_filters, EventSignpostLink.created_at >= since)
+        )
+        b_query = b_query.where(or_(
+            EventSignpostLink.created_at >= since,
+            EventSignpostLink.signpost_id.in_(new_a_signposts),
+        ))
 
+    b_links = db.execute(b_query).all()
     stats["checked"] = len(b_links)
     print(f"🔍 Checking {len(b_links)} B-tier provisional links for A-tier corroboration...")
+    if not b_links:
+        return stats
+
+    signpost_ids = {link.signpost_id for link in b_links}
+    a_links = db.execute(
+        select(EventSignpostLink.event_id, EventSignpostLink.signpost_id, EventSignpostLink.observed_at)
+        .join(Event, Event.id == EventSignpostLink.event_id)
+        .where(*a_filters, EventSignpostLink.signpost_id.in_(signpost_ids))
+    ).all()
 
-    for b_link in b_links:
-        # Look for A-tier evidence on same signpost within 14 days
-        # Check both directions: A-tier before or after B-tier
-        cutoff_before = b_link.observed_at - timedelta(days=14) if b_link.observed_at else None
-        cutoff_after = b_link.observed_at + timedelta(days=14) if b_link.observed_at else None
-
-        # Build query for A-tier links on same signpost
-        query = db.query(EventSignpostLink).join(Event).filter(
-            EventSignpostLink.signpost_id == b_link.signpost_id,
-            EventSignpostLink.tier == "A",
-            not EventSignpostLink.provisional,
-            not Event.retracted
-        )
-
-        # Add date range filter if we have observed_at
-        if cutoff_before and cutoff_after:
-            query = query.filter(
-                EventSignpostLink.observed_at >= cutoff_before,
-                EventSignpostLink.observed_at <= cutoff_after
-            )
-
-        a_link = query.first()
-
-        if a_link:
-            # Corroborate B-tier link
-            old_conf = float(b_link.confidence)
-            new_conf = min(old_conf + 0.1, 0.95)
-
-            b_link.provisional = False
-            b_link.confidence = new_conf
-
-            # Update rationale
-            corroboration_note = f" | Corroborated by A-tier event #{a_link.event_id} (conf boosted: {old_conf:.2f} → {new_conf:.2f})"
-            if corroboration_note not in (b_link.rationale or ""):
-                b_link.rationale = (b_link.rationale or "") + corroboration_note
-
-            stats["corroborated"] += 1
-
-            # Get event titles for logging
-            b_event = db.query(Event).filter(Event.id == b_link.event_id).first()
-            a_event = db.query(Event).filter(Event.id == a_link.event_id).first()
-
-            print("  ✓ Corroborated B-tier link:")
-            print(f"    B-tier: {b_event.title[:60] if b_event else 'Unknown'}...")
-            print(f"    A-tier: {a_event.title[:60] if a_event else 'Unknown'}...")
-            print(f"    Confidence: {old_conf:.2f} → {new_conf:.2f}")
-
+    matches = find_corroborations(
+        [(link.event_id, link.signpost_id, link.observed_at) for link in b_links],
+        [tuple(link) for link in a_links],
+    )
+
+    updates = []
+    for link in b_links:
+        a_event_id = matches.get((link.event_id, link.signpost_id))
+        if a_event_id is None:
+            continue
+
+        # Corroborate B-tier link
+        old_conf = float(link.confidence)
+        new_conf = min(old_conf + 0.1, 0.95)
+
+        # Update rationale
+        rationale = link.rationale or ""
+        corroboration_note = f" | Corroborated by A-tier event #{a_event_id} (conf boosted: {old_conf:.2f} → {new_conf:.2f})"
+        if corroboration_note not in rationale:
+            rationale += corroboration_note
+
+        updates.append({
+            "event_id": link.event_id,
+            "signpost_id": link.signpost_id,
+            "provisional": False,
+            "confidence": new_conf,
+            "rationale": rationale,
+        })
+
+    if updates:
+        db.execute(update(EventSignpostLink), updates)
+        # Corroborated links become scorable; refresh their signposts' values on commit
+        mark_signposts_stale(db, {row["signpost_id"] for row in updates})
     db.commit()
+    stats["corroborated"] = len(updates)
 
     print("\n✅ Corroboration check complete:")
     print(f"   Checked: {stats['checked']}, Corroborated: {stats['corroborated']}")
@@ -98,6 +185,16 @@ def check_b_tier_corroboration(db: Session) -> dict[str, int]:
     return stats
 
 
+def corroboration_watermark(db: Session) -> datetime:
+    """
+    Database clock reading to pass as ``since`` to a later incremental check.
+
+    Taken from the database (not the worker) so it compares cleanly with the
+    server-defaulted created_at of links written afterwards.
+    """
+    return db.scalar(select(func.now()))
+
+
 def find_uncorroborated_b_tier_links(db: Session, days_old: int = 14) -> list[EventSignpostLink]:
     """
     Find B-tier links that remain provisional after the corroboration window.
@@ -115,10 +212,9 @@ def find_uncorroborated_b_tier_links(db: Session, days_old: int = 14) -> list[Ev
 
     uncorroborated = db.query(EventSignpostLink).join(Event).filter(
         EventSignpostLink.tier == "B",
-        EventSignpostLink.provisional,
+        EventSignpostLink.provisional.is_(True),
         EventSignpostLink.created_at <= cutoff,
-        not Event.retracted
+        Event.retracted.is_(False)
     ).all()
 
     return uncorroborated
-
@@ -1,13 +1,214 @@
-"""Cache management utilities."""
+"""
+Cache management utilities.
+
+Responses cached with @cache are registered under tag sets so they can be
+invalidated without scanning the keyspace:
+
+- tagged_key_builder() builds a stable key from the route path and the
+  endpoint's resolved scalar parameters, and picks the response's tags: the
+  route section ("events", "signposts", "index", ...), "signpost:{id|code}"
+  for signpost parameters and "index:{preset}" for preset parameters.
+- TaggedRedisBackend.set() writes the response and SADDs its key into each
+  tag set in one pipeline.
+- invalidate_tags() reads the tag sets (SMEMBERS) and UNLINKs just those
+  keys, over the shared pooled client from get_cache_redis().
+
+Hit/miss/invalidation counters are kept in a Redis hash (shared by all API
+workers and Celery) and reported by get_cache_stats().
+
+Hot endpoints use @swr_cache instead of @cache: entries stay fresh for a
+jittered TTL, are then served stale while a single background task
+recomputes them, and concurrent misses for a key share one computation.
+"""
+
+import asyncio
+import hashlib
+import inspect
+from contextvars import ContextVar
+from datetime import date
+from functools import wraps
+from secrets import compare_digest
+from typing import Iterable
 
 import redis.asyncio as aioredis
+from fastapi import Request, Response
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.key_builder import default_key_builder
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from app.config import settings
+from app.utils.cache_helpers import get_ttl_with_jitter
+
+CACHE_PREFIX = "fastapi-cache"
+
+# Internal header (value: the admin API key) that makes @swr_cache recompute and overwrite an entry
+REFRESH_HEADER = "X-Cache-Refresh"
+STATS_KEY = f"{CACHE_PREFIX}:stats"
+
+# Every cached response is also registered under ALL_TAG (full cache clear)
+ALL_TAG = "*"
+
+# Tag sets outlive their members; stale members are harmless (UNLINK skips them)
+TAG_SET_TTL = 24 * 3600
+
+# Route sections that share data with another section's tag
+SECTION_ALIASES = {
+    "feed.json": "events",
+    "search": "events",
+    "timeline": "events",
+}
+
+_redis_client: aioredis.Redis | None = None
+
+# (cache key, tags) chosen by the key builder for the request being served
+_pending_tags: ContextVar[tuple[str, tuple[str, ...]] | None] = ContextVar("cache_pending_tags", default=None)
+
+
+def get_cache_redis() -> aioredis.Redis:
+    """Shared Redis client (with its connection pool) for the response cache."""
+    global _redis_client
+    if _redis_client is None:
+        # Raw bytes: cached bodies are encoded by the cache coder, not Redis
+        _redis_client = aioredis.from_url(settings.redis_url)
+    return _redis_client
 
 
-async def invalidate_signpost_caches(signpost_ids: list[int]) -> int:
+def tag_key(tag: str) -> str:
+    """Redis key of the set holding the cache keys registered under a tag."""
+    return f"{CACHE_PREFIX}:tag:{tag}"
+
+
+def signpost_tags(signpost_ids: Iterable[int] = (), signpost_codes: Iterable[str] = ()) -> list[str]:
+    """Tags of responses built from the given signposts (by id and by code)."""
+    return [f"signpost:{value}" for value in (*signpost_ids, *signpost_codes)]
+
+
+def _cache_params(kwargs: dict) -> dict:
+    """Scalar endpoint parameters (drops sessions, requests and other dependencies)."""
+    return {
+        name: value
+        for name, value in kwargs.items()
+        if value is None or isinstance(value, (str, int, float, bool, date))
+    }
+
+
+def response_tags(path: str | None, params: dict) -> tuple[str, ...]:
+    """
+    Tags for a cached response.
+
+    Args:
+        path: Request path (e.g. "/v1/signposts/swe_bench_85"), if any
+        params: The endpoint's resolved scalar parameters
+
+    Returns:
+        Sorted tuple of tags, always including ALL_TAG
     """
-    Invalidate all caches related to the given signpost IDs.
+    tags = {ALL_TAG}
+    if path:
+        parts = path.strip("/").split("/")
+        section = parts[1] if parts[0] == "v1" and len(parts) > 1 else parts[0]
+        if section:
+            tags.add(SECTION_ALIASES.get(section, section))
+
+    if params.get("signpost_id") is not None:
+        tags.add(f"signpost:{params['signpost_id']}")
+    if params.get("code"):
+        tags.add(f"signpost:{params['code']}")
+    for preset in (params.get("preset"), *(params.get("presets") or "").split(",")):
+        if preset and preset.strip():
+            tags.add(f"index:{preset.strip()}")
+    return tuple(sorted(tags))
+
+
+def tagged_key_builder(func, namespace: str = "", *, request=None, response=None, args=(), kwargs=None) -> str:
+    """
+    fastapi-cache key builder that also picks the response's tags.
+
+    The key depends only on the route path and the resolved scalar parameters,
+    so "/v1/index" and "/v1/index?preset=equal" share an entry and per-request
+    dependencies (DB sessions) no longer make every key unique.
+    """
+    if request is None:
+        return default_key_builder(func, namespace, request=request, response=response, args=args, kwargs=kwargs or {})
+
+    params = _cache_params(kwargs or {})
+    digest = hashlib.md5(repr(sorted(params.items())).encode()).hexdigest()
+    cache_key = f"{namespace}:{request.url.path}:{digest}"
+    _pending_tags.set((cache_key, response_tags(request.url.path, params)))
+    return cache_key
+
+
+class TaggedRedisBackend(RedisBackend):
+    """RedisBackend that registers each cached key under its tags and counts hits/misses."""
+
+    async def get_with_ttl(self, key: str):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            ttl, value, _ = await pipe.ttl(key).get(key).hincrby(STATS_KEY, "lookups", 1).execute()
+        if value is None:
+            # Misses pay for a recomputation anyway; one more round trip is noise
+            await self.redis.hincrby(STATS_KEY, "misses", 1)
+        return ttl, value
+
+    async def set(self, key: str, value, expire: int | None = None) -> None:
+        pending = _pending_tags.get()
+        tags = pending[1] if pending and pending[0] == key else (ALL_TAG,)
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(key, value, ex=expire)
+            for tag in tags:
+                pipe.sadd(tag_key(tag), key)
+                if expire:
+                    pipe.expire(tag_key(tag), max(expire, TAG_SET_TTL))
+            await pipe.execute()
+
+    async def clear(self, namespace: str | None = None, key: str | None = None) -> int:
+        if namespace == CACHE_PREFIX:
+            return await invalidate_tags([ALL_TAG], redis_client=self.redis)
+        return await super().clear(namespace, key)
+
+
+async def invalidate_tags(tags: Iterable[str], redis_client: aioredis.Redis | None = None) -> int:
+    """
+    Invalidate every cached response registered under any of the given tags.
+
+    Args:
+        tags: Tags to invalidate (e.g. ["events", "signpost:12", "index:equal"])
+        redis_client: Client to use (defaults to the shared pooled client)
+
+    Returns:
+        Number of cache keys removed
+    """
+    tags = list(dict.fromkeys(tags))
+    if not tags:
+        return 0
+
+    redis_client = redis_client or get_cache_redis()
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for tag in tags:
+            pipe.smembers(tag_key(tag))
+        members = await pipe.execute()
+
+    keys = set().union(*members)
+    async with redis_client.pipeline(transaction=False) as pipe:
+        if keys:
+            pipe.unlink(*keys)
+        # SREM (not UNLINK) the tag sets so keys registered meanwhile stay tagged
+        for tag, tag_members in zip(tags, members):
+            if tag_members:
+                pipe.srem(tag_key(tag), *tag_members)
+        pipe.hincrby(STATS_KEY, "invalidations", 1)
+        results = await pipe.execute()
+
+    removed = results[0] if keys else 0
+    await redis_client.hincrby(STATS_KEY, "invalidated_keys", removed)
+    return removed
+
+
+async def invalidate_signpost_caches(signpost_ids: list[int], signpost_codes: Iterable[str] = ()) -> int:
+    """
+    Invalidate all caches related to the given signposts.
 
     Called when:
     - An event is retracted that affects these signposts
@@ -16,50 +217,17 @@ async def invalidate_signpost_caches(signpost_ids: list[int]) -> int:
 
     Args:
         signpost_ids: List of signpost IDs to invalidate caches for
+        signpost_codes: Codes of the same signposts (for /v1/signposts/{code})
 
     Returns:
         Number of cache keys invalidated
 
     Example:
-        affected_ids = [1, 2, 3]
-        count = await invalidate_signpost_caches(affected_ids)
-        # count: 12 (4 patterns × 3 signposts)
+        count = await invalidate_signpost_caches([1, 2], ["swe_bench_85", "osworld_50"])
     """
     if not signpost_ids:
         return 0
-
-    redis_client = await aioredis.from_url(
-        settings.redis_url,
-        encoding="utf-8",
-        decode_responses=True
-    )
-
-    count = 0
-    try:
-        for signpost_id in signpost_ids:
-            # Invalidate patterns:
-            # 1. /v1/signposts/{id}/events
-            # 2. /v1/signposts/{code}/events (need to look up code)
-            # 3. /v1/events with filters
-            # 4. /v1/timeline/feed
-
-            patterns = [
-                f"fastapi-cache:*signposts/{signpost_id}/*",
-                "fastapi-cache:*signposts/*/events*",
-                "fastapi-cache:*events*",
-                "fastapi-cache:*timeline*",
-            ]
-
-            for pattern in patterns:
-                keys = await redis_client.keys(pattern)
-                if keys:
-                    deleted = await redis_client.delete(*keys)
-                    count += deleted
-
-    finally:
-        await redis_client.close()
-
-    return count
+    return await invalidate_tags([*signpost_tags(signpost_ids, signpost_codes), "events"])
 
 
 async def invalidate_all_event_caches() -> int:
@@ -74,29 +242,265 @@ async def invalidate_all_event_caches() -> int:
     Returns:
         Number of cache keys invalidated
     """
-    redis_client = await aioredis.from_url(
-        settings.redis_url,
-        encoding="utf-8",
-        decode_responses=True
-    )
+    return await invalidate_tags(["events", "signposts", "predictions"])
+
+
+async def get_cache_stats() -> dict:
+    """
+    Response cache counters (shared across workers).
+
+    Returns:
+        {"hits", "misses", "hit_rate", "invalidations", "invalidated_keys"}
+    """
+    counters = {
+        name.decode() if isinstance(name, bytes) else name: int(value)
+        for name, value in (await get_cache_redis().hgetall(STATS_KEY)).items()
+    }
+    lookups = counters.get("lookups", 0)
+    misses = min(counters.get("misses", 0), lookups)
+    hits = lookups - misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups, 4) if lookups else None,
+        "invalidations": counters.get("invalidations", 0),
+        "invalidated_keys": counters.get("invalidated_keys", 0),
+    }
+
+
+# Single-flight state: in-progress fills and background refreshes per cache key (refresh
+# futures resolve to None when they didn't store a value), and refresh tasks we must keep referenced
+_inflight: dict[str, asyncio.Future] = {}
+_refreshing: dict[str, asyncio.Future] = {}
+_background_refreshes: set[asyncio.Task] = set()
+
+# How long a miss waits for another worker's fill before computing itself
+FILL_WAIT_SECONDS = 5.0
+FILL_POLL_SECONDS = 0.05
+
+
+def _param_name(signature: inspect.Signature, annotation) -> str | None:
+    return next((p.name for p in signature.parameters.values() if p.annotation is annotation), None)
+
+
+def _is_forced_refresh(request: Request) -> bool:
+    token = request.headers.get(REFRESH_HEADER)
+    return bool(token and settings.admin_api_key and compare_digest(token, settings.admin_api_key))
+
+
+def _etag(encoded: bytes) -> str:
+    return f'W/"{hashlib.md5(encoded).hexdigest()}"'
+
+
+async def _acquire_fill_lock(backend, key: str, lock_ttl: int) -> bool:
+    """Cross-worker fill lock (SET NX); backends without Redis only coalesce in-process."""
+    redis_client = getattr(backend, "redis", None)
+    if redis_client is None:
+        return True
+    return bool(await redis_client.set(f"{key}:lock", b"1", nx=True, ex=lock_ttl))
+
+
+async def _release_fill_lock(backend, key: str) -> None:
+    redis_client = getattr(backend, "redis", None)
+    if redis_client is not None:
+        await redis_client.delete(f"{key}:lock")
+
+
+async def _wait_for_fill(backend, key: str):
+    """Poll for the value another worker is computing (None if it doesn't show up)."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + FILL_WAIT_SECONDS
+    while loop.time() < deadline:
+        await asyncio.sleep(FILL_POLL_SECONDS)
+        cached = await backend.get(key)
+        if cached is not None:
+            return cached
+    return None
+
+
+def _single_flight(key: str, fill, registry: dict[str, asyncio.Future] = _inflight) -> tuple[asyncio.Future, bool]:
+    """
+    Join the in-progress fill for a key, or start one.
+
+    Returns:
+        (future, leader) - leader is True if this call started the fill
+    """
+    future = registry.get(key)
+    if future is not None:
+        return future, False
+
+    future = asyncio.ensure_future(fill())
+    registry[key] = future
+    future.add_done_callback(lambda done: registry.pop(key, None) if registry.get(key) is done else None)
+    return future, True
+
+
+def _fresh_sessions(kwargs: dict) -> tuple[dict, list]:
+    """
+    Swap request-scoped DB sessions for new ones.
+
+    Background refreshes outlive the request whose dependencies are being
+    torn down, so they open (and later close) their own sessions.
+    """
+    from app.database import AsyncSessionLocal, SessionLocal
+
+    sessions = []
+    refreshed = dict(kwargs)
+    for name, value in kwargs.items():
+        if isinstance(value, AsyncSession):
+            refreshed[name] = AsyncSessionLocal()
+        elif isinstance(value, Session):
+            refreshed[name] = SessionLocal()
+        else:
+            continue
+        sessions.append(refreshed[name])
+    return refreshed, sessions
+
+
+def swr_cache(expire: int, stale_ttl: int | None = None, lock_ttl: int = 30):
+    """
+    Cache a GET endpoint with stale-while-revalidate and single-flight fills.
+
+    Entries are fresh for get_ttl_with_jitter(expire) seconds, then served
+    stale for up to stale_ttl more (default: expire) while one background
+    task recomputes them. Concurrent misses and refreshes of a key share one
+    computation: in-process through a shared future, across workers through
+    a Redis lock (SET NX, held for at most lock_ttl seconds).
+
+    A request carrying the admin API key in REFRESH_HEADER (the cache
+    warm-up) recomputes and overwrites the entry; public `Cache-Control:
+    no-cache` (e.g. a hard reload) is served like any other request, so it
+    can't bypass single-flight. `no-store` bypasses the cache.
+
+    The endpoint must take a `request: Request` parameter; a `response:
+    Response` parameter, if present, gets the cache status and ETag headers.
+
+    Args:
+        expire: Base fresh TTL in seconds
+        stale_ttl: How long an expired entry may still be served
+        lock_ttl: Expiry of the cross-worker fill lock
+    """
+    stale_ttl = expire if stale_ttl is None else stale_ttl
+
+    def wrapper(func):
+        signature = inspect.signature(func)
+        request_name = _param_name(signature, Request)
+        response_name = _param_name(signature, Response)
+        if request_name is None:
+            raise TypeError(f"@swr_cache endpoint {func.__name__} must take a `request: Request` parameter")
+
+        async def compute_and_store(key: str, backend, coder, args, kwargs):
+            result = await func(*args, **kwargs)
+            if isinstance(result, Response):
+                # Conditional/error responses are per-request; never cache them
+                return result, None
+            encoded = coder.encode(result)
+            # Jittered soft TTL; the hard TTL keeps a fixed stale window on top of it
+            await backend.set(key, encoded, get_ttl_with_jitter(expire) + stale_ttl)
+            return result, encoded
+
+        async def fill(key: str, backend, coder, args, kwargs):
+            locked = await _acquire_fill_lock(backend, key, lock_ttl)
+            if not locked:
+                cached = await _wait_for_fill(backend, key)
+                if cached is not None:
+                    return coder.decode(cached), cached
+            try:
+                return await compute_and_store(key, backend, coder, args, kwargs)
+            finally:
+                if locked:
+                    await _release_fill_lock(backend, key)
+
+        async def revalidate(key: str, backend, coder, args, kwargs):
+            if not await _acquire_fill_lock(backend, key, lock_ttl):
+                return None  # another worker is already refreshing this key
+            kwargs, sessions = _fresh_sessions(kwargs)
+            try:
+                result, encoded = await compute_and_store(key, backend, coder, args, kwargs)
+                return (result, encoded) if encoded is not None else None
+            except Exception as e:
+                print(f"⚠️  Background cache refresh failed for {key}: {e}")
+                return None
+            finally:
+                for session in sessions:
+                    closed = session.close()
+                    if inspect.isawaitable(closed):
+                        await closed
+                await _release_fill_lock(backend, key)
+
+        @wraps(func)
+        async def inner(*args, **kwargs):
+            request: Request = kwargs[request_name]
+            response: Response | None = kwargs.get(response_name) if response_name else None
+            if (
+                not FastAPICache.get_enable()
+                or request.method != "GET"
+                or request.headers.get("Cache-Control") == "no-store"
+            ):
+                return await func(*args, **kwargs)
+
+            backend = FastAPICache.get_backend()
+            coder = FastAPICache.get_coder()
+            key = FastAPICache.get_key_builder()(
+                func, f"{FastAPICache.get_prefix()}:", request=request, response=response, args=args, kwargs=kwargs
+            )
+            if inspect.isawaitable(key):
+                key = await key
+
+            if _is_forced_refresh(request):
+                # Forced refresh (cache warm-up): recompute and overwrite the entry
+                status = "REFRESH"
+                result, encoded = await compute_and_store(key, backend, coder, args, kwargs)
+                if encoded is None:
+                    return result
+                fresh_for = expire
+            else:
+                try:
+                    ttl, cached = await backend.get_with_ttl(key)
+                except Exception as e:
+                    print(f"⚠️  Cache read failed for {key}: {e}")
+                    ttl, cached = 0, None
 
-    count = 0
-    try:
-        patterns = [
-            "fastapi-cache:*events*",
-            "fastapi-cache:*signposts*",
-            "fastapi-cache:*timeline*",
-            "fastapi-cache:*predictions*",
-        ]
+                refreshed = None
+                if cached is None and key in _refreshing:
+                    # The entry was dropped (invalidated or expired) mid-refresh: use that refresh's value
+                    refreshed = await asyncio.shield(_refreshing[key])
 
-        for pattern in patterns:
-            keys = await redis_client.keys(pattern)
-            if keys:
-                deleted = await redis_client.delete(*keys)
-                count += deleted
+                if refreshed is not None:
+                    status = "MISS"
+                    result, encoded = refreshed
+                    fresh_for = expire
+                elif cached is None:
+                    status = "MISS"
+                    future, leader = _single_flight(key, lambda: fill(key, backend, coder, args, kwargs))
+                    result, encoded = await asyncio.shield(future)
+                    if encoded is None:
+                        # The leader's response was request-specific (e.g. a 304)
+                        return result if leader else await func(*args, **kwargs)
+                    fresh_for = expire
+                else:
+                    result, encoded = coder.decode(cached), cached
+                    fresh_for = ttl - stale_ttl if ttl is not None and ttl >= 0 else expire
+                    status = "HIT" if fresh_for > 0 else "STALE"
+                    if status == "STALE" and key not in _inflight:
+                        future, _ = _single_flight(
+                            key, lambda: revalidate(key, backend, coder, args, kwargs), registry=_refreshing
+                        )
+                        _background_refreshes.add(future)
+                        future.add_done_callback(_background_refreshes.discard)
 
-    finally:
-        await redis_client.close()
+            if response is not None:
+                etag = _etag(encoded)
+                response.headers.update({
+                    "Cache-Control": f"max-age={max(fresh_for, 0)}",
+                    "ETag": etag,
+                    FastAPICache.get_cache_status_header(): status,
+                })
+                if status in ("HIT", "STALE") and request.headers.get("if-none-match") == etag:
+                    response.status_code = 304
+                    return response
+            return result
 
-    return count
+        return inner
 
+    return wrapper
@@ -4,7 +4,7 @@ import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.config import settings
-from app.utils.scraper_helpers import check_robots_txt, get_user_agent
+from app.utils.scraper_helpers import check_robots_txt, check_robots_txt_async, get_user_agent
 
 
 @retry(
@@ -16,23 +16,24 @@ from app.utils.scraper_helpers import check_robots_txt, get_user_agent
     ),
     reraise=True
 )
-async def fetch_with_envelope(url: str, **kwargs) -> httpx.Response:
+async def fetch_with_envelope(url: str, client: httpx.AsyncClient | None = None, **kwargs) -> httpx.Response:
     """
     Fetch URL with standard timeout, retry, backoff, and robots.txt compliance.
 
     Args:
         url: URL to fetch
+        client: Shared client to reuse connections across fetches (default: a new client per call)
         **kwargs: Additional arguments to pass to httpx.get()
 
     Returns:
-        httpx.Response object
+        httpx.Response object (a 304 Not Modified answer to a conditional GET is returned, not raised)
 
     Raises:
         ValueError: If robots.txt disallows scraping
         httpx.HTTPError: On HTTP errors after retries exhausted
     """
-    # Check robots.txt before scraping
-    if not check_robots_txt(url):
+    # Check robots.txt before scraping (cached per host, fetched on the shared client)
+    if not await check_robots_txt_async(url, client=client):
         raise ValueError(f"Scraping disallowed by robots.txt: {url}")
 
     # Set timeout
@@ -46,10 +47,14 @@ async def fetch_with_envelope(url: str, **kwargs) -> httpx.Response:
     if "User-Agent" not in headers and "user-agent" not in headers:
         headers["User-Agent"] = get_user_agent()
 
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.get(url, headers=headers, **kwargs)
+    if client is not None:
+        response = await client.get(url, headers=headers, timeout=timeout, **kwargs)
+    else:
+        async with httpx.AsyncClient(timeout=timeout) as own_client:
+            response = await own_client.get(url, headers=headers, **kwargs)
+    if response.status_code != 304:
         response.raise_for_status()
-        return response
+    return response
 
 
 def fetch_with_envelope_sync(url: str, **kwargs) -> httpx.Response:
@@ -8,12 +8,18 @@ Policy:
 - Confidence threshold for auto-approval: 0.6
 - LLM augmentation runs on ALL events to enhance rule-based matching
 """
+import os
 import re
 from datetime import UTC
 from pathlib import Path
 
 import yaml
 
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
 ALIASES_PATH = Path(__file__).parent.parent.parent.parent.parent / "infra" / "seeds" / "aliases_signposts.yaml"
 
 
@@ -25,69 +31,199 @@ def load_aliases() -> dict:
         return yaml.safe_load(f) or {}
 
 
-def match_aliases(text: str, aliases: dict, max_signposts: int = 5) -> list[tuple[str, float, str]]:
+def _required_literals(parsed) -> set[str] | None:
     """
-    Match text against alias patterns and return (code, confidence, rationale) tuples.
+    Literal substrings of which at least one must occur for a pattern to match.
 
-    Returns up to max_signposts per event (default 5, increased from 2 to capture
-    more connections between events and signposts).
+    Walks the sre_parse tree of a pattern. Each run of literal characters in a
+    sequence is required, as is one of the literals of every alternative in a
+    group. The longest such candidate is kept as the prefilter key.
+
+    Returns:
+        Set of lowercase literals, or None when the pattern has no usable
+        literal (such rules are always evaluated)
     """
-    text_lower = text.lower()
-    matches = []
-    seen_codes = set()
+    candidates = []
+    run = []
+
+    def close_run():
+        if run:
+            candidates.append({"".join(run)})
+            run.clear()
 
-    # Aliases structure: {category: [{pattern, codes, boost}, ...]}
-    for category, rules in aliases.items():
-        if not isinstance(rules, list):
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av).lower())
             continue
-        for rule in rules:
-            if not isinstance(rule, dict):
-                continue
-            pattern = rule.get("pattern", "")
-            codes = rule.get("codes", [])
-            boost = rule.get("boost", 0.0)
-
-            # Check if pattern matches
-            try:
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    for code in codes:
-                        if code not in seen_codes:
-                            base_conf = 0.5 + boost
-                            rationale = f"Alias match: '{pattern}'"
-                            matches.append((code, base_conf, rationale))
-                            seen_codes.add(code)
-            except re.error:
-                # Invalid regex; skip
+        close_run()
+        if op is sre_parse.SUBPATTERN:
+            literals = _required_literals(av[-1])
+            if literals:
+                candidates.append(literals)
+        elif op is sre_parse.BRANCH:
+            alternatives = [_required_literals(branch) for branch in av[1]]
+            if all(alternatives):
+                candidates.append(set().union(*alternatives))
+    close_run()
+
+    if not candidates:
+        return None
+    # Prefer the candidate whose shortest literal is longest (most selective)
+    return max(candidates, key=lambda literals: (min(map(len, literals)), -len(literals)))
+
+
+class AliasIndex:
+    """
+    Compiled alias registry.
+
+    All rule patterns are compiled once. A single lookahead alternation over
+    the rules' required literals scans each text once and selects the rules
+    worth evaluating, so a typical event runs a handful of regexes instead of
+    every rule in the registry.
+    """
+
+    def __init__(self, aliases: dict):
+        # (pattern, compiled, codes, boost) in registry order
+        self.rules = []
+        # literal -> rule indexes requiring it
+        literal_rules = {}
+        # rules without a usable literal, evaluated for every text
+        self.always = []
+
+        # Aliases structure: {category: [{pattern, codes, boost}, ...]}
+        for category, rules in aliases.items():
+            if not isinstance(rules, list):
                 continue
+            for rule in rules:
+                if not isinstance(rule, dict):
+                    continue
+                pattern = rule.get("pattern", "")
+                try:
+                    compiled = re.compile(pattern, re.IGNORECASE)
+                    literals = _required_literals(sre_parse.parse(pattern, re.IGNORECASE))
+                except re.error:
+                    # Invalid regex; skip
+                    continue
+
+                index = len(self.rules)
+                self.rules.append((pattern, compiled, rule.get("codes", []), rule.get("boost", 0.0)))
+                if literals is None:
+                    self.always.append(index)
+                else:
+                    for literal in literals:
+                        literal_rules.setdefault(literal, []).append(index)
+
+        # Longest first so a literal is preferred over its own prefixes at the
+        # same position; the prefixes are credited through literal_prefixes.
+        literals = sorted(literal_rules, key=len, reverse=True)
+        self.prefilter = (
+            re.compile("(?=(" + "|".join(map(re.escape, literals)) + "))") if literals else None
+        )
+        self.literal_rules = {
+            literal: sorted({
+                index
+                for other in literal_rules
+                if literal.startswith(other)
+                for index in literal_rules[other]
+            })
+            for literal in literal_rules
+        }
+
+    def candidate_rules(self, text_lower: str) -> list[int]:
+        """Indexes (in registry order) of rules whose required literals occur in text."""
+        candidates = set(self.always)
+        if self.prefilter is not None:
+            for literal in {m.group(1) for m in self.prefilter.finditer(text_lower)}:
+                candidates.update(self.literal_rules[literal])
+        return sorted(candidates)
+
+    def match(self, text: str, max_signposts: int = 5) -> list[tuple[str, float, str]]:
+        """Match text against the compiled rules; same contract as match_aliases."""
+        text_lower = text.lower()
+        matches = []
+        seen_codes = set()
+
+        for index in self.candidate_rules(text_lower):
+            pattern, compiled, codes, boost = self.rules[index]
+            if compiled.search(text_lower):
+                for code in codes:
+                    if code not in seen_codes:
+                        matches.append((code, 0.5 + boost, f"Alias match: '{pattern}'"))
+                        seen_codes.add(code)
+
+        # Sort by confidence (descending) and cap to max_signposts
+        matches.sort(key=lambda x: x[1], reverse=True)
+        return matches[:max_signposts]
+
+    def match_batch(self, texts: list[str], max_signposts: int = 5) -> list[list[tuple[str, float, str]]]:
+        """Match many texts; one result list per text."""
+        return [self.match(text, max_signposts) for text in texts]
+
+
+# (aliases path, mtime_ns, index) for the process-wide registry
+_alias_index_cache = None
+# (aliases dict, index) for the most recent caller-supplied registry
+_last_compiled = None
+
+
+def get_alias_index() -> AliasIndex:
+    """
+    Process-wide compiled alias registry.
+
+    Compiled on first use and rebuilt whenever the YAML file's mtime changes,
+    so edits to aliases_signposts.yaml are picked up without a restart.
+    """
+    global _alias_index_cache
 
-    # Sort by confidence (descending) and cap to max_signposts
-    matches.sort(key=lambda x: x[1], reverse=True)
-    return matches[:max_signposts]
+    try:
+        mtime = os.stat(ALIASES_PATH).st_mtime_ns
+    except OSError:
+        mtime = None
+
+    if _alias_index_cache is None or _alias_index_cache[:2] != (ALIASES_PATH, mtime):
+        _alias_index_cache = (ALIASES_PATH, mtime, AliasIndex(load_aliases()))
+    return _alias_index_cache[2]
+
+
+def _resolve_alias_index(aliases) -> AliasIndex:
+    """Accept None (process registry), an AliasIndex, or a raw alias dict."""
+    global _last_compiled
+
+    if aliases is None:
+        return get_alias_index()
+    if isinstance(aliases, AliasIndex):
+        return aliases
+    # Callers typically pass the same loaded dict for every event; compile it once
+    if _last_compiled is None or _last_compiled[0] is not aliases:
+        _last_compiled = (aliases, AliasIndex(aliases))
+    return _last_compiled[1]
 
 
-def map_event_to_signposts(event, aliases: dict = None) -> list[tuple[str, float, str]]:
+def match_aliases(text: str, aliases, max_signposts: int = 5) -> list[tuple[str, float, str]]:
     """
-    Map event to signposts using alias registry.
+    Match text against alias patterns and return (code, confidence, rationale) tuples.
 
-    Args:
-        event: Event object or dict with title/summary
-        aliases: Optional pre-loaded alias dict
+    Returns up to max_signposts per event (default 5, increased from 2 to capture
+    more connections between events and signposts).
 
-    Returns:
-        List of (signpost_code, confidence, tier) tuples
+    Args:
+        text: Text to match
+        aliases: Alias dict (compiled once and reused while the same dict is
+            passed), a compiled AliasIndex, or None for the process registry
+        max_signposts: Cap on returned matches
     """
-    if aliases is None:
-        aliases = load_aliases()
+    return _resolve_alias_index(aliases).match(text, max_signposts)
 
-    # Combine title and summary for matching
-    text = f"{event.get('title', '')} {event.get('summary', '')}" if isinstance(event, dict) else f"{event.title} {event.summary or ''}"
 
-    # Match aliases
-    candidates = match_aliases(text, aliases)
+def _event_text_and_tier(event) -> tuple[str, str]:
+    """Matching text (title + summary) and evidence tier for an Event or dict."""
+    if isinstance(event, dict):
+        return f"{event.get('title', '')} {event.get('summary', '')}", event.get("evidence_tier")
+    return f"{event.title} {event.summary or ''}", getattr(event, "evidence_tier", "D")
 
-    # Add tier from event
-    tier = event.get("evidence_tier") if isinstance(event, dict) else getattr(event, "evidence_tier", "D")
 
+def _apply_tier(candidates: list[tuple[str, float, str]], tier: str) -> list[tuple[str, float, str]]:
+    """Apply tier confidence adjustments to alias matches."""
     results = []
     for code, conf, rationale in candidates:
         # Apply tier adjustments (A gets +0.1, B gets +0.05, C/D get 0)
@@ -105,6 +241,40 @@ def map_event_to_signposts(event, aliases: dict = None) -> list[tuple[str, float
     return results
 
 
+def map_event_to_signposts(event, aliases=None) -> list[tuple[str, float, str]]:
+    """
+    Map event to signposts using alias registry.
+
+    Args:
+        event: Event object or dict with title/summary
+        aliases: Optional pre-loaded alias dict or AliasIndex
+
+    Returns:
+        List of (signpost_code, confidence, tier) tuples
+    """
+    text, tier = _event_text_and_tier(event)
+    return _apply_tier(match_aliases(text, aliases), tier)
+
+
+def map_events_batch(events: list, aliases=None) -> list[list[tuple[str, float, str]]]:
+    """
+    Map many events to signposts with a single registry lookup.
+
+    Args:
+        events: Event objects or dicts with title/summary
+        aliases: Optional pre-loaded alias dict or AliasIndex
+
+    Returns:
+        One list of (signpost_code, confidence, tier) tuples per event, in order
+    """
+    index = _resolve_alias_index(aliases)
+    results = []
+    for event in events:
+        text, tier = _event_text_and_tier(event)
+        results.append(_apply_tier(index.match(text), tier))
+    return results
+
+
 def needs_review(confidence: float, tier: str) -> bool:
     """Determine if event needs manual review based on confidence and tier."""
     # C/D always need review (they're "if true" only)
@@ -114,134 +284,248 @@ def needs_review(confidence: float, tier: str) -> bool:
     return confidence < 0.6
 
 
-def map_all_unmapped_events() -> dict:
+# Events per keyset page; each chunk is mapped, bulk-inserted and committed together
+MAPPING_CHUNK_SIZE = 500
+
+
+def iter_unmapped_event_chunks(db, chunk_size: int = MAPPING_CHUNK_SIZE):
+    """
+    Yield unmapped events in id order, one keyset page at a time.
+
+    Pages on Event.id > last seen id rather than OFFSET, so events mapped
+    (or left unmapped) by earlier chunks never shift later pages and each
+    page is an index range scan.
+    """
+    from app.models import Event, EventSignpostLink
+
+    last_id = 0
+    while True:
+        chunk = (
+            db.query(Event)
+            .outerjoin(EventSignpostLink)
+            .filter(EventSignpostLink.event_id.is_(None), Event.id > last_id)
+            .order_by(Event.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1].id
+
+
+def merge_llm_results(
+    event, results: list[tuple[str, float, str]], llm_results: list[tuple[str, float, str]]
+) -> list[tuple[str, float, str]]:
+    """
+    Merge LLM-suggested signposts into rule-based results.
+
+    Deduplicates by code, keeping the highest confidence.
+    """
+    result_dict = {code: (conf, tier) for code, conf, tier in results}
+    for code, conf, rationale in llm_results:
+        if code not in result_dict or conf > result_dict[code][0]:
+            result_dict[code] = (conf, event.evidence_tier)
+
+    return [(code, conf, tier) for code, (conf, tier) in result_dict.items()]
+
+
+def build_link_rows(event, results: list[tuple[str, float, str]], signpost_ids: dict[str, int]) -> list[dict]:
+    """
+    Build event_signpost_links rows for one event's mapping results.
+
+    Codes without a signpost are skipped.
+
+    Args:
+        event: Event being mapped
+        results: (signpost_code, confidence, tier) tuples
+        signpost_ids: Signpost code -> id map
+
+    Returns:
+        List of column dicts ready for a bulk INSERT
+    """
+    rows = []
+    for code, conf, tier in results:
+        signpost_id = signpost_ids.get(code)
+        if signpost_id is None:
+            continue
+
+        # Determine provisional status based on tier
+        # A tier: provisional=False (direct evidence, CAN move gauges)
+        # B tier: provisional=True (needs A-tier corroboration within 14 days)
+        # C/D tier: provisional=True (ALWAYS provisional, NEVER moves gauges)
+        provisional = tier in ("B", "C", "D")
+
+        # Policy: C/D tier adds rationale note
+        rationale = f"Auto-mapped via alias registry (conf={conf:.2f})"
+        if tier in ("C", "D"):
+            rationale += " [C/D tier: displayed but NEVER moves gauges]"
+        elif tier == "B":
+            rationale += " [B-tier: provisional until A-tier corroboration]"
+
+        rows.append({
+            "event_id": event.id,
+            "signpost_id": signpost_id,
+            "confidence": conf,
+            "tier": tier,
+            "provisional": provisional,
+            "rationale": rationale,
+            "observed_at": event.published_at or event.ingested_at,
+            "value": None,
+        })
+    return rows
+
+
+def insert_links_statement(rows: list[dict]):
+    """Multi-row INSERT of link rows that skips (event_id, signpost_id) pairs already present."""
+    from sqlalchemy.dialects.postgresql import insert
+
+    from app.models import EventSignpostLink
+
+    return (
+        insert(EventSignpostLink)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["event_id", "signpost_id"])
+        .returning(EventSignpostLink.event_id)
+    )
+
+
+def map_all_unmapped_events(chunk_size: int = MAPPING_CHUNK_SIZE) -> dict:
     """
     Map all events that don't have signpost links yet.
 
-    Uses rule-based aliases first, then LLM fallback if enabled and budget allows.
+    Uses rule-based aliases first, then LLM augmentation if enabled. Events are
+    streamed in keyset-paginated chunks; each chunk's links go out as one
+    INSERT ... ON CONFLICT DO NOTHING, its event flags as one bulk UPDATE,
+    and the chunk is committed once.
+
+    Args:
+        chunk_size: Events per chunk
 
     Returns:
-        Statistics dict with processed/linked/needs_review/unmapped counts
+        Statistics dict with processed/linked/needs_review/unmapped counts,
+        links_created, and events_per_sec/links_per_sec throughput
     """
+    import time
     from datetime import datetime
 
+    from sqlalchemy import update
+
     from app.config import settings
     from app.database import SessionLocal
-    from app.models import Event, EventSignpostLink, Signpost
+    from app.models import Event, Signpost
+    from app.services.signpost_values import mark_signposts_stale
+    from app.utils.llm_news_parser import parse_events_with_llm
 
     db = SessionLocal()
-    stats = {"processed": 0, "linked": 0, "needs_review": 0, "unmapped": 0, "llm_used": 0}
+    stats = {
+        "processed": 0, "linked": 0, "needs_review": 0, "unmapped": 0, "llm_used": 0,
+        "links_created": 0, "chunks": 0,
+    }
+    started = time.perf_counter()
 
     try:
-        # Find events without links
-        events = db.query(Event).outerjoin(EventSignpostLink).filter(
-            EventSignpostLink.event_id.is_(None)
-        ).all()
-
-        print(f"📍 Mapping {len(events)} unmapped events to signposts...")
-        aliases = load_aliases()
-
-        # Get all signpost codes for LLM
-        all_signpost_codes = [sp.code for sp in db.query(Signpost.code).all()]
+        print("📍 Mapping unmapped events to signposts...")
+        from app.utils.b_tier_corroboration import check_b_tier_corroboration, corroboration_watermark
+
+        # Only links written from here on need the post-mapping corroboration pass
+        corroboration_since = corroboration_watermark(db)
+        alias_index = get_alias_index()
+
+        # Signpost code -> id, loaded once for all chunks (codes also feed the LLM)
+        signpost_ids = dict(db.query(Signpost.code, Signpost.id).all())
+        all_signpost_codes = list(signpost_ids)
+        use_llm = settings.enable_llm_mapping and settings.openai_api_key
+
+        for events in iter_unmapped_event_chunks(db, chunk_size):
+            # Rule-based matching for the whole chunk in one pass
+            alias_results = map_events_batch(events, alias_index)
+
+            link_rows = []
+            max_conf_by_event = {}
+            event_updates = []
+
+            # LLM augmentation: Run on ALL events to enhance rule-based results.
+            # The chunk's requests run concurrently; failures yield [] per event.
+            if use_llm:
+                llm_results = parse_events_with_llm(
+                    [(event.title, event.summary or "", event.evidence_tier) for event in events],
+                    all_signpost_codes,
+                )
+            else:
+                llm_results = [[]] * len(events)
 
-        for event in events:
-            # Try rule-based first
-            results = map_event_to_signposts(event, aliases)
-            stats["processed"] += 1
+            for event, results, suggestions in zip(events, alias_results, llm_results):
+                stats["processed"] += 1
 
-            # LLM augmentation: Run on ALL events to enhance rule-based results
-            # This provides richer context and can catch implicit connections
-            if settings.enable_llm_mapping and settings.openai_api_key:
-                try:
-                    from app.utils.llm_news_parser import parse_event_with_llm
-                    llm_results = parse_event_with_llm(
-                        event.title,
-                        event.summary or "",
-                        all_signpost_codes,
-                        event.evidence_tier
-                    )
-
-                    if llm_results:
-                        # Merge LLM results with rule-based results
-                        # Deduplicate by code, keeping highest confidence
-                        result_dict = {code: (conf, tier) for code, conf, tier in results}
-                        for code, conf, rationale in llm_results:
-                            if code not in result_dict or conf > result_dict[code][0]:
-                                result_dict[code] = (conf, event.evidence_tier)
-
-                        # Rebuild results list
-                        results = [(code, conf, tier) for code, (conf, tier) in result_dict.items()]
-                        stats["llm_used"] += 1
-
-                        if llm_results:
-                            print(f"  🤖 LLM augmentation added {len(llm_results)} signposts for: {event.title[:50]}...")
-                except Exception as e:
-                    print(f"  ⚠️  LLM augmentation failed: {e}")
-                    # Continue with rule-based results only
-
-            if not results:
-                stats["unmapped"] += 1
-                event.needs_review = True
-                db.commit()
-                continue
+                if suggestions:
+                    results = merge_llm_results(event, results, suggestions)
+                    stats["llm_used"] += 1
 
-            # Create links
-            links_created = 0
-            max_conf = 0.0
-            for code, conf, tier in results:
-                signpost = db.query(Signpost).filter(Signpost.code == code).first()
-                if not signpost:
+                if not results:
+                    stats["unmapped"] += 1
+                    event_updates.append({"id": event.id, "needs_review": True})
                     continue
 
-                # Determine provisional status based on tier
-                # A tier: provisional=False (direct evidence, CAN move gauges)
-                # B tier: provisional=True (needs A-tier corroboration within 14 days)
-                # C/D tier: provisional=True (ALWAYS provisional, NEVER moves gauges)
-                provisional = tier in ("B", "C", "D")
-
-                # Policy: C/D tier adds rationale note
-                rationale = f"Auto-mapped via alias registry (conf={conf:.2f})"
-                if tier in ("C", "D"):
-                    rationale += " [C/D tier: displayed but NEVER moves gauges]"
-                elif tier == "B":
-                    rationale += " [B-tier: provisional until A-tier corroboration]"
-
-                link = EventSignpostLink(
-                    event_id=event.id,
-                    signpost_id=signpost.id,
-                    confidence=conf,
-                    tier=tier,  # Phase A: Add tier field
-                    provisional=provisional,  # Phase A: Add provisional field
-                    rationale=rationale,
-                    observed_at=event.published_at or event.ingested_at,
-                    value=None,
-                )
-                db.add(link)
-                links_created += 1
-                max_conf = max(max_conf, conf)
-
-            if links_created > 0:
-                stats["linked"] += 1
+                rows = build_link_rows(event, results, signpost_ids)
+                if rows:
+                    link_rows.extend(rows)
+                    max_conf_by_event[event.id] = max(row["confidence"] for row in rows)
+
+            linked_ids = set()
+            if link_rows:
+                inserted = db.execute(insert_links_statement(link_rows)).scalars().all()
+                stats["links_created"] += len(inserted)
+                linked_ids = set(inserted)
+                # Core INSERT bypasses the ORM hooks; refresh these signposts' values on commit
+                mark_signposts_stale(db, {row["signpost_id"] for row in link_rows if row["event_id"] in linked_ids})
+
+            mapped_at = datetime.now(UTC).isoformat()
+            for event in events:
+                if event.id not in linked_ids:
+                    continue
+                max_conf = max_conf_by_event[event.id]
                 # Set needs_review based on tier and confidence
-                event.needs_review = needs_review(max_conf, event.evidence_tier)
-                if event.needs_review:
+                review = needs_review(max_conf, event.evidence_tier)
+                stats["linked"] += 1
+                if review:
                     stats["needs_review"] += 1
-                event.parsed = {
-                    **(event.parsed or {}),
-                    "mapped_at": datetime.now(UTC).isoformat(),
-                    "max_confidence": max_conf,
-                }
-                db.commit()
-                print(f"  ✓ Mapped: {event.title[:50]}... → {links_created} signposts (conf: {max_conf:.2f})")
+                event_updates.append({
+                    "id": event.id,
+                    "needs_review": review,
+                    "parsed": {
+                        **(event.parsed or {}),
+                        "mapped_at": mapped_at,
+                        "max_confidence": max_conf,
+                    },
+                })
+
+            if event_updates:
+                db.execute(update(Event), event_updates)
+            db.commit()
+            # Drop the chunk's objects so memory stays flat across the backlog
+            db.expunge_all()
+
+            stats["chunks"] += 1
+            elapsed = time.perf_counter() - started
+            print(
+                f"  ✓ Chunk {stats['chunks']}: {stats['processed']} events, "
+                f"{stats['links_created']} links ({stats['processed'] / elapsed:.0f} events/s)"
+            )
+
+        elapsed = time.perf_counter() - started
+        stats["elapsed_s"] = round(elapsed, 2)
+        stats["events_per_sec"] = round(stats["processed"] / elapsed, 1) if elapsed else 0.0
+        stats["links_per_sec"] = round(stats["links_created"] / elapsed, 1) if elapsed else 0.0
 
         # After mapping, check for B-tier corroboration
         print("\n🔗 Checking B-tier corroboration...")
-        from app.utils.b_tier_corroboration import check_b_tier_corroboration
-        corroboration_stats = check_b_tier_corroboration(db)
+        corroboration_stats = check_b_tier_corroboration(db, since=corroboration_since)
         stats["corroborated"] = corroboration_stats.get("corroborated", 0)
 
         print("\n✅ Mapping complete!")
         print(f"   Processed: {stats['processed']}, Linked: {stats['linked']}, Needs review: {stats['needs_review']}, Unmapped: {stats['unmapped']}")
+        print(f"   Links: {stats['links_created']} ({stats['events_per_sec']} events/s, {stats['links_per_sec']} links/s)")
         print(f"   Corroborated: {stats['corroborated']}")
         return stats
 
@@ -0,0 +1,104 @@
+"""
+Shared event serialization for event-returning endpoints.
+
+Every endpoint that returns events loads their signpost links and linked
+signposts with with_signpost_links(), which adds one SELECT ... IN query for
+the links (signposts joined in) to the event query. Serializing then never
+touches the database, so a page costs the same number of queries whether it
+holds 10 events or 100.
+
+Usage:
+    query = with_signpost_links(query_active_events(select(Event)))
+    events = (await db.execute(query.limit(50))).scalars().all()
+    results = [serialize_event(event) for event in events]
+"""
+from sqlalchemy.orm import selectinload
+
+from app.models import Event, EventSignpostLink
+
+
+def with_signpost_links(query):
+    """
+    Eager-load each event's signpost links and their signposts.
+
+    Works with both select(Event) statements (async sessions) and legacy
+    db.query(Event) queries.
+    """
+    return query.options(selectinload(Event.signpost_links).joinedload(EventSignpostLink.signpost))
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _float(value):
+    return float(value) if value else None
+
+
+def serialize_signpost_link(link: EventSignpostLink) -> dict:
+    """Serialize an event -> signpost link with its (eager-loaded) signpost."""
+    signpost = link.signpost
+    return {
+        "signpost_id": signpost.id,
+        "signpost_code": signpost.code,
+        "signpost_name": signpost.name,
+        # alias for web UI
+        "signpost_title": signpost.name,
+        "category": signpost.category,
+        "confidence": _float(link.confidence),
+        "value": _float(link.value),
+        "tier": link.tier,
+        "provisional": link.provisional,
+        "observed_at": _isoformat(link.observed_at),
+    }
+
+
+def serialize_signpost_links(event: Event) -> list[dict]:
+    """Serialize an event's links, skipping any whose signpost no longer exists."""
+    return [serialize_signpost_link(link) for link in event.signpost_links if link.signpost]
+
+
+def serialize_event(event: Event) -> dict:
+    """
+    Serialize an event for list/search responses.
+
+    Expects signpost links to be eager-loaded (see with_signpost_links).
+    """
+    return {
+        "id": event.id,
+        "title": event.title,
+        "summary": event.summary,
+        "source_url": event.source_url,
+        "publisher": event.publisher,
+        "published_at": _isoformat(event.published_at),
+        # aliases for web UI compatibility
+        "date": _isoformat(event.published_at),
+        "evidence_tier": event.evidence_tier,
+        "tier": event.evidence_tier,
+        "source_type": event.source_type,
+        "provisional": event.provisional,
+        "needs_review": event.needs_review,
+        "url_is_valid": event.url_is_valid,
+        "story_cluster_id": event.story_cluster_id,
+        "signpost_links": serialize_signpost_links(event),
+    }
+
+
+def serialize_feed_item(event: Event) -> dict:
+    """Serialize an event for the public/research JSON feed (stable feed schema)."""
+    return {
+        "title": event.title,
+        "summary": event.summary,
+        "url": event.source_url,
+        "publisher": event.publisher,
+        "date": _isoformat(event.published_at),
+        "tier": event.evidence_tier,
+        "provisional": event.provisional,
+        "url_is_valid": event.url_is_valid,
+        "story_cluster_id": event.story_cluster_id,
+        "signposts": [
+            {"code": link.signpost.code, "confidence": _float(link.confidence)}
+            for link in event.signpost_links
+            if link.signpost
+        ],
+    }
@@ -0,0 +1,189 @@
+"""
+Bulk event writer shared by the news connectors.
+
+Connectors normalize a whole feed first, then hand the rows to
+upsert_events(), which writes each batch with one
+INSERT ... ON CONFLICT (dedup_hash) DO UPDATE ... RETURNING instead of
+SELECT-then-INSERT per item. Each batch runs in its own SAVEPOINT, so a bad
+row only costs its own batch (which is then retried row by row) rather than
+rolling back everything ingested earlier in the run.
+
+Matching follows the old per-connector create_or_update_event: dedup_hash
+first, then source_url / content_hash for rows whose hash is missing or
+changed. Matched events get the incoming non-null values; NULLs keep the
+stored value.
+
+New events are then fingerprinted into near-duplicate story clusters
+(app/services/event_clusters.py) in the same transaction.
+"""
+from sqlalchemy import func, literal_column, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models import Event
+from app.services.event_clusters import assign_story_clusters
+
+INGEST_BATCH_SIZE = 200
+
+
+def dedupe_rows(rows: list[dict]) -> list[dict]:
+    """
+    Collapse rows describing the same event within one feed.
+
+    Rows sharing a dedup_hash or source_url are merged in order, later
+    non-null values winning, just as sequential create_or_update_event calls
+    would have left the stored event.
+    """
+    merged = []
+    by_key = {}
+
+    for row in rows:
+        keys = [("dedup", row.get("dedup_hash")), ("url", row.get("source_url"))]
+        keys = [key for key in keys if key[1]]
+        target = next((by_key[key] for key in keys if key in by_key), None)
+
+        if target is None:
+            target = dict(row)
+            merged.append(target)
+        else:
+            target.update({k: v for k, v in row.items() if v is not None})
+
+        for key in keys:
+            by_key[key] = target
+
+    return merged
+
+
+def _match_existing(db: Session, rows: list[dict]) -> dict[int, int]:
+    """
+    Find events a row must update in place because its dedup_hash won't match.
+
+    One query per batch looks up the rows' source_urls and content_hashes;
+    a hit whose stored dedup_hash differs from the row's (or is NULL) means
+    the ON CONFLICT arbiter would miss it.
+
+    Returns:
+        {row index: existing event id}
+    """
+    urls = [row["source_url"] for row in rows if row.get("source_url")]
+    content_hashes = [row["content_hash"] for row in rows if row.get("content_hash")]
+
+    conditions = [Event.source_url.in_(urls)] if urls else []
+    if content_hashes:
+        conditions.append(Event.content_hash.in_(content_hashes))
+    if not conditions:
+        return {}
+
+    by_url, by_content = {}, {}
+    for event_id, source_url, content_hash, dedup_hash in db.execute(
+        select(Event.id, Event.source_url, Event.content_hash, Event.dedup_hash).where(or_(*conditions))
+    ):
+        by_url[source_url] = (event_id, dedup_hash)
+        if content_hash:
+            by_content[content_hash] = (event_id, dedup_hash)
+
+    matches = {}
+    for i, row in enumerate(rows):
+        existing = by_url.get(row.get("source_url")) or by_content.get(row.get("content_hash"))
+        if existing and (not row.get("dedup_hash") or existing[1] != row["dedup_hash"]):
+            matches[i] = existing[0]
+    return matches
+
+
+def upsert_statement(rows: list[dict]):
+    """
+    INSERT ... ON CONFLICT (dedup_hash) DO UPDATE ... RETURNING for one batch.
+
+    The conflict target matches the partial unique index
+    idx_events_dedup_hash_unique. RETURNING reports (id, inserted), where
+    inserted is true for new rows (xmax = 0) and false for updated ones.
+    All rows must share the same keys (they come from one normalizer).
+    """
+    columns = list(rows[0])
+    stmt = insert(Event).values([{column: row.get(column) for column in columns} for row in rows])
+    table = Event.__table__
+
+    return stmt.on_conflict_do_update(
+        index_elements=["dedup_hash"],
+        index_where=Event.dedup_hash.isnot(None),
+        set_={
+            column: func.coalesce(stmt.excluded[column], table.c[column])
+            for column in columns
+            if column != "dedup_hash"
+        },
+    ).returning(Event.id, literal_column("xmax = 0").label("inserted"))
+
+
+def _write_batch(db: Session, rows: list[dict]) -> dict[str, int]:
+    """Write one batch: in-place updates for URL/content matches, one upsert for the rest."""
+    counts = {"inserted": 0, "updated": 0}
+    matches = _match_existing(db, rows)
+
+    if matches:
+        db.execute(update(Event), [
+            {"id": event_id, **{k: v for k, v in rows[i].items() if v is not None}}
+            for i, event_id in matches.items()
+        ])
+        counts["updated"] += len(matches)
+
+    remaining = [row for i, row in enumerate(rows) if i not in matches]
+    if remaining:
+        for _, inserted in db.execute(upsert_statement(remaining)):
+            counts["inserted" if inserted else "updated"] += 1
+
+    return counts
+
+
+def upsert_events(db: Session, rows: list[dict], batch_size: int = INGEST_BATCH_SIZE) -> dict[str, int]:
+    """
+    Insert or update normalized events in batches.
+
+    Does not commit; the connector commits once with its IngestRun update.
+
+    Args:
+        db: Database session
+        rows: Normalized event dicts (output of a connector's normalize_event_data)
+        batch_size: Rows per INSERT statement
+
+    Returns:
+        {"inserted", "updated", "errors"} counts (plus "clustered" when new
+        events were clustered); in-feed duplicates merged into another row
+        count as updated
+    """
+    stats = {"inserted": 0, "updated": 0, "errors": 0}
+    unique_rows = dedupe_rows(rows)
+    stats["updated"] += len(rows) - len(unique_rows)
+
+    for start in range(0, len(unique_rows), batch_size):
+        batch = unique_rows[start:start + batch_size]
+        try:
+            with db.begin_nested():
+                counts = _write_batch(db, batch)
+        except SQLAlchemyError as e:
+            # Isolate the offending row(s): retry this batch one row per savepoint
+            print(f"  ⚠️  Batch upsert failed ({e.__class__.__name__}); retrying {len(batch)} rows individually")
+            counts = {"inserted": 0, "updated": 0}
+            for row in batch:
+                try:
+                    with db.begin_nested():
+                        row_counts = _write_batch(db, [row])
+                    counts["inserted"] += row_counts["inserted"]
+                    counts["updated"] += row_counts["updated"]
+                except SQLAlchemyError as row_error:
+                    stats["errors"] += 1
+                    print(f"  ❌ Error writing event {row.get('source_url')}: {row_error}")
+
+        stats["inserted"] += counts["inserted"]
+        stats["updated"] += counts["updated"]
+
+    # Cluster near-duplicates (the same story from other outlets) of new events
+    if stats["inserted"]:
+        try:
+            with db.begin_nested():
+                stats["clustered"] = assign_story_clusters(db)
+        except SQLAlchemyError as e:
+            # Events stay unclustered (minhash NULL) and are picked up by the next run
+            print(f"  ⚠️  Story clustering failed ({e.__class__.__name__}); retrying next run")
+
+    return stats
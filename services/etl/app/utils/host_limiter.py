@@ -0,0 +1,65 @@
+"""
+Per-host concurrency and pacing for outbound HTTP.
+
+Batch fetchers (feed waves, URL validation) run many requests at once but
+must stay polite to each host. HostLimiter bounds the requests in flight per
+host and spaces them out, measured either between request starts (a steady
+request rate, for hosts that can take a few parallel requests) or from the
+end of one request to the start of the next (a pause between sequential
+requests, for crawl-delay style politeness).
+"""
+import asyncio
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+SPACINGS = ("start", "end")
+
+
+class HostLimiter:
+    """At most `concurrency` requests in flight per host, spaced `interval` seconds apart."""
+
+    def __init__(self, concurrency: int = 1, interval: float = 0.0, spacing: str = "start", clock=time.monotonic):
+        """
+        Args:
+            concurrency: Requests in flight per host
+            interval: Minimum gap in seconds between requests to one host
+            spacing: "start" (gap between request starts) or "end" (gap from a
+                request finishing to the next one starting)
+            clock: Monotonic clock (injectable for tests)
+        """
+        if spacing not in SPACINGS:
+            raise ValueError(f"spacing must be one of {SPACINGS}, got {spacing!r}")
+        self.interval = interval
+        self.spacing = spacing
+        self.clock = clock
+        self._semaphores = defaultdict(lambda: asyncio.Semaphore(concurrency))
+        self._next_start = {}
+
+    @asynccontextmanager
+    async def slot(self, host: str, gate: asyncio.Semaphore | None = None):
+        """
+        Hold a request slot for a host.
+
+        Args:
+            host: Host name
+            gate: Global concurrency cap, acquired after the host slot so that
+                waiting on a busy host never holds a global slot
+        """
+        async with self._semaphores[host]:
+            now = self.clock()
+            start = max(now, self._next_start.get(host, now))
+            if self.spacing == "start":
+                # Reserve the next start time before sleeping so waiters queue up behind it
+                self._next_start[host] = start + self.interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            try:
+                if gate is None:
+                    yield
+                else:
+                    async with gate:
+                        yield
+            finally:
+                if self.spacing == "end":
+                    self._next_start[host] = self.clock() + self.interval
@@ -7,48 +7,54 @@ Uses OpenAI to:
 3. Assess confidence and rationale
 
 Enabled when OPENAI_API_KEY is set and LLM budget available.
+
+Requests share one pooled OpenAI client, spend is reserved against the daily
+budget before each request is dispatched, and responses are cached in Redis
+by prompt hash so re-running the mapper over the same events doesn't pay
+twice. parse_events_with_llm() fans a batch out over a bounded thread pool.
 """
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
 from openai import OpenAI
 
 from app.config import settings
-from app.tasks.llm_budget import add_spend, can_spend
+from app.tasks.llm_budget import get_redis_client, release_spend, reserve_spend
 
+MODEL = "gpt-4o-mini"
+CACHE_KEY_PREFIX = "llm_event_map:"
 
-def parse_event_with_llm(
-    title: str,
-    summary: str,
-    signpost_codes: list[str],
-    tier: str
-) -> list[tuple[str, float, str]]:
-    """
-    Use OpenAI to parse event and map to signposts.
+# Estimate cost: ~500 tokens @ $0.15/1M = $0.000075
+ESTIMATED_COST_USD = 0.0001
 
-    Args:
-        title: Event title
-        summary: Event summary
-        signpost_codes: Available signpost codes to choose from
-        tier: Evidence tier (A/B/C/D)
+_client = None
+_client_lock = threading.Lock()
 
-    Returns:
-        List of (signpost_code, confidence, rationale) tuples
-    """
-    if not settings.openai_api_key:
-        return []
 
-    # Estimate cost: ~500 tokens @ $0.15/1M = $0.000075
-    estimated_cost = 0.0001
-    if not can_spend(estimated_cost):
-        return []
+def get_openai_client() -> OpenAI:
+    """Shared OpenAI client over a pooled httpx transport (thread-safe, created once)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # Initialize OpenAI client without deprecated proxies parameter
+                pool_size = max(settings.llm_mapping_concurrency, 1)
+                _client = OpenAI(
+                    api_key=settings.openai_api_key,
+                    http_client=httpx.Client(
+                        timeout=30.0,
+                        limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+                    ),
+                )
+    return _client
 
-    try:
-        # Initialize OpenAI client without deprecated proxies parameter
-        import httpx
-        client = OpenAI(
-            api_key=settings.openai_api_key,
-            http_client=httpx.Client(timeout=30.0)
-        )
 
-        prompt = f"""You are an AI progress analyst. Given this news event, identify which AGI signposts it relates to.
+def build_prompt(title: str, summary: str, signpost_codes: list[str], tier: str) -> str:
+    """Build the signpost-mapping prompt for one event."""
+    return f"""You are an AI progress analyst. Given this news event, identify which AGI signposts it relates to.
 
 Event title: {title}
 Event summary: {summary}
@@ -83,31 +89,131 @@ If the event doesn't clearly relate to any signpost, return empty signposts arra
 Confidence scoring: 0.9+ = explicit mention, 0.7-0.9 = strong implication, 0.5-0.7 = weak connection.
 """
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.1,
-            max_tokens=300,
-            response_format={"type": "json_object"}
-        )
-
-        # Track spend
-        add_spend(estimated_cost)
-
-        # Parse response
-        import json
-        result = json.loads(response.choices[0].message.content)
-
-        matches = []
-        for sp in result.get("signposts", [])[:2]:  # Cap at 2
-            code = sp.get("code")
-            if code in signpost_codes:
-                conf = float(sp.get("confidence", 0.5))
-                rationale = sp.get("rationale", "LLM-identified relevance")
-                matches.append((code, conf, f"LLM: {rationale}"))
 
+def prompt_cache_key(prompt: str) -> str:
+    """Redis key for a prompt's cached response (hash of model + prompt)."""
+    digest = hashlib.sha256(f"{MODEL}\n{prompt}".encode()).hexdigest()
+    return f"{CACHE_KEY_PREFIX}{digest}"
+
+
+def parse_llm_response(content: str, signpost_codes: list[str]) -> list[tuple[str, float, str]]:
+    """Turn the model's JSON reply into (code, confidence, rationale) tuples."""
+    result = json.loads(content)
+
+    matches = []
+    for sp in result.get("signposts", [])[:2]:  # Cap at 2
+        code = sp.get("code")
+        if code in signpost_codes:
+            conf = float(sp.get("confidence", 0.5))
+            rationale = sp.get("rationale", "LLM-identified relevance")
+            matches.append((code, conf, f"LLM: {rationale}"))
+
+    return matches
+
+
+def _get_cached_response(key: str) -> str | None:
+    cache = get_redis_client()
+    if not cache:
+        return None
+    try:
+        cached = cache.get(key)
+    except Exception:
+        return None
+    return cached.decode() if isinstance(cached, bytes) else cached
+
+
+def _set_cached_response(key: str, content: str) -> None:
+    cache = get_redis_client()
+    if not cache:
+        return
+    try:
+        cache.setex(key, settings.llm_mapping_cache_ttl_days * 86400, content)
+    except Exception as e:
+        print(f"⚠️  Could not cache LLM response: {e}")
+
+
+def parse_event_with_llm(
+    title: str,
+    summary: str,
+    signpost_codes: list[str],
+    tier: str
+) -> list[tuple[str, float, str]]:
+    """
+    Use OpenAI to parse event and map to signposts.
+
+    Cached responses are reused without spending budget. Otherwise spend is
+    reserved before the request and released if it fails.
+
+    Args:
+        title: Event title
+        summary: Event summary
+        signpost_codes: Available signpost codes to choose from
+        tier: Evidence tier (A/B/C/D)
+
+    Returns:
+        List of (signpost_code, confidence, rationale) tuples
+    """
+    if not settings.openai_api_key:
+        return []
+
+    prompt = build_prompt(title, summary, signpost_codes, tier)
+    key = prompt_cache_key(prompt)
+
+    try:
+        cached = _get_cached_response(key)
+        if cached is not None:
+            return parse_llm_response(cached, signpost_codes)
+
+        if not reserve_spend(ESTIMATED_COST_USD):
+            return []
+
+        try:
+            response = get_openai_client().chat.completions.create(
+                model=MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.1,
+                max_tokens=300,
+                response_format={"type": "json_object"}
+            )
+        except Exception:
+            release_spend(ESTIMATED_COST_USD)
+            raise
+
+        content = response.choices[0].message.content
+        matches = parse_llm_response(content, signpost_codes)
+        _set_cached_response(key, content)
         return matches
 
     except Exception as e:
         print(f"⚠️  LLM parsing failed: {e}")
         return []
+
+
+def parse_events_with_llm(
+    events: list[tuple[str, str, str]],
+    signpost_codes: list[str],
+    max_workers: int | None = None,
+) -> list[list[tuple[str, float, str]]]:
+    """
+    Run parse_event_with_llm over many events with bounded concurrency.
+
+    The calls are network-bound, so a thread pool sharing the pooled client
+    overlaps their latency; budget reservation keeps the daily limit exact.
+
+    Args:
+        events: (title, summary, tier) per event
+        signpost_codes: Available signpost codes to choose from
+        max_workers: Concurrent requests (default settings.llm_mapping_concurrency)
+
+    Returns:
+        One result list per event, in input order
+    """
+    if not events:
+        return []
+
+    workers = max(1, min(max_workers or settings.llm_mapping_concurrency, len(events)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-map") as pool:
+        return list(pool.map(
+            lambda event: parse_event_with_llm(event[0], event[1], signpost_codes, event[2]),
+            events,
+        ))
@@ -0,0 +1,34 @@
+"""Lightweight SQL statement counting for performance instrumentation."""
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+@contextmanager
+def count_queries(db: Session):
+    """
+    Count SQL statements executed on a session's connection.
+
+    Yields a dict whose "count" key is updated as statements run, so callers
+    can read it after the block exits (or mid-block for progress logging).
+
+    Args:
+        db: Database session to instrument
+
+    Example:
+        with count_queries(db) as stats:
+            db.query(Signpost).all()
+        print(stats["count"])  # 1
+    """
+    stats = {"count": 0}
+    connection = db.connection()
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats["count"] += 1
+
+    event.listen(connection, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield stats
+    finally:
+        event.remove(connection, "before_cursor_execute", _before_cursor_execute)
@@ -0,0 +1,330 @@
+"""
+Shared robots.txt policy cache.
+
+check_robots_txt used to build a new RobotFileParser and download
+/robots.txt on every fetch, so a multi-page scrape made two requests per
+page and the async fetch path blocked on a synchronous round trip.
+RobotsPolicyStore caches one policy per origin (scheme://host[:port]):
+
+- in process: parsed policies, evicted after their TTL (LRU-bounded)
+- in Redis: the raw robots.txt status + body under robots:{origin}, so
+  every API worker and Celery task downloads a host's robots.txt once per
+  TTL; local entries expire with the shared one
+- negative caching: a 4xx (no robots.txt) is cached for the full TTL like
+  a real file; a 5xx (disallow all, as RobotFileParser.read() and RFC 9309
+  treat it) and network errors (permissive) are cached for
+  ROBOTS_ERROR_TTL so a flaky host isn't hit before every page
+- async lookups fetch with httpx, and concurrent lookups for one origin
+  share a single download (sync lookups the same, per thread lock)
+
+Lookup counters (local hits, shared hits, fetches, fetch errors) are
+aggregated in Redis and reported by get_robots_cache_stats().
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+import redis
+
+from app.config import settings
+from app.utils.scraper_helpers import get_user_agent
+
+KEY_PREFIX = "robots:"
+STATS_KEY = f"{KEY_PREFIX}stats"
+STATS_FIELDS = ("lookups", "local_hits", "shared_hits", "fetches", "fetch_errors")
+STATS_FLUSH_EVERY = 100  # Local lookups between counter flushes to Redis
+
+LOCAL_MAX_ORIGINS = 1024
+MAX_ROBOTS_BYTES = 512 * 1024  # RFC 9309: parse at least the first 500 KiB
+FETCH_TIMEOUT_SECONDS = 10.0
+
+
+def get_redis_client() -> redis.Redis | None:
+    """Redis client for the shared robots.txt cache, or None if unavailable."""
+    try:
+        return redis.from_url(settings.redis_url, decode_responses=True)
+    except Exception as e:
+        print(f"⚠️  Redis unavailable for robots.txt cache: {e}")
+        return None
+
+
+def robots_origin(url: str) -> str:
+    """Cache key of the robots.txt that governs a URL (scheme://host[:port])."""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}".lower()
+
+
+def build_policy(status: int | None, body: str = "") -> RobotFileParser:
+    """
+    Parse a robots.txt fetch result.
+
+    Args:
+        status: HTTP status of /robots.txt (None if the fetch failed)
+        body: robots.txt content (used for 2xx only)
+
+    Returns:
+        RobotFileParser with the same semantics as RobotFileParser.read():
+        401/403 and 5xx disallow everything (RFC 9309: a server error means
+        the site is unreachable), other 4xx allow everything. Network errors
+        are allowed, as before (permissive fallback).
+    """
+    policy = RobotFileParser()
+    if status is None:
+        policy.allow_all = True
+    elif status in (401, 403) or status >= 500:
+        policy.disallow_all = True
+    elif status >= 400:
+        policy.allow_all = True
+    else:
+        policy.parse(body.splitlines())
+    return policy
+
+
+class RobotsPolicyStore:
+    """Per-origin robots.txt policies cached in process and in Redis."""
+
+    def __init__(
+        self,
+        redis_client=None,
+        ttl: int | None = None,
+        error_ttl: int | None = None,
+        clock=time.time,
+    ):
+        self.ttl = ttl if ttl is not None else settings.robots_cache_ttl_seconds
+        self.error_ttl = error_ttl if error_ttl is not None else settings.robots_error_ttl_seconds
+        self.clock = clock
+        self._redis = redis_client
+        self._redis_checked = redis_client is not None
+        self._local = OrderedDict()  # origin -> (expires_at, policy)
+        self._lock = threading.Lock()
+        self._fetch_locks = defaultdict(threading.Lock)
+        self._inflight = {}  # origin -> asyncio.Future (single-flight for async lookups)
+        self._pending = Counter()
+
+    # Storage
+
+    def _get_redis(self):
+        if not self._redis_checked:
+            self._redis = get_redis_client()
+            self._redis_checked = True
+        return self._redis
+
+    def _local_get(self, origin: str) -> RobotFileParser | None:
+        with self._lock:
+            entry = self._local.get(origin)
+            if entry is None:
+                return None
+            if entry[0] <= self.clock():
+                del self._local[origin]
+                return None
+            self._local.move_to_end(origin)
+            return entry[1]
+
+    def _local_put(self, origin: str, policy: RobotFileParser, ttl: float) -> None:
+        with self._lock:
+            self._local[origin] = (self.clock() + ttl, policy)
+            self._local.move_to_end(origin)
+            while len(self._local) > LOCAL_MAX_ORIGINS:
+                self._local.popitem(last=False)
+
+    def _shared_get(self, origin: str) -> tuple[dict, int] | None:
+        """Stored fetch result and its remaining TTL, or None."""
+        r = self._get_redis()
+        if not r:
+            return None
+        try:
+            pipe = r.pipeline(transaction=False)
+            pipe.get(KEY_PREFIX + origin)
+            pipe.ttl(KEY_PREFIX + origin)
+            value, ttl = pipe.execute()
+        except redis.RedisError as e:
+            print(f"⚠️  Could not read robots.txt cache for {origin}: {e}")
+            return None
+        if not value:
+            return None
+        return json.loads(value), ttl if ttl and ttl > 0 else self.error_ttl
+
+    def _shared_put(self, origin: str, record: dict, ttl: int) -> None:
+        r = self._get_redis()
+        if not r:
+            return
+        try:
+            r.set(KEY_PREFIX + origin, json.dumps(record), ex=ttl)
+        except redis.RedisError as e:
+            print(f"⚠️  Could not store robots.txt cache for {origin}: {e}")
+
+    def _count(self, **counters) -> None:
+        with self._lock:
+            self._pending.update(counters)
+            if self._pending["lookups"] < STATS_FLUSH_EVERY:
+                return
+        self.flush_stats()
+
+    def flush_stats(self) -> None:
+        """Add the locally counted lookups to the shared counters."""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        r = self._get_redis()
+        if not r or not pending:
+            return
+        try:
+            pipe = r.pipeline(transaction=False)
+            for name, value in pending.items():
+                pipe.hincrby(STATS_KEY, name, value)
+            pipe.execute()
+        except redis.RedisError as e:
+            print(f"⚠️  Could not record robots.txt cache stats: {e}")
+
+    # Fetching
+
+    def _record(self, response: httpx.Response | None) -> tuple[dict, int]:
+        """Cacheable fetch result and its TTL (errors get the short TTL)."""
+        if response is None:
+            return {"status": None, "body": ""}, self.error_ttl
+        record = {"status": response.status_code, "body": ""}
+        if response.status_code < 300:
+            record["body"] = response.content[:MAX_ROBOTS_BYTES].decode("utf-8", errors="ignore")
+        return record, self.error_ttl if response.status_code >= 500 else self.ttl
+
+    def _store(self, origin: str, response: httpx.Response | None) -> RobotFileParser:
+        record, ttl = self._record(response)
+        self._shared_put(origin, record, ttl)
+        policy = build_policy(record["status"], record["body"])
+        self._local_put(origin, policy, ttl)
+        return policy
+
+    def _cached(self, origin: str) -> RobotFileParser | None:
+        """Policy from the local or shared cache (counted), or None on a miss."""
+        policy = self._local_get(origin)
+        if policy is not None:
+            self._count(lookups=1, local_hits=1)
+            return policy
+        shared = self._shared_get(origin)
+        if shared is not None:
+            record, ttl = shared
+            policy = build_policy(record["status"], record["body"])
+            self._local_put(origin, policy, ttl)
+            self._count(lookups=1, shared_hits=1)
+            return policy
+        return None
+
+    def policy(self, url: str) -> RobotFileParser:
+        """robots.txt policy governing a URL (downloads it on a cache miss)."""
+        origin = robots_origin(url)
+        policy = self._local_get(origin)
+        if policy is not None:
+            self._count(lookups=1, local_hits=1)
+            return policy
+        with self._fetch_locks[origin]:
+            policy = self._cached(origin)
+            if policy is not None:
+                return policy
+            response = None
+            try:
+                with httpx.Client(timeout=FETCH_TIMEOUT_SECONDS, follow_redirects=True) as client:
+                    response = client.get(f"{origin}/robots.txt", headers={"User-Agent": get_user_agent()})
+            except httpx.HTTPError as e:
+                print(f"ℹ️  Could not fetch robots.txt for {origin}: {e}. Allowing scrape.")
+            self._count(lookups=1, fetches=1, fetch_errors=int(response is None or response.status_code >= 500))
+            return self._store(origin, response)
+
+    async def policy_async(self, url: str, client: httpx.AsyncClient | None = None) -> RobotFileParser:
+        """
+        policy() for async callers: cache reads run in a thread, the download
+        uses httpx.AsyncClient, and concurrent misses for an origin share it.
+        """
+        origin = robots_origin(url)
+        policy = self._local_get(origin)
+        if policy is not None:
+            self._count(lookups=1, local_hits=1)
+            return policy
+
+        inflight = self._inflight.get(origin)
+        if inflight is not None and inflight.get_loop() is asyncio.get_running_loop():
+            self._count(lookups=1, local_hits=1)
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[origin] = future
+        try:
+            policy = await asyncio.to_thread(self._cached, origin)
+            if policy is None:
+                response = None
+                try:
+                    response = await _get_robots_txt(origin, client)
+                except httpx.HTTPError as e:
+                    print(f"ℹ️  Could not fetch robots.txt for {origin}: {e}. Allowing scrape.")
+                self._count(lookups=1, fetches=1, fetch_errors=int(response is None or response.status_code >= 500))
+                policy = await asyncio.to_thread(self._store, origin, response)
+            future.set_result(policy)
+            return policy
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved: waiters re-raise it, nobody else has to
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            if self._inflight.get(origin) is future:
+                del self._inflight[origin]
+
+    # Checks
+
+    def can_fetch(self, url: str, user_agent: str | None = None) -> bool:
+        """Whether robots.txt allows fetching a URL."""
+        return self.policy(url).can_fetch(user_agent or get_user_agent(), url)
+
+    async def can_fetch_async(self, url: str, user_agent: str | None = None, client: httpx.AsyncClient | None = None) -> bool:
+        """can_fetch for async callers."""
+        return (await self.policy_async(url, client)).can_fetch(user_agent or get_user_agent(), url)
+
+    def clear_local(self) -> None:
+        """Drop in-process policies (the shared cache is left alone)."""
+        with self._lock:
+            self._local.clear()
+
+    def stats(self) -> dict:
+        """
+        Lookup counters, aggregated across workers (flushes local counters first).
+
+        Returns:
+            {"lookups", "local_hits", "shared_hits", "fetches", "fetch_errors",
+             "hit_rate", "cached_origins"}
+        """
+        self.flush_stats()
+        counters = Counter()
+        r = self._get_redis()
+        if r:
+            try:
+                counters.update({name: int(value) for name, value in r.hgetall(STATS_KEY).items()})
+            except redis.RedisError as e:
+                print(f"⚠️  Could not read robots.txt cache stats: {e}")
+        with self._lock:
+            counters.update(self._pending)
+            cached_origins = len(self._local)
+        stats = {name: counters.get(name, 0) for name in STATS_FIELDS}
+        hits = stats["local_hits"] + stats["shared_hits"]
+        stats["hit_rate"] = round(hits / stats["lookups"], 4) if stats["lookups"] else None
+        stats["cached_origins"] = cached_origins
+        return stats
+
+
+async def _get_robots_txt(origin: str, client: httpx.AsyncClient | None) -> httpx.Response:
+    headers = {"User-Agent": get_user_agent()}
+    if client is not None:
+        return await client.get(f"{origin}/robots.txt", headers=headers, timeout=FETCH_TIMEOUT_SECONDS, follow_redirects=True)
+    async with httpx.AsyncClient(timeout=FETCH_TIMEOUT_SECONDS, follow_redirects=True) as own_client:
+        return await own_client.get(f"{origin}/robots.txt", headers=headers)
+
+
+robots_policies = RobotsPolicyStore()
+
+
+def get_robots_cache_stats() -> dict:
+    """robots.txt cache counters (see RobotsPolicyStore.stats)."""
+    return robots_policies.stats()
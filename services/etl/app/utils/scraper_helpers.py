@@ -1,6 +1,4 @@
 """Scraper utility functions for respectful web scraping."""
-import urllib.robotparser
-from urllib.parse import urlparse
 
 
 def get_user_agent() -> str:
@@ -22,30 +20,48 @@ def check_robots_txt(url: str) -> bool:
     Returns:
         True if allowed, False if disallowed
 
-    Note: Returns True if robots.txt cannot be fetched (permissive fallback)
+    Note: Policies are cached per host (see app.utils.robots_cache).
+    Returns True if robots.txt cannot be fetched (permissive fallback);
+    a 5xx from robots.txt disallows (RFC 9309)
     """
+    from app.utils.robots_cache import robots_policies
+
     try:
-        parsed = urlparse(url)
-        robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+        is_allowed = robots_policies.can_fetch(url, get_user_agent())
+    except Exception as e:
+        # If we can't check robots.txt, be permissive and allow scraping
+        # (but log the error)
+        print(f"ℹ️  Could not check robots.txt for {url}: {e}. Allowing scrape.")
+        return True
 
-        rp = urllib.robotparser.RobotFileParser()
-        rp.set_url(robots_url)
-        rp.read()
+    if not is_allowed:
+        print(f"⚠️  robots.txt disallows scraping: {url}")
+    return is_allowed
 
-        user_agent = get_user_agent()
-        is_allowed = rp.can_fetch(user_agent, url)
 
-        if not is_allowed:
-            print(f"⚠️  robots.txt disallows scraping: {url}")
+async def check_robots_txt_async(url: str, client=None) -> bool:
+    """
+    Async version of check_robots_txt (non-blocking cache lookup and fetch).
 
-        return is_allowed
+    Args:
+        url: The URL to check
+        client: Optional httpx.AsyncClient to fetch robots.txt with
 
+    Returns:
+        True if allowed, False if disallowed
+    """
+    from app.utils.robots_cache import robots_policies
+
+    try:
+        is_allowed = await robots_policies.can_fetch_async(url, get_user_agent(), client=client)
     except Exception as e:
-        # If we can't fetch robots.txt, be permissive and allow scraping
-        # (but log the error)
         print(f"ℹ️  Could not check robots.txt for {url}: {e}. Allowing scrape.")
         return True
 
+    if not is_allowed:
+        print(f"⚠️  robots.txt disallows scraping: {url}")
+    return is_allowed
+
 
 def should_scrape_real() -> bool:
     """
@@ -0,0 +1,352 @@
+"""
+Shared runtime for the leaderboard scrapers.
+
+Each scraper used to launch its own Chromium via async_playwright() per
+source (fallbacks included), and each ran in its own Celery beat slot, so
+browser cold start dominated their runtime and memory. Scrapers now fetch
+pages through fetch_page():
+
+1. a snapshot in infra/cache younger than leaderboard_snapshot_max_age_hours
+   is reused as is (no network)
+2. otherwise the page is fetched with plain HTTP; if the HTML already has
+   what the scraper parses (a <table> by default) no browser is needed
+3. only script-rendered pages open a page in a BrowserPool: one headless
+   Chromium, launched on first use, whose contexts are reused across pages
+
+run_scrapes() runs several scrapers concurrently on one pool, each with its
+own timeout. Scrapers parse the returned HTML with parse_tables().
+"""
+import asyncio
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import httpx
+from playwright.async_api import async_playwright
+
+from app.config import settings
+from app.utils.scraper_helpers import check_robots_txt_async, get_user_agent
+
+SNAPSHOT_DIR = Path(__file__).parent.parent.parent.parent.parent / "infra" / "cache"
+SNAPSHOT_TIMESTAMP = "%Y%m%d_%H%M%S"
+
+GOTO_TIMEOUT_MS = 30000
+NETWORK_IDLE_TIMEOUT_MS = 15000
+HTTP_TIMEOUT_SECONDS = 20.0
+
+
+# Snapshots
+
+def save_snapshot(prefix: str, html: str, directory: Path | None = None) -> Path:
+    """Write an HTML snapshot to infra/cache/{prefix}_{timestamp}.html."""
+    directory = directory or SNAPSHOT_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{prefix}_{datetime.now(UTC).strftime(SNAPSHOT_TIMESTAMP)}.html"
+    path.write_text(html, encoding="utf-8")
+    return path
+
+
+def fresh_snapshot(prefix: str, max_age_hours: float | None = None, directory: Path | None = None) -> Path | None:
+    """
+    Newest snapshot for a prefix, if it was taken less than max_age_hours ago.
+
+    Age comes from the timestamp in the file name (checkouts reset mtimes).
+    """
+    directory = directory or SNAPSHOT_DIR
+    if max_age_hours is None:
+        max_age_hours = settings.leaderboard_snapshot_max_age_hours
+    newest = None
+    for path in directory.glob(f"{prefix}_*.html"):
+        try:
+            taken = datetime.strptime(path.stem[len(prefix) + 1:], SNAPSHOT_TIMESTAMP).replace(tzinfo=UTC)
+        except ValueError:
+            continue  # Another prefix (e.g. webarena_github_* for webarena)
+        if newest is None or taken > newest[0]:
+            newest = (taken, path)
+    if newest and datetime.now(UTC) - newest[0] < timedelta(hours=max_age_hours):
+        return newest[1]
+    return None
+
+
+# HTML tables
+
+class _TableParser(HTMLParser):
+    """Collects top-level tables as rows of cell texts (nested tables are flattened)."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tables = []
+        self._depth = 0
+        self._row = None
+        self._cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            self._depth += 1
+            if self._depth == 1:
+                self.tables.append([])
+        elif self._depth == 0:
+            return
+        elif tag == "tr" and self._depth == 1:
+            self._end_row()
+            self._row = {"cells": [], "header": True, "links": [], "text": []}
+        elif tag in ("td", "th") and self._depth == 1 and self._row is not None:
+            self._end_cell()
+            self._cell = []
+            if tag == "td":
+                self._row["header"] = False
+        elif tag == "a" and self._row is not None:
+            href = dict(attrs).get("href")
+            if href:
+                self._row["links"].append(href)
+
+    def handle_endtag(self, tag):
+        if self._depth == 0:
+            return
+        if tag == "table":
+            if self._depth == 1:
+                self._end_row()
+            self._depth -= 1
+        elif tag in ("td", "th") and self._depth == 1:
+            self._end_cell()
+        elif tag == "tr" and self._depth == 1:
+            self._end_row()
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+        if self._row is not None:
+            self._row["text"].append(data)
+
+    def _end_cell(self):
+        if self._cell is not None:
+            self._row["cells"].append(" ".join("".join(self._cell).split()))
+            self._cell = None
+
+    def _end_row(self):
+        self._end_cell()
+        if self._row is not None and self._row["cells"]:
+            self._row["text"] = " ".join("".join(self._row["text"]).split())
+            self.tables[-1].append(self._row)
+        self._row = None
+
+
+def parse_tables(html: str) -> list[list[dict]]:
+    """
+    Tables in an HTML document.
+
+    Returns:
+        One list of rows per top-level <table>, in document order. Each row is
+        {"cells": [cell text], "header": True if it has no <td>, "links": [href], "text": row text}
+    """
+    parser = _TableParser()
+    parser.feed(html)
+    parser.close()
+    return parser.tables
+
+
+def has_table(html: str) -> bool:
+    """Default readiness check: the server-sent HTML already contains a table."""
+    return "<table" in html.lower()
+
+
+# Browser
+
+class BrowserPool:
+    """
+    One headless Chromium shared by a batch of scrapes.
+
+    The browser is launched on the first page() call (runs served from
+    snapshots or plain HTTP never start it). Pages open in browser contexts
+    that are reused after their cookies are cleared.
+    """
+
+    def __init__(self, max_contexts: int | None = None, user_agent: str | None = None):
+        self.max_contexts = max_contexts or settings.browser_max_contexts
+        self.user_agent = user_agent or get_user_agent()
+        self.stats = Counter()  # launches, contexts, pages
+        self._semaphore = asyncio.Semaphore(self.max_contexts)
+        self._start_lock = asyncio.Lock()
+        self._playwright = None
+        self._browser = None
+        self._idle = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _get_browser(self):
+        async with self._start_lock:
+            if self._browser is None:
+                started = time.perf_counter()
+                self._playwright = await async_playwright().start()
+                try:
+                    self._browser = await self._playwright.chromium.launch(headless=True)
+                except Exception:
+                    await self._playwright.stop()
+                    self._playwright = None
+                    raise
+                self.stats["launches"] += 1
+                print(f"🌐 Launched headless Chromium in {time.perf_counter() - started:.1f}s")
+        return self._browser
+
+    @asynccontextmanager
+    async def page(self):
+        """A fresh page in a reused browser context (at most max_contexts at once)."""
+        async with self._semaphore:
+            browser = await self._get_browser()
+            if self._idle:
+                context = self._idle.pop()
+            else:
+                context = await browser.new_context(user_agent=self.user_agent)
+                self.stats["contexts"] += 1
+            page = await context.new_page()
+            self.stats["pages"] += 1
+            reusable = False
+            try:
+                yield page
+                reusable = True
+            finally:
+                try:
+                    await page.close()
+                    if reusable:
+                        await context.clear_cookies()
+                        self._idle.append(context)
+                    else:
+                        await context.close()
+                except Exception as e:
+                    print(f"⚠️  Could not release browser context: {e}")
+
+    async def close(self):
+        """Close the browser (no-op if it was never launched)."""
+        for context in self._idle:
+            await context.close()
+        self._idle = []
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+@asynccontextmanager
+async def browser_pool(pool: BrowserPool | None = None):
+    """Use the given pool, or a pool of our own for the duration of the block."""
+    if pool is not None:
+        yield pool
+        return
+    async with BrowserPool() as own_pool:
+        yield own_pool
+
+
+# Fetching
+
+async def fetch_page(
+    url: str,
+    snapshot_prefix: str | None = None,
+    pool: BrowserPool | None = None,
+    ready: Callable[[str], bool] = has_table,
+    render: str = "auto",
+    max_age_hours: float | None = None,
+    client: httpx.AsyncClient | None = None,
+) -> dict | None:
+    """
+    Fetch a leaderboard page: fresh snapshot, else plain HTTP, else browser.
+
+    Args:
+        url: Page URL
+        snapshot_prefix: infra/cache snapshot name (None: no snapshot read or written)
+        pool: Shared browser pool (default: a pool of our own if a browser is needed)
+        ready: Whether server-sent HTML is enough (no script rendering needed)
+        render: "auto" (HTTP first) or "browser" (always render)
+        max_age_hours: Snapshot freshness (default: settings.leaderboard_snapshot_max_age_hours)
+        client: HTTP client for the plain fetch (default: a new client per call)
+
+    Returns:
+        {"html", "via": "snapshot" | "http" | "browser", "url"}, or None if
+        robots.txt disallows the page
+
+    Raises:
+        Playwright errors if the page had to be rendered and that failed
+    """
+    if snapshot_prefix:
+        snapshot = fresh_snapshot(snapshot_prefix, max_age_hours)
+        if snapshot:
+            print(f"✓ Using cached snapshot {snapshot.name}")
+            return {"html": snapshot.read_text(encoding="utf-8"), "via": "snapshot", "url": url}
+
+    if not await check_robots_txt_async(url):
+        print(f"❌ Scraping disallowed by robots.txt: {url}")
+        return None
+
+    html, via = None, None
+    if render == "auto":
+        headers = {"User-Agent": get_user_agent()}
+        try:
+            if client is not None:
+                response = await client.get(url, headers=headers, timeout=HTTP_TIMEOUT_SECONDS, follow_redirects=True)
+            else:
+                async with httpx.AsyncClient(timeout=HTTP_TIMEOUT_SECONDS, follow_redirects=True) as own_client:
+                    response = await own_client.get(url, headers=headers)
+            response.raise_for_status()
+            if ready(response.text):
+                html, via = response.text, "http"
+            else:
+                print(f"ℹ️  {url} is rendered client-side, using the browser")
+        except httpx.HTTPError as e:
+            print(f"ℹ️  Plain HTTP fetch of {url} failed ({e}), using the browser")
+
+    if html is None:
+        async with browser_pool(pool) as active_pool, active_pool.page() as page:
+            await page.goto(url, timeout=GOTO_TIMEOUT_MS)
+            await page.wait_for_load_state("networkidle", timeout=NETWORK_IDLE_TIMEOUT_MS)
+            html, via = await page.content(), "browser"
+
+    if snapshot_prefix:
+        print(f"✓ Cached HTML to {save_snapshot(snapshot_prefix, html)}")
+    return {"html": html, "via": via, "url": url}
+
+
+async def run_scrapes(
+    scrapes: dict[str, Callable[[BrowserPool], Awaitable]],
+    timeout: float | None = None,
+    pool: BrowserPool | None = None,
+) -> dict:
+    """
+    Run scrapers concurrently on one browser pool.
+
+    Args:
+        scrapes: {name: async fn(pool) -> result}
+        timeout: Seconds per scraper (default: settings.leaderboard_scrape_timeout_seconds);
+            a scraper that runs over or raises yields None
+        pool: Browser pool (default: one for this batch, closed at the end)
+
+    Returns:
+        {name: result or None}
+    """
+    timeout = timeout or settings.leaderboard_scrape_timeout_seconds
+
+    async def run(name: str, scrape, active_pool: BrowserPool):
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(scrape(active_pool), timeout)
+        except asyncio.TimeoutError:
+            print(f"❌ {name} timed out after {timeout}s")
+            return None
+        except Exception as e:
+            print(f"❌ {name} failed: {e}")
+            return None
+        print(f"✓ {name} finished in {time.perf_counter() - started:.1f}s")
+        return result
+
+    async with browser_pool(pool) as active_pool:
+        results = await asyncio.gather(*(run(name, scrape, active_pool) for name, scrape in scrapes.items()))
+        print(f"🌐 Browser: {dict(active_pool.stats) or 'not launched'}")
+    return dict(zip(scrapes, results))
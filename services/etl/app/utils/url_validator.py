@@ -2,16 +2,34 @@
 URL validation utility for Sprint 10.
 
 Validates that source URLs are accessible and returns detailed status information.
+
+validate_url checks one URL with blocking requests calls. validate_urls is
+the batch engine used by the weekly task: one pooled httpx.AsyncClient,
+a global concurrency cap, and per-host limits (requests in flight and a
+minimum gap between request starts) so a host that owns most of the
+corpus is paced while the others proceed in parallel.
 """
-import requests
+import asyncio
+import ssl
+import time
 from datetime import datetime, UTC
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 from urllib.parse import urlparse
 
+import httpx
+import requests
 import structlog
 
+from app.config import settings
+from app.utils.host_limiter import HostLimiter
+
 logger = structlog.get_logger(__name__)
 
+VALIDATOR_HEADERS = {
+    'User-Agent': 'AGI-Tracker-URL-Validator/1.0 (https://agi-tracker.vercel.app)',
+    'Accept': '*/*'
+}
+
 
 def validate_url(url: str, timeout: int = 10) -> Dict:
     """
@@ -67,10 +85,7 @@ def validate_url(url: str, timeout: int = 10) -> Dict:
         }
     
     # Set headers to identify ourselves
-    headers = {
-        'User-Agent': 'AGI-Tracker-URL-Validator/1.0 (https://agi-tracker.vercel.app)',
-        'Accept': '*/*'
-    }
+    headers = VALIDATOR_HEADERS
     
     try:
         # Try HEAD request first (faster, less bandwidth)
@@ -178,3 +193,146 @@ def is_url_format_valid(url: Optional[str]) -> bool:
         return bool(parsed.scheme and parsed.netloc)
     except Exception:
         return False
+
+
+def _failure(error: str, redirect_count: int = 0) -> Dict:
+    return {
+        "valid": False,
+        "status_code": None,
+        "final_url": None,
+        "redirect_count": redirect_count,
+        "error": error,
+        "checked_at": datetime.now(UTC)
+    }
+
+
+def _is_ssl_error(error: BaseException) -> bool:
+    while error is not None:
+        if isinstance(error, ssl.SSLError):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+async def validate_url_async(url: str, client: httpx.AsyncClient, timeout: float = 10) -> Dict:
+    """
+    Async version of validate_url on a shared client (same result dict).
+
+    Args:
+        url: URL to validate
+        client: Pooled HTTP client (see url_validation_client)
+        timeout: Request timeout in seconds
+
+    Returns:
+        Dict with validation results (see validate_url)
+    """
+    if not is_url_format_valid(url):
+        return _failure("Empty or None URL" if not url else "Invalid URL format (missing scheme or domain)")
+
+    try:
+        response = await client.head(url, headers=VALIDATOR_HEADERS, timeout=timeout, follow_redirects=True)
+
+        # Some servers don't support HEAD, try GET if HEAD returns 405
+        if response.status_code == 405:
+            logger.info("HEAD not supported, trying GET", url=url)
+            async with client.stream(
+                "GET", url, headers=VALIDATOR_HEADERS, timeout=timeout, follow_redirects=True
+            ) as response:
+                pass  # Status and redirects only: the body is never read
+
+        is_valid = response.status_code < 400
+        return {
+            "valid": is_valid,
+            "status_code": response.status_code,
+            "final_url": str(response.url),
+            "redirect_count": len(response.history),
+            "error": None if is_valid else f"HTTP {response.status_code}",
+            "checked_at": datetime.now(UTC)
+        }
+
+    except httpx.TimeoutException:
+        logger.warning("URL validation timeout", url=url, timeout=timeout)
+        return _failure(f"Timeout after {timeout}s")
+
+    except httpx.TooManyRedirects:
+        logger.warning("URL redirect loop", url=url)
+        return _failure("Too many redirects (loop detected)", redirect_count=999)
+
+    except httpx.TransportError as e:
+        if _is_ssl_error(e):
+            logger.warning("URL SSL error", url=url, error=str(e)[:100])
+            return _failure(f"SSL certificate error: {str(e)[:100]}")
+        logger.warning("URL connection error", url=url, error=str(e)[:100])
+        return _failure(f"Connection error: {str(e)[:100]}")
+
+    except Exception as e:
+        logger.error("URL validation error", url=url, error=str(e))
+        return _failure(f"Unexpected error: {str(e)[:100]}")
+
+
+def url_validation_client(concurrency: int | None = None) -> httpx.AsyncClient:
+    """Pooled HTTP client for validate_urls (keep-alive connections are reused per host)."""
+    concurrency = concurrency or settings.url_validation_concurrency
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+    )
+
+
+async def validate_urls(
+    urls: list[str],
+    timeout: float = 10,
+    concurrency: int | None = None,
+    per_host: int | None = None,
+    host_interval: float | None = None,
+    client: httpx.AsyncClient | None = None,
+    on_result: Callable[[str, Dict], None] | None = None,
+) -> Dict[str, Dict]:
+    """
+    Validate many URLs concurrently.
+
+    URLs are started in the given order (put the most overdue first).
+
+    Args:
+        urls: URLs to validate (duplicates are checked once)
+        timeout: Request timeout in seconds
+        concurrency: Maximum requests in flight (default: settings.url_validation_concurrency)
+        per_host: Maximum requests in flight per host (default: settings.url_validation_per_host)
+        host_interval: Minimum seconds between request starts to one host
+            (default: settings.url_validation_host_interval_seconds)
+        client: HTTP client (default: a pooled client for this batch)
+        on_result: Called with (url, result) as each URL finishes, e.g. to
+            write results back in batches while the rest are still running
+
+    Returns:
+        {url: validation result dict (see validate_url)}
+    """
+    concurrency = concurrency or settings.url_validation_concurrency
+    limiter = HostLimiter(
+        per_host or settings.url_validation_per_host,
+        settings.url_validation_host_interval_seconds if host_interval is None else host_interval,
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+    results = {}
+
+    async def check(http: httpx.AsyncClient, url: str):
+        async with limiter.slot(urlparse(url).hostname or "", gate=semaphore):
+            result = await validate_url_async(url, http, timeout)
+        results[url] = result
+        if on_result is not None:
+            on_result(url, result)
+
+    urls = list(dict.fromkeys(urls))
+    started = time.perf_counter()
+    if client is not None:
+        await asyncio.gather(*(check(client, url) for url in urls))
+    else:
+        async with url_validation_client(concurrency) as http:
+            await asyncio.gather(*(check(http, url) for url in urls))
+
+    logger.info(
+        "Validated URLs",
+        count=len(urls),
+        valid=sum(result["valid"] for result in results.values()),
+        seconds=round(time.perf_counter() - started, 1),
+    )
+    return results
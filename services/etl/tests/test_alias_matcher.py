@@ -0,0 +1,137 @@
+"""Tests for the compiled alias index and bulk mapping helpers in app.utils.event_mapper."""
+import os
+import re
+from datetime import datetime
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.utils import event_mapper
+from app.utils.event_mapper import (
+    AliasIndex,
+    _required_literals,
+    build_link_rows,
+    get_alias_index,
+    insert_links_statement,
+    load_aliases,
+    map_event_to_signposts,
+    map_events_batch,
+    sre_parse,
+)
+
+
+def naive_match(text, aliases, max_signposts=5):
+    """Reference implementation: re.search every rule in registry order."""
+    text_lower = text.lower()
+    matches, seen = [], set()
+    for rules in aliases.values():
+        if not isinstance(rules, list):
+            continue
+        for rule in rules:
+            try:
+                if re.search(rule["pattern"], text_lower, re.IGNORECASE):
+                    for code in rule["codes"]:
+                        if code not in seen:
+                            matches.append((code, 0.5 + rule.get("boost", 0.0), f"Alias match: '{rule['pattern']}'"))
+                            seen.add(code)
+            except re.error:
+                continue
+    matches.sort(key=lambda x: x[1], reverse=True)
+    return matches[:max_signposts]
+
+
+def test_required_literals():
+    """Prefilter keys cover every alternative and skip optional characters."""
+    def literals(pattern):
+        return _required_literals(sre_parse.parse(pattern, re.IGNORECASE))
+
+    assert literals("swe-?bench") == {"bench"}
+    assert literals("1\\s*gw|1.?gigawatt") == {"gw", "gigawatt"}
+    assert literals("(70|75|80)%.*(gpqa|phd)") == {"gpqa", "phd"}
+    assert literals(".*") is None
+
+
+def test_compiled_index_matches_naive_search():
+    """The prefiltered index returns exactly what scanning every rule returns."""
+    aliases = load_aliases()
+    index = AliasIndex(aliases)
+    texts = [
+        "New model achieves 89% on SWE-bench Verified",
+        "xAI announces 10 GW datacenter for petaflop training",
+        "Claude 4 jailbreak found by red team; export control debate in 2027",
+        "Startup raises funding round to expand enterprise sales",
+        "Humanity's Last Exam: AGI lab reports 85% on GPQA",
+    ]
+
+    for text in texts:
+        assert index.match(text) == naive_match(text, aliases)
+
+
+def test_prefix_literals_are_credited():
+    """A literal that is a prefix of a longer one at the same position still fires."""
+    index = AliasIndex({"c": [
+        {"pattern": "petaflop", "codes": ["long"], "boost": 0.1},
+        {"pattern": "peta", "codes": ["short"], "boost": 0.0},
+    ]})
+
+    assert [code for code, _, _ in index.match("a petaflop cluster")] == ["long", "short"]
+
+
+def test_batch_mapping_matches_single():
+    """map_events_batch gives the same per-event results as map_event_to_signposts."""
+    events = [
+        {"title": "OSWorld results", "summary": "65% computer use", "evidence_tier": "A"},
+        {"title": "Training run exceeds 10^26 FLOPs", "summary": "", "evidence_tier": "B"},
+        {"title": "Nothing relevant", "summary": "", "evidence_tier": "C"},
+    ]
+    aliases = load_aliases()
+
+    assert map_events_batch(events, aliases) == [map_event_to_signposts(e, aliases) for e in events]
+
+
+def test_alias_index_hot_reloads_on_mtime_change(tmp_path, monkeypatch):
+    """Editing the YAML rebuilds the process registry on next use."""
+    path = tmp_path / "aliases.yaml"
+    path.write_text('c:\n  - pattern: "alpha"\n    codes: [a]\n    boost: 0.1\n')
+    monkeypatch.setattr(event_mapper, "ALIASES_PATH", path)
+    monkeypatch.setattr(event_mapper, "_alias_index_cache", None)
+
+    first = get_alias_index()
+    assert get_alias_index() is first
+    assert [m[0] for m in first.match("alpha beta")] == ["a"]
+
+    path.write_text('c:\n  - pattern: "beta"\n    codes: [b]\n    boost: 0.1\n')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    reloaded = get_alias_index()
+    assert reloaded is not first
+    assert [m[0] for m in reloaded.match("alpha beta")] == ["b"]
+
+
+def test_build_link_rows_applies_tier_policy():
+    """Link rows skip unknown codes and only A-tier links are non-provisional."""
+    event = SimpleNamespace(id=7, published_at=datetime(2025, 1, 2), ingested_at=datetime(2025, 1, 3))
+    rows = build_link_rows(
+        event,
+        [("swe_bench_85", 0.9, "A"), ("osworld_50", 0.7, "B"), ("missing", 0.8, "A"), ("gpqa_75", 0.5, "C")],
+        {"swe_bench_85": 1, "osworld_50": 2, "gpqa_75": 3},
+    )
+
+    assert [(r["signpost_id"], r["provisional"]) for r in rows] == [(1, False), (2, True), (3, True)]
+    assert all(r["event_id"] == 7 and r["observed_at"] == event.published_at for r in rows)
+    assert "NEVER moves gauges" in rows[2]["rationale"]
+
+
+def test_insert_links_statement_is_single_upsert():
+    """A chunk's links compile to one multi-row INSERT ... ON CONFLICT DO NOTHING."""
+    rows = [
+        {"event_id": 1, "signpost_id": s, "confidence": 0.6, "tier": "A", "provisional": False,
+         "rationale": "r", "observed_at": None, "value": None}
+        for s in (1, 2, 3)
+    ]
+    sql = str(insert_links_statement(rows).compile(dialect=postgresql.dialect()))
+
+    assert sql.count("INSERT INTO event_signpost_links") == 1
+    assert "ON CONFLICT (event_id, signpost_id) DO NOTHING" in sql
+    assert "RETURNING event_signpost_links.event_id" in sql
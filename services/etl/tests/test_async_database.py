@@ -0,0 +1,18 @@
+"""Tests for the async database session layer."""
+from app import database
+from app.database import get_async_database_url
+
+
+def test_async_url_switches_to_psycopg_async():
+    """Sync Postgres URLs map to psycopg's async driver, keeping credentials."""
+    url = get_async_database_url("postgresql+psycopg://user:secret@db:5432/agi")
+
+    assert url == "postgresql+psycopg_async://user:secret@db:5432/agi"
+    assert get_async_database_url("postgresql://u:p@h/d").startswith("postgresql+psycopg_async://")
+
+
+def test_async_url_override(monkeypatch):
+    """ASYNC_DATABASE_URL wins over the derived URL."""
+    monkeypatch.setattr(database.settings, "async_database_url", "postgresql+asyncpg://u:p@h/d")
+
+    assert get_async_database_url("postgresql+psycopg://u:p@h/d") == "postgresql+asyncpg://u:p@h/d"
@@ -0,0 +1,45 @@
+"""Tests for the B-tier corroboration sweep."""
+from datetime import datetime, timedelta
+
+from app.utils.b_tier_corroboration import find_corroborations
+
+DAY = datetime(2025, 3, 1)
+
+
+def test_corroboration_window_is_inclusive_and_per_signpost():
+    """A-tier links within ±14 days on the same signpost corroborate; others don't."""
+    b_links = [
+        (1, 10, DAY),                        # A-tier 14 days later: corroborated
+        (2, 10, DAY - timedelta(days=30)),   # nothing in range
+        (3, 20, DAY),                        # A-tier only on another signpost
+    ]
+    a_links = [
+        (100, 10, DAY + timedelta(days=14)),
+        (101, 30, DAY),
+    ]
+
+    assert find_corroborations(b_links, a_links) == {(1, 10): 100}
+
+
+def test_closest_a_tier_link_wins():
+    """When several A-tier links are in range, the nearest observation is credited."""
+    b_links = [(1, 10, DAY)]
+    a_links = [
+        (100, 10, DAY - timedelta(days=10)),
+        (101, 10, DAY + timedelta(days=2)),
+        (102, 10, DAY + timedelta(days=9)),
+    ]
+
+    assert find_corroborations(b_links, a_links) == {(1, 10): 101}
+
+
+def test_undated_b_tier_link_takes_any_a_tier_link():
+    """B-tier links without observed_at match any A-tier link on the signpost."""
+    b_links = [(1, 10, None), (2, 20, None), (3, 30, None)]
+    a_links = [
+        (100, 10, DAY + timedelta(days=100)),
+        (101, 10, DAY),
+        (102, 20, None),
+    ]
+
+    assert find_corroborations(b_links, a_links) == {(1, 10): 101, (2, 20): 102}
@@ -0,0 +1,258 @@
+"""Tests for the tag-indexed response cache."""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi import Request
+from fastapi_cache import FastAPICache
+
+from app.config import settings
+from app.utils.cache import (
+    ALL_TAG,
+    CACHE_PREFIX,
+    REFRESH_HEADER,
+    TaggedRedisBackend,
+    get_cache_stats,
+    invalidate_tags,
+    response_tags,
+    swr_cache,
+    tag_key,
+    tagged_key_builder,
+)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        results = [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+        self.calls = []
+        return results
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio for the cache (no KEYS: scans must not be needed)."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        self.ttls[key] = ex if ex else -1
+        return True
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def ttl(self, key):
+        return self.ttls.get(key, -2)
+
+    async def expire(self, key, seconds):
+        self.ttls[key] = seconds
+
+    async def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+
+    async def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    async def srem(self, key, *members):
+        self.data.get(key, set()).difference_update(members)
+
+    async def unlink(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def hincrby(self, key, field, amount):
+        counters = self.data.setdefault(key, {})
+        counters[field] = counters.get(field, 0) + amount
+        return counters[field]
+
+    async def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+
+def request_for(path):
+    return SimpleNamespace(url=SimpleNamespace(path=path))
+
+
+async def cache_response(backend, path, **params):
+    key = tagged_key_builder(None, f"{CACHE_PREFIX}:", request=request_for(path), kwargs=params)
+    await backend.set(key, b"{}", 300)
+    return key
+
+
+def test_response_tags_cover_section_signposts_and_presets():
+    assert response_tags("/v1/signposts/swe_bench_85", {"code": "swe_bench_85"}) == (
+        ALL_TAG, "signpost:swe_bench_85", "signposts",
+    )
+    assert response_tags("/v1/index/history", {"preset": "equal", "presets": "cotra, equal", "days": 90}) == (
+        ALL_TAG, "index", "index:cotra", "index:equal",
+    )
+    assert response_tags("/v1/feed.json", {"public": True}) == (ALL_TAG, "events")
+
+
+def test_key_ignores_dependencies_and_parameter_order():
+    request = request_for("/v1/evidence")
+    first = tagged_key_builder(None, "fastapi-cache:", request=request, kwargs={"tier": "A", "db": object()})
+    second = tagged_key_builder(None, "fastapi-cache:", request=request, kwargs={"db": object(), "tier": "A"})
+
+    assert first == second
+    assert first.startswith("fastapi-cache::/v1/evidence:")
+
+
+def test_invalidate_tags_removes_only_tagged_keys():
+    redis = FakeRedis()
+    backend = TaggedRedisBackend(redis)
+
+    async def scenario():
+        equal = await cache_response(backend, "/v1/index", preset="equal")
+        cotra = await cache_response(backend, "/v1/index", preset="cotra")
+        evidence = await cache_response(backend, "/v1/evidence", signpost_id=12)
+        other = await cache_response(backend, "/v1/evidence", signpost_id=13)
+
+        assert await invalidate_tags(["index:equal"], redis_client=redis) == 1
+        assert await invalidate_tags(["signpost:12", "missing"], redis_client=redis) == 1
+        return equal, cotra, evidence, other
+
+    equal, cotra, evidence, other = asyncio.run(scenario())
+
+    assert equal not in redis.data and evidence not in redis.data
+    assert cotra in redis.data and other in redis.data
+    assert redis.data[tag_key("index:equal")] == set()
+    assert redis.data[tag_key("index")] == {equal, cotra}
+
+
+def test_counters_and_full_clear():
+    redis = FakeRedis()
+    backend = TaggedRedisBackend(redis)
+
+    async def scenario():
+        key = await cache_response(backend, "/v1/signposts", category="agents")
+        await backend.get_with_ttl(key)
+        await backend.get_with_ttl("fastapi-cache::/v1/index:missing")
+        cleared = await backend.clear(namespace=CACHE_PREFIX)
+        with patch("app.utils.cache.get_cache_redis", return_value=redis):
+            return cleared, await get_cache_stats()
+
+    cleared, stats = asyncio.run(scenario())
+
+    assert cleared == 1 and redis.data[tag_key(ALL_TAG)] == set()
+    assert stats == {"hits": 1, "misses": 1, "hit_rate": 0.5, "invalidations": 1, "invalidated_keys": 1}
+
+
+@pytest.fixture
+def swr_setup():
+    """Tagged backend on a fake Redis plus an index-like endpoint that counts its computations."""
+    redis = FakeRedis()
+    FastAPICache.reset()
+    FastAPICache.init(TaggedRedisBackend(redis), prefix=CACHE_PREFIX, key_builder=tagged_key_builder)
+    calls = []
+
+    @swr_cache(expire=300, stale_ttl=60)
+    async def endpoint(request: Request, preset: str = "equal"):
+        calls.append(preset)
+        await asyncio.sleep(0.01)
+        return {"preset": preset, "version": len(calls)}
+
+    request = Request({"type": "http", "method": "GET", "path": "/v1/index", "headers": [], "query_string": b""})
+    yield redis, endpoint, request, calls
+    FastAPICache.reset()
+
+
+def test_swr_concurrent_misses_share_one_computation(swr_setup):
+    redis, endpoint, request, calls = swr_setup
+
+    async def scenario():
+        return await asyncio.gather(*(endpoint(request=request, preset="cotra") for _ in range(5)))
+
+    results = asyncio.run(scenario())
+
+    assert calls == ["cotra"]
+    assert results == [{"preset": "cotra", "version": 1}] * 5
+    (key,) = redis.data[tag_key("index:cotra")]
+    assert 300 * 0.9 + 60 <= redis.ttls[key] <= 300 * 1.1 + 60
+
+
+def test_swr_serves_stale_while_one_task_refreshes(swr_setup):
+    redis, endpoint, request, calls = swr_setup
+
+    async def scenario():
+        await endpoint(request=request, preset="equal")
+        (key,) = redis.data[tag_key("index:equal")]
+        redis.ttls[key] = 30  # past the soft TTL, inside the stale window
+
+        stale = await asyncio.gather(*(endpoint(request=request, preset="equal") for _ in range(3)))
+        await asyncio.sleep(0.05)
+        return stale, await endpoint(request=request, preset="equal")
+
+    stale, refreshed = asyncio.run(scenario())
+
+    assert stale == [{"preset": "equal", "version": 1}] * 3
+    assert refreshed == {"preset": "equal", "version": 2}
+    assert calls == ["equal", "equal"]
+
+
+def test_swr_miss_during_refresh_waits_for_it(swr_setup):
+    redis, endpoint, request, calls = swr_setup
+
+    async def scenario():
+        await endpoint(request=request, preset="equal")
+        (key,) = redis.data[tag_key("index:equal")]
+        redis.ttls[key] = 30
+
+        stale = await endpoint(request=request, preset="equal")
+        # Invalidation drops the entry while the background refresh is still computing
+        await invalidate_tags(["index:equal"], redis_client=redis)
+        return stale, await endpoint(request=request, preset="equal")
+
+    stale, missed = asyncio.run(scenario())
+
+    assert stale == {"preset": "equal", "version": 1}
+    assert missed == {"preset": "equal", "version": 2}
+    assert calls == ["equal", "equal"]
+
+
+def test_swr_forced_refresh_requires_the_admin_key(swr_setup):
+    redis, endpoint, request, calls = swr_setup
+
+    def request_with(headers):
+        return Request({"type": "http", "method": "GET", "path": "/v1/index", "query_string": b"",
+                        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()]})
+
+    async def scenario():
+        await endpoint(request=request, preset="equal")
+        # Hard reloads and forged refresh headers are served from the cache
+        reload = await endpoint(request=request_with({"Cache-Control": "no-cache"}), preset="equal")
+        forged = await endpoint(request=request_with({REFRESH_HEADER: "guess"}), preset="equal")
+        warmup = await endpoint(request=request_with({REFRESH_HEADER: settings.admin_api_key}), preset="equal")
+        return reload, forged, warmup, await endpoint(request=request, preset="equal")
+
+    reload, forged, warmup, after = asyncio.run(scenario())
+
+    assert reload == forged == {"preset": "equal", "version": 1}
+    assert warmup == after == {"preset": "equal", "version": 2}
+    assert calls == ["equal", "equal"]
@@ -0,0 +1,88 @@
+"""Tests for the post-snapshot cache warm-up."""
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import httpx
+from fastapi import FastAPI, Request, Response
+from fastapi_cache import FastAPICache
+
+from app.services.cache_warmup import HISTORY_WINDOWS, warm_caches, warmup_targets
+from app.tasks import snap_index
+from app.utils.cache import CACHE_PREFIX, TaggedRedisBackend, swr_cache, tag_key, tagged_key_builder
+from tests.test_cache import FakeRedis
+
+
+def test_targets_cover_presets_windows_and_compare():
+    targets = warmup_targets(["equal", "cotra"])
+
+    assert targets[:2] == [("/v1/index", {"preset": "equal"}), ("/v1/index", {"preset": "cotra"})]
+    history = [params for path, params in targets if path == "/v1/index/history"]
+    assert len(history) == 3 * len(HISTORY_WINDOWS)
+    assert {"presets": "equal,cotra", "days": 90} in history
+    assert targets[-1] == ("/v1/roadmaps/compare", {})
+
+
+def test_warm_up_overwrites_entries_that_requests_then_hit():
+    app = FastAPI()
+    computed = []
+
+    @app.get("/v1/index")
+    @swr_cache(expire=3600)
+    async def index(request: Request, response: Response, preset: str = "equal"):
+        computed.append(preset)
+        return {"preset": preset, "run": len(computed)}
+
+    @app.get("/v1/index/history")
+    @swr_cache(expire=3600)
+    async def history(request: Request, response: Response, preset: str = "equal", presets: str | None = None,
+                      days: int = 90):
+        return {"preset": preset, "presets": presets, "days": days}
+
+    @app.get("/v1/roadmaps/compare")
+    @swr_cache(expire=3600)
+    async def compare(request: Request, response: Response, roadmap: str | None = None):
+        return {"roadmap": roadmap}
+
+    redis = FakeRedis()
+
+    async def scenario():
+        first = await warm_caches(asgi_app=app, redis_client=redis, presets=["equal", "cotra"])
+        second = await warm_caches(asgi_app=app, redis_client=redis, presets=["equal", "cotra"])
+
+        # A visitor's request (defaults, no preset) hits the warmed entry
+        FastAPICache.init(TaggedRedisBackend(redis), prefix=CACHE_PREFIX, key_builder=tagged_key_builder)
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                visit = await client.get("/v1/index")
+        finally:
+            FastAPICache.reset()
+        return first, second, visit
+
+    first, second, visit = asyncio.run(scenario())
+
+    assert first["keys_warmed"] == second["keys_warmed"] == len(warmup_targets(["equal", "cotra"]))
+    assert first["keys_failed"] == 0
+    assert first["by_endpoint"] == {"/v1/index": 2, "/v1/index/history": 12, "/v1/roadmaps/compare": 1}
+    assert computed == ["equal", "cotra", "equal", "cotra"]
+    assert len(redis.data[tag_key("index:cotra")]) == 1 + 2 * len(HISTORY_WINDOWS)
+
+    assert visit.headers["x-fastapi-cache"] == "HIT"
+    assert visit.json() == {"preset": "equal", "run": 3}
+    assert visit.headers["etag"] == second["etags"]["/v1/index?preset=equal"]
+
+
+def test_same_day_recompute_still_warms_caches():
+    """A rerun only updates today's snapshots; the cached responses still need replacing."""
+    engine_result = {"stats": {"queries": 2, "signposts": 0, "load_ms": 1, "score_ms": 1}, "presets": {}}
+
+    with patch.object(snap_index, "SessionLocal", MagicMock()), \
+            patch.object(snap_index, "refresh_signpost_values", return_value={"signposts": 0}), \
+            patch.object(snap_index, "run_snapshot_engine", return_value=engine_result), \
+            patch.object(snap_index, "write_index_snapshots", return_value={"created": 0, "updated": 4}), \
+            patch.object(snap_index, "check_for_significant_changes"), \
+            patch.object(snap_index, "warm_response_caches", return_value={"keys_warmed": 15}) as warm:
+        result = snap_index.compute_daily_snapshot()
+
+    warm.assert_called_once_with()
+    assert (result["snapshots_created"], result["snapshots_updated"]) == (0, 4)
+    assert result["cache_warmup"] == {"keys_warmed": 15}
@@ -0,0 +1,133 @@
+"""Tests for the embedding service's binary cache, batch dispatch and backends."""
+import numpy as np
+import pytest
+
+from app.services.embedding_backends import LocalEmbeddingBackend, OpenAIEmbeddingBackend, get_embedding_backend
+from app.services.embedding_service import EmbeddingService, TokenRateLimiter
+
+
+class FakeRedis:
+    """Sync Redis stand-in that records round trips."""
+
+    def __init__(self):
+        self.data = {}
+        self.round_trips = []
+
+    def mget(self, keys):
+        self.round_trips.append(("mget", len(keys)))
+        return [self.data.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        redis = self
+        queued = []
+
+        class Pipeline:
+            def set(self, key, value, ex=None):
+                queued.append((key, value))
+
+            def execute(self):
+                redis.round_trips.append(("pipeline", len(queued)))
+                redis.data.update(queued)
+
+        return Pipeline()
+
+    def incrbyfloat(self, key, amount):
+        pass
+
+    def expire(self, key, seconds):
+        pass
+
+
+def fake_vector(text):
+    return [float(len(text)), 0.5, -0.25]
+
+
+@pytest.fixture
+def service():
+    service = EmbeddingService(backend=OpenAIEmbeddingBackend())
+    service.redis_client = FakeRedis()
+    service.batch_size = 2
+    calls = []
+
+    def api_call(texts):
+        calls.append(list(texts))
+        return [fake_vector(text) for text in texts], 10 * len(texts)
+
+    service._api_call = api_call
+    service.api_calls = calls
+    return service
+
+
+def test_vectors_round_trip_through_compact_encoding(service):
+    vector = [0.125, -1.5, 3.0]
+
+    assert len(service.encode_vector(vector)) == 4 * len(vector)
+    assert service.decode_vector(service.encode_vector(vector)) == vector
+
+
+def test_embed_batch_uses_one_mget_and_one_pipeline_per_batch(service):
+    service._set_cache_many([("cached", fake_vector("cached"))])
+    service.redis_client.round_trips.clear()
+    texts = ["alpha", "cached", "", "gamma", "delta", "epsilon"]
+
+    embeddings = service.embed_batch(texts, show_progress=False)
+
+    assert embeddings == [fake_vector(t) if t else None for t in texts]
+    assert sorted(map(tuple, service.api_calls)) == [("alpha", "gamma"), ("delta", "epsilon")]
+    assert service.redis_client.round_trips == [("mget", 5), ("pipeline", 2), ("pipeline", 2)]
+
+    # Everything is cached now: no API calls, still one MGET
+    assert service.embed_batch(texts, show_progress=False) == embeddings
+    assert len(service.api_calls) == 2
+
+
+def test_rate_limiter_waits_for_the_token_budget():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = TokenRateLimiter(600, clock=lambda: now[0], sleep=sleep)  # 10 tokens/second
+
+    assert limiter.acquire(600) == 0.0
+    assert limiter.acquire(100) == pytest.approx(10.0)
+
+    # Actual usage under the estimate is refunded
+    limiter.settle(estimated=100, actual=50)
+    assert limiter.acquire(50) == 0.0
+    assert sleeps == [pytest.approx(10.0)]
+
+
+def test_local_backend_is_deterministic_and_similarity_preserving():
+    backend = LocalEmbeddingBackend()
+    vectors, tokens = backend.embed([
+        "OpenAI releases GPT-5 with stronger SWE-bench results",
+        "OpenAI released GPT-5, with stronger SWE-bench results",
+        "Semiconductor export controls tighten on datacenter GPUs",
+    ])
+    first, paraphrase, unrelated = (np.asarray(v) for v in vectors)
+
+    assert tokens == 9 + 9 + 7
+    assert len(first) == 1536
+    assert np.linalg.norm(first) == pytest.approx(1.0)
+    assert backend.embed_one("OpenAI releases GPT-5 with stronger SWE-bench results") == first.tolist()
+    assert first @ paraphrase > 0.7
+    assert abs(first @ unrelated) < 0.2
+    assert backend.embed_one("") == [0.0] * 1536
+
+
+def test_local_backend_skips_cache_and_spend():
+    assert isinstance(get_embedding_backend("LOCAL"), LocalEmbeddingBackend)
+    with pytest.raises(ValueError):
+        get_embedding_backend("word2vec")
+
+    service = EmbeddingService(backend=LocalEmbeddingBackend())
+    service.redis_client = None  # any cache or spend access would fail
+
+    vectors = service.embed_batch(["frontier model evals", "", "compute thresholds"], show_progress=False)
+
+    assert service.model == "local-hashed-ngrams-v1"
+    assert vectors[1] is None
+    assert vectors[0] == service.embed_single("frontier model evals")
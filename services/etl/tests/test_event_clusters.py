@@ -0,0 +1,87 @@
+"""Tests for near-duplicate story clustering."""
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import Event, EventLSHBucket
+from app.services.event_clusters import (
+    BANDS,
+    StoryClusterer,
+    assign_story_clusters,
+    event_text,
+    minhash_signature,
+    similarity,
+)
+
+NOW = datetime(2025, 8, 7, 17, 0, tzinfo=UTC)
+
+LAUNCH = [
+    ("OpenAI launches GPT-5, its most capable model yet",
+     "OpenAI on Thursday launched GPT-5, saying the model sets new records on SWE-bench Verified and "
+     "reduces hallucinations, and is rolling out to all ChatGPT users."),
+    ("OpenAI launches GPT-5 model, its most capable yet",
+     "OpenAI launched GPT-5 on Thursday, saying the model sets records on SWE-bench Verified and "
+     "reduces hallucinations; it is rolling out to all ChatGPT users."),
+]
+UNRELATED = (
+    "Commerce Department tightens export controls on advanced AI chips",
+    "New rules restrict shipments of datacenter GPUs and high-bandwidth memory to additional countries.",
+)
+
+
+def test_signatures_separate_near_duplicates_from_other_stories():
+    first, second = (minhash_signature(event_text(*item)) for item in LAUNCH)
+    other = minhash_signature(event_text(*UNRELATED))
+
+    assert len(first) == 128
+    assert (minhash_signature(event_text(*LAUNCH[0])) == first).all()
+    assert similarity(first, second) >= 0.5
+    assert similarity(first, other) < 0.1
+
+
+def test_clusterer_joins_near_duplicates_within_the_window():
+    clusterer = StoryClusterer()
+    signatures = [minhash_signature(event_text(*item)) for item in LAUNCH + [UNRELATED]]
+
+    assert clusterer.assign(1, signatures[0], NOW) == 1
+    assert clusterer.assign(2, signatures[2], NOW) == 2
+    assert clusterer.assign(3, signatures[1], NOW + timedelta(hours=5)) == 1
+    # The same text weeks later is a different story
+    assert clusterer.assign(4, signatures[1], NOW + timedelta(days=30)) == 4
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    for model in (Event, EventLSHBucket):
+        model.__table__.create(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def add_events(db, items):
+    db.execute(insert(Event), [
+        {"id": event_id, "title": title, "summary": summary, "source_url": f"https://example.com/{event_id}",
+         "source_type": "news", "evidence_tier": "B", "published_at": published_at, "ingested_at": NOW,
+         "lang": "en", "retracted": False, "provisional": True, "needs_review": False, "url_is_valid": True}
+        for event_id, (title, summary), published_at in items
+    ])
+
+
+def test_assign_story_clusters_persists_and_matches_across_runs(db):
+    add_events(db, [(1, LAUNCH[0], NOW), (2, UNRELATED, NOW), (3, ("", None), NOW)])
+
+    assert assign_story_clusters(db, chunk_size=2) == 3
+    clusters = dict(db.execute(select(Event.id, Event.story_cluster_id)).all())
+    assert clusters == {1: 1, 2: 2, 3: 3}
+    # Empty text gets a signature but no buckets
+    assert db.scalar(select(Event.minhash).where(Event.id == 3)) is not None
+    assert len(db.execute(select(EventLSHBucket)).all()) == 2 * BANDS
+
+    # A later ingest finds the earlier event through the stored buckets
+    add_events(db, [(4, LAUNCH[1], NOW + timedelta(hours=2))])
+    assert assign_story_clusters(db) == 1
+    assert db.scalar(select(Event.story_cluster_id).where(Event.id == 4)) == 1
+    assert assign_story_clusters(db) == 0
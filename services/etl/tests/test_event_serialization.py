@@ -0,0 +1,56 @@
+"""Tests for the shared eager-loaded event serialization."""
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import Event, EventSignpostLink, Roadmap, Signpost
+from app.utils.event_serialization import serialize_event, serialize_feed_item, with_signpost_links
+from app.utils.query_counter import count_queries
+
+
+@pytest.fixture
+def db():
+    """In-memory database with 60 events, each linked to two signposts."""
+    engine = create_engine("sqlite://")
+    for model in (Roadmap, Signpost, Event, EventSignpostLink):
+        model.__table__.create(engine)
+
+    now = datetime(2025, 3, 1, tzinfo=UTC)
+    with Session(engine) as session:
+        # Core inserts keep the fixture out of the ORM write hooks
+        session.execute(insert(Signpost), [
+            {"id": i, "code": f"sp_{i}", "name": f"Signpost {i}", "category": "capabilities",
+             "metric_name": "score", "direction": ">=", "first_class": False}
+            for i in (1, 2)
+        ])
+        session.execute(insert(Event), [
+            {"id": i, "title": f"Event {i}", "source_url": f"https://example.com/{i}",
+             "source_type": "news", "evidence_tier": "A" if i % 2 else "C",
+             "published_at": now - timedelta(days=i), "ingested_at": now, "lang": "en",
+             "retracted": False, "provisional": True, "needs_review": False, "url_is_valid": True}
+            for i in range(1, 61)
+        ])
+        session.execute(insert(EventSignpostLink), [
+            {"event_id": i, "signpost_id": signpost_id, "confidence": 0.8, "tier": "A",
+             "provisional": False, "created_at": now, "needs_review": False}
+            for i in range(1, 61) for signpost_id in (1, 2)
+        ])
+        session.commit()
+        yield session
+
+
+@pytest.mark.parametrize("page_size", [5, 50])
+def test_page_costs_two_queries_regardless_of_size(db, page_size):
+    """Events plus one batched links/signposts query; serializing adds none."""
+    with count_queries(db) as stats:
+        events = db.scalars(with_signpost_links(select(Event)).order_by(Event.id).limit(page_size)).all()
+        results = [serialize_event(event) for event in events]
+        feed = [serialize_feed_item(event) for event in events]
+
+    assert stats["count"] == 2
+    assert len(results) == len(feed) == page_size
+    assert [link["signpost_code"] for link in results[0]["signpost_links"]] == ["sp_1", "sp_2"]
+    assert results[0]["url_is_valid"] is True and results[0]["tier"] == "A"
+    assert feed[0]["signposts"] == [{"code": "sp_1", "confidence": 0.8}, {"code": "sp_2", "confidence": 0.8}]
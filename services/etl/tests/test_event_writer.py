@@ -0,0 +1,45 @@
+"""Tests for the shared bulk event writer."""
+from sqlalchemy.dialects import postgresql
+
+from app.utils.event_writer import dedupe_rows, upsert_statement
+
+
+def make_row(url, dedup_hash, title="t", summary=None):
+    return {
+        "title": title,
+        "summary": summary,
+        "source_url": url,
+        "source_type": "blog",
+        "evidence_tier": "B",
+        "dedup_hash": dedup_hash,
+    }
+
+
+def test_dedupe_rows_merges_by_hash_and_url():
+    """Rows sharing a dedup_hash or URL collapse; later non-null values win."""
+    rows = [
+        make_row("https://a.example/1", "h1", title="first", summary="kept"),
+        make_row("https://a.example/1-amp", "h1", title="second"),
+        make_row("https://a.example/1-amp", None, title="third"),
+        make_row("https://b.example/2", "h2"),
+    ]
+
+    merged = dedupe_rows(rows)
+
+    assert len(merged) == 2
+    assert merged[0]["title"] == "third"
+    assert merged[0]["summary"] == "kept"
+    assert merged[0]["dedup_hash"] == "h1"
+    assert merged[1]["dedup_hash"] == "h2"
+
+
+def test_upsert_statement_targets_partial_dedup_index():
+    """One batch compiles to a single upsert on dedup_hash that keeps stored values over NULLs."""
+    rows = [make_row(f"https://a.example/{i}", f"h{i}") for i in range(3)]
+    sql = str(upsert_statement(rows).compile(dialect=postgresql.dialect()))
+
+    assert sql.count("INSERT INTO events") == 1
+    assert "ON CONFLICT (dedup_hash) WHERE dedup_hash IS NOT NULL DO UPDATE" in sql
+    assert "summary = coalesce(excluded.summary, events.summary)" in sql
+    assert "dedup_hash = " not in sql.split("DO UPDATE", 1)[1]
+    assert "RETURNING events.id, xmax = 0 AS inserted" in sql
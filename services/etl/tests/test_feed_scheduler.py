@@ -0,0 +1,92 @@
+"""Tests for the concurrent feed scheduler."""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.utils.feed_scheduler import fetch_feeds, load_feed_validators, save_feed_validators
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Lab blog</title>
+<item><title>Model card</title><link>https://lab.example/model-card</link></item>
+<item><title>Evals update</title><link>https://lab.example/evals</link></item>
+</channel></rss>"""
+
+
+pytestmark = pytest.mark.usefixtures("allow_robots")
+
+
+def feed_server(latency=0.0):
+    """Mock feed host: records request start times and honours If-None-Match."""
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append((request.url.host, time.perf_counter(), request.headers.get("if-none-match")))
+        await asyncio.sleep(latency)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=RSS, headers={"ETag": '"v1"', "Content-Type": "application/rss+xml"})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), requests
+
+
+def test_hosts_are_fetched_concurrently_with_per_host_spacing():
+    client, requests = feed_server(latency=0.2)
+    urls = [
+        "https://a.example/feed", "https://b.example/feed", "https://c.example/feed",
+        "https://a.example/research/feed",
+    ]
+
+    async def wave():
+        async with client:
+            started = time.perf_counter()
+            results = await fetch_feeds(urls, host_delay=0.3, client=client)
+            return results, time.perf_counter() - started
+
+    results, elapsed = asyncio.run(wave())
+
+    assert [result["status"] for result in results.values()] == ["ok"] * 4
+    assert [entry["title"] for entry in results[urls[0]]["entries"]] == ["Model card", "Evals update"]
+    # Serial with 3s sleeps would be 4 x (3 + 0.2); here b and c overlap a's two spaced requests
+    assert elapsed < 1.0
+    a_starts = sorted(started for host, started, _ in requests if host == "a.example")
+    assert a_starts[1] - a_starts[0] >= 0.2 + 0.3 - 0.01
+
+
+def test_conditional_get_turns_unchanged_feeds_into_304s():
+    client, requests = feed_server()
+    urls = ["https://a.example/feed"]
+    validators = {}
+
+    async def two_waves():
+        async with client:
+            first = await fetch_feeds(urls, validators, host_delay=0, client=client)
+            second = await fetch_feeds(urls, validators, host_delay=0, client=client)
+            return first, second
+
+    first, second = asyncio.run(two_waves())
+
+    assert first[urls[0]]["status"] == "ok"
+    assert validators == {urls[0]: {"etag": '"v1"', "last_modified": None}}
+    assert second[urls[0]] == {**second[urls[0]], "status": "not_modified", "entries": []}
+    assert [etag for _, _, etag in requests] == [None, '"v1"']
+
+
+def test_validators_round_trip_through_redis():
+    class FakeRedis:
+        def __init__(self):
+            self.hashes = {}
+
+        def hmget(self, key, fields):
+            return [self.hashes.get(key, {}).get(field) for field in fields]
+
+        def hset(self, key, mapping):
+            self.hashes.setdefault(key, {}).update(mapping)
+
+    redis_client = FakeRedis()
+    save_feed_validators({"https://a.example/feed": {"etag": '"v1"', "last_modified": None}}, redis_client)
+
+    assert load_feed_validators(["https://a.example/feed", "https://b.example/feed"], redis_client) == {
+        "https://a.example/feed": {"etag": '"v1"', "last_modified": None}
+    }
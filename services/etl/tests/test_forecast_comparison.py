@@ -0,0 +1,35 @@
+"""Tests for the batched forecast comparison."""
+import random
+from datetime import date, timedelta
+
+from app.services.forecast_comparison import compute_pace_status, compute_pace_status_batch
+
+
+def test_batch_matches_scalar_pace_status():
+    """Every pair gets exactly the scalar result, including degenerate and past-due cases."""
+    rng = random.Random(7)
+    cases = [
+        # baseline == target (binary), prediction in the past, current before baseline date
+        (5.0, 5.0, 5.0, ">=", date(2025, 1, 1), date(2026, 1, 1)),
+        (4.0, 5.0, 5.0, "<=", date(2025, 1, 1), date(2026, 1, 1)),
+        (60.0, 50.0, 90.0, ">=", date(2025, 6, 1), date(2022, 1, 1)),
+        (60.0, 50.0, 90.0, ">=", date(2022, 6, 1), date(2027, 1, 1)),
+    ]
+    for _ in range(200):
+        baseline = rng.uniform(0, 50)
+        cases.append((
+            rng.uniform(-10, 120),
+            baseline,
+            rng.choice([baseline + rng.uniform(1, 60), baseline - rng.uniform(1, 60)]),
+            rng.choice([">=", "<="]),
+            date(2023, 1, 1) + timedelta(days=rng.randint(0, 1200)),
+            date(2023, 1, 1) + timedelta(days=rng.randint(-100, 3000)),
+        ))
+
+    batch = compute_pace_status_batch(*zip(*cases))
+
+    assert batch == [compute_pace_status(*case) for case in cases]
+
+
+def test_batch_handles_no_pairs():
+    assert compute_pace_status_batch([], [], [], [], [], []) == []
@@ -0,0 +1,45 @@
+"""Tests for the shared per-host limiter."""
+import asyncio
+import time
+
+import pytest
+
+from app.utils.host_limiter import HostLimiter
+
+
+def starts_and_ends(limiter, latency, hosts):
+    events = []
+
+    async def request(host):
+        async with limiter.slot(host):
+            started = time.perf_counter()
+            await asyncio.sleep(latency)
+            events.append((host, started, time.perf_counter()))
+
+    async def run():
+        await asyncio.gather(*(request(host) for host in hosts))
+
+    asyncio.run(run())
+    return events
+
+
+def test_start_spacing_overlaps_requests_to_one_host():
+    events = starts_and_ends(HostLimiter(concurrency=2, interval=0.1, spacing="start"), 0.3, ["a", "a"])
+
+    (_, first_start, first_end), (_, second_start, _) = sorted(events, key=lambda e: e[1])
+    assert second_start - first_start >= 0.1 - 0.01
+    assert second_start < first_end
+
+
+def test_end_spacing_pauses_after_each_response():
+    events = starts_and_ends(HostLimiter(concurrency=1, interval=0.1, spacing="end"), 0.1, ["a", "a", "b"])
+
+    a = sorted((start, end) for host, start, end in events if host == "a")
+    b_start = next(start for host, start, _ in events if host == "b")
+    assert a[1][0] - a[0][1] >= 0.1 - 0.01
+    assert b_start < a[0][1]
+
+
+def test_unknown_spacing_is_rejected():
+    with pytest.raises(ValueError):
+        HostLimiter(spacing="middle")
@@ -0,0 +1,39 @@
+"""Tests for the batched index history service."""
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.models import IndexSnapshot
+from app.services.index_history import assemble_history, top_events_by_day_query
+
+
+def test_top_events_query_is_windowed_and_range_filtered():
+    """Events for the whole window come from one ROW_NUMBER query with a range predicate."""
+    query = top_events_by_day_query(Session(), date(2025, 1, 1), date(2025, 3, 31))
+    sql = str(query.statement.compile(dialect=postgresql.dialect()))
+
+    assert "row_number() OVER (PARTITION BY date(events.published_at)" in sql
+    assert "events.published_at >= " in sql
+    assert "events.published_at < " in sql
+    # The date() cast must not be used as a filter predicate
+    assert "WHERE date(" not in sql
+
+
+def test_assemble_history_joins_events_by_day():
+    """Each snapshot picks up only its own day's events."""
+    snapshots = [
+        IndexSnapshot(as_of_date=date(2025, 1, 1), preset="equal", overall=Decimal("0.4"),
+                      capabilities=Decimal("0.5"), agents=None, inputs=Decimal("0.3"), security=Decimal("0.1")),
+        IndexSnapshot(as_of_date=date(2025, 1, 2), preset="equal", overall=Decimal("0.41")),
+    ]
+    events_by_day = {date(2025, 1, 2): [{"id": 7, "title": "GPT launch", "tier": "A"}]}
+
+    history = assemble_history(snapshots, events_by_day)
+
+    assert history[0]["date"] == "2025-01-01"
+    assert history[0]["events"] == []
+    assert history[0]["agents"] == 0.0
+    assert history[0]["capabilities"] == 0.5
+    assert history[1]["events"] == [{"id": 7, "title": "GPT launch", "tier": "A"}]
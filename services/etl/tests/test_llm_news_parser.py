@@ -0,0 +1,123 @@
+"""Tests for the cached, budget-reserving LLM event parser."""
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.utils import llm_news_parser
+from app.utils.llm_news_parser import (
+    ESTIMATED_COST_USD,
+    build_prompt,
+    parse_event_with_llm,
+    parse_events_with_llm,
+    prompt_cache_key,
+)
+
+CODES = ["swe_bench_85", "osworld_50"]
+REPLY = json.dumps({"signposts": [
+    {"code": "swe_bench_85", "confidence": 0.8, "rationale": "SWE-bench result"},
+    {"code": "not_a_code", "confidence": 0.9, "rationale": "ignored"},
+]})
+
+
+@pytest.fixture
+def api_key():
+    with patch.object(llm_news_parser.settings, "openai_api_key", "sk-test"):
+        yield
+
+
+def make_client(content=REPLY):
+    client = MagicMock()
+    client.chat.completions.create.return_value.choices = [MagicMock(message=MagicMock(content=content))]
+    return client
+
+
+def test_prompt_cache_key_is_content_hash():
+    """Identical prompts share a key; any content change gives a new one."""
+    prompt = build_prompt("title", "summary", CODES, "A")
+
+    assert prompt_cache_key(prompt) == prompt_cache_key(build_prompt("title", "summary", CODES, "A"))
+    assert prompt_cache_key(prompt) != prompt_cache_key(build_prompt("title", "summary", CODES, "B"))
+
+
+def test_cache_hit_skips_budget_and_api(api_key):
+    """A cached response is parsed without reserving spend or calling OpenAI."""
+    redis_mock = MagicMock()
+    redis_mock.get.return_value = REPLY.encode()
+    client = make_client()
+
+    with patch("app.utils.llm_news_parser.get_redis_client", return_value=redis_mock), \
+            patch("app.utils.llm_news_parser.reserve_spend") as reserve, \
+            patch("app.utils.llm_news_parser.get_openai_client", return_value=client):
+        result = parse_event_with_llm("title", "summary", CODES, "A")
+
+    assert result == [("swe_bench_85", 0.8, "LLM: SWE-bench result")]
+    reserve.assert_not_called()
+    client.chat.completions.create.assert_not_called()
+
+
+def test_cache_miss_reserves_then_caches(api_key):
+    """A miss reserves budget before dispatch and stores the raw reply."""
+    redis_mock = MagicMock()
+    redis_mock.get.return_value = None
+    client = make_client()
+
+    with patch("app.utils.llm_news_parser.get_redis_client", return_value=redis_mock), \
+            patch("app.utils.llm_news_parser.reserve_spend", return_value=True) as reserve, \
+            patch("app.utils.llm_news_parser.get_openai_client", return_value=client):
+        result = parse_event_with_llm("title", "summary", CODES, "A")
+
+    assert [code for code, _, _ in result] == ["swe_bench_85"]
+    reserve.assert_called_once_with(ESTIMATED_COST_USD)
+    key, _, content = redis_mock.setex.call_args.args
+    assert key.startswith("llm_event_map:") and content == REPLY
+
+
+def test_exhausted_budget_skips_api(api_key):
+    """No request is made when the reservation is refused."""
+    client = make_client()
+
+    with patch("app.utils.llm_news_parser.get_redis_client", return_value=None), \
+            patch("app.utils.llm_news_parser.reserve_spend", return_value=False), \
+            patch("app.utils.llm_news_parser.get_openai_client", return_value=client):
+        assert parse_event_with_llm("title", "summary", CODES, "A") == []
+
+    client.chat.completions.create.assert_not_called()
+
+
+def test_failed_request_releases_reservation(api_key):
+    """A failed request hands its reserved spend back."""
+    client = make_client()
+    client.chat.completions.create.side_effect = RuntimeError("timeout")
+
+    with patch("app.utils.llm_news_parser.get_redis_client", return_value=None), \
+            patch("app.utils.llm_news_parser.reserve_spend", return_value=True), \
+            patch("app.utils.llm_news_parser.release_spend") as release, \
+            patch("app.utils.llm_news_parser.get_openai_client", return_value=client):
+        assert parse_event_with_llm("title", "summary", CODES, "A") == []
+
+    release.assert_called_once_with(ESTIMATED_COST_USD)
+
+
+def test_batch_is_concurrent_bounded_and_ordered():
+    """The batch stage overlaps calls up to max_workers and keeps input order."""
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+
+    def fake_parse(title, summary, codes, tier):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.02)
+        with lock:
+            active["now"] -= 1
+        return [(title, 0.5, tier)]
+
+    events = [(f"event-{i}", "", "B") for i in range(12)]
+    with patch("app.utils.llm_news_parser.parse_event_with_llm", side_effect=fake_parse):
+        results = parse_events_with_llm(events, CODES, max_workers=4)
+
+    assert [r[0][0] for r in results] == [title for title, _, _ in events]
+    assert 1 < active["peak"] <= 4
@@ -0,0 +1,142 @@
+"""Tests for the shared robots.txt policy cache."""
+import asyncio
+
+import httpx
+
+from app.utils.robots_cache import RobotsPolicyStore
+
+ROBOTS = b"User-agent: *\nDisallow: /private/\n"
+
+
+class FakeRedis:
+    """The subset of redis-py the store uses (TTLs on a fake clock)."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.values, self.expires, self.hashes = {}, {}, {}
+
+    def get(self, key):
+        if key in self.expires and self.expires[key] <= self.clock():
+            self.values.pop(key, None)
+        return self.values.get(key)
+
+    def ttl(self, key):
+        return int(self.expires[key] - self.clock()) if self.get(key) else -2
+
+    def set(self, key, value, ex):
+        self.values[key], self.expires[key] = value, self.clock() + ex
+
+    def hincrby(self, key, field, amount):
+        bucket = self.hashes.setdefault(key, {})
+        bucket[field] = bucket.get(field, 0) + amount
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def pipeline(self, transaction=False):
+        redis_client, calls = self, []
+
+        class Pipeline:
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: calls.append((name, args, kwargs))
+
+            def execute(self):
+                return [getattr(redis_client, name)(*args, **kwargs) for name, args, kwargs in calls]
+
+        return Pipeline()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def robots_server(responses):
+    """Mock hosts serving robots.txt: {host: (status, body)}, status None = unreachable; records requests."""
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.host)
+        await asyncio.sleep(0.01)
+        status, body = responses[request.url.host]
+        if status is None:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(status, content=body)
+
+    return httpx.MockTransport(handler), requests
+
+
+def test_concurrent_async_checks_share_one_download():
+    clock = Clock()
+    store = RobotsPolicyStore(FakeRedis(clock), ttl=3600, error_ttl=60, clock=clock)
+    transport, requests = robots_server({"lab.example": (200, ROBOTS)})
+    urls = [f"https://lab.example/blog/{i}" for i in range(5)] + ["https://lab.example/private/x"]
+
+    async def check_all():
+        async with httpx.AsyncClient(transport=transport) as client:
+            first = await asyncio.gather(*(store.can_fetch_async(url, client=client) for url in urls))
+            second = await store.can_fetch_async(urls[0], client=client)
+            return first, second
+
+    first, second = asyncio.run(check_all())
+
+    assert first == [True] * 5 + [False]
+    assert second is True
+    assert requests == ["lab.example"]
+    assert store.stats() == {
+        "lookups": 7, "local_hits": 6, "shared_hits": 0, "fetches": 1, "fetch_errors": 0,
+        "hit_rate": 0.8571, "cached_origins": 1,
+    }
+
+
+def test_policies_are_shared_across_workers_through_redis():
+    clock = Clock()
+    redis_client = FakeRedis(clock)
+    api_worker = RobotsPolicyStore(redis_client, ttl=3600, error_ttl=60, clock=clock)
+    celery_worker = RobotsPolicyStore(redis_client, ttl=3600, error_ttl=60, clock=clock)
+    transport, requests = robots_server({"lab.example": (200, ROBOTS)})
+
+    async def check():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await api_worker.can_fetch_async("https://lab.example/private/x", client=client)
+
+    assert asyncio.run(check()) is False
+    # The other worker reads the stored robots.txt instead of downloading it (sync path, no network)
+    assert celery_worker.can_fetch("https://lab.example/private/y") is False
+    assert celery_worker.can_fetch("https://lab.example/blog") is True
+    assert requests == ["lab.example"]
+
+    # Local copies expire with the shared entry
+    clock.now += 3600
+    assert celery_worker._local_get("https://lab.example") is None
+    api_worker.flush_stats()
+    stats = celery_worker.stats()
+    assert (stats["lookups"], stats["local_hits"], stats["shared_hits"], stats["fetches"]) == (3, 1, 1, 1)
+
+
+def test_missing_and_unreachable_robots_are_negatively_cached():
+    clock = Clock()
+    store = RobotsPolicyStore(FakeRedis(clock), ttl=3600, error_ttl=60, clock=clock)
+    transport, requests = robots_server({
+        "nofile.example": (404, b""), "flaky.example": (503, b""), "auth.example": (401, b""),
+        "down.example": (None, b""),
+    })
+
+    async def check(urls):
+        async with httpx.AsyncClient(transport=transport) as client:
+            return [await store.can_fetch_async(url, client=client) for url in urls]
+
+    # Server errors disallow (RFC 9309); only network errors fall back to permissive
+    urls = ["https://nofile.example/a", "https://flaky.example/a", "https://auth.example/a", "https://down.example/a"]
+    assert asyncio.run(check(urls + urls)) == [True, False, False, True] * 2
+    assert requests == ["nofile.example", "flaky.example", "auth.example", "down.example"]
+
+    # Unreachable hosts are retried after the short error TTL, missing files only after the full TTL
+    clock.now += 61
+    store.clear_local()
+    asyncio.run(check(urls))
+    assert requests[4:] == ["flaky.example", "down.example"]
+    assert store.stats()["fetch_errors"] == 4
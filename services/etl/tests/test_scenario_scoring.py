@@ -0,0 +1,58 @@
+"""Tests for vectorized what-if scenario scoring."""
+import pytest
+
+from app.models import Signpost
+from app.services.scenario_scoring import build_scenario_matrix, score_scenarios
+
+
+def make_signposts():
+    return [
+        Signpost(code="swe", category="capabilities", first_class=True),
+        Signpost(code="gpqa", category="capabilities", first_class=False),
+        Signpost(code="osworld", category="agents", first_class=True),
+        Signpost(code="flops", category="inputs", first_class=True),
+        Signpost(code="evals", category="security", first_class=False),
+        Signpost(code="gdp", category="economic", first_class=True),
+    ]
+
+
+def test_scenario_matrix_ignores_unknown_codes():
+    """Unknown signpost codes are ignored and missing ones score zero."""
+    matrix = build_scenario_matrix(make_signposts(), [{"swe": 50.0, "nope": 99.0}, {}])
+
+    assert matrix.shape == (2, 6)
+    assert matrix[0, 0] == pytest.approx(0.5)
+    assert matrix[0].sum() == pytest.approx(0.5)
+    assert matrix[1].sum() == 0.0
+
+
+def test_score_scenarios_matches_scalar_calculation():
+    """Batch scoring matches the per-scenario weighted mean + harmonic mean."""
+    scenarios = [
+        {"swe": 90.0, "gpqa": 60.0, "flops": 40.0, "evals": 20.0},
+        {"swe": 90.0},  # inputs zero -> overall zero
+    ]
+
+    scored = score_scenarios(make_signposts(), scenarios)
+
+    cap = (0.9 * 2 + 0.6) / 3
+    inputs = 0.4
+    assert scored["category_scores"][0, 0] == pytest.approx(cap)
+    assert scored["overall"][0] == pytest.approx(2 / (1 / cap + 1 / inputs))
+    assert scored["safety_margin"][0] == pytest.approx(0.2 - cap)
+    assert scored["overall"][1] == 0.0
+
+
+def test_score_scenarios_across_presets():
+    """preset_overall has one column per preset, in order."""
+    presets = {
+        "equal": {"capabilities": 0.25, "agents": 0.25, "inputs": 0.25, "security": 0.25},
+        "agents_only": {"capabilities": 0.0, "agents": 1.0, "inputs": 0.5, "security": 0.0},
+    }
+    scenarios = [{"swe": 80.0, "osworld": 40.0, "flops": 40.0}] * 1000
+
+    scored = score_scenarios(make_signposts(), scenarios, presets=presets)
+
+    assert scored["preset_overall"].shape == (1000, 2)
+    # agents_only preset: combined capabilities == agents == 0.4, inputs == 0.4
+    assert scored["preset_overall"][0, 1] == pytest.approx(0.4)
@@ -0,0 +1,128 @@
+"""Tests for the shared leaderboard scraper runtime."""
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+
+import httpx
+import pytest
+
+from app.tasks.fetch_osworld import parse_osworld_html
+from app.utils import scraper_runtime
+from app.utils.scraper_runtime import fetch_page, fresh_snapshot, parse_tables, run_scrapes
+
+LEADERBOARD = """<html><body><h2>Leaderboard</h2>
+<table>
+  <thead><tr><th>Model</th><th>Success rate</th></tr></thead>
+  <tbody>
+    <tr><td><a href="https://arxiv.org/abs/2404.07972">Agent S2</a></td><td>45.2%</td></tr>
+    <tr><td>UI-TARS (verified)<td>42.5%
+    <tr><td>Baseline</td><td>n/a</td></tr>
+  </tbody>
+</table>
+<table><tr><td>Other <table><tr><td>nested</td></tr></table> table</td></tr></table>
+</body></html>"""
+
+
+pytestmark = pytest.mark.usefixtures("allow_robots")
+
+
+def test_parse_tables_and_leaderboard_rows():
+    tables = parse_tables(LEADERBOARD)
+
+    assert len(tables) == 2
+    assert [row["cells"] for row in tables[0]] == [
+        ["Model", "Success rate"], ["Agent S2", "45.2%"], ["UI-TARS (verified)", "42.5%"], ["Baseline", "n/a"],
+    ]
+    assert [row["header"] for row in tables[0]] == [True, False, False, False]
+    assert tables[0][1]["links"] == ["https://arxiv.org/abs/2404.07972"]
+    assert tables[1][0]["cells"] == ["Other nested table"]
+
+    results = parse_osworld_html(LEADERBOARD)
+    assert [(r["model_name"], r["task_success_rate"], r["benchmark_version"]) for r in results] == [
+        ("Agent S2", 45.2, "standard"), ("UI-TARS (verified)", 42.5, "verified"),
+    ]
+
+
+class FakeBrowserPool:
+    """Stands in for BrowserPool: serves rendered HTML and counts pages."""
+
+    def __init__(self, html):
+        self.html = html
+        self.pages = 0
+
+    @asynccontextmanager
+    async def page(self):
+        self.pages += 1
+        pool = self
+
+        class Page:
+            async def goto(self, url, timeout):
+                pass
+
+            async def wait_for_load_state(self, state, timeout):
+                pass
+
+            async def content(self):
+                return pool.html
+
+        yield Page()
+
+
+def test_fetch_page_prefers_snapshot_then_http_then_browser(tmp_path, monkeypatch):
+    monkeypatch.setattr(scraper_runtime, "SNAPSHOT_DIR", tmp_path)
+    pages = {"/static": LEADERBOARD, "/spa": '<div id="root"></div><script src="app.js"></script>'}
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        return httpx.Response(200, text=pages[request.url.path])
+
+    pool = FakeBrowserPool(LEADERBOARD)
+
+    async def fetch(path, prefix):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await fetch_page(f"https://lab.example{path}", prefix, pool, client=client)
+
+    static = asyncio.run(fetch("/static", "static"))
+    spa = asyncio.run(fetch("/spa", "spa"))
+    again = asyncio.run(fetch("/static", "static"))
+
+    assert (static["via"], spa["via"], again["via"]) == ("http", "browser", "snapshot")
+    assert spa["html"] == LEADERBOARD
+    assert requests == ["/static", "/spa"]
+    assert pool.pages == 1
+    assert sorted(path.name.split("_")[0] for path in tmp_path.iterdir()) == ["spa", "static"]
+
+
+def test_stale_snapshots_are_ignored(tmp_path):
+    stale = (datetime.now(UTC) - timedelta(hours=13)).strftime(scraper_runtime.SNAPSHOT_TIMESTAMP)
+    fresh = (datetime.now(UTC) - timedelta(hours=1)).strftime(scraper_runtime.SNAPSHOT_TIMESTAMP)
+    for name in (f"gpqa_{stale}.html", f"webarena_github_{fresh}.html"):
+        (tmp_path / name).write_text(LEADERBOARD)
+
+    assert fresh_snapshot("gpqa", 12, tmp_path) is None
+    assert fresh_snapshot("webarena", 12, tmp_path) is None
+    assert fresh_snapshot("webarena_github", 12, tmp_path).name == f"webarena_github_{fresh}.html"
+
+
+def test_scrapes_run_concurrently_with_per_site_timeouts():
+    async def quick(pool):
+        await asyncio.sleep(0.1)
+        return ["entry"]
+
+    async def hangs(pool):
+        await asyncio.sleep(10)
+
+    async def broken(pool):
+        raise RuntimeError("layout changed")
+
+    async def run():
+        started = asyncio.get_running_loop().time()
+        # The shared browser is launched lazily: none of these scrapers opens a page
+        results = await run_scrapes({"a": quick, "b": quick, "slow": hangs, "broken": broken}, timeout=0.3)
+        return results, asyncio.get_running_loop().time() - started
+
+    results, elapsed = asyncio.run(run())
+
+    assert results == {"a": ["entry"], "b": ["entry"], "slow": None, "broken": None}
+    assert elapsed < 0.5
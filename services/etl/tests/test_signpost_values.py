@@ -0,0 +1,114 @@
+"""Tests for the materialized signpost current values."""
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Event, EventSignpostLink, Signpost, SignpostCurrentValue
+from app.services.signpost_values import (
+    STALE_KEY,
+    build_signpost_value_rows,
+    mark_signposts_stale,
+)
+from app.services.snapshot_engine import load_snapshot_graph
+
+MARCH = datetime(2025, 3, 1)
+APRIL = datetime(2025, 4, 1)
+
+
+def empty_evidence(**overrides):
+    return {"latest_claims": [], "latest_links": [], "max_values": [], "counts": [], **overrides}
+
+
+def test_event_link_wins_only_when_strictly_newer():
+    """The latest claim is the current value unless an event link is observed on a later day."""
+    evidence = empty_evidence(
+        latest_claims=[(1, Decimal("70"), MARCH), (2, Decimal("40"), APRIL)],
+        latest_links=[(1, Decimal("75"), APRIL), (2, Decimal("45"), APRIL.replace(hour=12))],
+    )
+
+    rows = {row["signpost_id"]: row for row in build_signpost_value_rows([1, 2], evidence)}
+
+    assert (rows[1]["current_value"], rows[1]["source_type"]) == (Decimal("75"), "event")
+    assert (rows[2]["current_value"], rows[2]["source_type"]) == (Decimal("40"), "claim")
+
+
+def test_max_value_tier_and_counts_merge_claims_and_links():
+    """Claim and link aggregates combine; signposts without evidence get an empty row."""
+    evidence = empty_evidence(
+        latest_links=[(1, Decimal("60"), None)],
+        max_values=[(1, Decimal("55"), "B"), (1, Decimal("60"), "A")],
+        counts=[(1, "A", 2), (1, "B", 1), (1, "A", 3), (1, "C", 4)],
+    )
+
+    first, second = build_signpost_value_rows([1, 2], evidence)
+
+    assert first["current_value"] == Decimal("60") and first["source_type"] == "event"
+    assert first["max_value"] == Decimal("60") and first["best_tier"] == "A"
+    assert (first["tier_a_count"], first["tier_b_count"], first["tier_c_count"], first["tier_d_count"]) == (5, 1, 4, 0)
+    assert second == {
+        "signpost_id": 2, "current_value": None, "observed_at": None, "source_type": None,
+        "max_value": None, "best_tier": None,
+        "tier_a_count": 0, "tier_b_count": 0, "tier_c_count": 0, "tier_d_count": 0,
+    }
+
+
+def test_mark_signposts_stale_accumulates_on_session():
+    """Bulk writers queue signposts on the session for the pre-commit refresh."""
+    db = Session()
+    mark_signposts_stale(db, [3, 1])
+    mark_signposts_stale(db, {1, 2})
+    mark_signposts_stale(db, [])
+
+    assert db.info[STALE_KEY]["signposts"] == {1, 2, 3}
+
+
+def test_snapshot_graph_reads_materialized_values():
+    """The snapshot engine takes max values, tiers and per-category counts from the table."""
+    signposts = [
+        {"id": 1, "category": "capabilities"},
+        {"id": 2, "category": "capabilities"},
+        {"id": 3, "category": "agents"},
+    ]
+    counts = {"tier_a_count": 1, "tier_b_count": 2, "tier_c_count": 0, "tier_d_count": 1}
+    values = {
+        1: SimpleNamespace(signpost_id=1, max_value=Decimal("70"), best_tier="A", **counts),
+        2: SimpleNamespace(signpost_id=2, max_value=None, best_tier=None, **counts),
+    }
+
+    with patch("app.services.snapshot_engine.load_snapshot_signposts", return_value=signposts), \
+            patch("app.services.snapshot_engine.load_signpost_values", return_value=values) as load:
+        graph = load_snapshot_graph(db=None)
+
+    load.assert_called_once_with(None, [1, 2, 3])
+    assert graph["max_values"] == {1: 70.0}
+    assert graph["best_tiers"] == {1: "A"}
+    assert graph["evidence_counts"]["capabilities"] == {"A": 2, "B": 4, "C": 0, "D": 2}
+    assert graph["evidence_counts"]["agents"] == {"A": 0, "B": 0, "C": 0, "D": 0}
+
+
+def test_rejecting_a_mapping_refreshes_the_materialized_row(client, db_session):
+    """The reject endpoint bulk-deletes links; the removed link's value and tier count go with it."""
+    event = Event(title="SWE-bench result", source_url="https://lab.example/swe", source_type="blog",
+                  evidence_tier="A", published_at=APRIL)
+    signpost = Signpost(code="swe_bench_85", category="capabilities", name="SWE-bench 85%",
+                        direction=">=", target_value=85, baseline_value=0)
+    db_session.add_all([event, signpost])
+    db_session.flush()
+    db_session.add(EventSignpostLink(event_id=event.id, signpost_id=signpost.id, confidence=0.9, tier="A",
+                                     provisional=False, value=Decimal("72"), observed_at=APRIL))
+    db_session.commit()
+
+    before = db_session.get(SignpostCurrentValue, signpost.id)
+    assert (before.max_value, before.tier_a_count) == (Decimal("72"), 1)
+
+    response = client.post(f"/v1/admin/events/{event.id}/reject", params={"reason": "wrong benchmark"},
+                           headers={"X-API-Key": settings.admin_api_key})
+
+    assert response.status_code == 200
+    db_session.expire_all()
+    after = db_session.get(SignpostCurrentValue, signpost.id)
+    assert (after.current_value, after.max_value, after.best_tier, after.tier_a_count) == (None, None, None, 0)
@@ -0,0 +1,150 @@
+"""Tests for the set-based snapshot engine."""
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.services.snapshot_engine import (
+    SNAPSHOT_CATEGORIES,
+    replay_snapshots,
+    score_categories,
+    score_presets,
+)
+from app.utils.query_counter import count_queries
+
+
+def make_graph():
+    """Small graph with one signpost per category plus an extra capabilities signpost."""
+    return {
+        "signposts": [
+            {"id": 1, "code": "swe", "category": "capabilities", "direction": ">=",
+             "baseline": 50.0, "target": 90.0, "first_class": True},
+            {"id": 2, "code": "gpqa", "category": "capabilities", "direction": ">=",
+             "baseline": 0.0, "target": 100.0, "first_class": False},
+            {"id": 3, "code": "osworld", "category": "agents", "direction": ">=",
+             "baseline": 10.0, "target": 60.0, "first_class": True},
+            {"id": 4, "code": "flops", "category": "inputs", "direction": ">=",
+             "baseline": 24.0, "target": 27.0, "first_class": True},
+            {"id": 5, "code": "latency", "category": "security", "direction": "<=",
+             "baseline": 10.0, "target": 0.0, "first_class": False},
+        ],
+        "max_values": {1: 70.0, 2: 40.0, 3: 35.0, 4: 25.5},
+        "best_tiers": {1: "A", 2: "B", 3: "A", 4: "B"},
+        "evidence_counts": {
+            "capabilities": {"A": 2, "B": 1, "C": 0, "D": 0},
+            "agents": {"A": 1, "B": 0, "C": 0, "D": 0},
+            "inputs": {"A": 0, "B": 1, "C": 1, "D": 0},
+            "security": {"A": 0, "B": 0, "C": 0, "D": 0},
+        },
+    }
+
+
+def test_score_categories_matches_scalar_path():
+    """Category scores use max A/B values with 2x first-class weighting."""
+    scores = score_categories(make_graph())
+
+    # swe: 0.5 (weight 2), gpqa: 0.4 (weight 1)
+    assert scores["capabilities"] == pytest.approx((0.5 * 2 + 0.4) / 3)
+    assert scores["agents"] == pytest.approx(0.5)
+    assert scores["inputs"] == pytest.approx(0.5)
+    # No evidence: falls back to baseline, zero progress
+    assert scores["security"] == 0.0
+
+
+def test_score_presets_shares_category_scores():
+    """Every preset gets the same category scores but its own index combination."""
+    presets = {
+        "equal": {"capabilities": 0.25, "agents": 0.25, "inputs": 0.25, "security": 0.25},
+        "aschenbrenner": {"capabilities": 0.2, "agents": 0.3, "inputs": 0.4, "security": 0.1},
+    }
+    results = score_presets(make_graph(), presets)
+
+    assert set(results) == set(presets)
+    assert results["equal"]["category_scores"] == results["aschenbrenner"]["category_scores"]
+    assert results["equal"]["index_metrics"]["overall"] != pytest.approx(
+        results["aschenbrenner"]["index_metrics"]["overall"]
+    )
+    for result in results.values():
+        assert set(SNAPSHOT_CATEGORIES) <= set(result["confidence_bands"])
+        assert "overall" in result["confidence_bands"]
+
+
+def test_monte_carlo_bands_replace_heuristic_for_selected_presets():
+    """Only presets selected for Monte Carlo get sampled bands."""
+    presets = {
+        "equal": {"capabilities": 0.25, "agents": 0.25, "inputs": 0.25, "security": 0.25},
+        "aschenbrenner": {"capabilities": 0.2, "agents": 0.3, "inputs": 0.4, "security": 0.1},
+    }
+    results = score_presets(make_graph(), presets, monte_carlo_presets=["aschenbrenner"], n_samples=2000, seed=1)
+
+    assert results["equal"]["confidence_method"] == "heuristic"
+    assert results["aschenbrenner"]["confidence_method"] == "monte_carlo"
+
+    bands = results["aschenbrenner"]["confidence_bands"]
+    overall = results["aschenbrenner"]["index_metrics"]["overall"]
+    assert bands["overall"]["lower"] <= overall <= bands["overall"]["upper"]
+    assert set(SNAPSHOT_CATEGORIES) <= set(bands)
+
+
+def test_empty_category_scores_zero():
+    """Categories without signposts score 0.0."""
+    graph = make_graph()
+    graph["signposts"] = [sp for sp in graph["signposts"] if sp["category"] != "agents"]
+
+    assert score_categories(graph)["agents"] == 0.0
+
+
+def test_count_queries_counts_statements():
+    """count_queries records each statement executed on the session."""
+    engine = create_engine("sqlite://")
+    with Session(engine) as db:
+        with count_queries(db) as stats:
+            db.execute(text("SELECT 1"))
+            db.execute(text("SELECT 2"))
+        db.execute(text("SELECT 3"))
+
+    assert stats["count"] == 2
+
+
+def test_replay_final_day_matches_aggregate_scoring():
+    """Replaying dated evidence reaches the same state as the aggregate graph."""
+    graph = make_graph()
+    observations = sorted([
+        (date(2024, 1, 1), 1, 60.0, "A", True),
+        (date(2024, 1, 3), 1, 70.0, "B", True),
+        (date(2024, 1, 3), 2, 40.0, "A", True),
+        (date(2024, 1, 2), 3, 35.0, "A", True),
+        (date(2024, 1, 5), 4, 25.5, "B", True),
+        (date(2024, 1, 5), 4, 26.9, "C", False),  # C-tier: counted, not scored
+    ], key=lambda obs: obs[0])
+    presets = {"equal": {"capabilities": 0.25, "agents": 0.25, "inputs": 0.25, "security": 0.25}}
+
+    days = dict(replay_snapshots(graph["signposts"], observations, presets, date(2024, 1, 2), date(2024, 1, 6)))
+
+    assert list(days) == [date(2024, 1, d) for d in range(2, 7)]
+
+    expected = score_categories(graph)
+    final = days[date(2024, 1, 6)]["equal"]
+    for category in SNAPSHOT_CATEGORIES:
+        assert final["category_scores"][category] == pytest.approx(expected[category])
+    assert final["evidence_counts"]["inputs"] == {"A": 0, "B": 1, "C": 1, "D": 0}
+
+
+def test_replay_carries_state_forward():
+    """Evidence before start_date seeds day one; later evidence only moves later days."""
+    graph = make_graph()
+    observations = [
+        (date(2023, 12, 1), 3, 35.0, "A", True),
+        (date(2024, 1, 3), 3, 60.0, "A", True),
+    ]
+    presets = {"equal": {"capabilities": 0.25, "agents": 0.25, "inputs": 0.25, "security": 0.25}}
+
+    days = dict(replay_snapshots(graph["signposts"], observations, presets, date(2024, 1, 1), date(2024, 1, 4)))
+
+    assert days[date(2024, 1, 1)]["equal"]["category_scores"]["agents"] == pytest.approx(0.5)
+    assert days[date(2024, 1, 2)]["equal"]["category_scores"]["agents"] == pytest.approx(0.5)
+    assert days[date(2024, 1, 3)]["equal"]["category_scores"]["agents"] == pytest.approx(1.0)
+    # Earlier days keep their own evidence counts
+    assert days[date(2024, 1, 1)]["equal"]["evidence_counts"]["agents"]["A"] == 1
+    assert days[date(2024, 1, 4)]["equal"]["evidence_counts"]["agents"]["A"] == 2
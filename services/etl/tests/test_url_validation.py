@@ -0,0 +1,120 @@
+"""Tests for the concurrent URL validation engine and task."""
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import Event
+from app.tasks.validate_urls import validate_due_event_urls
+from app.utils.url_validator import validate_urls
+
+
+def url_server(latency=0.0):
+    """Mock source hosts; records (method, host, path, start time)."""
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.url.host, request.url.path, time.perf_counter()))
+        await asyncio.sleep(latency)
+        path = request.url.path
+        if path == "/moved":
+            return httpx.Response(301, headers={"Location": "https://a.example/paper"})
+        if path == "/no-head" and request.method == "HEAD":
+            return httpx.Response(405)
+        if path == "/gone":
+            return httpx.Response(404)
+        if path == "/slow":
+            raise httpx.ReadTimeout("timed out", request=request)
+        return httpx.Response(200)
+
+    return httpx.MockTransport(handler), requests
+
+
+def test_results_match_the_single_url_validator():
+    transport, requests = url_server()
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await validate_urls(
+                ["https://a.example/moved", "https://a.example/no-head", "https://b.example/gone",
+                 "https://b.example/slow", "not a url", "https://a.example/moved"],
+                client=client, host_interval=0,
+            )
+
+    results = asyncio.run(run())
+
+    moved = results["https://a.example/moved"]
+    assert (moved["valid"], moved["status_code"], moved["final_url"], moved["redirect_count"]) == (
+        True, 200, "https://a.example/paper", 1
+    )
+    assert results["https://a.example/no-head"]["valid"] is True
+    assert results["https://b.example/gone"]["error"] == "HTTP 404"
+    assert results["https://b.example/slow"]["error"] == "Timeout after 10s"
+    assert results["not a url"]["error"] == "Invalid URL format (missing scheme or domain)"
+    # Duplicates are checked once; GET only as the HEAD fallback
+    assert sorted((method, path) for method, _, path, _ in requests) == [
+        ("GET", "/no-head"), ("HEAD", "/gone"), ("HEAD", "/moved"), ("HEAD", "/no-head"),
+        ("HEAD", "/paper"), ("HEAD", "/slow"),
+    ]
+
+
+def test_hosts_are_paced_independently():
+    transport, requests = url_server(latency=0.05)
+    urls = [f"https://a.example/{i}" for i in range(6)] + [f"https://b.example/{i}" for i in range(2)]
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            started = time.perf_counter()
+            await validate_urls(urls, client=client, per_host=2, host_interval=0.1)
+            return time.perf_counter() - started
+
+    elapsed = asyncio.run(run())
+
+    a_starts = sorted(started for _, host, _, started in requests if host == "a.example")
+    b_starts = sorted(started for _, host, _, started in requests if host == "b.example")
+    assert all(later - earlier >= 0.09 for earlier, later in zip(a_starts, a_starts[1:]))
+    # b.example doesn't queue behind a.example, and a.example is paced, not serialized on latency
+    assert b_starts[0] - a_starts[0] < 0.05
+    assert elapsed < 0.5 + 0.05 + 0.1
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Event.__table__.create(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def test_only_due_urls_are_checked_and_written_in_batches(db):
+    now = datetime.now(UTC)
+    db.execute(insert(Event), [
+        {"id": event_id, "title": f"Event {event_id}", "source_url": url, "source_type": "news",
+         "evidence_tier": "B", "published_at": now, "ingested_at": now, "lang": "en", "retracted": False,
+         "provisional": True, "needs_review": False, "url_is_valid": True, "url_validated_at": validated_at}
+        for event_id, url, validated_at in [
+            (1, "https://a.example/paper", None),
+            (2, "https://a.example/model-card", None),
+            (3, "https://b.example/gone", now - timedelta(days=30)),
+            (4, "https://b.example/fresh", now - timedelta(days=1)),
+        ]
+    ])
+    db.commit()
+    transport, requests = url_server()
+    client = httpx.AsyncClient(transport=transport)
+
+    stats = validate_due_event_urls(db, max_age_days=7, batch_size=2, client=client, host_interval=0)
+
+    assert (stats["checked"], stats["valid"], stats["invalid"], stats["errors"]) == (3, 2, 1, 0)
+    assert sorted(path for _, _, path, _ in requests) == ["/gone", "/model-card", "/paper"]
+    rows = {row.id: row for row in db.execute(select(Event.id, Event.url_is_valid, Event.url_status_code,
+                                                       Event.url_validated_at))}
+    assert [(rows[i].url_is_valid, rows[i].url_status_code) for i in (1, 2, 3)] == [
+        (True, 200), (True, 200), (False, 404)
+    ]
+    assert rows[4].url_status_code is None
+    assert validate_due_event_urls(db, max_age_days=7, client=client)["checked"] == 0
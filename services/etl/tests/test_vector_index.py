@@ -0,0 +1,121 @@
+"""Tests for the in-process vector index."""
+from datetime import datetime, timezone
+
+import numpy as np
+from sqlalchemy import create_engine, event, func, insert
+from sqlalchemy.orm import Session
+
+from app.models import Event
+from app.services import vector_index
+from app.services.vector_index import VectorIndex
+from app.tasks.populate_embeddings import UNDATED, _unindexed_ids
+
+
+def unit(*values, dimensions=4):
+    vector = np.zeros(dimensions)
+    vector[:len(values)] = values
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+def test_upserts_persist_and_are_visible_to_other_readers(tmp_path):
+    writer = VectorIndex("events", directory=tmp_path, dimensions=4)
+    reader = VectorIndex("events", directory=tmp_path, dimensions=4)
+    assert len(reader) == 0 and reader.search(unit(1), k=3) == []
+
+    writer.upsert([1, 2, 3], [unit(1, 0), unit(0, 1), unit(1, 1)])
+    assert [item_id for item_id, _ in reader.search(unit(1, 0.1), k=2)] == [1, 3]
+
+    # Replacing a vector and removing an item
+    writer.upsert([1], [unit(0, 0, 1)])
+    writer.remove([3])
+    hits = reader.search(unit(1, 0.1), k=3)
+    assert [item_id for item_id, _ in hits] == [2, 1]
+    assert reader.get(1) == unit(0, 0, 1)
+    assert len(reader) == 2 and len(reader.ids) == 4
+
+    # Compaction drops the dead rows and keeps results
+    assert writer.needs_rebuild()
+    assert writer.build() == {"rows": 2, "lists": 0, "generation": 1}
+    assert reader.search(unit(1, 0.1), k=3) == hits
+    assert sorted(path.name for path in tmp_path.glob("*.f32")) == ["events.1.f32"]
+
+
+def test_filters_on_tier_retraction_and_date(tmp_path):
+    index = VectorIndex("events", directory=tmp_path, dimensions=4)
+    index.upsert(
+        [10, 11, 12, 13],
+        [unit(1, 0.1), unit(1, 0.2), unit(1, 0.3), unit(1, 0.4)],
+        tiers=["A", "B", "A", None],
+        published_at=[
+            datetime(2025, 1, 5, tzinfo=timezone.utc),
+            datetime(2025, 3, 1),
+            datetime(2025, 6, 1, tzinfo=timezone.utc),
+            None,
+        ],
+    )
+    index.set_retracted([12])
+
+    def search(**filters):
+        return [item_id for item_id, _ in index.search(unit(1), k=10, **filters)]
+
+    assert search() == [10, 11, 13]
+    assert search(include_retracted=True) == [10, 11, 12, 13]
+    assert search(tiers=["A"], include_retracted=True) == [10, 12]
+    assert search(start=datetime(2025, 2, 1)) == [11]
+    assert search(end=datetime(2025, 3, 1)) == [10, 11]
+
+
+def test_ivf_search_matches_brute_force(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_index, "IVF_MIN_VECTORS", 500)
+    rng = np.random.default_rng(7)
+    centers = rng.normal(size=(30, 32))
+    vectors = centers[rng.integers(0, 30, 3000)] + rng.normal(scale=0.3, size=(3000, 32))
+    tiers = ["A" if i % 50 == 0 else "B" for i in range(3000)]
+
+    index = VectorIndex("events", directory=tmp_path, dimensions=32)
+    index.upsert(list(range(3000)), vectors, tiers=tiers)
+    assert index.needs_rebuild()
+    assert index.build()["lists"] == 55
+    assert not index.needs_rebuild()
+
+    recalls = []
+    for query in vectors[rng.integers(0, 3000, 20)] + rng.normal(scale=0.1, size=(20, 32)):
+        exact = {item_id for item_id, _ in index.search(query, k=10, exact=True)}
+        approximate = {item_id for item_id, _ in index.search(query, k=10)}
+        recalls.append(len(exact & approximate) / 10)
+
+        # A selective filter (60 rows) falls back to an exact scan
+        assert index.search(query, k=5, tiers=["A"]) == index.search(query, k=5, tiers=["A"], exact=True)
+    assert np.mean(recalls) >= 0.9
+
+    # Rows added after training are assigned to lists and found
+    index.upsert([5000], [vectors[0] * 2])
+    assert {item_id for item_id, _ in index.search(vectors[0], k=2)} == {0, 5000}
+
+
+def test_unindexed_events_are_paged_without_sending_the_index():
+    engine = create_engine("sqlite://")
+    Event.__table__.create(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, sql, params, *args: statements.append(params))
+    with Session(engine) as db:
+        db.execute(insert(Event), [
+            {"id": event_id, "title": f"Event {event_id}", "source_url": f"https://lab.example/{event_id}",
+             "source_type": "blog", "evidence_tier": "B" if event_id != 5 else "C", "lang": "en",
+             "retracted": event_id == 6, "provisional": True, "needs_review": False,
+             "published_at": datetime(2025, 1, event_id, tzinfo=timezone.utc) if event_id != 7 else None}
+            for event_id in range(1, 10)
+        ])
+        statements.clear()
+
+        ids = _unindexed_ids(
+            db,
+            (func.coalesce(Event.published_at, UNDATED), Event.id),
+            (Event.retracted.is_(False), Event.evidence_tier.in_(["A", "B"])),
+            indexed_ids={9, 8, 4, 3, 100_000}, limit=3, page_size=2,
+        )
+
+    # Newest first, skipping indexed, C-tier and retracted events; undated last
+    assert ids == [2, 1, 7]
+    # Indexed ids stay in Python: each page binds a handful of parameters
+    assert all(100_000 not in params and len(params) < 10 for params in statements)